@@ -144,23 +144,18 @@ def _get_role_filter(role_key: str) -> Q:
         return Q(show_to_guests=True)
 
 
-def compute_cache_ttl(
+def _ttl_boundary_querysets(
+    now: datetime,
     banner_type: str | None = None,
     role_key: str | None = None,
-) -> int:
+) -> tuple[QuerySet, QuerySet]:
     """
-    Вычисляет динамический TTL на основе ближайших временных границ активных баннеров.
-
-    Args:
-        banner_type: Тип баннера (hero, marketing). Если None — hero по умолчанию.
-        role_key: Ключ роли пользователя (guest, retail, trainer, ...). Если None — учитываются все роли.
+    Строит запросы ближайших временных границ баннеров для расчёта TTL.
 
     Returns:
-        TTL в секундах, не менее MIN_CACHE_TTL.
+        Кортеж (ближайший end_date текущих баннеров, ближайший start_date будущих)
+        в виде values_list QuerySet'ов — вызывающий код берёт first()/afirst().
     """
-    now = timezone.now()
-    nearest_seconds = BANNER_CACHE_TTL
-
     # Базовый queryset: только активные баннеры БЕЗ temporal/role фильтрации,
     # чтобы учесть будущие start_date и приближающиеся end_date для TTL.
     queryset = Banner.objects.filter(is_active=True)
@@ -170,37 +165,86 @@ def compute_cache_ttl(
         queryset = queryset.filter(_get_role_filter(role_key))
 
     # Ближайший end_date текущих активных баннеров (истечёт раньше TTL)
-    nearest_end = (
+    nearest_end_qs = (
         queryset.filter(end_date__isnull=False, end_date__gt=now)
         .order_by("end_date")
         .values_list("end_date", flat=True)
-        .first()
     )
-    if isinstance(nearest_end, datetime):
-        delta = int((nearest_end - now).total_seconds())
-        if 0 < delta < nearest_seconds:
-            nearest_seconds = delta
-
     # Ближайший start_date будущих баннеров (появится раньше TTL)
-    nearest_start = (
+    nearest_start_qs = (
         queryset.filter(start_date__isnull=False, start_date__gt=now)
         .order_by("start_date")
         .values_list("start_date", flat=True)
-        .first()
     )
-    if isinstance(nearest_start, datetime):
-        delta = int((nearest_start - now).total_seconds())
-        if 0 < delta < nearest_seconds:
-            nearest_seconds = delta
+    return nearest_end_qs, nearest_start_qs
 
+
+def _ttl_from_boundaries(now: datetime, boundaries: tuple[Any, ...]) -> int:
+    """Сокращает TTL до ближайшей границы показа, но не ниже MIN_CACHE_TTL."""
+    nearest_seconds = BANNER_CACHE_TTL
+    for boundary in boundaries:
+        if isinstance(boundary, datetime):
+            delta = int((boundary - now).total_seconds())
+            if 0 < delta < nearest_seconds:
+                nearest_seconds = delta
     return max(nearest_seconds, MIN_CACHE_TTL)
 
 
+def compute_cache_ttl(
+    banner_type: str | None = None,
+    role_key: str | None = None,
+) -> int:
+    """
+    Вычисляет динамический TTL на основе ближайших временных границ активных баннеров.
+
+    Args:
+        banner_type: Тип баннера (hero, marketing). Если None — hero по умолчанию.
+        role_key: Ключ роли пользователя (guest, retail, trainer, ...). Если None — учитываются все роли.
+
+    Returns:
+        TTL в секундах, не менее MIN_CACHE_TTL.
+    """
+    now = timezone.now()
+    nearest_end_qs, nearest_start_qs = _ttl_boundary_querysets(now, banner_type, role_key)
+    return _ttl_from_boundaries(now, (nearest_end_qs.first(), nearest_start_qs.first()))
+
+
+async def acompute_cache_ttl(
+    banner_type: str | None = None,
+    role_key: str | None = None,
+) -> int:
+    """Асинхронная версия compute_cache_ttl (async ORM) для ASGI endpoint'а."""
+    now = timezone.now()
+    nearest_end_qs, nearest_start_qs = _ttl_boundary_querysets(now, banner_type, role_key)
+    return _ttl_from_boundaries(now, (await nearest_end_qs.afirst(), await nearest_start_qs.afirst()))
+
+
 def cache_banner_response(cache_key: str, data: Any, ttl: Optional[int] = None) -> None:
     """Кеширует сериализованные данные баннеров."""
     cache.set(cache_key, data, ttl if ttl is not None else BANNER_CACHE_TTL)
 
 
+async def aget_cached_banners(cache_key: str) -> Any:
+    """Асинхронная версия get_cached_banners."""
+    return await cache.aget(cache_key)
+
+
+async def aget_active_banners(user: Any, banner_type: str = "hero", role_key: str | None = None) -> list[Banner]:
+    """
+    Асинхронно загружает активные баннеры (async ORM).
+
+    Фильтрация идентична get_active_banners_queryset; список материализуется
+    в event loop, поэтому сериализатор не обращается к БД.
+    """
+    queryset = get_active_banners_queryset(user, banner_type, role_key)
+    return [banner async for banner in queryset]
+
+
+async def acache_banner_response(cache_key: str, data: Any, ttl: Optional[int] = None) -> None:
+    """Асинхронная версия cache_banner_response."""
+    await cache.aset(cache_key, data, ttl if ttl is not None else BANNER_CACHE_TTL)
+
+
 def invalidate_banner_cache(banner_type: str) -> None:
     """
     Инвалидирует все ключи кеша для данного типа баннера по всем ролям.
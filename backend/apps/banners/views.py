@@ -9,16 +9,20 @@ from rest_framework import permissions, viewsets
 from rest_framework.request import Request
 from rest_framework.response import Response
 
+from apps.common.async_views import AsyncAPIViewMixin
+from apps.common.db_routing import ReplicaReadMixin
+
 from . import services
 from .serializers import BannerSerializer
 
 
-class ActiveBannersView(viewsets.ViewSet):
+class ActiveBannersView(AsyncAPIViewMixin, ReplicaReadMixin, viewsets.ViewSet):
     """
     ViewSet для получения активных баннеров
 
     Возвращает баннеры, отфильтрованные по роли текущего пользователя
-    и отсортированные по приоритету
+    и отсортированные по приоритету. Асинхронный (async ORM и кэш):
+    под ASGI не занимает поток воркера.
     """
 
     permission_classes = [permissions.AllowAny]
@@ -80,7 +84,7 @@ class ActiveBannersView(viewsets.ViewSet):
             ),
         ],
     )
-    def list(self, request: Request) -> Response:
+    async def list(self, request: Request) -> Response:
         """
         Получить список активных баннеров для текущего пользователя
 
@@ -95,15 +99,15 @@ class ActiveBannersView(viewsets.ViewSet):
         role_key = services.get_role_key(request.user)
         cache_key = services.build_cache_key(banner_type, role_key)
 
-        cached_data = services.get_cached_banners(cache_key)
+        cached_data = await services.aget_cached_banners(cache_key)
         if cached_data is not None:
             return Response(cached_data)
 
-        banners = services.get_active_banners_queryset(request.user, banner_type)
+        banners = await services.aget_active_banners(request.user, banner_type)
         serializer = BannerSerializer(banners, many=True, context={"request": request})
         data = serializer.data
 
-        ttl = services.compute_cache_ttl(banner_type, role_key)
-        services.cache_banner_response(cache_key, data, ttl)
+        ttl = await services.acompute_cache_ttl(banner_type, role_key)
+        await services.acache_banner_response(cache_key, data, ttl)
 
         return Response(data)
@@ -8,9 +8,15 @@ from django.core.management.base import BaseCommand
 from django.utils import timezone
 
 from apps.cart.models import Cart
+from apps.cart.services import CLEANUP_CHUNK_SIZE, purge_carts
 
 
 class Command(BaseCommand):
+    """
+    Удаляет старые гостевые корзины пачками (purge_carts): на пачку один DELETE
+    позиций со снятием резерва через журнал резервов и один DELETE корзин.
+    """
+
     help = "Очистка старых гостевых корзин (старше 30 дней)"
 
     def add_arguments(self, parser):
@@ -25,6 +31,12 @@ class Command(BaseCommand):
             action="store_true",
             help="Показать количество корзин для удаления без фактического удаления",
         )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=CLEANUP_CHUNK_SIZE,
+            help=f"Количество корзин, удаляемых за одну транзакцию (по умолчанию {CLEANUP_CHUNK_SIZE})",
+        )
 
     def handle(self, *args, **options):
         days = options["days"]
@@ -53,6 +65,6 @@ class Command(BaseCommand):
             return
 
         # Удаляем старые корзины
-        deleted_count, _ = old_guest_carts.delete()
+        deleted_count = purge_carts(old_guest_carts, chunk_size=options["chunk_size"])
 
         self.stdout.write(self.style.SUCCESS(f"Успешно удалено {deleted_count} старых гостевых корзин"))
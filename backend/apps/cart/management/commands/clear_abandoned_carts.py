@@ -7,6 +7,7 @@ from django.core.management.base import BaseCommand
 from django.utils import timezone
 
 from apps.cart.models import CartItem
+from apps.cart.services import CLEANUP_CHUNK_SIZE, purge_cart_items
 
 logger = logging.getLogger(__name__)
 
@@ -18,8 +19,9 @@ class Command(BaseCommand):
     "Брошенной" считается корзина, товары в которой не обновлялись
     дольше определенного времени (по умолчанию 24 часа).
 
-    При удалении CartItem автоматически срабатывает сигнал post_delete,
-    который освобождает зарезервированное количество товара (reserved_quantity).
+    Позиции удаляются пачками (purge_cart_items): на пачку один DELETE и одна
+    запись журнала резервов на вариант, строки вариантов не блокируются;
+    reserved_quantity обновится при ближайшей сверке журнала (fold_reservation_ledger_task).
     """
 
     help = 'Удаляет старые "брошенные" корзины для освобождения резервов товаров.'
@@ -31,6 +33,12 @@ class Command(BaseCommand):
             default=24,
             help='Количество часов, после которых корзина считается "брошенной".',
         )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=CLEANUP_CHUNK_SIZE,
+            help=f"Количество позиций, удаляемых за одну транзакцию (по умолчанию {CLEANUP_CHUNK_SIZE}).",
+        )
 
     def handle(self, *args, **options):
         hours = options["hours"]
@@ -47,11 +55,11 @@ class Command(BaseCommand):
 
         if count == 0:
             self.stdout.write(self.style.SUCCESS('"Брошенных" корзин не найдено. Завершаю работу.'))
+            return
 
         self.stdout.write(self.style.WARNING(f"Найдено {count} устаревших позиций в корзинах. Начинаю удаление..."))
-        # Удаляем найденные элементы. Сигнал post_delete на CartItem
-        # позаботится об обновлении reserved_quantity у товаров.
-        deleted_count, _ = abandoned_cart_items.delete()
+        # Удаляем найденные элементы пачками со снятием резерва через журнал
+        deleted_count = purge_cart_items(abandoned_cart_items, chunk_size=options["chunk_size"])
 
         self.stdout.write(
             self.style.SUCCESS(
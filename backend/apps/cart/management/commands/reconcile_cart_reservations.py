@@ -0,0 +1,33 @@
+# backend/apps/cart/management/commands/reconcile_cart_reservations.py
+
+from django.core.management.base import BaseCommand
+
+from apps.cart.services import fold_reservation_ledger, rebuild_reserved_quantities
+
+
+class Command(BaseCommand):
+    """
+    Django management-команда для сверки резервов корзин.
+
+    По умолчанию сворачивает журнал резервов в ProductVariant.reserved_quantity
+    (то же, что периодическая задача fold_reservation_ledger_task). С --rebuild
+    пересчитывает резерв всех вариантов из текущих позиций корзин.
+    """
+
+    help = "Сворачивает журнал резервов корзин в reserved_quantity вариантов."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rebuild",
+            action="store_true",
+            help="Пересчитать reserved_quantity из позиций корзин вместо сворачивания журнала.",
+        )
+
+    def handle(self, *args, **options):
+        if options["rebuild"]:
+            fixed = rebuild_reserved_quantities()
+            self.stdout.write(self.style.SUCCESS(f"Резерв пересчитан из корзин, исправлено вариантов: {fixed}"))
+            return
+
+        folded = fold_reservation_ledger()
+        self.stdout.write(self.style.SUCCESS(f"Свёрнуто записей журнала резервов: {folded}"))
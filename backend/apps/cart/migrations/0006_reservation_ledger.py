@@ -0,0 +1,38 @@
+# Generated by Django 5.2.7 on 2026-10-18 22:18
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("cart", "0005_migrate_to_productvariant"),
+        ("products", "0051_alter_productvariant_vat_rate"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ReservationLedgerEntry",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("delta", models.IntegerField(verbose_name="Изменение резерва")),
+                ("created_at", models.DateTimeField(auto_now_add=True, verbose_name="Дата создания")),
+                (
+                    "variant",
+                    models.ForeignKey(
+                        db_constraint=False,
+                        db_index=False,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="+",
+                        to="products.productvariant",
+                        verbose_name="Вариант товара",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Запись журнала резервов",
+                "verbose_name_plural": "Журнал резервов",
+                "db_table": "cart_reservation_ledger",
+            },
+        ),
+    ]
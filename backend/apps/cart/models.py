@@ -62,25 +62,45 @@ class Cart(models.Model):
             return f"Корзина пользователя {str(self.user.email or '')}"
         return f"Гостевая корзина {self.session_key[:10]}..."
 
+    def _prefetched_items(self) -> list["CartItem"] | None:
+        """Позиции из prefetch_related("items"), если они уже загружены"""
+        prefetched = getattr(self, "_prefetched_objects_cache", {})
+        if "items" in prefetched:
+            return list(prefetched["items"])
+        return None
+
     @property
     def total_items(self):
         """Общее количество товаров в корзине"""
         from django.db.models import Sum
 
+        items = self._prefetched_items()
+        if items is not None:
+            return sum(item.quantity for item in items)
         result = self.items.aggregate(total=Sum("quantity"))["total"]
         return result or 0
 
     @property
     def total_amount(self) -> "Decimal":
         """Общая стоимость товаров в корзине на основе снимков цен"""
-        total = Decimal("0")
-        for item in self.items.all():
-            total += item.total_price
-        return total
+        from django.db.models import F, Sum
+
+        items = self._prefetched_items()
+        if items is not None:
+            return sum((item.total_price for item in items), Decimal("0"))
+        result = self.items.aggregate(total=Sum(F("price_snapshot") * F("quantity")))["total"]
+        return result or Decimal("0")
 
     def clear(self):
-        """Очистить корзину"""
-        self.items.all().delete()
+        """
+        Очистить корзину.
+
+        Позиции удаляются одним DELETE, резерв снимается одной вставкой в журнал
+        резервов (apps.cart.services), без post_delete-сигнала на каждую позицию.
+        """
+        from apps.cart.services import delete_cart_items
+
+        delete_cart_items(self.pk)
         # Обновляем только updated_at без лишнего save()
         self.save(update_fields=["updated_at"])
 
@@ -116,6 +136,13 @@ class CartItem(models.Model):
             models.Index(fields=["cart", "added_at"]),
         ]
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Сохранённые значения — чтобы сигналы считали изменение резерва без повторного чтения
+        instance._loaded_reservation = (instance.__dict__.get("variant_id"), instance.__dict__.get("quantity"))
+        return instance
+
     def __str__(self) -> str:
         product_name = self.variant.product.name
         variant_info = []
@@ -156,3 +183,34 @@ class CartItem(models.Model):
         super().save(*args, **kwargs)
         # Обновляем время модификации корзины
         self.cart.save(update_fields=["updated_at"])
+
+
+class ReservationLedgerEntry(models.Model):
+    """
+    Запись журнала резервов: изменение ProductVariant.reserved_quantity.
+
+    Позиции корзины только добавляют записи (INSERT не блокирует строку варианта),
+    периодическая сверка сворачивает журнал в reserved_quantity одним UPDATE
+    (apps.cart.services.fold_reservation_ledger). Внешний ключ без constraint:
+    проверка FK брала бы блокировку строки популярного варианта на каждую вставку;
+    индекс по варианту не нужен — сверка читает журнал по id.
+    """
+
+    variant = models.ForeignKey(
+        "products.ProductVariant",
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        db_index=False,
+        related_name="+",
+        verbose_name="Вариант товара",
+    )
+    delta = models.IntegerField("Изменение резерва")
+    created_at = models.DateTimeField("Дата создания", auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Запись журнала резервов"
+        verbose_name_plural = "Журнал резервов"
+        db_table = "cart_reservation_ledger"
+
+    def __str__(self) -> str:
+        return f"{self.variant_id}: {self.delta:+d}"
@@ -144,6 +144,32 @@ class CartItemCreateSerializer(serializers.ModelSerializer):
         return attrs
 
 
+class CartBulkItemSerializer(serializers.Serializer):
+    """
+    Строка пакетного добавления: вариант по variant_id или по SKU и количество
+    """
+
+    variant_id = serializers.IntegerField(required=False)
+    sku = serializers.CharField(required=False, max_length=100)
+    quantity = serializers.IntegerField(min_value=1)
+
+    def validate(self, attrs: Dict[str, Any]) -> Dict[str, Any]:
+        """Ровно один идентификатор варианта"""
+        if ("variant_id" in attrs) == ("sku" in attrs):
+            raise serializers.ValidationError("Укажите variant_id или sku")
+        return attrs
+
+
+class CartBulkAddSerializer(serializers.Serializer):
+    """
+    Serializer пакетного добавления позиций в корзину (бланк заказа B2B)
+    """
+
+    MAX_ITEMS = 500
+
+    items = CartBulkItemSerializer(many=True, allow_empty=False, max_length=MAX_ITEMS)
+
+
 class CartItemUpdateSerializer(serializers.ModelSerializer):
     """
     Serializer для обновления количества в элементе корзины
@@ -202,3 +228,13 @@ class CartSerializer(serializers.ModelSerializer):
     def get_total_amount(self, obj):
         """Получить общую стоимость корзины в виде строки"""
         return f"{obj.total_amount:.2f}"
+
+
+class CartSummarySerializer(serializers.Serializer):
+    """
+    Serializer сводки корзины для бейджа в шапке сайта
+    """
+
+    items_count = serializers.IntegerField(help_text="Число позиций (вариантов) в корзине")
+    total_items = serializers.IntegerField(help_text="Общее количество товаров")
+    total_amount = serializers.CharField(help_text="Общая стоимость по снимкам цен")
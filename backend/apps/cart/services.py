@@ -0,0 +1,424 @@
+"""
+Журнал резервов корзины.
+
+Раньше каждое изменение позиции корзины перечитывало CartItem и сохраняло
+ProductVariant.reserved_quantity (read-modify-write): популярный SKU становился
+горячей строкой, а параллельные изменения теряли инкременты.
+
+Теперь изменения резерва записываются в ReservationLedgerEntry (только INSERT),
+а fold_reservation_ledger периодически (Celery beat) сворачивает журнал в
+reserved_quantity одним UPDATE с атомарным приращением. available_quantity
+варианта отстаёт от корзин не более чем на интервал сверки; остаток при
+оформлении заказа по-прежнему проверяется условным UPDATE (OrderCreateService).
+
+rebuild_reserved_quantities пересчитывает резерв из cart_items целиком —
+ежесуточная страховка от расхождений (например, после ручных правок в БД).
+
+bulk_add_items — пакетное добавление позиций (вставка бланка заказа B2B).
+
+Очистка брошенных и гостевых корзин (purge_cart_items, purge_carts) удаляет
+позиции пачками: на пачку один запрос удаления и одна запись журнала на вариант.
+Перенос гостевой корзины при входе (merge_guest_cart) — идемпотентный upsert.
+
+Сводка корзины (число позиций, количество, сумма) для бейджа в шапке сайта
+кэшируется по корзине и сбрасывается после commit'а любого изменения позиций.
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
+from typing import Any
+
+from django.core.cache import cache
+from django.db import connections, router, transaction
+from django.db.models import Count, F, Prefetch, Q, QuerySet, Sum
+
+from apps.cart.models import Cart, CartItem, ReservationLedgerEntry
+from apps.products.models import ProductVariant
+
+logger = logging.getLogger(__name__)
+
+CART_SUMMARY_CACHE_KEY = "cart:summary:{cart_id}"
+CART_SUMMARY_CACHE_TIMEOUT = 60 * 60 * 24
+CLEANUP_CHUNK_SIZE = 1000
+FOLD_BATCH_SIZE = 10000
+# Advisory lock: сверки журнала выполняются параллельно (shared), полный пересчёт — монопольно
+RESERVATION_LEDGER_LOCK_ID = 310031
+
+
+def with_cart_items(queryset: QuerySet[Cart]) -> QuerySet[Cart]:
+    """
+    Корзины с позициями, вариантами и товарами за два запроса.
+
+    Итоги (Cart.total_items, Cart.total_amount) и CartSerializer считаются
+    по загруженным позициям без дополнительных запросов.
+    """
+    items = CartItem.objects.select_related("variant__product").order_by("id")
+    return queryset.prefetch_related(Prefetch("items", queryset=items))
+
+
+def get_cart_summary(cart_id: int) -> dict[str, Any]:
+    """
+    Сводка корзины из кэша: число позиций, общее количество и сумма.
+
+    При промахе считается одним агрегатным запросом.
+    """
+    key = CART_SUMMARY_CACHE_KEY.format(cart_id=cart_id)
+    summary = cache.get(key)
+    if summary is None:
+        totals = CartItem.objects.filter(cart_id=cart_id).aggregate(
+            items_count=Count("id"), total_items=Sum("quantity"), total_amount=Sum(F("price_snapshot") * F("quantity"))
+        )
+        summary = {
+            "items_count": totals["items_count"],
+            "total_items": totals["total_items"] or 0,
+            "total_amount": f"{totals['total_amount'] or 0:.2f}",
+        }
+        cache.set(key, summary, CART_SUMMARY_CACHE_TIMEOUT)
+    return summary
+
+
+def invalidate_cart_summary(cart_id: int) -> None:
+    """Сбрасывает сводку корзины после commit'а: откат не сбрасывает, commit не гонится с кэшем."""
+    key = CART_SUMMARY_CACHE_KEY.format(cart_id=cart_id)
+    transaction.on_commit(lambda: cache.delete(key), using=router.db_for_write(CartItem))
+
+
+def record_reservation(variant_id: int, delta: int) -> None:
+    """Добавляет изменение резерва варианта в журнал."""
+    if delta:
+        ReservationLedgerEntry.objects.create(variant_id=variant_id, delta=delta)
+
+
+def _delete_items_releasing(cursor: Any, where_sql: str, params: list[Any]) -> dict[int, int]:
+    """
+    Удаляет позиции корзин по условию и снимает их резерв одним запросом.
+
+    Снятие резерва — одна запись журнала на вариант с суммой по всем удалённым
+    позициям; строки вариантов не блокируются.
+
+    Returns:
+        Количество удалённых позиций по корзинам
+    """
+    ledger = ReservationLedgerEntry._meta
+    items = CartItem._meta
+    cursor.execute(
+        f"""
+        WITH deleted AS (
+            DELETE FROM "{items.db_table}" WHERE {where_sql} RETURNING cart_id, variant_id, quantity
+        ),
+        released AS (
+            INSERT INTO "{ledger.db_table}" (variant_id, delta, created_at)
+            SELECT variant_id, -SUM(quantity), NOW() FROM deleted GROUP BY variant_id
+        )
+        SELECT cart_id, COUNT(*) FROM deleted GROUP BY cart_id
+        """,
+        params,
+    )
+    return dict(cursor.fetchall())
+
+
+def _invalidate_cart_summaries(cart_ids: list[int]) -> None:
+    keys = [CART_SUMMARY_CACHE_KEY.format(cart_id=cart_id) for cart_id in cart_ids]
+    if keys:
+        transaction.on_commit(lambda: cache.delete_many(keys), using=router.db_for_write(CartItem))
+
+
+def delete_cart_items(cart_id: int) -> int:
+    """
+    Удаляет все позиции корзины и снимает их резерв одним запросом, без post_delete-сигналов.
+
+    Returns:
+        Количество удалённых позиций
+    """
+    using = router.db_for_write(CartItem)
+    with transaction.atomic(using=using), connections[using].cursor() as cursor:
+        deleted = _delete_items_releasing(cursor, "cart_id = %s", [cart_id])
+        invalidate_cart_summary(cart_id)
+    return deleted.get(cart_id, 0)
+
+
+def purge_cart_items(queryset: QuerySet[CartItem], chunk_size: int = CLEANUP_CHUNK_SIZE) -> int:
+    """
+    Удаляет позиции корзин из queryset пачками по chunk_size.
+
+    Каждая пачка — отдельная транзакция из двух запросов: выбор id и удаление
+    со снятием резерва (_delete_items_releasing). Сигналы не вызываются.
+
+    Returns:
+        Количество удалённых позиций
+    """
+    using = router.db_for_write(CartItem)
+    total = 0
+    while True:
+        ids = list(queryset.order_by("pk").values_list("pk", flat=True)[:chunk_size])
+        if not ids:
+            break
+        with transaction.atomic(using=using), connections[using].cursor() as cursor:
+            deleted = _delete_items_releasing(cursor, "id = ANY(%s)", [ids])
+            _invalidate_cart_summaries(list(deleted))
+        total += sum(deleted.values())
+        if len(ids) < chunk_size:
+            break
+    return total
+
+
+def purge_carts(queryset: QuerySet[Cart], chunk_size: int = CLEANUP_CHUNK_SIZE) -> int:
+    """
+    Удаляет корзины из queryset вместе с позициями пачками по chunk_size.
+
+    На пачку — выбор id, удаление позиций со снятием резерва и удаление корзин;
+    ORM-каскад с post_delete-сигналом на каждую позицию не используется.
+
+    Returns:
+        Количество удалённых корзин
+    """
+    using = router.db_for_write(Cart)
+    carts_table = Cart._meta.db_table
+    total = 0
+    while True:
+        ids = list(queryset.order_by("pk").values_list("pk", flat=True)[:chunk_size])
+        if not ids:
+            break
+        with transaction.atomic(using=using), connections[using].cursor() as cursor:
+            _delete_items_releasing(cursor, "cart_id = ANY(%s)", [ids])
+            cursor.execute(f'DELETE FROM "{carts_table}" WHERE id = ANY(%s)', [ids])
+            total += cursor.rowcount
+            _invalidate_cart_summaries(ids)
+        if len(ids) < chunk_size:
+            break
+    return total
+
+
+def merge_guest_cart(guest_cart_id: int, user_id: int) -> int:
+    """
+    Переносит позиции гостевой корзины в корзину пользователя и удаляет гостевую.
+
+    Идемпотентна: гостевая корзина удаляется в той же транзакции, повторный вызов
+    (ретрай задачи) ничего не делает. Количество одинаковых вариантов суммируется,
+    снимок цены новых позиций берётся из гостевой корзины. Позиции переносятся
+    одним upsert'ом; резерв не меняется — товар лишь переходит между корзинами.
+
+    Returns:
+        Количество перенесённых позиций
+    """
+    using = router.db_for_write(Cart)
+    with transaction.atomic(using=using):
+        guest_cart = Cart.objects.select_for_update().filter(pk=guest_cart_id, user__isnull=True).first()
+        if guest_cart is None:
+            return 0
+        user_cart, _ = Cart.objects.get_or_create(user_id=user_id)
+        Cart.objects.select_for_update().filter(pk=user_cart.pk).values_list("pk", flat=True).first()
+
+        guest_items = list(
+            CartItem.objects.filter(cart=guest_cart).values_list("variant_id", "quantity", "price_snapshot")
+        )
+        quantities = dict(
+            CartItem.objects.filter(cart=user_cart, variant_id__in=[item[0] for item in guest_items]).values_list(
+                "variant_id", "quantity"
+            )
+        )
+        if guest_items:
+            CartItem.objects.bulk_create(
+                [
+                    CartItem(
+                        cart=user_cart,
+                        variant_id=variant_id,
+                        quantity=quantities.get(variant_id, 0) + quantity,
+                        price_snapshot=price_snapshot,
+                    )
+                    for variant_id, quantity, price_snapshot in sorted(guest_items)
+                ],
+                update_conflicts=True,
+                unique_fields=["cart", "variant"],
+                update_fields=["quantity", "updated_at"],
+            )
+            user_cart.save(update_fields=["updated_at"])
+
+        with connections[using].cursor() as cursor:
+            cursor.execute(f'DELETE FROM "{CartItem._meta.db_table}" WHERE cart_id = %s', [guest_cart.pk])
+            cursor.execute(f'DELETE FROM "{Cart._meta.db_table}" WHERE id = %s', [guest_cart.pk])
+        _invalidate_cart_summaries([guest_cart.pk, user_cart.pk])
+    return len(guest_items)
+
+
+def fold_reservation_ledger(batch_size: int = FOLD_BATCH_SIZE) -> int:
+    """
+    Сворачивает журнал резервов в ProductVariant.reserved_quantity.
+
+    Каждая пачка — один запрос: записи удаляются (DELETE ... RETURNING),
+    суммируются по варианту и применяются приращением к reserved_quantity.
+    SKIP LOCKED позволяет параллельным запускам сверки не ждать друг друга;
+    каждая запись учитывается ровно один раз.
+
+    Returns:
+        Количество свёрнутых записей журнала
+    """
+    ledger = ReservationLedgerEntry._meta
+    variants = ProductVariant._meta
+    sql = f"""
+        WITH folded AS (
+            DELETE FROM "{ledger.db_table}"
+            WHERE id IN (
+                SELECT id FROM "{ledger.db_table}" ORDER BY id LIMIT %s FOR UPDATE SKIP LOCKED
+            )
+            RETURNING variant_id, delta
+        ),
+        totals AS (
+            SELECT variant_id, SUM(delta) AS delta, COUNT(*) AS entries FROM folded GROUP BY variant_id
+        ),
+        applied AS (
+            UPDATE "{variants.db_table}" AS v
+            SET reserved_quantity = GREATEST(v.reserved_quantity + totals.delta, 0)
+            FROM totals
+            WHERE v.id = totals.variant_id AND totals.delta <> 0
+        )
+        SELECT COALESCE(SUM(entries), 0) FROM totals
+    """
+    using = router.db_for_write(ProductVariant)
+    total = 0
+    while True:
+        with transaction.atomic(using=using), connections[using].cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_xact_lock_shared(%s)", [RESERVATION_LEDGER_LOCK_ID])
+            cursor.execute(sql, [batch_size])
+            folded = int(cursor.fetchone()[0])
+        total += folded
+        if folded < batch_size:
+            break
+    if total:
+        logger.info("Журнал резервов: свёрнуто %s записей", total)
+    return total
+
+
+def rebuild_reserved_quantities() -> int:
+    """
+    Пересчитывает reserved_quantity всех вариантов из текущих позиций корзин.
+
+    Журнал очищается в том же запросе (data-modifying CTE выполняется всегда):
+    записи, видимые в снимке, уже отражены в cart_items этого снимка, а более
+    поздние будут свёрнуты обычной сверкой.
+
+    Returns:
+        Количество вариантов, у которых резерв был исправлен
+    """
+    ledger = ReservationLedgerEntry._meta
+    variants = ProductVariant._meta
+    items = CartItem._meta
+    sql = f"""
+        WITH cleared AS (
+            DELETE FROM "{ledger.db_table}" RETURNING 1
+        ),
+        actual AS (
+            SELECT v.id, COALESCE(SUM(ci.quantity), 0) AS reserved
+            FROM "{variants.db_table}" AS v
+            LEFT JOIN "{items.db_table}" AS ci ON ci.variant_id = v.id
+            GROUP BY v.id
+        )
+        UPDATE "{variants.db_table}" AS v
+        SET reserved_quantity = actual.reserved
+        FROM actual
+        WHERE v.id = actual.id AND v.reserved_quantity <> actual.reserved
+    """
+    using = router.db_for_write(ProductVariant)
+    with transaction.atomic(using=using), connections[using].cursor() as cursor:
+        # Ждём завершения идущих сверок: иначе их приращение затёрлось бы пересчётом
+        cursor.execute("SELECT pg_advisory_xact_lock(%s)", [RESERVATION_LEDGER_LOCK_ID])
+        cursor.execute(sql)
+        fixed = cursor.rowcount
+    if fixed:
+        logger.warning("Резерв пересчитан из корзин: исправлено %s вариантов", fixed)
+    return fixed
+
+
+@dataclass
+class BulkAddResult:
+    """Итог пакетного добавления: добавленные строки и ошибки по индексам входного списка."""
+
+    added: list[dict[str, Any]] = field(default_factory=list)
+    errors: list[dict[str, Any]] = field(default_factory=list)
+
+
+def bulk_add_items(cart: Cart, lines: list[dict[str, Any]], user: Any = None) -> BulkAddResult:
+    """
+    Добавляет в корзину список позиций {variant_id | sku, quantity} за фиксированное число запросов.
+
+    Семантика совпадает с добавлением одной позиции (CartItemViewSet.perform_create):
+    количество суммируется с уже лежащим в корзине, снимок цены фиксируется только
+    для новых позиций, итоговое количество не превышает остаток на складе.
+    Ошибочные строки не мешают добавлению остальных.
+
+    Запросы: блокировка корзины, варианты с товарами и ценами, текущие позиции,
+    upsert позиций (bulk_create с update_conflicts), вставка журнала резервов,
+    обновление updated_at корзины.
+    """
+    result = BulkAddResult()
+    variant_ids = {line["variant_id"] for line in lines if line.get("variant_id") is not None}
+    skus = {line["sku"] for line in lines if line.get("sku")}
+
+    with transaction.atomic(using=router.db_for_write(CartItem)):
+        # Блокировка корзины сериализует параллельные добавления: итоговое количество
+        # считается здесь и записывается upsert'ом как абсолютное значение
+        Cart.objects.select_for_update().filter(pk=cart.pk).values_list("pk", flat=True).first()
+
+        variants = list(
+            ProductVariant.objects.select_related("product").filter(Q(pk__in=variant_ids) | Q(sku__in=skus))
+        )
+        by_id = {variant.pk: variant for variant in variants}
+        by_sku = {variant.sku: variant for variant in variants}
+        quantities = dict(
+            CartItem.objects.filter(cart=cart, variant_id__in=by_id).values_list("variant_id", "quantity")
+        )
+
+        added: dict[int, int] = {}
+        for index, line in enumerate(lines):
+            if line.get("variant_id") is not None:
+                variant = by_id.get(line["variant_id"])
+            else:
+                variant = by_sku.get(line["sku"])
+            error = _validate_bulk_line(variant, line["quantity"], quantities)
+            if variant is None or error:
+                result.errors.append(
+                    {"index": index, "variant_id": line.get("variant_id"), "sku": line.get("sku"), "error": error}
+                )
+                continue
+            quantities[variant.pk] = quantities.get(variant.pk, 0) + line["quantity"]
+            added[variant.pk] = added.get(variant.pk, 0) + line["quantity"]
+            result.added.append({"index": index, "variant_id": variant.pk, "sku": variant.sku})
+
+        if added:
+            CartItem.objects.bulk_create(
+                [
+                    CartItem(
+                        cart=cart,
+                        variant_id=variant_pk,
+                        quantity=quantities[variant_pk],
+                        price_snapshot=by_id[variant_pk].get_price_for_user(user),
+                    )
+                    for variant_pk in sorted(added)
+                ],
+                update_conflicts=True,
+                unique_fields=["cart", "variant"],
+                update_fields=["quantity", "updated_at"],
+            )
+            # bulk_create не вызывает post_save — резерв записываем в журнал сами
+            ReservationLedgerEntry.objects.bulk_create(
+                ReservationLedgerEntry(variant_id=variant_pk, delta=delta) for variant_pk, delta in added.items()
+            )
+            cart.save(update_fields=["updated_at"])
+            invalidate_cart_summary(cart.pk)
+
+    return result
+
+
+def _validate_bulk_line(variant: ProductVariant | None, quantity: int, quantities: dict[int, int]) -> str | None:
+    """Проверки CartItemCreateSerializer и CartItem.clean для одной строки пакета."""
+    if variant is None:
+        return "Вариант товара не найден"
+    if not variant.product.is_active:
+        return "Товар неактивен"
+    if not variant.is_active:
+        return "Вариант товара неактивен"
+    if quantities.get(variant.pk, 0) + quantity > variant.stock_quantity:
+        return f"Недостаточно товара на складе. Доступно: {variant.stock_quantity}"
+    return None
@@ -3,42 +3,64 @@
 """
 
 from django.contrib.auth import get_user_model
+from django.db import transaction
 from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 
 from .models import Cart, CartItem
+from .services import invalidate_cart_summary, record_reservation
+
+
+def _release_loaded_reservation(instance) -> None:
+    """Снимает резерв, записанный при загрузке или последнем сохранении позиции."""
+    variant_id, quantity = getattr(instance, "_loaded_reservation", (None, None))
+    if variant_id is not None and quantity:
+        record_reservation(variant_id, -quantity)
 
 
 @receiver(pre_save, sender=CartItem)
-def update_reserved_quantity_on_save(sender, instance, **kwargs):
+def remember_reservation_before_save(sender, instance, **kwargs):
     """
-    Обновляет зарезервированное количество варианта товара до сохранения CartItem.
+    Запоминает сохранённые вариант и количество позиции, если объект создан не из БД.
+
+    Для загруженных из БД позиций значения уже есть (CartItem.from_db).
     """
-    if instance.pk:  # Если это обновление существующего объекта
-        try:
-            old_instance = CartItem.objects.get(pk=instance.pk)
-            quantity_diff = instance.quantity - old_instance.quantity
-        except CartItem.DoesNotExist:
-            quantity_diff = instance.quantity
-    else:  # Если это создание нового объекта
-        quantity_diff = instance.quantity
+    if instance.pk and not hasattr(instance, "_loaded_reservation"):
+        instance._loaded_reservation = CartItem.objects.filter(pk=instance.pk).values_list(
+            "variant_id", "quantity"
+        ).first() or (None, None)
 
-    variant = instance.variant
-    variant.reserved_quantity += quantity_diff
-    variant.save(update_fields=["reserved_quantity"])
+
+@receiver(post_save, sender=CartItem)
+def update_reserved_quantity_on_save(sender, instance, created, **kwargs):
+    """
+    Записывает изменение резерва варианта в журнал после сохранения CartItem.
+
+    Строка ProductVariant не читается и не блокируется: reserved_quantity
+    обновляется периодической сверкой журнала (fold_reservation_ledger).
+    Кэшированная сводка корзины сбрасывается после commit'а.
+    """
+    old_variant_id, old_quantity = (None, None) if created else getattr(instance, "_loaded_reservation", (None, None))
+    if old_variant_id == instance.variant_id:
+        record_reservation(instance.variant_id, instance.quantity - (old_quantity or 0))
+    else:
+        if not created:
+            _release_loaded_reservation(instance)
+        record_reservation(instance.variant_id, instance.quantity)
+    instance._loaded_reservation = (instance.variant_id, instance.quantity)
+    invalidate_cart_summary(instance.cart_id)
 
 
 @receiver(post_delete, sender=CartItem)
 def update_reserved_quantity_on_delete(sender, instance, **kwargs):
     """
-    Уменьшает зарезервированное количество варианта товара после удаления CartItem.
+    Записывает снятие резерва варианта в журнал после удаления CartItem.
     """
-    variant = instance.variant
-    variant.reserved_quantity -= instance.quantity
-    # Убедимся, что резерв не станет отрицательным
-    if variant.reserved_quantity < 0:
-        variant.reserved_quantity = 0
-    variant.save(update_fields=["reserved_quantity"])
+    if not hasattr(instance, "_loaded_reservation"):
+        instance._loaded_reservation = (instance.variant_id, instance.quantity)
+    _release_loaded_reservation(instance)
+    instance._loaded_reservation = (None, None)
+    invalidate_cart_summary(instance.cart_id)
 
 
 User = get_user_model()
@@ -47,9 +69,12 @@ User = get_user_model()
 @receiver(post_save, sender=User)
 def merge_guest_cart_on_login(sender, instance, created, **kwargs):
     """
-    Перенос гостевой корзины при авторизации пользователя
+    Перенос гостевой корзины при авторизации пользователя.
+
+    Сам перенос выполняется в фоне (merge_guest_cart_task) после commit'а
+    транзакции, сохранившей пользователя, — сигнал лишь находит гостевую корзину.
     """
-    if not created:  # Срабатывает только при обновлении, не при создании
+    if not created:  # Срабатывает только при создании пользователя
         return
 
     # Ищем гостевую корзину в текущей сессии
@@ -61,33 +86,12 @@ def merge_guest_cart_on_login(sender, instance, created, **kwargs):
     if not session_key:
         return
 
-    try:
-        guest_cart = Cart.objects.get(session_key=session_key, user__isnull=True)
-
-        # Получаем или создаем корзину пользователя
-        user_cart, created = Cart.objects.get_or_create(user=instance)
-
-        if guest_cart.items.exists():
-            # Переносим товары из гостевой корзины
-            for guest_item in guest_cart.items.all():
-                try:
-                    # Проверяем, есть ли уже такой вариант в корзине пользователя
-                    user_item = CartItem.objects.get(cart=user_cart, variant=guest_item.variant)
-                    # Если есть, увеличиваем количество
-                    user_item.quantity += guest_item.quantity
-                    user_item.save()
-                except CartItem.DoesNotExist:
-                    # Если нет, создаем новый элемент с price_snapshot
-                    CartItem.objects.create(
-                        cart=user_cart,
-                        variant=guest_item.variant,
-                        quantity=guest_item.quantity,
-                        price_snapshot=guest_item.price_snapshot,
-                    )
-
-            # Удаляем гостевую корзину
-            guest_cart.delete()
-
-    except Cart.DoesNotExist:
+    guest_cart_id = Cart.objects.filter(session_key=session_key, user__isnull=True).values_list("pk", flat=True).first()
+    if guest_cart_id is None:
         # Гостевой корзины нет, ничего не делаем
-        pass
+        return
+
+    from .tasks import merge_guest_cart_task
+
+    user_id = instance.pk
+    transaction.on_commit(lambda: merge_guest_cart_task.delay(guest_cart_id, user_id))
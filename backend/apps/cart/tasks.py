@@ -4,6 +4,7 @@ import logging
 
 from celery import shared_task
 from django.core.management import call_command
+from django.db import OperationalError
 
 logger = logging.getLogger(__name__)
 
@@ -29,3 +30,46 @@ def clear_abandoned_carts_task(hours: int = 24) -> None:
         # В реальном проекте здесь можно добавить механизм повторных попыток
         # или систему уведомлений об ошибках
         raise
+
+
+@shared_task(name="apps.cart.tasks.fold_reservation_ledger_task", ignore_result=True)
+def fold_reservation_ledger_task() -> int:
+    """
+    Сворачивает журнал резервов корзин в ProductVariant.reserved_quantity.
+
+    Запускается Celery beat каждые RESERVATION_LEDGER_FOLD_SECONDS секунд.
+    """
+    from apps.cart.services import fold_reservation_ledger
+
+    return fold_reservation_ledger()
+
+
+@shared_task(name="apps.cart.tasks.rebuild_reserved_quantities_task")
+def rebuild_reserved_quantities_task() -> int:
+    """
+    Пересчитывает reserved_quantity из позиций корзин (ежесуточная страховка от расхождений).
+    """
+    from apps.cart.services import rebuild_reserved_quantities
+
+    logger.info("Запуск пересчёта резервов корзин")
+    return rebuild_reserved_quantities()
+
+
+@shared_task(
+    name="apps.cart.tasks.merge_guest_cart_task",
+    autoretry_for=(OperationalError,),
+    retry_backoff=True,
+    max_retries=3,
+)
+def merge_guest_cart_task(guest_cart_id: int, user_id: int) -> int:
+    """
+    Переносит гостевую корзину в корзину пользователя.
+
+    Идемпотентна (apps.cart.services.merge_guest_cart): ретрай после сбоя
+    не удвоит количество товаров.
+    """
+    from apps.cart.services import merge_guest_cart
+
+    merged = merge_guest_cart(guest_cart_id, user_id)
+    logger.info("Гостевая корзина %s перенесена пользователю %s: %s позиций", guest_cart_id, user_id, merged)
+    return merged
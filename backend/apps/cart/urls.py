@@ -11,6 +11,8 @@ app_name = "cart"
 urlpatterns = [
     # GET /cart/ - получить корзину
     path("", CartViewSet.as_view({"get": "list"}), name="cart-list"),
+    # GET /cart/summary/ - сводка для бейджа корзины
+    path("summary/", CartViewSet.as_view({"get": "summary"}), name="cart-summary"),
     # DELETE /cart/clear/ - очистить корзину
     path("clear/", CartViewSet.as_view({"delete": "clear"}), name="cart-clear"),
     # CRUD операции с элементами корзины
@@ -19,6 +21,8 @@ urlpatterns = [
         CartItemViewSet.as_view({"post": "create", "get": "list"}),
         name="cart-items-list",
     ),
+    # POST /cart/items/bulk/ - пакетное добавление (бланк заказа)
+    path("items/bulk/", CartItemViewSet.as_view({"post": "bulk"}), name="cart-items-bulk"),
     path(
         "items/<int:pk>/",
         CartItemViewSet.as_view({"get": "retrieve", "patch": "partial_update", "delete": "destroy"}),
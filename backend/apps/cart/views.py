@@ -15,7 +15,15 @@ if TYPE_CHECKING:
     pass  # Пока не используем TYPE_CHECKING импорты
 
 from .models import Cart, CartItem
-from .serializers import CartItemCreateSerializer, CartItemSerializer, CartItemUpdateSerializer, CartSerializer
+from .serializers import (
+    CartBulkAddSerializer,
+    CartItemCreateSerializer,
+    CartItemSerializer,
+    CartItemUpdateSerializer,
+    CartSerializer,
+    CartSummarySerializer,
+)
+from .services import bulk_add_items, get_cart_summary, with_cart_items
 
 
 class CartViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
@@ -61,9 +69,29 @@ class CartViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
     def list(self, request, *args, **kwargs):
         """Получить содержимое корзины"""
         cart = self.get_or_create_cart()
+        # Позиции с вариантами и товарами одним prefetch — итоги считаются по ним же
+        cart = with_cart_items(Cart.objects.filter(pk=cart.pk)).get()
         serializer = self.get_serializer(cart)
         return Response(serializer.data)
 
+    @extend_schema(
+        summary="Сводка корзины",
+        description=(
+            "Число позиций, общее количество и стоимость корзины для бейджа в шапке сайта. "
+            "Значения берутся из кэша и пересчитываются после изменения позиций."
+        ),
+        responses={200: CartSummarySerializer},
+        tags=["Cart"],
+    )
+    @action(detail=False, methods=["get"])
+    def summary(self, request):
+        """Получить сводку корзины без загрузки позиций"""
+        cart_id = self.get_queryset().values_list("pk", flat=True).first()
+        if cart_id is None:
+            # Корзину для бейджа не создаём
+            return Response({"items_count": 0, "total_items": 0, "total_amount": "0.00"})
+        return Response(CartSummarySerializer(get_cart_summary(cart_id)).data)
+
     @extend_schema(
         summary="Очистить корзину",
         description="Удаление всех товаров из корзины",
@@ -111,6 +139,8 @@ class CartItemViewSet(viewsets.ModelViewSet):
         """Выбор serializer в зависимости от действия"""
         if self.action == "create":
             return CartItemCreateSerializer
+        elif self.action == "bulk":
+            return CartBulkAddSerializer
         elif self.action in ["update", "partial_update"]:
             return CartItemUpdateSerializer
         return CartItemSerializer
@@ -198,6 +228,39 @@ class CartItemViewSet(viewsets.ModelViewSet):
         response_serializer = CartItemSerializer(self.cart_item, context={"request": request})
         return Response(response_serializer.data, status=status.HTTP_201_CREATED)
 
+    @extend_schema(
+        summary="Пакетно добавить варианты в корзину",
+        description=(
+            "Добавление списка позиций {variant_id | sku, quantity} одним запросом "
+            "(вставка бланка заказа). Количество суммируется с уже лежащим в корзине. "
+            "Ошибки возвращаются по каждой строке (index — позиция во входном списке), "
+            "остальные строки добавляются. В ответе — пересчитанная корзина."
+        ),
+        request=CartBulkAddSerializer,
+        responses={
+            200: OpenApiResponse(description="Корзина, добавленные строки и ошибки по строкам"),
+            400: OpenApiResponse(description="Ошибки валидации запроса или ни одна строка не добавлена"),
+        },
+        tags=["Cart Items"],
+    )
+    @action(detail=False, methods=["post"])
+    def bulk(self, request):
+        """Пакетно добавить варианты товаров в корзину"""
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        cart = self.get_or_create_cart()
+        user = request.user if request.user.is_authenticated else None
+        result = bulk_add_items(cart, serializer.validated_data["items"], user=user)
+
+        cart = with_cart_items(Cart.objects.filter(pk=cart.pk)).get()
+        data = {
+            "cart": CartSerializer(cart, context={"request": request}).data,
+            "added": result.added,
+            "errors": result.errors,
+        }
+        return Response(data, status=status.HTTP_200_OK if result.added else status.HTTP_400_BAD_REQUEST)
+
     @extend_schema(
         summary="Обновить количество товара",
         description="Полное изменение товара в корзине",
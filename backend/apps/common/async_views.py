@@ -0,0 +1,102 @@
+"""
+Асинхронный dispatch для DRF-представлений (ASGI режим).
+
+DRF 3.14 не умеет вызывать ``async def`` обработчики: ``APIView.dispatch``
+синхронный. ``AsyncAPIViewMixin`` заменяет его на корутину, поэтому под
+uvicorn-воркером read-only endpoint'ы обслуживаются в event loop и не
+занимают поток, пока долгие запросы обмена с 1С выполняются в пуле потоков.
+
+Аутентификация, permissions и throttling в DRF синхронные (JWT/сессии и
+throttle ходят в БД и Redis), поэтому ``initial()`` выполняется через
+``sync_to_async``. Синхронные обработчики (например, ``retrieve`` рядом с
+асинхронным ``list``) также вызываются через ``sync_to_async``.
+
+Под WSGI Django сам оборачивает асинхронное представление в ``async_to_sync``,
+так что представления работают в обоих режимах.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.db import connections, transaction
+from rest_framework.response import Response
+
+if TYPE_CHECKING:
+    from rest_framework.views import APIView
+
+    _MixinBase = APIView
+else:
+    _MixinBase = object
+
+
+class AsyncAPIViewMixin(_MixinBase):
+    """
+    Mixin для APIView/ViewSet с асинхронными обработчиками.
+
+    Использование:
+        class BannerView(AsyncAPIViewMixin, viewsets.ViewSet):
+            async def list(self, request): ...
+
+    Mixin предназначен только для read-only endpoint'ов: представление
+    исключается из ATOMIC_REQUESTS (Django не поддерживает его для async views).
+    """
+
+    @classmethod
+    def as_view(cls, *args: Any, **initkwargs: Any) -> Callable[..., Any]:  # type: ignore[override]
+        view = super().as_view(*args, **initkwargs)
+        if not iscoroutinefunction(view):
+            # ViewSetMixin.as_view возвращает sync-обёртку, которая вернёт корутину dispatch
+            view = markcoroutinefunction(view)
+        for alias in connections:
+            view = transaction.non_atomic_requests(using=alias)(view)
+        return view
+
+    def get_exception_handler(self) -> Callable[..., Response | None]:
+        """
+        Обработчик исключений DRF без ``set_rollback()``.
+
+        Представление не открывает транзакцию (non_atomic_requests), поэтому
+        откатывать нечего; иначе DRF пометил бы на откат внешний atomic-блок,
+        которому представление не принадлежит (например, транзакцию теста).
+        """
+        exception_handler = super().get_exception_handler()
+
+        def handler(exc: Exception, context: dict[str, Any]) -> Response | None:
+            needs_rollback = {conn.alias: conn.needs_rollback for conn in connections.all(initialized_only=True)}
+            response: Response | None = exception_handler(exc, context)
+            for conn in connections.all(initialized_only=True):
+                if conn.alias in needs_rollback:
+                    conn.needs_rollback = needs_rollback[conn.alias]
+            return response
+
+        return handler
+
+    async def dispatch(self, request: Any, *args: Any, **kwargs: Any) -> Response:  # type: ignore[override]
+        """Асинхронная версия ``APIView.dispatch`` с теми же хуками DRF."""
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+
+            if iscoroutinefunction(handler):
+                response = await handler(request, *args, **kwargs)
+            else:
+                response = await sync_to_async(handler)(request, *args, **kwargs)
+
+        except Exception as exc:
+            response = await sync_to_async(self.handle_exception)(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
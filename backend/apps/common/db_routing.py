@@ -0,0 +1,188 @@
+"""
+Маршрутизация чтения на read-реплику PostgreSQL.
+
+Реплика — необязательный alias ``replica`` в DATABASES (DB_REPLICA_HOST, см.
+settings/base.py). Пока он не настроен, все запросы идут в ``default``.
+
+Чтение уходит на реплику только внутри явно разрешённой области:
+- ``ReplicaReadMixin`` — безопасные (GET/HEAD/OPTIONS) запросы read-only
+  ViewSet'ов каталога, баннеров, страниц, новостей/блога;
+- ``replica_reads()`` — контекстный менеджер для метрик мониторинга и отчётов.
+
+Всё остальное остаётся на primary: записи, ``select_for_update()`` и
+``get_or_create()`` (Django маршрутизирует их через ``db_for_write``),
+импорт из 1С, оформление заказа и корзина.
+
+Read-your-writes: ``ReplicaRoutingMiddleware`` отмечает запросы, в которых
+была запись, и на ``DB_REPLICA_STICKY_SECONDS`` закрепляет клиента за primary —
+cookie для гостя и ключ в кэше для аутентифицированного пользователя (JWT-клиенты
+cookie не хранят). Так пользователь не увидит устаревшие данные из-за
+задержки репликации сразу после собственных изменений.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpRequest, HttpResponse
+from rest_framework.permissions import SAFE_METHODS
+
+if TYPE_CHECKING:
+    from rest_framework.views import APIView
+
+    _MixinBase = APIView
+else:
+    _MixinBase = object
+
+PRIMARY_DATABASE_ALIAS = "default"
+REPLICA_DATABASE_ALIAS = "replica"
+STICKY_COOKIE_NAME = "db_primary"
+STICKY_CACHE_KEY = "db_routing:primary:user:{user_id}"
+
+
+@dataclass
+class RoutingState:
+    """Состояние маршрутизации в пределах одного запроса или задачи."""
+
+    use_replica: bool = False
+    wrote: bool = False
+
+
+_routing_state: ContextVar[RoutingState | None] = ContextVar("db_routing_state", default=None)
+
+
+def replica_configured() -> bool:
+    """Настроен ли alias реплики в DATABASES."""
+    return REPLICA_DATABASE_ALIAS in settings.DATABASES
+
+
+def get_sticky_seconds() -> int:
+    """Сколько секунд после записи клиент читает с primary."""
+    return int(getattr(settings, "DB_REPLICA_STICKY_SECONDS", 10))
+
+
+@contextmanager
+def replica_reads() -> Iterator[None]:
+    """
+    Чтение внутри блока идёт на реплику (если она настроена).
+
+    Использование:
+        with replica_reads():
+            metrics = CustomerSyncMonitor().get_operation_metrics(start, end)
+    """
+    token = _routing_state.set(RoutingState(use_replica=replica_configured()))
+    try:
+        yield
+    finally:
+        _routing_state.reset(token)
+
+
+def is_sticky_to_primary(request: HttpRequest) -> bool:
+    """Писал ли клиент недавно (cookie гостя или ключ пользователя в кэше)."""
+    if STICKY_COOKIE_NAME in request.COOKIES:
+        return True
+    user = getattr(request, "user", None)
+    if user is not None and user.is_authenticated:
+        return bool(cache.get(STICKY_CACHE_KEY.format(user_id=user.pk)))
+    return False
+
+
+class ReplicaRouter:
+    """
+    Database router: чтение в разрешённой области — на реплику, остальное — на primary.
+
+    Подключается в DATABASE_ROUTERS вместе с ``ReplicaRoutingMiddleware``.
+    """
+
+    def db_for_read(self, model: Any, **hints: Any) -> str | None:
+        state = _routing_state.get()
+        if state is not None and state.use_replica and replica_configured():
+            return REPLICA_DATABASE_ALIAS
+        return None
+
+    def db_for_write(self, model: Any, **hints: Any) -> str | None:
+        state = _routing_state.get()
+        if state is not None:
+            state.wrote = True
+        return PRIMARY_DATABASE_ALIAS
+
+    def allow_relation(self, obj1: Any, obj2: Any, **hints: Any) -> bool | None:
+        # Реплика содержит те же данные, что и primary
+        aliases = {PRIMARY_DATABASE_ALIAS, REPLICA_DATABASE_ALIAS}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Создаёт состояние маршрутизации на запрос и закрепляет писавших клиентов за primary.
+
+    Не используется (MiddlewareNotUsed), если реплика не настроена.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Any) -> None:
+        if not replica_configured():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> Any:
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        state = RoutingState()
+        token = _routing_state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _routing_state.reset(token)
+        self._mark_sticky(request, response, state)
+        return response
+
+    async def __acall__(self, request: HttpRequest) -> Any:
+        state = RoutingState()
+        token = _routing_state.set(state)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _routing_state.reset(token)
+        self._mark_sticky(request, response, state)
+        return response
+
+    def _mark_sticky(self, request: HttpRequest, response: HttpResponse, state: RoutingState) -> None:
+        if not (state.wrote or request.method not in SAFE_METHODS):
+            return
+        sticky_seconds = get_sticky_seconds()
+        response.set_cookie(STICKY_COOKIE_NAME, "1", max_age=sticky_seconds, httponly=True, samesite="Lax")
+        # DRF проставляет пользователя JWT в исходный HttpRequest после аутентификации
+        user = getattr(request, "user", None)
+        if user is not None and user.is_authenticated:
+            cache.set(STICKY_CACHE_KEY.format(user_id=user.pk), 1, sticky_seconds)
+
+
+class ReplicaReadMixin(_MixinBase):
+    """
+    Mixin для read-only ViewSet'ов: безопасные запросы читают с реплики.
+
+    Область включается после аутентификации (``initial``), поэтому закрепление
+    за primary учитывает и пользователя JWT. Совместим с AsyncAPIViewMixin.
+    """
+
+    def initial(self, request: Any, *args: Any, **kwargs: Any) -> None:
+        super().initial(request, *args, **kwargs)
+        state = _routing_state.get()
+        if state is None or request.method not in SAFE_METHODS:
+            return
+        state.use_replica = not is_sticky_to_primary(request)
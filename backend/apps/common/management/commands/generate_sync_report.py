@@ -8,6 +8,7 @@ from datetime import datetime, timedelta
 from django.conf import settings
 from django.core.management.base import BaseCommand, CommandError
 
+from apps.common.db_routing import replica_reads
 from apps.common.services import SyncReportGenerator
 
 
@@ -59,12 +60,14 @@ class Command(BaseCommand):
         generator = SyncReportGenerator()
 
         try:
-            if report_type == "daily":
-                self._generate_daily_report(generator, target_date, recipients, no_send)
-            elif report_type == "weekly":
-                self._generate_weekly_report(generator, target_date, recipients, no_send)
-            else:
-                raise CommandError(f"Неизвестный тип отчета: {report_type}")
+            # Отчёты только читают журнал синхронизации — выполняем на реплике
+            with replica_reads():
+                if report_type == "daily":
+                    self._generate_daily_report(generator, target_date, recipients, no_send)
+                elif report_type == "weekly":
+                    self._generate_weekly_report(generator, target_date, recipients, no_send)
+                else:
+                    raise CommandError(f"Неизвестный тип отчета: {report_type}")
 
         except Exception as e:
             raise CommandError(f"Ошибка при генерации отчета: {str(e)}")
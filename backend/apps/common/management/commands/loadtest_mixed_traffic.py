@@ -0,0 +1,171 @@
+"""
+Management команда нагрузочного теста смешанного трафика.
+
+Сравнивает пропускную способность каталога под долгими запросами обмена с 1С
+в режимах SERVER_MODE=wsgi и SERVER_MODE=asgi (см. gunicorn.conf.py):
+команда запускается против каждого развёртывания, результаты сравниваются.
+
+Использование:
+    python manage.py loadtest_mixed_traffic --base-url http://localhost:8000
+    python manage.py loadtest_mixed_traffic --duration 60 --catalog-clients 64 \\
+        --slow-clients 4 --slow-auth admin@example.com:password
+"""
+
+from __future__ import annotations
+
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import requests
+from django.core.management.base import BaseCommand, CommandError
+
+DEFAULT_CATALOG_PATHS = (
+    "/api/v1/categories-tree/",
+    "/api/v1/brands/featured/",
+    "/api/v1/banners/",
+    "/api/v1/pages/",
+    "/api/v1/health/",
+)
+DEFAULT_SLOW_PATH = "/api/integration/1c/exchange/?type=sale&mode=query"
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Перцентиль методом nearest-rank (values не обязаны быть отсортированы)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def summarize(latencies: list[float], errors: int, duration: float) -> dict[str, Any]:
+    """
+    Сводная статистика группы запросов.
+
+    Args:
+        latencies: Длительности успешных запросов в секундах
+        errors: Количество неуспешных запросов (сетевые ошибки и HTTP >= 500)
+        duration: Длительность теста в секундах
+
+    Returns:
+        Dict с количеством запросов, req/s и перцентилями задержки в мс
+    """
+    total = len(latencies) + errors
+    return {
+        "requests": total,
+        "errors": errors,
+        "rps": round(len(latencies) / duration, 2) if duration > 0 else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 1),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 1),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 1) if latencies else 0.0,
+    }
+
+
+class Command(BaseCommand):
+    """Нагрузочный тест: каталог под параллельными долгими запросами обмена с 1С"""
+
+    help = "Измеряет пропускную способность каталога при параллельном долгом обмене с 1С"
+
+    def add_arguments(self, parser):
+        """Добавляет аргументы команды"""
+        parser.add_argument("--base-url", default="http://localhost:8000", help="Адрес развёртывания")
+        parser.add_argument("--duration", type=int, default=30, help="Длительность теста в секундах")
+        parser.add_argument(
+            "--catalog-clients",
+            type=int,
+            default=32,
+            help="Количество параллельных клиентов каталога",
+        )
+        parser.add_argument(
+            "--slow-clients",
+            type=int,
+            default=4,
+            help="Количество параллельных клиентов обмена с 1С (0 — только каталог)",
+        )
+        parser.add_argument(
+            "--catalog-path",
+            action="append",
+            dest="catalog_paths",
+            default=None,
+            help="Путь каталога (можно указать несколько раз)",
+        )
+        parser.add_argument("--slow-path", default=DEFAULT_SLOW_PATH, help="Путь долгого запроса обмена с 1С")
+        parser.add_argument(
+            "--slow-auth",
+            default=None,
+            help="Basic auth для обмена с 1С в формате email:password",
+        )
+        parser.add_argument("--timeout", type=float, default=310.0, help="Таймаут одного запроса в секундах")
+
+    def handle(self, *args, **options):
+        """Основная логика команды"""
+        base_url = options["base_url"].rstrip("/")
+        duration = options["duration"]
+        catalog_clients = options["catalog_clients"]
+        slow_clients = options["slow_clients"]
+        catalog_paths = tuple(options["catalog_paths"] or DEFAULT_CATALOG_PATHS)
+        timeout = options["timeout"]
+
+        if duration <= 0 or catalog_clients <= 0 or slow_clients < 0:
+            raise CommandError("--duration и --catalog-clients должны быть > 0, --slow-clients >= 0")
+
+        slow_auth = None
+        if options["slow_auth"]:
+            if ":" not in options["slow_auth"]:
+                raise CommandError("--slow-auth должен быть в формате email:password")
+            slow_auth = tuple(options["slow_auth"].split(":", 1))
+
+        self.stdout.write(
+            f"\nНагрузочный тест смешанного трафика:"
+            f"\n  - Развёртывание: {base_url}"
+            f"\n  - Длительность: {duration} с"
+            f"\n  - Клиентов каталога: {catalog_clients}"
+            f"\n  - Клиентов обмена с 1С: {slow_clients} ({options['slow_path']})"
+        )
+
+        deadline = time.monotonic() + duration
+        lock = threading.Lock()
+        results: dict[str, dict[str, Any]] = {
+            "catalog": {"latencies": [], "errors": 0},
+            "exchange": {"latencies": [], "errors": 0},
+        }
+
+        def run_client(group: str, paths: tuple[str, ...], auth: Any) -> None:
+            session = requests.Session()
+            i = 0
+            while time.monotonic() < deadline:
+                url = f"{base_url}{paths[i % len(paths)]}"
+                i += 1
+                started = time.perf_counter()
+                try:
+                    response = session.get(url, auth=auth, timeout=timeout)
+                    ok = response.status_code < 500
+                except requests.RequestException:
+                    ok = False
+                elapsed = time.perf_counter() - started
+                with lock:
+                    if ok:
+                        results[group]["latencies"].append(elapsed)
+                    else:
+                        results[group]["errors"] += 1
+
+        started_at = time.monotonic()
+        with ThreadPoolExecutor(max_workers=catalog_clients + slow_clients) as executor:
+            for _ in range(slow_clients):
+                executor.submit(run_client, "exchange", (options["slow_path"],), slow_auth)
+            for _ in range(catalog_clients):
+                executor.submit(run_client, "catalog", catalog_paths, None)
+        elapsed = time.monotonic() - started_at
+
+        for group, data in results.items():
+            if group == "exchange" and slow_clients == 0:
+                continue
+            summary = summarize(data["latencies"], data["errors"], elapsed)
+            self.stdout.write(
+                f"\n{group}: {summary['requests']} запросов, {summary['rps']} req/s, "
+                f"p50={summary['p50_ms']} мс, p95={summary['p95_ms']} мс, ошибок: {summary['errors']}"
+            )
+        self.stdout.write(self.style.SUCCESS("\n✓ Нагрузочный тест завершён"))
@@ -6,11 +6,15 @@ from .alerting import AlertManager, RealTimeAlertMonitor
 from .customer_sync_monitor import CustomerSyncMonitor, IntegrationHealthCheck
 from .monitoring import PrometheusMetrics, StructuredLogger, WebhookAlerts
 from .reporting import SyncReportGenerator
+from .sync_log_buffer import CustomerSyncLogBuffer, sync_log_buffer, write_sync_log
 from .sync_logger import CustomerSyncLogger
 
 __all__ = [
     "SyncReportGenerator",
     "CustomerSyncLogger",
+    "CustomerSyncLogBuffer",
+    "sync_log_buffer",
+    "write_sync_log",
     "PrometheusMetrics",
     "WebhookAlerts",
     "StructuredLogger",
@@ -12,6 +12,8 @@ from datetime import datetime, timedelta
 from typing import TYPE_CHECKING, Any, cast
 
 import requests
+from asgiref.sync import sync_to_async
+from django.conf import settings
 from django.core.cache import cache
 from django.db import connection
 from django.db.models import Avg, Count, Max, Min, Q
@@ -262,6 +264,7 @@ class CustomerSyncMonitor:
 
         # Проверяем все компоненты
         db_health = health_checker.check_database_connection()
+        db_connections_health = health_checker.check_database_connections()
         redis_health = health_checker.check_redis_connection()
         disk_health = health_checker.check_disk_space()
 
@@ -270,7 +273,7 @@ class CustomerSyncMonitor:
         api_1c_health = health_checker.check_1c_api_availability() if api_1c_url else None
 
         # Агрегированный статус
-        components = [db_health, redis_health, disk_health]
+        components = [db_health, db_connections_health, redis_health, disk_health]
         if api_1c_health:
             components.append(api_1c_health)
 
@@ -292,6 +295,7 @@ class CustomerSyncMonitor:
             "is_healthy": is_healthy,
             "components": {
                 "database": db_health,
+                "database_connections": db_connections_health,
                 "redis": redis_health,
                 "disk": disk_health,
             },
@@ -514,6 +518,122 @@ class IntegrationHealthCheck:
                 "message": "Redis недоступен",
             }
 
+    def check_database_connections(self) -> dict[str, Any]:
+        """
+        Статистика соединений с PostgreSQL: режим (persistent/пул/pgbouncer),
+        пул psycopg3 текущего процесса и загрузка max_connections сервера.
+
+        Компонент недоступен, если занято больше HEALTH_CHECK_DB_CONNECTIONS_THRESHOLD
+        процентов max_connections (по умолчанию 90).
+
+        Returns:
+            Словарь с результатом проверки
+        """
+        threshold = int(os.getenv("HEALTH_CHECK_DB_CONNECTIONS_THRESHOLD", 90))
+        settings_dict = connection.settings_dict
+
+        if settings_dict["OPTIONS"].get("pool"):
+            mode = "pool"
+        elif settings_dict.get("DISABLE_SERVER_SIDE_CURSORS"):
+            mode = "pgbouncer"
+        elif settings_dict.get("CONN_MAX_AGE"):
+            mode = "persistent"
+        else:
+            mode = "per_request"
+
+        result: dict[str, Any] = {
+            "component": "database_connections",
+            "mode": mode,
+            "process_type": getattr(settings, "PROCESS_TYPE", "web"),
+            "conn_max_age": settings_dict.get("CONN_MAX_AGE"),
+            "conn_health_checks": settings_dict.get("CONN_HEALTH_CHECKS"),
+            "threshold_percent": threshold,
+        }
+
+        try:
+            pool = getattr(connection, "pool", None)
+            if pool is not None:
+                result["pool"] = pool.get_stats()
+
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT count(*), count(*) FILTER (WHERE state = 'active'), "
+                    "count(*) FILTER (WHERE state = 'idle'), current_setting('max_connections')::int "
+                    "FROM pg_stat_activity WHERE datname = current_database()"
+                )
+                total, active, idle, max_connections = cursor.fetchone()
+
+            used_percent = (total / max_connections) * 100 if max_connections else 0.0
+            is_available = used_percent < threshold
+
+            result.update(
+                {
+                    "available": is_available,
+                    "server": {
+                        "total": total,
+                        "active": active,
+                        "idle": idle,
+                        "max_connections": max_connections,
+                        "used_percent": round(used_percent, 2),
+                    },
+                    "message": (
+                        "OK"
+                        if is_available
+                        else f"DB connections {used_percent:.1f}% of max_connections exceed threshold {threshold}%"
+                    ),
+                }
+            )
+            return result
+
+        except Exception as e:
+            logger.error("Database connections health check failed: %s", str(e))
+            result.update(
+                {
+                    "available": False,
+                    "error": str(e),
+                    "message": "Не удалось получить статистику соединений",
+                }
+            )
+            return result
+
+    async def acheck_database_connection(self) -> dict[str, Any]:
+        """
+        Асинхронная проверка PostgreSQL для async health endpoint.
+
+        У курсора Django нет async API, поэтому SELECT 1 выполняется
+        через sync_to_async в пуле потоков, не блокируя event loop.
+        """
+        return await sync_to_async(self.check_database_connection)()
+
+    async def acheck_redis_connection(self) -> dict[str, Any]:
+        """
+        Асинхронная проверка Redis через async API кэша Django.
+
+        Returns:
+            Словарь с результатом проверки
+        """
+        try:
+            test_key = "health_check:redis"
+            await cache.aset(test_key, "OK", timeout=10)
+            result = await cache.aget(test_key)
+
+            is_available = result == "OK"
+
+            return {
+                "component": "redis",
+                "available": is_available,
+                "message": "OK" if is_available else "Redis test failed",
+            }
+
+        except Exception as e:
+            logger.error("Redis health check failed: %s", str(e))
+            return {
+                "component": "redis",
+                "available": False,
+                "error": str(e),
+                "message": "Redis недоступен",
+            }
+
     def check_celery_workers(self) -> dict[str, Any]:
         """
         Проверяет статус Celery workers.
@@ -0,0 +1,153 @@
+"""
+Буферизованная запись CustomerSyncLog.
+
+Внутри ``sync_log_buffer()`` записи лога синхронизации не пишутся по одной:
+``write_sync_log`` складывает их в память, а буфер сбрасывает накопленное
+одним ``bulk_create`` — каждые CUSTOMER_SYNC_LOG_BUFFER_SIZE записей, не реже
+чем раз в CUSTOMER_SYNC_LOG_FLUSH_INTERVAL секунд (проверяется при добавлении)
+и при выходе из блока, в том числе по исключению.
+
+Сброс по порогу откладывается, пока вызывающий код находится во вложенной
+транзакции (atomic глубже, чем при входе в буфер): откат чужой savepoint
+не должен уносить с собой записи уже завершённых операций.
+
+created_at буферизованной записи — время сброса (auto_now_add выставляется
+при INSERT), то есть отстаёт от события не больше чем на интервал сброса.
+Порядок записей сохраняется.
+
+Вне буфера ``write_sync_log`` сохраняет запись сразу, как раньше.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DatabaseError, router, transaction
+
+from apps.common.models import CustomerSyncLog
+
+logger = logging.getLogger(__name__)
+
+_active_buffer: ContextVar[CustomerSyncLogBuffer | None] = ContextVar("customer_sync_log_buffer", default=None)
+
+
+class CustomerSyncLogBuffer:
+    """Накопитель записей CustomerSyncLog с пакетным сбросом."""
+
+    def __init__(self, max_records: int | None = None, flush_interval: float | None = None):
+        """
+        Args:
+            max_records: Сброс при накоплении стольких записей
+                (по умолчанию CUSTOMER_SYNC_LOG_BUFFER_SIZE)
+            flush_interval: Сброс, если с прошлого прошло столько секунд
+                (по умолчанию CUSTOMER_SYNC_LOG_FLUSH_INTERVAL)
+        """
+        self.max_records = max_records or getattr(settings, "CUSTOMER_SYNC_LOG_BUFFER_SIZE", 500)
+        self.flush_interval = (
+            flush_interval if flush_interval is not None else getattr(settings, "CUSTOMER_SYNC_LOG_FLUSH_INTERVAL", 5.0)
+        )
+        self.written = 0
+        self._records: list[CustomerSyncLog] = []
+        self._last_flush = time.monotonic()
+        self._atomic_depth = self._current_atomic_depth()
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def add(self, record: CustomerSyncLog) -> CustomerSyncLog:
+        """Добавляет запись; сбрасывает буфер, если достигнут порог."""
+        self._records.append(record)
+        if self._flush_due() and self._current_atomic_depth() <= self._atomic_depth:
+            self.flush()
+        return record
+
+    def flush(self) -> None:
+        """Записывает накопленные записи одним bulk_create."""
+        records, self._records = self._records, []
+        self._last_flush = time.monotonic()
+        if not records:
+            return
+        try:
+            with transaction.atomic(using=self._db):
+                CustomerSyncLog.objects.bulk_create(records, batch_size=self.max_records)
+        except DatabaseError as e:
+            # Одна некорректная запись не должна уносить весь пакет
+            logger.warning(f"Пакетная запись {len(records)} записей CustomerSyncLog не удалась ({e}), пишем по одной")
+            self._save_one_by_one(records)
+        else:
+            self.written += len(records)
+
+    def _save_one_by_one(self, records: list[CustomerSyncLog]) -> None:
+        for record in records:
+            record.pk = None
+            try:
+                with transaction.atomic(using=self._db):
+                    record.save(force_insert=True)
+            except DatabaseError:
+                logger.exception(f"Не удалось записать CustomerSyncLog onec_id={record.onec_id}")
+            else:
+                self.written += 1
+
+    def _flush_due(self) -> bool:
+        return len(self._records) >= self.max_records or time.monotonic() - self._last_flush >= self.flush_interval
+
+    @property
+    def _db(self) -> str:
+        return router.db_for_write(CustomerSyncLog)
+
+    def _current_atomic_depth(self) -> int:
+        return len(transaction.get_connection(self._db).atomic_blocks)
+
+
+@contextmanager
+def sync_log_buffer(
+    max_records: int | None = None, flush_interval: float | None = None
+) -> Iterator[CustomerSyncLogBuffer]:
+    """
+    Буферизует записи CustomerSyncLog на время синхронизации.
+
+    Оставшиеся записи сбрасываются при выходе из блока, в том числе когда
+    блок завершается исключением. Вложенный вызов использует уже активный
+    буфер. Блок должен находиться внутри той же транзакции, что и данные,
+    на которые ссылаются записи (dry-run откатывает их вместе).
+
+    Использование:
+        with sync_log_buffer():
+            processor.process_customers(customers)
+    """
+    active = _active_buffer.get()
+    if active is not None:
+        yield active
+        return
+
+    buffer = CustomerSyncLogBuffer(max_records, flush_interval)
+    token = _active_buffer.set(buffer)
+    try:
+        yield buffer
+    finally:
+        _active_buffer.reset(token)
+        connection = transaction.get_connection(buffer._db)
+        if connection.in_atomic_block and connection.needs_rollback:
+            # Транзакция откатывается исключением блока: записи ушли бы вместе с ней и без буфера
+            logger.warning(f"{len(buffer)} записей CustomerSyncLog отброшены вместе с откатываемой транзакцией")
+        else:
+            buffer.flush()
+
+
+def write_sync_log(record: CustomerSyncLog) -> CustomerSyncLog:
+    """
+    Пишет запись CustomerSyncLog: в активный буфер или сразу в БД.
+
+    Returns:
+        Та же запись (в буфере — ещё без pk)
+    """
+    buffer = _active_buffer.get()
+    if buffer is not None:
+        return buffer.add(record)
+    record.save(force_insert=True)
+    return record
@@ -10,13 +10,19 @@ from django.contrib.auth import get_user_model
 from django.utils import timezone
 
 from apps.common.models import CustomerSyncLog
+from apps.common.services.sync_log_buffer import write_sync_log
 
 User = get_user_model()
 logger = logging.getLogger(__name__)
 
 
 class CustomerSyncLogger:
-    """Специализированное логирование синхронизации клиентов"""
+    """
+    Специализированное логирование синхронизации клиентов.
+
+    Внутри sync_log_buffer() записи не сохраняются сразу, а копятся в буфере:
+    методы log_* возвращают запись, которая получит pk при сбросе буфера.
+    """
 
     def __init__(self, correlation_id: str | None = None):
         """
@@ -69,15 +75,17 @@ class CustomerSyncLogger:
                 }
             )
 
-        return CustomerSyncLog.objects.create(
-            operation_type=CustomerSyncLog.OperationType.IMPORT_FROM_1C,
-            customer=customer if success else None,
-            onec_id=customer_data.get("id", ""),
-            status=(CustomerSyncLog.StatusType.SUCCESS if success else CustomerSyncLog.StatusType.ERROR),
-            details=details,
-            error_message=result.get("error_message", ""),
-            duration_ms=duration_ms,
-            correlation_id=self.correlation_id,
+        return write_sync_log(
+            CustomerSyncLog(
+                operation_type=CustomerSyncLog.OperationType.IMPORT_FROM_1C,
+                customer=customer if success else None,
+                onec_id=customer_data.get("id", ""),
+                status=(CustomerSyncLog.StatusType.SUCCESS if success else CustomerSyncLog.StatusType.ERROR),
+                details=details,
+                error_message=result.get("error_message", ""),
+                duration_ms=duration_ms,
+                correlation_id=self.correlation_id,
+            )
         )
 
     def log_customer_export(
@@ -116,15 +124,17 @@ class CustomerSyncLogger:
                 }
             )
 
-        return CustomerSyncLog.objects.create(
-            operation_type=CustomerSyncLog.OperationType.EXPORT_TO_1C,
-            customer=platform_customer,
-            onec_id=result.get("onec_id", platform_customer.onec_id or ""),
-            status=(CustomerSyncLog.StatusType.SUCCESS if success else CustomerSyncLog.StatusType.ERROR),
-            details=details,
-            error_message=result.get("error_message", ""),
-            duration_ms=duration_ms,
-            correlation_id=self.correlation_id,
+        return write_sync_log(
+            CustomerSyncLog(
+                operation_type=CustomerSyncLog.OperationType.EXPORT_TO_1C,
+                customer=platform_customer,
+                onec_id=result.get("onec_id", platform_customer.onec_id or ""),
+                status=(CustomerSyncLog.StatusType.SUCCESS if success else CustomerSyncLog.StatusType.ERROR),
+                details=details,
+                error_message=result.get("error_message", ""),
+                duration_ms=duration_ms,
+                correlation_id=self.correlation_id,
+            )
         )
 
     def log_customer_identification(
@@ -155,14 +165,16 @@ class CustomerSyncLogger:
             "customer_id": customer.id if customer else None,
         }
 
-        return CustomerSyncLog.objects.create(
-            operation_type=CustomerSyncLog.OperationType.CUSTOMER_IDENTIFICATION,
-            customer=customer,
-            onec_id=onec_data.get("onec_id", ""),
-            status=(CustomerSyncLog.StatusType.SUCCESS if found else CustomerSyncLog.StatusType.SKIPPED),
-            details=details,
-            duration_ms=duration_ms,
-            correlation_id=self.correlation_id,
+        return write_sync_log(
+            CustomerSyncLog(
+                operation_type=CustomerSyncLog.OperationType.CUSTOMER_IDENTIFICATION,
+                customer=customer,
+                onec_id=onec_data.get("onec_id", ""),
+                status=(CustomerSyncLog.StatusType.SUCCESS if found else CustomerSyncLog.StatusType.SKIPPED),
+                details=details,
+                duration_ms=duration_ms,
+                correlation_id=self.correlation_id,
+            )
         )
 
     def log_conflict_resolution(
@@ -199,15 +211,17 @@ class CustomerSyncLogger:
             "sync_conflict_id": resolution_result.get("sync_conflict_id"),
         }
 
-        return CustomerSyncLog.objects.create(
-            operation_type=CustomerSyncLog.OperationType.CONFLICT_RESOLUTION,
-            customer=existing_customer,
-            onec_id=onec_data.get("onec_id", ""),
-            status=(CustomerSyncLog.StatusType.SUCCESS if success else CustomerSyncLog.StatusType.ERROR),
-            details=details,
-            error_message=resolution_result.get("error_message", ""),
-            duration_ms=duration_ms,
-            correlation_id=self.correlation_id,
+        return write_sync_log(
+            CustomerSyncLog(
+                operation_type=CustomerSyncLog.OperationType.CONFLICT_RESOLUTION,
+                customer=existing_customer,
+                onec_id=onec_data.get("onec_id", ""),
+                status=(CustomerSyncLog.StatusType.SUCCESS if success else CustomerSyncLog.StatusType.ERROR),
+                details=details,
+                error_message=resolution_result.get("error_message", ""),
+                duration_ms=duration_ms,
+                correlation_id=self.correlation_id,
+            )
         )
 
     def log_sync_changes(
@@ -237,15 +251,17 @@ class CustomerSyncLogger:
             "customer_id": customer.id,
         }
 
-        return CustomerSyncLog.objects.create(
-            operation_type=CustomerSyncLog.OperationType.SYNC_CHANGES,
-            customer=customer,
-            onec_id=customer.onec_id or "",
-            status=(CustomerSyncLog.StatusType.SUCCESS if success else CustomerSyncLog.StatusType.ERROR),
-            details=details,
-            error_message=error_message,
-            duration_ms=duration_ms,
-            correlation_id=self.correlation_id,
+        return write_sync_log(
+            CustomerSyncLog(
+                operation_type=CustomerSyncLog.OperationType.SYNC_CHANGES,
+                customer=customer,
+                onec_id=customer.onec_id or "",
+                status=(CustomerSyncLog.StatusType.SUCCESS if success else CustomerSyncLog.StatusType.ERROR),
+                details=details,
+                error_message=error_message,
+                duration_ms=duration_ms,
+                correlation_id=self.correlation_id,
+            )
         )
 
     def log_batch_operation(
@@ -285,15 +301,17 @@ class CustomerSyncLogger:
             else:
                 status = CustomerSyncLog.StatusType.WARNING
 
-        return CustomerSyncLog.objects.create(
-            operation_type=CustomerSyncLog.OperationType.BATCH_OPERATION,
-            customer=None,
-            onec_id="",
-            status=status,
-            details=details,
-            error_message=(f"{error_count} ошибок из {total_count}" if error_count > 0 else ""),
-            duration_ms=duration_ms,
-            correlation_id=self.correlation_id,
+        return write_sync_log(
+            CustomerSyncLog(
+                operation_type=CustomerSyncLog.OperationType.BATCH_OPERATION,
+                customer=None,
+                onec_id="",
+                status=status,
+                details=details,
+                error_message=(f"{error_count} ошибок из {total_count}" if error_count > 0 else ""),
+                duration_ms=duration_ms,
+                correlation_id=self.correlation_id,
+            )
         )
 
     def log_data_validation(
@@ -327,13 +345,15 @@ class CustomerSyncLogger:
             "validated_fields": validation_result.get("validated_fields", []),
         }
 
-        return CustomerSyncLog.objects.create(
-            operation_type=CustomerSyncLog.OperationType.DATA_VALIDATION,
-            customer=None,
-            onec_id=onec_id,
-            status=(CustomerSyncLog.StatusType.SUCCESS if is_valid else CustomerSyncLog.StatusType.ERROR),
-            details=details,
-            error_message="; ".join(errors) if errors else "",
-            duration_ms=duration_ms,
-            correlation_id=self.correlation_id,
+        return write_sync_log(
+            CustomerSyncLog(
+                operation_type=CustomerSyncLog.OperationType.DATA_VALIDATION,
+                customer=None,
+                onec_id=onec_id,
+                status=(CustomerSyncLog.StatusType.SUCCESS if is_valid else CustomerSyncLog.StatusType.ERROR),
+                details=details,
+                error_message="; ".join(errors) if errors else "",
+                duration_ms=duration_ms,
+                correlation_id=self.correlation_id,
+            )
         )
@@ -0,0 +1,87 @@
+"""
+Тесты асинхронных read-only endpoint'ов (ASGI режим).
+"""
+
+import asyncio
+
+import pytest
+from asgiref.sync import iscoroutinefunction
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import resolve, reverse
+
+from apps.common.management.commands.loadtest_mixed_traffic import percentile, summarize
+from apps.pages.models import Page
+from apps.products.models import Brand
+
+ASYNC_URLS = (
+    ("common:health-check", {}),
+    ("banners:banner-list", {}),
+    ("pages:pages-list", {}),
+    ("pages:pages-detail", {"slug": "about"}),
+    ("products:category-tree-list", {}),
+    ("products:brand-featured", {}),
+)
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("url_name,kwargs", ASYNC_URLS)
+def test_read_only_endpoints_are_async_and_non_atomic(url_name, kwargs):
+    callback = resolve(reverse(url_name, kwargs=kwargs)).func
+
+    assert iscoroutinefunction(callback)
+    # Django запрещает ATOMIC_REQUESTS для async views — представление исключено явно
+    assert "default" in callback._non_atomic_requests
+
+
+@pytest.mark.unit
+def test_loadtest_summary():
+    latencies = [0.01 * i for i in range(1, 101)]
+
+    summary = summarize(latencies, errors=2, duration=10.0)
+
+    assert summary["requests"] == 102
+    assert summary["errors"] == 2
+    assert summary["rps"] == 10.0
+    assert summary["p50_ms"] == 500.0
+    assert summary["p95_ms"] == 950.0
+    assert percentile([], 95) == 0.0
+
+
+@pytest.mark.integration
+class TestAsyncEndpointsUnderAsyncClient(TestCase):
+    """Endpoint'ы обслуживаются AsyncClient'ом параллельно, как под uvicorn."""
+
+    def setUp(self):
+        cache.clear()
+        Page.objects.create(title="О компании", slug="about", content="<p>О нас</p>", is_published=True)
+        Brand.objects.create(name="Async Brand", slug="async-brand", is_featured=True, image="brands/a.png")
+
+    async def test_concurrent_requests(self):
+        urls = [reverse(name, kwargs=kwargs) for name, kwargs in ASYNC_URLS]
+
+        responses = await asyncio.gather(*(self.async_client.get(url) for url in urls))
+
+        assert [r.status_code for r in responses] == [200] * len(urls)
+        health = responses[0].json()
+        assert health["status"] == "healthy"
+        assert health["checks"] == {"database": True, "cache": True}
+        assert responses[-1].json()[0]["slug"] == "async-brand"
+
+    async def test_cached_page_served_from_async_cache(self):
+        url = reverse("pages:pages-detail", kwargs={"slug": "about"})
+        await self.async_client.get(url)
+
+        # update() не вызывает сигналы инвалидации — ответ должен прийти из кэша
+        await Page.objects.filter(slug="about").aupdate(title="Изменено")
+        response = await self.async_client.get(url)
+
+        assert response.status_code == 200
+        assert response.json()["title"] == "О компании"
+
+    def test_not_found_keeps_outer_transaction_usable(self):
+        response = self.client.get(reverse("pages:pages-detail", kwargs={"slug": "missing"}))
+
+        assert response.status_code == 404
+        # Представление не открывало транзакцию и не должно помечать внешнюю на откат
+        assert Page.objects.filter(slug="about").exists()
@@ -0,0 +1,92 @@
+"""
+Тесты маршрутизации чтения на read-реплику (без второй БД).
+
+Сценарии с настоящей второй базой — tests/integration/test_replica_routing.py.
+"""
+
+from unittest.mock import patch
+
+import pytest
+from django.core.exceptions import MiddlewareNotUsed
+from django.test import RequestFactory
+
+from apps.common import db_routing
+from apps.common.db_routing import (
+    STICKY_CACHE_KEY,
+    STICKY_COOKIE_NAME,
+    ReplicaRouter,
+    ReplicaRoutingMiddleware,
+    RoutingState,
+    is_sticky_to_primary,
+    replica_reads,
+)
+from apps.products.models import Brand
+
+
+@pytest.fixture
+def replica_enabled():
+    with patch.object(db_routing, "replica_configured", return_value=True):
+        yield
+
+
+@pytest.mark.unit
+class TestReplicaRouter:
+    """Тесты ReplicaRouter"""
+
+    def test_reads_stay_on_primary_outside_scope(self, replica_enabled):
+        assert ReplicaRouter().db_for_read(Brand) is None
+        assert Brand.objects.all().db == "default"
+
+    def test_reads_go_to_replica_inside_scope(self, replica_enabled):
+        with replica_reads():
+            assert Brand.objects.all().db == "replica"
+
+        assert Brand.objects.all().db == "default"
+
+    def test_locking_reads_and_writes_stay_on_primary(self, replica_enabled):
+        with replica_reads():
+            assert Brand.objects.select_for_update().db == "default"
+            assert ReplicaRouter().db_for_write(Brand) == "default"
+
+    def test_scope_without_replica_reads_primary(self):
+        with replica_reads():
+            assert Brand.objects.all().db == "default"
+
+    def test_write_marks_state(self):
+        state = RoutingState()
+        token = db_routing._routing_state.set(state)
+        try:
+            ReplicaRouter().db_for_write(Brand)
+        finally:
+            db_routing._routing_state.reset(token)
+
+        assert state.wrote is True
+
+
+@pytest.mark.unit
+def test_middleware_not_used_without_replica():
+    with pytest.raises(MiddlewareNotUsed):
+        ReplicaRoutingMiddleware(lambda request: None)
+
+
+@pytest.mark.django_db
+def test_sticky_to_primary_by_cookie_and_user_key(django_user_model):
+    from django.contrib.auth.models import AnonymousUser
+    from django.core.cache import cache
+
+    factory = RequestFactory()
+    request = factory.get("/")
+    request.user = AnonymousUser()
+    assert is_sticky_to_primary(request) is False
+
+    request.COOKIES[STICKY_COOKIE_NAME] = "1"
+    assert is_sticky_to_primary(request) is True
+
+    user = django_user_model.objects.create_user(email="sticky@example.com", password="pass12345")
+    request = factory.get("/")
+    request.user = user
+    cache.delete(STICKY_CACHE_KEY.format(user_id=user.pk))
+    assert is_sticky_to_primary(request) is False
+
+    cache.set(STICKY_CACHE_KEY.format(user_id=user.pk), 1, 10)
+    assert is_sticky_to_primary(request) is True
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 from datetime import datetime, timedelta
 
@@ -16,7 +17,10 @@ from rest_framework.parsers import JSONParser
 from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
 from rest_framework.request import Request
 from rest_framework.response import Response
+from rest_framework.views import APIView
 
+from apps.common.async_views import AsyncAPIViewMixin
+from apps.common.db_routing import ReplicaReadMixin, replica_reads
 from apps.common.models import BlogPost, News, UserConsent
 from apps.common.serializers import (
     BlogPostDetailSerializer,
@@ -28,7 +32,7 @@ from apps.common.serializers import (
     UnsubscribeResponseSerializer,
     UnsubscribeSerializer,
 )
-from apps.common.services import CustomerSyncMonitor
+from apps.common.services import CustomerSyncMonitor, IntegrationHealthCheck
 from apps.common.throttling import SubscribeRateThrottle, UnsubscribeRateThrottle
 from apps.common.utils.consent_audit import (
     get_consent_ip_address,
@@ -47,43 +51,64 @@ def _has_error_code(detail: object, code: str) -> bool:
     return getattr(detail, "code", None) == code
 
 
-@extend_schema(
-    summary="Health Check",
-    description="Проверка состояния API сервера",
-    responses={
-        200: OpenApiResponse(
-            description="API работает корректно",
-            examples=[
-                OpenApiExample(
-                    "Successful Response",
-                    value={
-                        "status": "healthy",
-                        "version": "1.0.0",
-                        "environment": "development",
-                    },
-                    response_only=True,
-                )
-            ],
-        )
-    },
-    tags=["System"],
-)
-@api_view(["GET"])
-@permission_classes([AllowAny])
-@throttle_classes([])
-def health_check(_request):
+class HealthCheckView(AsyncAPIViewMixin, APIView):
     """
     Endpoint для проверки состояния API.
-    Возвращает информацию о версии и окружении.
+
+    Асинхронный: под ASGI проверки БД и Redis не занимают поток воркера,
+    поэтому health check отвечает даже при длительном обмене с 1С.
     """
-    return Response(
-        {
-            "status": "healthy",
-            "version": "1.0.0",
-            "environment": getattr(settings, "ENVIRONMENT", "development"),
+
+    permission_classes = [AllowAny]
+    throttle_classes: list = []
+
+    @extend_schema(
+        summary="Health Check",
+        description="Проверка состояния API сервера, подключения к БД и кэшу",
+        responses={
+            200: OpenApiResponse(
+                description="API работает корректно",
+                examples=[
+                    OpenApiExample(
+                        "Successful Response",
+                        value={
+                            "status": "healthy",
+                            "version": "1.0.0",
+                            "environment": "development",
+                            "checks": {"database": True, "cache": True},
+                        },
+                        response_only=True,
+                    )
+                ],
+            ),
+            503: OpenApiResponse(description="БД или кэш недоступны"),
         },
-        status=status.HTTP_200_OK,
+        tags=["System"],
     )
+    async def get(self, request: Request) -> Response:
+        """Возвращает информацию о версии, окружении и доступности БД/кэша."""
+        health_checker = IntegrationHealthCheck()
+        db_health, cache_health = await asyncio.gather(
+            health_checker.acheck_database_connection(),
+            health_checker.acheck_redis_connection(),
+        )
+        is_healthy = db_health["available"] and cache_health["available"]
+
+        return Response(
+            {
+                "status": "healthy" if is_healthy else "unhealthy",
+                "version": "1.0.0",
+                "environment": getattr(settings, "ENVIRONMENT", "development"),
+                "checks": {
+                    "database": db_health["available"],
+                    "cache": cache_health["available"],
+                },
+            },
+            status=status.HTTP_200_OK if is_healthy else status.HTTP_503_SERVICE_UNAVAILABLE,
+        )
+
+
+health_check = HealthCheckView.as_view()
 
 
 # ============================================================================
@@ -165,7 +190,8 @@ def operation_metrics(request: Request) -> Response:
         )
 
     monitor = CustomerSyncMonitor()
-    metrics = monitor.get_operation_metrics(start_date, end_date)
+    with replica_reads():
+        metrics = monitor.get_operation_metrics(start_date, end_date)
 
     return Response(metrics, status=status.HTTP_200_OK)
 
@@ -237,7 +263,8 @@ def business_metrics(request: Request) -> Response:
         )
 
     monitor = CustomerSyncMonitor()
-    metrics = monitor.get_business_metrics(start_date, end_date)
+    with replica_reads():
+        metrics = monitor.get_business_metrics(start_date, end_date)
 
     return Response(metrics, status=status.HTTP_200_OK)
 
@@ -303,7 +330,8 @@ def system_health(_request: Request) -> Response:
 def realtime_metrics(_request: Request) -> Response:
     """Получить метрики в реальном времени (последние 5 минут)."""
     monitor = CustomerSyncMonitor()
-    metrics = monitor.get_real_time_metrics()
+    with replica_reads():
+        metrics = monitor.get_real_time_metrics()
 
     return Response(metrics, status=status.HTTP_200_OK)
 
@@ -657,7 +685,7 @@ def unsubscribe(request: Request) -> Response:
     },
     tags=["News"],
 )
-class NewsListView(generics.ListAPIView):
+class NewsListView(ReplicaReadMixin, generics.ListAPIView):
     """
     API endpoint для получения списка новостей.
 
@@ -729,7 +757,7 @@ class NewsListView(generics.ListAPIView):
     },
     tags=["News"],
 )
-class NewsDetailView(generics.RetrieveAPIView):
+class NewsDetailView(ReplicaReadMixin, generics.RetrieveAPIView):
     """
     API endpoint для получения детальной информации о новости.
 
@@ -815,7 +843,7 @@ class NewsDetailView(generics.RetrieveAPIView):
     },
     tags=["Blog"],
 )
-class BlogPostListView(generics.ListAPIView):
+class BlogPostListView(ReplicaReadMixin, generics.ListAPIView):
     """
     API endpoint для получения списка статей блога.
 
@@ -891,7 +919,7 @@ class BlogPostListView(generics.ListAPIView):
     },
     tags=["Blog"],
 )
-class BlogPostDetailView(generics.RetrieveAPIView):
+class BlogPostDetailView(ReplicaReadMixin, generics.RetrieveAPIView):
     """
     API endpoint для получения детальной информации о статье блога.
 
@@ -2,10 +2,13 @@ import io
 import logging
 import re
 import shutil
+import tempfile
 import time
+import uuid
 import zipfile
+from datetime import timedelta
 from pathlib import Path
-from typing import Any
+from typing import IO, Any, Iterator
 from xml.etree.ElementTree import ParseError as ETParseError
 from xml.sax.saxutils import escape as xml_escape
 
@@ -14,14 +17,16 @@ from django.conf import settings
 from django.contrib.auth import get_backends, login
 from django.core.cache import cache
 from django.db import DatabaseError, OperationalError, transaction
-from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.http import HttpResponse, StreamingHttpResponse
 from django.utils import timezone
 from rest_framework.views import APIView
 
 from apps.orders.models import Order
 from apps.orders.services.order_export import OrderExportService
-from apps.orders.services.order_status_import import OrderStatusImportService
+from apps.orders.services.order_status_import import ImportResult, OrderStatusImportService
 from apps.orders.signals import orders_bulk_updated
+from apps.orders.tasks import process_order_status_import_task
+from apps.products.models import ImportSession
 
 from .authentication import Basic1CAuthentication, CsrfExemptSessionAuthentication
 from .file_service import FileLockError, FileStreamService
@@ -36,8 +41,11 @@ logger = logging.getLogger(__name__)
 EXCHANGE_LOG_SUBDIR = "1c_exchange/logs"
 ORDERS_XML_FILENAME = "orders.xml"
 ORDERS_ZIP_FILENAME = "orders.zip"
-ORDERS_XML_MAX_SIZE = 5 * 1024 * 1024  # 5MB (ADR-004)
-MAX_DOCUMENTS_PER_FILE = 1000  # FM4.5: Guard against oversized XML
+ORDERS_XML_MAX_SIZE = 50 * 1024 * 1024  # 50MB (ADR-004): parsed as a stream, memory does not grow with size
+ORDERS_XML_SPOOL_SIZE = 1024 * 1024  # Bodies above 1MB are spooled to a temp file on disk
+ORDERS_XML_READ_CHUNK = 64 * 1024
+ORDERS_XML_ASYNC_THRESHOLD = 1024 * 1024  # Larger bodies are imported by a Celery worker
+MAX_DOCUMENTS_PER_FILE = 10000  # FM4.5: Guard against oversized XML
 ORDERS_IMPORT_MAX_RETRIES = 3  # FM5.1/FM5.2: DB retry attempts
 XML_TIMESTAMP_SCAN_BYTES = 2048  # Review follow-up: avoid missing timestamp
 
@@ -47,6 +55,9 @@ _DOCUMENT_TAG_RE = re.compile(rb"<\xd0\x94\xd0\xbe\xd0\xba\xd1\x83\xd0\xbc\xd0\x
 # Regex to detect encoding from XML declaration (AC10)
 _XML_ENCODING_RE = re.compile(rb'<\?xml[^>]+encoding=["\']([^"\']+)["\']', re.IGNORECASE)
 
+# Bytes carried between chunks so a <Документ> tag split by a chunk boundary is still counted
+_DOCUMENT_TAG_OVERLAP = 64
+
 
 def _validate_xml_timestamp(xml_data: bytes, max_age_hours: int = 24) -> bool:
     """Check ДатаФормирования attribute is not older than max_age_hours.
@@ -114,6 +125,51 @@ def _reencode_xml_if_needed(xml_data: bytes) -> bytes:
         return xml_data
 
 
+def _document_tag_re(header: bytes) -> re.Pattern[bytes]:
+    """Return the <Документ> tag regex for the encoding declared in the XML header.
+
+    The body is no longer re-encoded to UTF-8 before counting, so a
+    windows-1251 file needs the tag encoded in windows-1251 as well.
+    """
+    match = _XML_ENCODING_RE.search(header[:200])
+    if not match:
+        return _DOCUMENT_TAG_RE
+    declared = match.group(1).decode("ascii", errors="ignore").strip()
+    try:
+        tag = "<Документ".encode(declared)
+    except (LookupError, UnicodeEncodeError):
+        return _DOCUMENT_TAG_RE
+    return re.compile(re.escape(tag) + rb"[\s>/]")
+
+
+def _count_xml_documents(fileobj: IO[bytes], pattern: re.Pattern[bytes]) -> int:
+    """Count <Документ> tags in a file chunk by chunk, without loading it into RAM."""
+    fileobj.seek(0)
+    count = 0
+    tail = b""
+    while chunk := fileobj.read(ORDERS_XML_READ_CHUNK):
+        data = tail + chunk
+        # Matches ending inside the carried tail were counted on the previous chunk
+        count += sum(1 for match in pattern.finditer(data) if match.end() > len(tail))
+        tail = data[-_DOCUMENT_TAG_OVERLAP:]
+    return count
+
+
+def _get_orders_async_threshold() -> int:
+    """Return the body size above which orders.xml is imported by a Celery worker."""
+    exchange_cfg = getattr(settings, "ONEC_EXCHANGE", {})
+    return int(exchange_cfg.get("ORDERS_XML_ASYNC_THRESHOLD_BYTES", ORDERS_XML_ASYNC_THRESHOLD))
+
+
+def _get_orders_import_dir() -> Path:
+    """Return the private directory where queued orders.xml files wait for the worker."""
+    exchange_cfg = getattr(settings, "ONEC_EXCHANGE", {})
+    custom = exchange_cfg.get("ORDERS_IMPORT_DIR")
+    if custom:
+        return Path(str(custom))
+    return Path(settings.ONEC_PRIVATE_DIR) / "1c_orders"
+
+
 def _get_exchange_log_dir() -> Path:
     """Return the private directory for exchange audit logs.
 
@@ -127,14 +183,27 @@ def _get_exchange_log_dir() -> Path:
     return Path(settings.BASE_DIR) / "var" / EXCHANGE_LOG_SUBDIR
 
 
-def _save_exchange_log(filename: str, content: bytes | str, is_binary: bool = False) -> None:
-    """Save a copy of exchange output to a private log directory for audit."""
+def _exchange_log_path(filename: str) -> Path:
+    """Return a timestamped path for an audit log file, creating the log directory."""
+    log_dir = _get_exchange_log_dir()
+    log_dir.mkdir(parents=True, exist_ok=True)
+    timestamp = timezone.now().strftime("%Y%m%d_%H%M%S")
+    return log_dir / f"{timestamp}_{filename}"
+
+
+def _save_exchange_log(filename: str, content: bytes | str | IO[bytes], is_binary: bool = False) -> None:
+    """Save a copy of exchange output to a private log directory for audit.
+
+    A binary file object is copied in chunks from its start, so spooled
+    uploads are logged without reading them into memory.
+    """
     try:
-        log_dir = _get_exchange_log_dir()
-        log_dir.mkdir(parents=True, exist_ok=True)
-        timestamp = timezone.now().strftime("%Y%m%d_%H%M%S")
-        filepath = log_dir / f"{timestamp}_{filename}"
-        if is_binary:
+        filepath = _exchange_log_path(filename)
+        if not isinstance(content, (bytes, str)):
+            content.seek(0)
+            with filepath.open("wb") as dest:
+                shutil.copyfileobj(content, dest)
+        elif is_binary:
             if isinstance(content, str):
                 content = content.encode("utf-8")
             filepath.write_bytes(content)
@@ -146,20 +215,57 @@ def _save_exchange_log(filename: str, content: bytes | str, is_binary: bool = Fa
         logger.error(f"[EXCHANGE LOG] Failed to save audit log {filename}: {e}")
 
 
-def _copy_file_to_log(source_path: Path, filename: str) -> None:
-    """Copy a file to the exchange log directory without loading it into RAM.
-
-    This avoids OOM issues when logging large XML/ZIP files by using
-    filesystem-level copy instead of reading content into memory.
-    """
+def _open_exchange_log(filename: str) -> IO[bytes] | None:
+    """Open an audit log file for incremental writes (None if logging is unavailable)."""
     try:
-        log_dir = _get_exchange_log_dir()
-        log_dir.mkdir(parents=True, exist_ok=True)
-        timestamp = timezone.now().strftime("%Y%m%d_%H%M%S")
-        dest_path = log_dir / f"{timestamp}_{filename}"
-        shutil.copy2(source_path, dest_path)
+        return _exchange_log_path(filename).open("wb")
     except Exception as e:
-        logger.error(f"[EXCHANGE LOG] Failed to copy audit log {filename}: {e}")
+        logger.error(f"[EXCHANGE LOG] Failed to open audit log {filename}: {e}")
+        return None
+
+
+class _ZipStreamBuffer:
+    """Write-only sink for zipfile: collects compressed bytes until drained.
+
+    Has no tell()/seek(), so ZipFile treats it as unseekable and writes
+    sizes and CRC in data descriptors after each entry.
+    """
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        if data:
+            self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _iter_zip_stream(arcname: str, xml_chunks: Iterator[str]) -> Iterator[bytes]:
+    """Compress XML chunks into a single-entry ZIP archive, yielding archive bytes as they are produced."""
+    buffer = _ZipStreamBuffer()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zf:  # type: ignore
+        with zf.open(arcname, "w") as entry:
+            for chunk in xml_chunks:
+                entry.write(chunk.encode("utf-8"))
+                data = buffer.drain()
+                if data:
+                    yield data
+    yield buffer.drain()
+
+
+def _get_export_max_orders() -> int | None:
+    """Return the per-query cap on exported orders (None — no cap)."""
+    exchange_cfg = getattr(settings, "ONEC_EXCHANGE", {})
+    max_orders = exchange_cfg.get("EXPORT_MAX_ORDERS")
+    return int(max_orders) if max_orders else None
 
 
 class ICExchangeView(APIView):
@@ -269,6 +375,10 @@ class ICExchangeView(APIView):
             logger.warning("[IMPORT] Request rejected: No identifier found.")
             return HttpResponse("failure\nMissing sessid", content_type="text/plain; charset=utf-8")
 
+        # orders.xml is imported on upload; mode=import only polls an async import
+        if filename.lower() == ORDERS_XML_FILENAME:
+            return self._orders_import_status(sessid)
+
         orchestrator = ImportOrchestratorService(sessid, filename)
         success, message = orchestrator.execute()
 
@@ -566,9 +676,11 @@ class ICExchangeView(APIView):
         Protocol: GET /?mode=query[&zip=yes]
         Returns XML (or ZIP) with pending orders for 1C.
 
-        Memory optimization: Uses streaming for XML responses to avoid
-        materializing large exports in RAM. For ZIP, uses tempfile to
-        avoid doubling memory pressure.
+        Memory optimization: orders are read in keyset-ordered chunks (by pk)
+        with per-chunk prefetch. XML (or the ZIP archive, compressed on the
+        fly) is streamed straight into the response and the audit log.
+        ONEC_EXCHANGE["EXPORT_MAX_ORDERS"] caps one query, so a backlog is
+        drained across several exchanges.
         """
         # 1С УТ 11 sends repeated query instead of mode=success.
         # Treat a repeated query as implicit confirmation of previous batch.
@@ -599,92 +711,50 @@ class ICExchangeView(APIView):
         service = OrderExportService(schema_version=schema_ver)
         use_zip = request.query_params.get("zip", "").lower() == "yes"
 
-        import tempfile
+        # Pick the batch up front (pk only): export state for mode=success is
+        # stored before the body is generated and streamed.
+        exported_ids, skipped_ids = service.select_export_batch(orders, max_orders=_get_export_max_orders())
+
+        # Mark skipped orders to prevent poison queue
+        if skipped_ids:
+            Order.objects.filter(pk__in=skipped_ids).update(export_skipped=True)
+            logger.info(f"Marked {len(skipped_ids)} orders as export_skipped")
+
+        # Store session/cache state for mode=success / implicit success
+        request.session["last_1c_query_time"] = query_time.isoformat()
+        cache_key = f"1c_exported_ids_{request.session.session_key}"
+        cache.set(cache_key, exported_ids, timeout=3600)
 
-        exported_ids: list[int] = []
-        skipped_ids: list[int] = []
+        # Skipped orders are now export_skipped, so the pk boundary selects exactly the batch
+        batch = orders.filter(pk__lte=exported_ids[-1]) if exported_ids else orders.none()
+        xml_chunks = service.generate_xml_streaming(batch)
 
         if use_zip:
-            # ZIP mode: Stream XML to temp file, then compress and stream response
-            # Using NamedTemporaryFile to allow FileResponse streaming
-            xml_tmp = tempfile.NamedTemporaryFile(delete=False, suffix=".xml")
-            try:
-                for chunk in service.generate_xml_streaming(orders, exported_ids, skipped_ids):
-                    xml_tmp.write(chunk.encode("utf-8"))
-                xml_tmp.close()
-
-                # Mark skipped orders to prevent poison queue
-                if skipped_ids:
-                    Order.objects.filter(pk__in=skipped_ids).update(export_skipped=True)
-                    logger.info(f"Marked {len(skipped_ids)} orders as export_skipped")
-
-                # Store session/cache state after successful generation
-                request.session["last_1c_query_time"] = query_time.isoformat()
-                cache_key = f"1c_exported_ids_{request.session.session_key}"
-                cache.set(cache_key, exported_ids, timeout=3600)
-
-                # Create ZIP in a named temp file for streaming
-                zip_tmp = tempfile.NamedTemporaryFile(delete=False, suffix=".zip")
-                try:
-                    with zipfile.ZipFile(zip_tmp, "w", zipfile.ZIP_DEFLATED) as zf:
-                        zf.write(xml_tmp.name, ORDERS_XML_FILENAME)
-                    zip_tmp.close()
-
-                    # Save audit log via file copy (avoids loading into RAM)
-                    _copy_file_to_log(Path(zip_tmp.name), ORDERS_ZIP_FILENAME)
-
-                    # Stream ZIP file as response
-                    response = FileResponse(
-                        open(zip_tmp.name, "rb"),
-                        content_type="application/zip",
-                        as_attachment=True,
-                        filename=ORDERS_ZIP_FILENAME,
-                    )
-                    # Mark temp file for cleanup after response is sent
-                    zip_path = Path(zip_tmp.name)
-                    response._resource_closers.append(lambda p=zip_path: p.unlink(missing_ok=True))  # type: ignore
-                    return response
-                finally:
-                    # Cleanup XML temp file
-                    Path(xml_tmp.name).unlink(missing_ok=True)
-            except Exception:
-                # Cleanup on error
-                Path(xml_tmp.name).unlink(missing_ok=True)
-                raise
-
-        # Non-ZIP: Stream XML directly via FileResponse
-        xml_file = tempfile.NamedTemporaryFile(delete=False, suffix=".xml", mode="w", encoding="utf-8")
-        try:
-            for chunk in service.generate_xml_streaming(orders, exported_ids, skipped_ids):
-                xml_file.write(chunk)
-            xml_file.close()
-
-            # Mark skipped orders to prevent poison queue
-            if skipped_ids:
-                Order.objects.filter(pk__in=skipped_ids).update(export_skipped=True)
-                logger.info(f"Marked {len(skipped_ids)} orders as export_skipped")
-
-            # Store session/cache state after successful generation
-            request.session["last_1c_query_time"] = query_time.isoformat()
-            cache_key = f"1c_exported_ids_{request.session.session_key}"
-            cache.set(cache_key, exported_ids, timeout=3600)
-
-            # Save audit log via file copy (avoids loading into RAM)
-            _copy_file_to_log(Path(xml_file.name), ORDERS_XML_FILENAME)
-
-            # Stream XML file as response
-            response = FileResponse(
-                open(xml_file.name, "rb"),
+            # ZIP mode: compress chunks on the fly into the response, teeing the archive into the audit log
+            log_file = _open_exchange_log(ORDERS_ZIP_FILENAME)
+            response = StreamingHttpResponse(
+                self._stream_orders_export(_iter_zip_stream(ORDERS_XML_FILENAME, xml_chunks), log_file),
+                content_type="application/zip",
+            )
+            response["Content-Disposition"] = f'attachment; filename="{ORDERS_ZIP_FILENAME}"'
+        else:
+            # Non-ZIP: stream XML chunks directly into the response, teeing into the audit log
+            log_file = _open_exchange_log(ORDERS_XML_FILENAME)
+            response = StreamingHttpResponse(
+                self._stream_orders_export((chunk.encode("utf-8") for chunk in xml_chunks), log_file),
                 content_type="application/xml",
             )
-            # Mark temp file for cleanup after response is sent
-            xml_path = Path(xml_file.name)
-            response._resource_closers.append(lambda p=xml_path: p.unlink(missing_ok=True))  # type: ignore
-            return response
-        except Exception:
-            # Cleanup on error
-            Path(xml_file.name).unlink(missing_ok=True)
-            raise
+        if log_file is not None:
+            # Closed with the response, even if the body is never consumed
+            response._resource_closers.append(log_file.close)  # type: ignore
+        return response
+
+    def _stream_orders_export(self, chunks: Iterator[bytes], log_file: IO[bytes] | None) -> Iterator[bytes]:
+        """Pass export chunks to the response and tee them into the audit log."""
+        for data in chunks:
+            if log_file is not None:
+                log_file.write(data)
+            yield data
 
     def handle_success(self, request):
         """
@@ -842,11 +912,14 @@ class ICExchangeView(APIView):
     def _handle_orders_xml(self, request: Any) -> HttpResponse:
         """Handle orders.xml import synchronously (ADR-001).
 
-        Unlike catalog files (streamed to disk), orders.xml is processed
+        Unlike catalog files (routed for mode=import), orders.xml is processed
         inline because:
-        1. It's typically small (<1MB)
-        2. 1C expects immediate status response
-        3. No need for mode=import follow-up
+        1. 1C expects immediate status response
+        2. No need for mode=import follow-up
+
+        The body is spooled to a temporary file (in memory up to
+        ORDERS_XML_SPOOL_SIZE, on disk above it) and parsed as a stream,
+        so peak memory does not grow with the file size.
         """
         try:
             # ADR-004: Check file size BEFORE reading
@@ -858,132 +931,203 @@ class ICExchangeView(APIView):
                     content_type="text/plain; charset=utf-8",
                 )
 
-            # Read body with hard limit (avoid reading oversized payloads)
-            xml_data = request._request.read(ORDERS_XML_MAX_SIZE + 1)
+            with tempfile.SpooledTemporaryFile(max_size=ORDERS_XML_SPOOL_SIZE) as xml_file:
+                return self._import_orders_xml_file(request, xml_file, content_length)
 
-            if len(xml_data) > ORDERS_XML_MAX_SIZE:
-                logger.warning(f"[ORDERS IMPORT] Rejected: file too large ({len(xml_data)} bytes)")
+        except (ETParseError, DefusedXmlException) as e:
+            logger.error(f"[ORDERS IMPORT] XML error: {e}")
+            if isinstance(e, DefusedXmlException):
                 return HttpResponse(
-                    "failure\nFile too large for inline processing",
+                    "failure\nXML security violation",
                     content_type="text/plain; charset=utf-8",
                 )
+            return HttpResponse(
+                "failure\nMalformed XML",
+                content_type="text/plain; charset=utf-8",
+            )
+        except Exception as e:
+            logger.exception(f"[ORDERS IMPORT] Failed: {e}")
+            return HttpResponse(
+                "failure\nInternal error",
+                content_type="text/plain; charset=utf-8",
+            )
 
-            # FM1.1: Body integrity check
-            if content_length > 0 and len(xml_data) != content_length:
-                logger.warning(f"[ORDERS IMPORT] Truncated body: expected {content_length}, " f"got {len(xml_data)}")
+    def _import_orders_xml_file(self, request: Any, xml_file: IO[bytes], content_length: int) -> HttpResponse:
+        """Spool the orders.xml body into ``xml_file`` and run the streaming import."""
+        # Read body in chunks with hard limit (avoid reading oversized payloads)
+        body_size = 0
+        while chunk := request._request.read(ORDERS_XML_READ_CHUNK):
+            body_size += len(chunk)
+            if body_size > ORDERS_XML_MAX_SIZE:
+                logger.warning(f"[ORDERS IMPORT] Rejected: file too large (more than {ORDERS_XML_MAX_SIZE} bytes)")
                 return HttpResponse(
-                    "failure\nIncomplete request body",
+                    "failure\nFile too large for inline processing",
                     content_type="text/plain; charset=utf-8",
                 )
+            xml_file.write(chunk)
 
-            # AC10: Detect and re-encode windows-1251 if needed
-            xml_data = _reencode_xml_if_needed(xml_data)
+        # FM1.1: Body integrity check
+        if content_length > 0 and body_size != content_length:
+            logger.warning(f"[ORDERS IMPORT] Truncated body: expected {content_length}, " f"got {body_size}")
+            return HttpResponse(
+                "failure\nIncomplete request body",
+                content_type="text/plain; charset=utf-8",
+            )
 
-            # AC13: Reject stale XML (anti-replay)
-            if not _validate_xml_timestamp(xml_data):
-                logger.warning("[SECURITY] Stale XML rejected")
-                return HttpResponse(
-                    "failure\nXML timestamp too old",
-                    content_type="text/plain; charset=utf-8",
-                )
+        # AC10: windows-1251 is decoded by the streaming parser itself;
+        # only the header is re-encoded for the timestamp check
+        xml_file.seek(0)
+        header = xml_file.read(XML_TIMESTAMP_SCAN_BYTES)
 
-            # ADR-005: Audit log BEFORE processing (for recovery)
-            _save_exchange_log(ORDERS_XML_FILENAME, xml_data, is_binary=True)
+        # AC13: Reject stale XML (anti-replay)
+        if not _validate_xml_timestamp(_reencode_xml_if_needed(header)):
+            logger.warning("[SECURITY] Stale XML rejected")
+            return HttpResponse(
+                "failure\nXML timestamp too old",
+                content_type="text/plain; charset=utf-8",
+            )
 
-            # FM4.5: Guard against oversized XML
-            doc_count = len(_DOCUMENT_TAG_RE.findall(xml_data))
-            if doc_count > MAX_DOCUMENTS_PER_FILE:
-                logger.warning(f"[ORDERS IMPORT] Too many documents: {doc_count} " f"(max {MAX_DOCUMENTS_PER_FILE})")
-                return HttpResponse(
-                    "failure\nToo many documents",
-                    content_type="text/plain; charset=utf-8",
-                )
+        # ADR-005: Audit log BEFORE processing (for recovery)
+        _save_exchange_log(ORDERS_XML_FILENAME, xml_file, is_binary=True)
 
-            # FM5.1/FM5.2: Retry on transient DB errors
-            service = OrderStatusImportService()
-            last_db_error = None
-            result = None
-            for attempt in range(ORDERS_IMPORT_MAX_RETRIES):
-                try:
-                    result = service.process(xml_data)
-                    break
-                except OperationalError as e:
-                    last_db_error = e
-                    if attempt == ORDERS_IMPORT_MAX_RETRIES - 1:
-                        raise
-                    logger.warning(f"[ORDERS IMPORT] DB error, retry {attempt + 1}: {e}")
-                    time.sleep(0.5 * (attempt + 1))
-
-            if result is None:
-                raise RuntimeError(f"Service returned no result: {last_db_error}")
-
-            parse_error = next(
-                (err for err in result.errors if "xml parse error" in err.lower()),
-                None,
-            )
-            if parse_error:
-                logger.warning(f"[ORDERS IMPORT] Malformed XML: {parse_error}")
-                return HttpResponse(
-                    "failure\nMalformed XML",
-                    content_type="text/plain; charset=utf-8",
-                )
-            security_error = next(
-                (err for err in result.errors if "xml security error" in err.lower()),
-                None,
+        # FM4.5: Guard against oversized XML
+        doc_count = _count_xml_documents(xml_file, _document_tag_re(header))
+        if doc_count > MAX_DOCUMENTS_PER_FILE:
+            logger.warning(f"[ORDERS IMPORT] Too many documents: {doc_count} " f"(max {MAX_DOCUMENTS_PER_FILE})")
+            return HttpResponse(
+                "failure\nToo many documents",
+                content_type="text/plain; charset=utf-8",
             )
-            if security_error:
-                logger.warning(f"[ORDERS IMPORT] XML security violation: {security_error}")
-                return HttpResponse(
-                    "failure\nXML security violation",
-                    content_type="text/plain; charset=utf-8",
-                )
 
-            # Log metrics
-            logger.info(
-                f"[ORDERS IMPORT] processed={result.processed}, "
-                f"updated={result.updated}, skipped={result.skipped}, "
-                f"aggregated_masters={result.aggregated_master_count}, "
-                f"not_found={result.not_found}, errors={len(result.errors)}"
-            )
+        # Large files are processed by a Celery worker, 1C polls mode=import
+        if body_size > _get_orders_async_threshold():
+            return self._enqueue_orders_xml(request, xml_file, body_size, doc_count)
 
-            # AC9/Pre-mortem #1: Alert on zero processed from non-empty XML
-            if result.processed == 0 and len(xml_data) > 100:
-                logger.error(
-                    "[ORDERS IMPORT] Zero documents processed from non-empty XML " f"(body size={len(xml_data)} bytes)"
-                )
+        # FM5.1/FM5.2: Retry on transient DB errors
+        service = OrderStatusImportService()
+        last_db_error = None
+        result = None
+        for attempt in range(ORDERS_IMPORT_MAX_RETRIES):
+            try:
+                xml_file.seek(0)
+                result = service.process_stream(xml_file)
+                break
+            except OperationalError as e:
+                last_db_error = e
+                if attempt == ORDERS_IMPORT_MAX_RETRIES - 1:
+                    raise
+                logger.warning(f"[ORDERS IMPORT] DB error, retry {attempt + 1}: {e}")
+                time.sleep(0.5 * (attempt + 1))
+
+        if result is None:
+            raise RuntimeError(f"Service returned no result: {last_db_error}")
+
+        return self._orders_import_response(result, body_size)
+
+    def _enqueue_orders_xml(self, request: Any, xml_file: IO[bytes], body_size: int, doc_count: int) -> HttpResponse:
+        """Persist a large orders.xml and hand it to a Celery worker.
+
+        1C gets ``success`` right away; progress and the final ImportResult
+        are stored on an ImportSession that 1C polls via
+        ``mode=import&filename=orders.xml`` and the admin shows in the import log.
+        """
+        import_dir = _get_orders_import_dir()
+        import_dir.mkdir(parents=True, exist_ok=True)
+        file_path = import_dir / f"{timezone.now():%Y%m%d_%H%M%S}_{uuid.uuid4().hex}_{ORDERS_XML_FILENAME}"
+        xml_file.seek(0)
+        with file_path.open("wb") as dest:
+            shutil.copyfileobj(xml_file, dest)
+
+        session = ImportSession.objects.create(
+            import_type=ImportSession.ImportType.ORDER_STATUSES,
+            status=ImportSession.ImportStatus.PENDING,
+            report_details={
+                "sessid": self._get_exchange_identity(request),
+                "total_items": doc_count,
+                "processed_items": 0,
+            },
+            report=(
+                f"[{timezone.now()}] Получен {ORDERS_XML_FILENAME}: {body_size} байт, "
+                f"документов: {doc_count}. Импорт поставлен в очередь\n"
+            ),
+        )
+        transaction.on_commit(lambda: process_order_status_import_task.delay(session.pk, str(file_path)))
 
-            if result.errors:
-                logger.warning(f"[ORDERS IMPORT] Errors: {result.errors[:5]}")
+        logger.info(
+            f"[ORDERS IMPORT] Queued async import: session_id={session.pk}, "
+            f"size={body_size} bytes, documents={doc_count}"
+        )
+        return HttpResponse("success", content_type="text/plain; charset=utf-8")
 
-            # ADR-003: Partial Success = Success
-            if result.updated > 0 or not result.errors:
-                return HttpResponse("success", content_type="text/plain; charset=utf-8")
+    def _orders_import_status(self, sessid: str) -> HttpResponse:
+        """Report the latest async orders.xml import of this exchange session.
 
-            # Complete failure: nothing updated AND errors present
-            summary = f"processed={result.processed}, updated={result.updated}, " f"errors={len(result.errors)}"
-            return HttpResponse(
-                f"failure\nNo orders updated. {summary}",
-                content_type="text/plain; charset=utf-8",
+        Returns ``progress`` while the worker is running and ``success`` /
+        ``failure`` once it has finished. Inline imports leave no session
+        and are reported as ``success``.
+        """
+        session = (
+            ImportSession.objects.filter(
+                import_type=ImportSession.ImportType.ORDER_STATUSES,
+                report_details__sessid=sessid,
             )
+            .order_by("-created_at")
+            .first()
+        )
+        if session is None or session.status == ImportSession.ImportStatus.COMPLETED:
+            return HttpResponse("success", content_type="text/plain; charset=utf-8")
 
-        except (ETParseError, DefusedXmlException) as e:
-            logger.error(f"[ORDERS IMPORT] XML error: {e}")
-            if isinstance(e, DefusedXmlException):
-                return HttpResponse(
-                    "failure\nXML security violation",
-                    content_type="text/plain; charset=utf-8",
-                )
+        # Lazy expiration, same threshold as catalog import sessions
+        stale_threshold = timezone.now() - timedelta(hours=2)
+        if session.status != ImportSession.ImportStatus.FAILED and session.updated_at < stale_threshold:
+            session.status = ImportSession.ImportStatus.FAILED
+            session.error_message = "Session expired (stale for > 2 hours)"
+            session.finished_at = timezone.now()
+            session.save(update_fields=["status", "error_message", "finished_at", "updated_at"])
+
+        if session.status == ImportSession.ImportStatus.FAILED:
             return HttpResponse(
-                "failure\nMalformed XML",
+                f"failure\n{session.error_message or 'Import failed'}",
                 content_type="text/plain; charset=utf-8",
             )
-        except Exception as e:
-            logger.exception(f"[ORDERS IMPORT] Failed: {e}")
-            return HttpResponse(
-                "failure\nInternal error",
-                content_type="text/plain; charset=utf-8",
+
+        details = session.report_details
+        return HttpResponse(
+            f"progress\nProcessed {details.get('processed_items', 0)} of {details.get('total_items', 0)} documents",
+            content_type="text/plain; charset=utf-8",
+        )
+
+    def _orders_import_response(self, result: ImportResult, body_size: int) -> HttpResponse:
+        """Log import metrics and map ImportResult to the 1C response."""
+        failure_reason = result.failure_reason
+        if failure_reason in ("Malformed XML", "XML security violation"):
+            logger.warning(f"[ORDERS IMPORT] {failure_reason}: {result.errors[:5]}")
+            return HttpResponse(f"failure\n{failure_reason}", content_type="text/plain; charset=utf-8")
+
+        # Log metrics
+        logger.info(
+            f"[ORDERS IMPORT] processed={result.processed}, "
+            f"updated={result.updated}, skipped={result.skipped}, "
+            f"aggregated_masters={result.aggregated_master_count}, "
+            f"not_found={result.not_found}, errors={len(result.errors)}"
+        )
+
+        # AC9/Pre-mortem #1: Alert on zero processed from non-empty XML
+        if result.processed == 0 and body_size > 100:
+            logger.error(
+                "[ORDERS IMPORT] Zero documents processed from non-empty XML " f"(body size={body_size} bytes)"
             )
 
+        if result.errors:
+            logger.warning(f"[ORDERS IMPORT] Errors: {result.errors[:5]}")
+
+        # ADR-003: Partial Success = Success
+        if failure_reason is None:
+            return HttpResponse("success", content_type="text/plain; charset=utf-8")
+
+        # Complete failure: nothing updated AND errors present
+        return HttpResponse(f"failure\n{failure_reason}", content_type="text/plain; charset=utf-8")
+
     def handle_file_upload(self, request):
         """
         Handle chunked file uploads from 1C.
@@ -12,6 +12,7 @@ from django.core.management import call_command
 from django.utils import timezone
 
 from apps.products.models import ImportSession, Product, ProductVariant
+from apps.products.services.image_catalog import ImageCatalog
 from apps.products.services.variant_import import VariantImportProcessor
 
 logger = logging.getLogger(__name__)
@@ -189,39 +190,20 @@ def _execute_import_type(import_type: str, task_id: str) -> dict[str, str]:
         raise ValueError(f"Неизвестный тип импорта: {import_type}")
 
 
-def _get_product_images(product: Product, base_dir: Path) -> list[str]:
+def _get_product_images(product: Product, catalog: ImageCatalog) -> list[str]:
     """
-    Получить список изображений для товара из директории 1С.
+    Получить список изображений для товара из индекса директории 1С.
 
     Args:
         product: Product instance с onec_id
-        base_dir: Путь к goods/import_files/
+        catalog: Индекс goods/import_files/
 
     Returns:
         Список относительных путей (например, ["00/001a16a4_image.jpg"])
     """
     if not product.onec_id:
         return []
-
-    # Первые 2 символа onec_id определяют поддиректорию
-    onec_id = product.onec_id
-    subdir = onec_id[:2] if len(onec_id) >= 2 else "00"
-
-    images_dir = base_dir / subdir
-
-    if not images_dir.exists():
-        return []
-
-    # Поиск файлов начинающихся с onec_id
-    image_paths = []
-    for ext in ["*.jpg", "*.jpeg", "*.png"]:
-        for img_file in images_dir.glob(f"{onec_id}*"):
-            if img_file.suffix.lower() in [".jpg", ".jpeg", ".png"]:
-                # Относительный путь от base_dir
-                relative_path = f"{subdir}/{img_file.name}"
-                image_paths.append(relative_path)
-
-    return image_paths
+    return catalog.product_images(product.onec_id)
 
 
 def _run_image_import(task_id: str) -> dict[str, str]:
@@ -281,15 +263,22 @@ def _run_image_import(task_id: str) -> dict[str, str]:
 
         logger.info(f"[Task {task_id}] Найдено {total_products} активных товаров с onec_id")
 
+        # Один проход по директории вместо glob/stat на каждый товар
+        catalog = ImageCatalog.build(base_dir)
+        logger.info(f"[Task {task_id}] Проиндексировано файлов: {len(catalog)}")
+
         # Создать экземпляр процессора, используя ID текущей сессии (если найдена)
         processor_session_id = session.id if session else 0
         processor = VariantImportProcessor(session_id=processor_session_id)
+        processor.use_image_catalog(catalog)
+        # Проход по товарам только собирает изображения; копирование — отдельным этапом пулом потоков
+        processor.defer_image_ingest()
 
         # Chunked processing для экономии памяти
         for product in products_qs.iterator(chunk_size=100):
             try:
                 # Получить список изображений для товара
-                image_paths = _get_product_images(product, base_dir)
+                image_paths = _get_product_images(product, catalog)
 
                 if not image_paths:
                     total_skipped += 1
@@ -347,6 +336,13 @@ def _run_image_import(task_id: str) -> dict[str, str]:
                 processed += 1
                 # Продолжаем обработку остальных товаров
 
+        ingest_result = processor.ingest_deferred_images()
+        logger.info(
+            f"[Task {task_id}] Изображения скопированы: файлов {ingest_result['files']}, "
+            f"товаров обновлено {ingest_result['products_updated']}, "
+            f"вариантов {ingest_result['variants_updated']}"
+        )
+
         # Финализация сессии
         if session:
             session.status = ImportSession.ImportStatus.COMPLETED
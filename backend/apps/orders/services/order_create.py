@@ -8,8 +8,7 @@ from decimal import Decimal
 from typing import Any, cast
 
 from django.conf import settings
-from django.db import transaction
-from django.db.models import F
+from django.db import connections, router, transaction
 from django.db.models.manager import BaseManager
 from rest_framework import serializers
 
@@ -99,45 +98,52 @@ class OrderCreateService:
         )
         master.save()
 
-        # 3. Создать субзаказы + OrderItem для каждой VAT-группы
-        variant_updates: list[tuple[int, int]] = []
+        # 3. Создать субзаказы + OrderItem одним bulk_create на модель.
+        # Субзаказы не нуждаются в Order.save()/post_save: номер уже сформирован,
+        # а обработчики сигналов заказа реагируют только на мастер.
+        order_manager = cast(BaseManager[Order], getattr(Order, "objects"))
         order_item_manager = cast(BaseManager[OrderItem], getattr(OrderItem, "objects"))
+        sub_orders: list[Order] = []
 
         for suborder_sequence, ((vat_key, _warehouse_key), items) in enumerate(ordered_groups, start=1):
             group_total = Decimal(sum(ci.total_price for ci in items))
             sub_number = OrderNumberingService.build_suborder_number(master, suborder_sequence)
-            sub = Order(
-                order_number=sub_number.order_number,
-                user=user,
-                is_master=False,
-                parent_order=master,
-                vat_group=vat_key,
-                customer_code_snapshot=sub_number.customer_code_snapshot,
-                order_year=sub_number.order_year,
-                customer_year_sequence=sub_number.customer_year_sequence,
-                suborder_sequence=sub_number.suborder_sequence,
-                delivery_cost=Decimal("0"),
-                total_amount=group_total,
-                status="pending",
-                payment_status="pending",
-                customer_name=master.customer_name,
-                customer_email=master.customer_email,
-                customer_phone=master.customer_phone,
-                delivery_address=master.delivery_address,
-                delivery_method=master.delivery_method,
-                delivery_date=master.delivery_date,
-                payment_method=master.payment_method,
-                notes=master.notes,
+            sub_orders.append(
+                Order(
+                    order_number=sub_number.order_number,
+                    user=user,
+                    is_master=False,
+                    parent_order=master,
+                    vat_group=vat_key,
+                    customer_code_snapshot=sub_number.customer_code_snapshot,
+                    order_year=sub_number.order_year,
+                    customer_year_sequence=sub_number.customer_year_sequence,
+                    suborder_sequence=sub_number.suborder_sequence,
+                    delivery_cost=Decimal("0"),
+                    total_amount=group_total,
+                    status="pending",
+                    payment_status="pending",
+                    customer_name=master.customer_name,
+                    customer_email=master.customer_email,
+                    customer_phone=master.customer_phone,
+                    delivery_address=master.delivery_address,
+                    delivery_method=master.delivery_method,
+                    delivery_date=master.delivery_date,
+                    payment_method=master.payment_method,
+                    notes=master.notes,
+                )
             )
-            sub.save()
+        order_manager.bulk_create(sub_orders)
 
-            sub_items = []
+        order_items = []
+        stock_decrements: dict[int, int] = {}
+        for sub, (_group_key, items) in zip(sub_orders, ordered_groups):
             for ci in items:
                 variant = ci.variant
                 product = variant.product
                 unit_price = ci.price_snapshot
                 snapshot = OrderItem.build_snapshot(product, variant)
-                sub_items.append(
+                order_items.append(
                     OrderItem(
                         order=sub,
                         product=product,
@@ -148,32 +154,60 @@ class OrderCreateService:
                         **snapshot,
                     )
                 )
-                variant_updates.append((variant.pk, ci.quantity))
-
-            order_item_manager.bulk_create(sub_items)
+                stock_decrements[variant.pk] = stock_decrements.get(variant.pk, 0) + ci.quantity
+        order_item_manager.bulk_create(order_items)
 
-        # 4. Списать остатки через conditional update — защита от race condition
-        # между параллельными checkout'ами: если stock уже забрали, update вернёт 0,
-        # бросаем ValidationError, транзакция откатывается целиком.
-        variant_manager = cast(BaseManager[ProductVariant], getattr(ProductVariant, "objects"))
-        for variant_pk, qty in variant_updates:
-            updated = variant_manager.filter(pk=variant_pk, stock_quantity__gte=qty).update(
-                stock_quantity=F("stock_quantity") - qty
-            )
-            if updated == 0:
-                variant: ProductVariant | None = variant_manager.filter(pk=variant_pk).only("id", "sku").first()
-                sku = getattr(variant, "sku", variant_pk) if variant else variant_pk
-                raise serializers.ValidationError(
-                    f"Недостаточно товара '{sku}' на складе. "
-                    f"Запрошенное количество больше не доступно — возможно, другой покупатель "
-                    f"оформил заказ раньше. Обновите корзину и попробуйте снова."
-                )
+        # 4. Списать остатки одним conditional UPDATE — защита от race condition
+        # между параллельными checkout'ами: если stock уже забрали, строка не
+        # попадёт в RETURNING, бросаем ValidationError, транзакция откатывается целиком.
+        self._decrement_stock(stock_decrements)
 
-        # 5. Очистить корзину
+        # 5. Очистить корзину: позиции удаляются одним DELETE, резерв снимается
+        # вставкой в журнал резервов (свернётся в reserved_quantity при сверке)
         cart.clear()
 
         return master
 
+    def _decrement_stock(self, quantities: dict[int, int]) -> None:
+        """
+        Списывает остатки всех позиций одним UPDATE ... FROM (VALUES ...).
+
+        Строка обновляется только при stock_quantity >= qty; варианты, не попавшие
+        в RETURNING, означают нехватку остатка. Значения отсортированы по pk: при
+        nested loop по VALUES PostgreSQL блокирует строки в этом порядке, что снижает
+        риск взаимоблокировки параллельных checkout'ов с общими товарами.
+        """
+        variant_pks = sorted(quantities)
+        opts = ProductVariant._meta
+        stock_column = opts.get_field("stock_quantity").column
+        pk_column = opts.pk.column
+        values_sql = ", ".join(["(%s::bigint, %s::integer)"] * len(variant_pks))
+        params: list[int] = []
+        for variant_pk in variant_pks:
+            params.extend((variant_pk, quantities[variant_pk]))
+
+        sql = (
+            f'UPDATE "{opts.db_table}" AS v '
+            f'SET "{stock_column}" = v."{stock_column}" - d.qty '
+            f"FROM (VALUES {values_sql}) AS d(id, qty) "
+            f'WHERE v."{pk_column}" = d.id AND v."{stock_column}" >= d.qty '
+            f'RETURNING v."{pk_column}"'
+        )
+        with connections[router.db_for_write(ProductVariant)].cursor() as cursor:
+            cursor.execute(sql, params)
+            updated = {row[0] for row in cursor.fetchall()}
+
+        missing = [variant_pk for variant_pk in variant_pks if variant_pk not in updated]
+        if missing:
+            variant_manager = cast(BaseManager[ProductVariant], getattr(ProductVariant, "objects"))
+            variant: ProductVariant | None = variant_manager.filter(pk=missing[0]).only("id", "sku").first()
+            sku = getattr(variant, "sku", missing[0]) if variant else missing[0]
+            raise serializers.ValidationError(
+                f"Недостаточно товара '{sku}' на складе. "
+                f"Запрошенное количество больше не доступно — возможно, другой покупатель "
+                f"оформил заказ раньше. Обновите корзину и попробуйте снова."
+            )
+
     def _resolve_item_vat_rate(self, variant: ProductVariant, product: Any) -> Decimal | None:
         """
         Возвращает ставку НДС для группировки заказа.
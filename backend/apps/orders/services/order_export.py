@@ -8,13 +8,13 @@ from __future__ import annotations
 
 import hashlib
 import logging
-import xml.etree.ElementTree as ET
+from dataclasses import dataclass, field
 from datetime import datetime
 from decimal import Decimal
 from typing import Any, Iterator, Union
 
 from django.conf import settings
-from django.db.models import QuerySet
+from django.db.models import Exists, OuterRef, QuerySet
 from django.utils import timezone
 
 from apps.orders.models import Order, OrderItem
@@ -24,6 +24,79 @@ from apps.users.models import User
 logger = logging.getLogger(__name__)
 
 
+def _xml_text(value: str) -> str:
+    """Экранирование текста узла по правилам ElementTree (_escape_cdata)."""
+    if "&" in value:
+        value = value.replace("&", "&amp;")
+    if "<" in value:
+        value = value.replace("<", "&lt;")
+    if ">" in value:
+        value = value.replace(">", "&gt;")
+    return value
+
+
+def _xml_attr(value: str) -> str:
+    """Экранирование значения атрибута по правилам ElementTree (_escape_attrib)."""
+    value = _xml_text(value)
+    if '"' in value:
+        value = value.replace('"', "&quot;")
+    if "\r" in value:
+        value = value.replace("\r", "&#13;")
+    if "\n" in value:
+        value = value.replace("\n", "&#10;")
+    if "\t" in value:
+        value = value.replace("\t", "&#09;")
+    return value
+
+
+def _xml_element(tag: str, text: str | None) -> str:
+    """Текстовый элемент; пустой текст даёт ``<tag />``, как ET.tostring."""
+    if not text:
+        return f"<{tag} />"
+    return f"<{tag}>{_xml_text(text)}</{tag}>"
+
+
+def _xml_requisite(name: str, value: str) -> str:
+    """Элемент ЗначениеРеквизита."""
+    return (
+        f"<ЗначениеРеквизита>{_xml_element('Наименование', name)}{_xml_element('Значение', value)}</ЗначениеРеквизита>"
+    )
+
+
+def _xml_vat(vat_rate: Decimal, vat_amount: str) -> str:
+    """Блок Налоги с НДС «в том числе» (CommerceML/Bitrix: флаг УчтеноВСумме)."""
+    return (
+        "<Налоги><Налог><Наименование>НДС</Наименование><УчтеноВСумме>true</УчтеноВСумме>"
+        f"<Ставка>{int(vat_rate)}</Ставка><Сумма>{vat_amount}</Сумма></Налог></Налоги>"
+    )
+
+
+_COUNTERPARTY_ROLE_XML = _xml_element("Роль", "Покупатель")
+_DOCUMENT_REQUISITES_TAIL_XML = (
+    _xml_requisite("Отменен", "false") + _xml_requisite("Проведен", "false") + _xml_requisite("Сайт", "freesport.ru")
+)
+_ITEM_REQUISITES_XML = (
+    "<ЗначенияРеквизитов>"
+    + _xml_requisite("ВидНоменклатуры", "Товар")
+    + _xml_requisite("ТипНоменклатуры", "Товар")
+    + "</ЗначенияРеквизитов>"
+)
+
+
+@dataclass
+class _ExportTemplates:
+    """Фрагменты XML, зависящие только от настроек — собираются один раз на экспорт."""
+
+    agreement_name: str
+    default_organization: str
+    default_warehouse: str
+    document_header_xml: str  # ХозОперация, Роль, Валюта, Курс
+    requisites_head_xml: str  # Операция и Статус заказа из ORDER_DEFAULTS
+    unit_xml: str  # БазоваяЕдиница строки товара
+    item_action_xml: str  # Действие строки товара
+    price_type_xml: dict[str, str] = field(default_factory=dict)  # ВидЦены по имени вида цены
+
+
 class OrderExportService:
     """
     Сервис генерации XML заказов в формате CommerceML 3.1 для экспорта в 1С.
@@ -33,6 +106,8 @@ class OrderExportService:
     """
 
     DEFAULT_SCHEMA_VERSION = "3.1"
+    # Orders fetched (with their prefetches) per keyset query
+    EXPORT_CHUNK_SIZE = 100
 
     def __init__(self, schema_version: str | None = None):
         if schema_version:
@@ -91,6 +166,7 @@ class OrderExportService:
         orders: "QuerySet[Order]",
         exported_ids: list[int] | None = None,
         skipped_ids: list[int] | None = None,
+        max_orders: int | None = None,
     ) -> Iterator[str]:
         """
         Generate CommerceML 3.1 XML using streaming/generator approach.
@@ -107,6 +183,8 @@ class OrderExportService:
                          Allows callers to know exactly which orders were included.
             skipped_ids: Optional list to append skipped order PKs to.
                         Orders that failed validation (e.g., no items) are added here.
+            max_orders: Optional cap on orders read per export (oldest pk first),
+                        so a backlog is drained across several exchanges.
 
         Yields:
             XML string fragments (declaration, root open, documents, root close).
@@ -120,7 +198,8 @@ class OrderExportService:
         yield f'ДатаФормирования="{formation_date}">\n'
 
         # Stream each order as a Container with Document inside
-        for _order in orders.iterator(chunk_size=100):
+        templates = self._build_templates()
+        for _order in self.iter_orders_keyset(orders, max_orders=max_orders):
             order: Any = _order
             if order.is_master:
                 logger.warning(
@@ -134,17 +213,68 @@ class OrderExportService:
                 if skipped_ids is not None:
                     skipped_ids.append(order.pk)
                 continue
-            container = ET.Element("Контейнер")
-            document = self._create_document_element(order)
-            container.append(document)
-            yield ET.tostring(container, encoding="unicode", method="xml")
-            yield "\n"
+            yield f"<Контейнер>{self._render_document(order, templates)}</Контейнер>\n"
             if exported_ids is not None:
                 exported_ids.append(order.pk)
 
         # Root element close tag
         yield "</КоммерческаяИнформация>"
 
+    def select_export_batch(
+        self, orders: "QuerySet[Order]", max_orders: int | None = None
+    ) -> tuple[list[int], list[int]]:
+        """
+        Pick the orders of one export before any XML is generated.
+
+        Reads only pk and an "has items" flag (oldest pk first), so the
+        caller can store export state for mode=success before streaming
+        the body.
+
+        Args:
+            orders: QuerySet of sub-orders pending export.
+            max_orders: Optional cap on orders per export.
+
+        Returns:
+            (pks to export, pks without items that _validate_order would skip).
+        """
+        rows = (
+            orders.prefetch_related(None)
+            .select_related(None)
+            .annotate(has_items=Exists(OrderItem.objects.filter(order_id=OuterRef("pk"))))
+            .order_by("pk")
+            .values_list("pk", "has_items")[:max_orders]
+        )
+        exported_ids: list[int] = []
+        skipped_ids: list[int] = []
+        for pk, has_items in rows:
+            (exported_ids if has_items else skipped_ids).append(pk)
+        return exported_ids, skipped_ids
+
+    def iter_orders_keyset(self, orders: "QuerySet[Order]", max_orders: int | None = None) -> Iterator["Order"]:
+        """
+        Walk orders in pk order, EXPORT_CHUNK_SIZE rows per query (keyset pagination).
+
+        Each chunk is a separate ``pk > last_pk`` query, so the queryset's
+        prefetch_related runs per chunk and only one chunk is held in memory.
+
+        Args:
+            orders: QuerySet of orders; its ordering is replaced by pk.
+            max_orders: Optional cap on the total number of orders yielded.
+        """
+        remaining = max_orders
+        last_pk = 0
+        while remaining is None or remaining > 0:
+            limit = self.EXPORT_CHUNK_SIZE if remaining is None else min(self.EXPORT_CHUNK_SIZE, remaining)
+            chunk = list(orders.filter(pk__gt=last_pk).order_by("pk")[:limit])
+            if not chunk:
+                return
+            yield from chunk
+            last_pk = chunk[-1].pk
+            if remaining is not None:
+                remaining -= len(chunk)
+            if len(chunk) < limit:
+                return
+
     def _validate_order(self, order: "Order") -> bool:
         """Валидация заказа перед генерацией XML."""
         # Use cached items from prefetch_related to avoid N+1 queries
@@ -154,22 +284,42 @@ class OrderExportService:
             return False
         return True
 
-    def _create_document_element(self, order: "Order") -> ET.Element:
-        """Создание элемента Документ для заказа."""
-        document = ET.Element("Документ")
+    def _build_templates(self) -> _ExportTemplates:
+        """Собирает производные от настроек фрагменты один раз на экспорт."""
+        exchange_cfg = getattr(settings, "ONEC_EXCHANGE", {})
+        ud = self._unit_defaults
+        unit_attrs = (
+            f'Код="{_xml_attr(ud["code"])}" '
+            f'НаименованиеПолное="{_xml_attr(ud["name_full"])}" '
+            f'МеждународноеСокращение="{_xml_attr(ud["name_intl"])}"'
+        )
+        if ud["name_short"]:
+            unit_xml = f'<БазоваяЕдиница {unit_attrs}>{_xml_text(ud["name_short"])}</БазоваяЕдиница>'
+        else:
+            unit_xml = f"<БазоваяЕдиница {unit_attrs} />"
+        order_defaults = self._get_order_defaults()
+        return _ExportTemplates(
+            agreement_name=exchange_cfg.get("DEFAULT_AGREEMENT", "Стандартное"),
+            default_organization=exchange_cfg.get("DEFAULT_ORGANIZATION", "ИП Семерюк Д.В."),
+            default_warehouse=exchange_cfg.get("DEFAULT_WAREHOUSE", "1 СДВ склад"),
+            document_header_xml=(
+                _xml_element("ХозОперация", self.OPERATION_TYPE)
+                + _xml_element("Роль", self.ROLE)
+                + _xml_element("Валюта", self.CURRENCY)
+                + _xml_element("Курс", self.EXCHANGE_RATE)
+            ),
+            requisites_head_xml=(
+                _xml_requisite("Операция", order_defaults["OPERATION"])
+                + _xml_requisite("Статус заказа", order_defaults["STATUS"])
+            ),
+            unit_xml=unit_xml,
+            item_action_xml=_xml_element("Действие", exchange_cfg.get("DEFAULT_ITEM_ACTION", "Резервировать")),
+        )
 
-        # Основные теги документа
-        self._add_text_element(document, "Ид", self._get_order_id(order))
-        self._add_text_element(document, "Номер", order.order_number)
+    def _render_document(self, order: "Order", templates: _ExportTemplates) -> str:
+        """Сериализация элемента Документ для заказа (вывод совпадает с ET.tostring)."""
         # Convert to local time before formatting to ensure correct date
         local_created_at = timezone.localtime(order.created_at)
-        self._add_text_element(document, "Дата", local_created_at.strftime("%Y-%m-%d"))
-        self._add_text_element(document, "Время", local_created_at.strftime("%H:%M:%S"))
-        self._add_text_element(document, "ХозОперация", self.OPERATION_TYPE)
-        self._add_text_element(document, "Роль", self.ROLE)
-        self._add_text_element(document, "Валюта", self.CURRENCY)
-        self._add_text_element(document, "Курс", self.EXCHANGE_RATE)
-        self._add_text_element(document, "Сумма", self._format_price(order.total_amount))
 
         # sub_order.vat_group → ORGANIZATION_BY_VAT, однородная группа НДС (AC4).
         # vat_group=None (AC8): DEFAULT_ORGANIZATION/DEFAULT_WAREHOUSE напрямую, warehouse_name не используется.
@@ -180,69 +330,46 @@ class OrderExportService:
         else:
             # AC8: vat_group=None → DEFAULT_* без warehouse_name routing
             logger.warning(f"Sub-order {order.order_number}: vat_group is None, using defaults")
-            _exc_cfg = getattr(settings, "ONEC_EXCHANGE", {})
-            org_name = _exc_cfg.get("DEFAULT_ORGANIZATION", "ИП Семерюк Д.В.")
-            warehouse_name = _exc_cfg.get("DEFAULT_WAREHOUSE", "1 СДВ склад")
-        exchange_cfg = getattr(settings, "ONEC_EXCHANGE", {})
-        agreement_name = exchange_cfg.get("DEFAULT_AGREEMENT", "Стандартное")
-
-        self._add_text_element(document, "Организация", org_name)
-        self._add_text_element(document, "Склад", warehouse_name)
-
-        agreement = ET.SubElement(document, "Соглашение")
-        self._add_text_element(agreement, "Наименование", agreement_name)
-
-        # 1C-БУС читает флаг "Цена включает НДС" из Документ.Налоги, а не из строк товара.
-        document.append(self._create_document_taxes_element(order, order_vat_rate))
-
-        # Блок контрагентов
-        counterparties = self._create_counterparties_element(order)
-        document.append(counterparties)
-
-        # Блок товаров
-        products = self._create_products_element(order)
-        document.append(products)
-
-        # Значения реквизитов документа (обязательные для УТ 11)
-        doc_props = ET.Element("ЗначенияРеквизитов")
-
-        order_defaults = self._get_order_defaults()
-
-        # Обязательные реквизиты УТ 11
-        # Организация, Склад и Соглашение берутся из динамически вычисленных значений
-        self._add_requisite(doc_props, "Операция", order_defaults["OPERATION"])
-        self._add_requisite(doc_props, "Статус заказа", order_defaults["STATUS"])
-        self._add_requisite(doc_props, "Организация", org_name)
-        self._add_requisite(doc_props, "Соглашение", agreement_name)
-        self._add_requisite(doc_props, "Склад", warehouse_name)
-
-        self._add_requisite(doc_props, "Отменен", "false")
-        self._add_requisite(doc_props, "Проведен", "false")
-        self._add_requisite(doc_props, "Сайт", "freesport.ru")
-
-        document.append(doc_props)
-
-        return document
-
-    def _create_document_taxes_element(self, order: "Order", order_vat_rate: Decimal) -> ET.Element:
-        """Создаёт блок Документ/Налоги для 1С, чтобы импорт выставил ЦенаВключаетНДС."""
-        taxes = ET.Element("Налоги")
-        tax = ET.SubElement(taxes, "Налог")
-        self._add_text_element(tax, "Наименование", "НДС")
-        self._add_text_element(tax, "УчтеноВСумме", "true")
-        self._add_text_element(tax, "Ставка", str(int(order_vat_rate)))
-        self._add_text_element(tax, "Сумма", self._format_price(self._get_document_vat_amount(order, order_vat_rate)))
-        return taxes
-
-    def _create_counterparties_element(self, order: "Order") -> ET.Element:
-        """Создание блока Контрагенты.
+            org_name, warehouse_name = templates.default_organization, templates.default_warehouse
+
+        # Один проход по позициям: блоки Товар и НДС документа (сумма НДС строк)
+        products_xml, document_vat = self._render_products(order, order_vat_rate, templates)
+
+        parts = [
+            "<Документ>",
+            _xml_element("Ид", self._get_order_id(order)),
+            _xml_element("Номер", order.order_number),
+            _xml_element("Дата", local_created_at.strftime("%Y-%m-%d")),
+            _xml_element("Время", local_created_at.strftime("%H:%M:%S")),
+            templates.document_header_xml,
+            _xml_element("Сумма", self._format_price(order.total_amount)),
+            _xml_element("Организация", org_name),
+            _xml_element("Склад", warehouse_name),
+            f"<Соглашение>{_xml_element('Наименование', templates.agreement_name)}</Соглашение>",
+            # 1C-БУС читает флаг "Цена включает НДС" из Документ.Налоги, а не из строк товара.
+            _xml_vat(order_vat_rate, self._format_price(document_vat)),
+            self._render_counterparties(order),
+            products_xml,
+            # Значения реквизитов документа (обязательные для УТ 11)
+            "<ЗначенияРеквизитов>",
+            templates.requisites_head_xml,
+            # Организация, Склад и Соглашение берутся из динамически вычисленных значений
+            _xml_requisite("Организация", org_name),
+            _xml_requisite("Соглашение", templates.agreement_name),
+            _xml_requisite("Склад", warehouse_name),
+            _DOCUMENT_REQUISITES_TAIL_XML,
+            "</ЗначенияРеквизитов></Документ>",
+        ]
+        return "".join(parts)
+
+    def _render_counterparties(self, order: "Order") -> str:
+        """Сериализация блока Контрагенты.
 
         Supports both registered users and guest orders. For guest orders,
         uses order.customer_name, customer_email, customer_phone fields.
         Customer fields скопированы с мастера в Story 34-2, прямое использование безопасно.
         """
-        counterparties = ET.Element("Контрагенты")
-        counterparty = ET.Element("Контрагент")
+        parts = ["<Контрагенты><Контрагент>"]
 
         user = order.user
         if user:
@@ -253,152 +380,117 @@ class OrderExportService:
                     f"Order {order.order_number}: User {user.id} has no onec_id, "
                     f"using fallback ID: {counterparty_id}"
                 )
-            self._add_text_element(counterparty, "Ид", counterparty_id)
+            parts.append(_xml_element("Ид", counterparty_id))
 
             # Наименование: company_name для B2B или full_name для B2C
             if user.is_b2b_user and user.company_name:
-                self._add_text_element(counterparty, "Наименование", str(user.company_name))
-                self._add_text_element(counterparty, "ПолноеНаименование", str(user.company_name))
+                name = str(user.company_name)
             else:
                 name = str(user.full_name or user.email or "")
-                self._add_text_element(counterparty, "Наименование", name)
-                self._add_text_element(counterparty, "ПолноеНаименование", name)
-
-            self._add_text_element(counterparty, "Роль", "Покупатель")
+            parts.append(_xml_element("Наименование", name))
+            parts.append(_xml_element("ПолноеНаименование", name))
+            parts.append(_COUNTERPARTY_ROLE_XML)
 
             # ИНН только если есть tax_id
             if user.tax_id:
-                self._add_text_element(counterparty, "ИНН", str(user.tax_id))
-
-            # Контакты
-            contacts = ET.Element("Контакты")
-            if user.email:
-                contact_email = ET.Element("Контакт")
-                self._add_text_element(contact_email, "Тип", "Почта")
-                self._add_text_element(contact_email, "Значение", str(user.email))
-                contacts.append(contact_email)
-            if user.phone:
-                contact_phone = ET.Element("Контакт")
-                self._add_text_element(contact_phone, "Тип", "Телефон")
-                self._add_text_element(contact_phone, "Значение", str(user.phone))
-                contacts.append(contact_phone)
-            if len(contacts) > 0:
-                counterparty.append(contacts)
+                parts.append(_xml_element("ИНН", str(user.tax_id)))
+
+            email = str(user.email) if user.email else None
+            phone = str(user.phone) if user.phone else None
         else:
             # Guest order: use Order.customer_name/email/phone fields
             # Generate stable ID from email hash or order number
-            counterparty_id = self._get_guest_counterparty_id(order)
-            self._add_text_element(counterparty, "Ид", counterparty_id)
+            parts.append(_xml_element("Ид", self._get_guest_counterparty_id(order)))
 
             # Наименование from customer_name or email
             name = order.customer_name or order.customer_email or f"Гость #{order.order_number}"
-            self._add_text_element(counterparty, "Наименование", name)
-            self._add_text_element(counterparty, "ПолноеНаименование", name)
-            self._add_text_element(counterparty, "Роль", "Покупатель")
-
-            # Контакты from order fields
-            contacts = ET.Element("Контакты")
-            if order.customer_email:
-                contact_email = ET.Element("Контакт")
-                self._add_text_element(contact_email, "Тип", "Почта")
-                self._add_text_element(contact_email, "Значение", order.customer_email)
-                contacts.append(contact_email)
-            if order.customer_phone:
-                contact_phone = ET.Element("Контакт")
-                self._add_text_element(contact_phone, "Тип", "Телефон")
-                self._add_text_element(contact_phone, "Значение", order.customer_phone)
-                contacts.append(contact_phone)
-            if len(contacts) > 0:
-                counterparty.append(contacts)
+            parts.append(_xml_element("Наименование", name))
+            parts.append(_xml_element("ПолноеНаименование", name))
+            parts.append(_COUNTERPARTY_ROLE_XML)
+
+            email = order.customer_email or None
+            phone = order.customer_phone or None
 
             logger.info(f"Order {order.order_number}: guest order, using customer fields for counterparty")
 
+        # Контакты
+        if email or phone:
+            parts.append("<Контакты>")
+            if email:
+                parts.append(f"<Контакт><Тип>Почта</Тип>{_xml_element('Значение', email)}</Контакт>")
+            if phone:
+                parts.append(f"<Контакт><Тип>Телефон</Тип>{_xml_element('Значение', phone)}</Контакт>")
+            parts.append("</Контакты>")
+
         # Адрес регистрации (common for both user and guest orders)
         if order.delivery_address:
-            address_reg = ET.Element("АдресРегистрации")
-            self._add_text_element(address_reg, "Представление", str(order.delivery_address))
-            counterparty.append(address_reg)
+            parts.append(
+                f"<АдресРегистрации>{_xml_element('Представление', str(order.delivery_address))}</АдресРегистрации>"
+            )
 
-        counterparties.append(counterparty)
-        return counterparties
+        parts.append("</Контрагент></Контрагенты>")
+        return "".join(parts)
 
-    def _create_products_element(self, order: "Order") -> ET.Element:
-        """Создание блока Товары."""
-        products = ET.Element("Товары")
+    def _render_products(
+        self, order: "Order", order_vat_rate: Decimal, templates: _ExportTemplates
+    ) -> tuple[str, Decimal]:
+        """Сериализация блока Товары.
 
-        exchange_cfg = getattr(settings, "ONEC_EXCHANGE", {})
-        action = exchange_cfg.get("DEFAULT_ITEM_ACTION", "Резервировать")
+        Returns:
+            (XML блока Товары, сумма НДС документа). НДС документа — сумма НДС
+            всех строк с вариантом, включая строки без onec_id, которые не попадают в Товары.
+        """
         price_type_name = self._get_price_type(order)
-        price_type_id = self._get_price_type_id(price_type_name)
-        order_vat_rate = self._get_order_vat_rate(order)
-
+        price_type_xml = templates.price_type_xml.get(price_type_name)
+        if price_type_xml is None:
+            # Вид цены — зависит от категории (роли) покупателя
+            price_type_id = self._get_price_type_id(price_type_name)
+            price_type_xml = (
+                "<ВидЦены>"
+                + (_xml_element("Ид", price_type_id) if price_type_id else "")
+                + _xml_element("Наименование", price_type_name)
+                + "</ВидЦены>"
+            )
+            templates.price_type_xml[price_type_name] = price_type_xml
+
+        parts = []
+        total_vat = Decimal("0.00")
         for item in order.items.all():
             # Defensive check: пропуск OrderItem с variant=None
             if item.variant is None:
                 logger.warning(f"OrderItem {item.id}: variant is None (deleted?), skipping")
                 continue
 
-            # Defensive check: пропуск товара без onec_id
-            if not item.variant.onec_id:
-                logger.warning(f"OrderItem {item.id}: ProductVariant {item.variant.id} " f"missing onec_id, skipping")
-                continue
-
-            product = ET.Element("Товар")
-            self._add_text_element(product, "Ид", item.variant.onec_id)
-            self._add_text_element(product, "Наименование", item.product_name)
-
-            # Базовая единица измерения (configurable via settings.ONEC_EXCHANGE.DEFAULT_UNIT)
-            ud = self._unit_defaults
-            unit = ET.Element("БазоваяЕдиница")
-            unit.set("Код", ud["code"])
-            unit.set("НаименованиеПолное", ud["name_full"])
-            unit.set("МеждународноеСокращение", ud["name_intl"])
-            unit.text = ud["name_short"]
-            product.append(unit)
-
-            self._add_text_element(product, "ЦенаЗаЕдиницу", self._format_price(item.unit_price))
-            self._add_text_element(product, "Количество", str(item.quantity))
-            self._add_text_element(product, "Сумма", self._format_price(item.total_price))
-
-            # Действие строки — резервирование товара на складе
-            self._add_text_element(product, "Действие", action)
-
-            # Вид цены — зависит от категории (роли) покупателя
-            vid_ceny = ET.SubElement(product, "ВидЦены")
-            if price_type_id:
-                self._add_text_element(vid_ceny, "Ид", price_type_id)
-            self._add_text_element(vid_ceny, "Наименование", price_type_name)
-
             # НДС «в том числе» (включён в сумму строки).
             item_vat_rate = self._resolve_item_vat_rate_for_export(item, order_vat_rate)
             vat_amount = self._calc_vat_amount(item.total_price, item_vat_rate)
+            total_vat += vat_amount
 
-            taxes = ET.SubElement(product, "Налоги")
-            tax = ET.SubElement(taxes, "Налог")
-            self._add_text_element(tax, "Наименование", "НДС")
-            # CommerceML/Bitrix expects the standard "included in sum" flag name.
-            self._add_text_element(tax, "УчтеноВСумме", "true")
-            self._add_text_element(tax, "Ставка", str(int(item_vat_rate)))
-            self._add_text_element(tax, "Сумма", self._format_price(vat_amount))
-
-            # Реквизиты товара (обязательно для загрузки в 1С УТ)
-            props = ET.Element("ЗначенияРеквизитов")
-
-            prop1 = ET.Element("ЗначениеРеквизита")
-            self._add_text_element(prop1, "Наименование", "ВидНоменклатуры")
-            self._add_text_element(prop1, "Значение", "Товар")
-            props.append(prop1)
-
-            prop2 = ET.Element("ЗначениеРеквизита")
-            self._add_text_element(prop2, "Наименование", "ТипНоменклатуры")
-            self._add_text_element(prop2, "Значение", "Товар")
-            props.append(prop2)
-
-            product.append(props)
-
-            products.append(product)
+            # Defensive check: пропуск товара без onec_id
+            if not item.variant.onec_id:
+                logger.warning(f"OrderItem {item.id}: ProductVariant {item.variant.id} " f"missing onec_id, skipping")
+                continue
 
-        return products
+            parts.append(
+                "<Товар>"
+                + _xml_element("Ид", item.variant.onec_id)
+                + _xml_element("Наименование", item.product_name)
+                # Базовая единица измерения (configurable via settings.ONEC_EXCHANGE.DEFAULT_UNIT)
+                + templates.unit_xml
+                + _xml_element("ЦенаЗаЕдиницу", self._format_price(item.unit_price))
+                + _xml_element("Количество", str(item.quantity))
+                + _xml_element("Сумма", self._format_price(item.total_price))
+                # Действие строки — резервирование товара на складе
+                + templates.item_action_xml
+                + price_type_xml
+                + _xml_vat(item_vat_rate, self._format_price(vat_amount))
+                # Реквизиты товара (обязательно для загрузки в 1С УТ)
+                + _ITEM_REQUISITES_XML
+                + "</Товар>"
+            )
+
+        products_xml = f"<Товары>{''.join(parts)}</Товары>" if parts else "<Товары />"
+        return products_xml, total_vat.quantize(Decimal("0.01"))
 
     def _resolve_item_vat_rate_for_export(self, item: "OrderItem", order_vat_rate: Decimal) -> Decimal:
         """Возвращает ставку НДС строки для XML-экспорта заказа."""
@@ -413,16 +505,6 @@ class OrderExportService:
         product_vat_rate = self._get_prefetched_product_vat_rate(item)
         return product_vat_rate if product_vat_rate is not None else order_vat_rate
 
-    def _get_document_vat_amount(self, order: "Order", order_vat_rate: Decimal) -> Decimal:
-        """Сумма НДС документа как сумма НДС строк, чтобы совпадать с товарными блоками."""
-        total_vat = Decimal("0.00")
-        for item in order.items.all():
-            if item.variant is None:
-                continue
-            item_vat_rate = self._resolve_item_vat_rate_for_export(item, order_vat_rate)
-            total_vat += self._calc_vat_amount(item.total_price, item_vat_rate)
-        return total_vat.quantize(Decimal("0.01"))
-
     # -------------------------------------------------------------------------
     # Вспомогательные методы для организации/склада/цены/НДС
     # -------------------------------------------------------------------------
@@ -584,23 +666,10 @@ class OrderExportService:
             "STATUS": defaults.get("STATUS", "Не согласован"),
         }
 
-    def _add_requisite(self, parent: ET.Element, name: str, value: str) -> None:
-        """Добавление элемента ЗначениеРеквизита."""
-        prop = ET.Element("ЗначениеРеквизита")
-        self._add_text_element(prop, "Наименование", name)
-        self._add_text_element(prop, "Значение", value)
-        parent.append(prop)
-
     # -------------------------------------------------------------------------
     # Общие вспомогательные методы
     # -------------------------------------------------------------------------
 
-    def _add_text_element(self, parent: ET.Element, tag: str, text: str) -> ET.Element:
-        """Добавление текстового элемента к родителю."""
-        element = ET.SubElement(parent, tag)
-        element.text = text
-        return element
-
     def _format_datetime(self, dt: datetime) -> str:
         """Форматирование даты/времени в ISO 8601."""
         return dt.isoformat()
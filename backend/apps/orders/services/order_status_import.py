@@ -3,6 +3,7 @@
 
 Реализует Service Layer паттерн с разделением Parser/Processor:
 - _parse_orders_xml() — чистый парсинг XML, возврат dataclass
+- _iter_orders_xml() — потоковый парсинг XML порциями по batch
 - _process_order_update() — бизнес-логика обновления Order
 """
 
@@ -10,15 +11,20 @@ from __future__ import annotations
 
 import logging
 import re
+from collections.abc import Callable, Collection, Iterable, Iterator
 from dataclasses import dataclass, field
 from datetime import datetime
+from typing import IO
 from xml.etree.ElementTree import Element
 from zoneinfo import ZoneInfo
 
 import defusedxml.ElementTree as ET
 from defusedxml.common import DefusedXmlException
 from django.conf import settings
-from django.db import OperationalError, transaction
+from django.contrib.postgres.aggregates import ArrayAgg
+from django.db import OperationalError, router, transaction
+from django.db.models import Max
+from django.db.models.signals import post_save
 from django.utils import timezone
 from django.utils.dateparse import parse_date, parse_datetime
 
@@ -100,6 +106,22 @@ class ImportResult:
             + self.skipped_master_regression
         )
 
+    @property
+    def failure_reason(self) -> str | None:
+        """
+        Причина отказа для ответа 1С или None, если импорт считается успешным.
+
+        Частичный успех — успех (ADR-003): failure только при ошибке XML
+        или когда ничего не обновлено и есть ошибки.
+        """
+        if any("xml parse error" in err.lower() for err in self.errors):
+            return "Malformed XML"
+        if any("xml security error" in err.lower() for err in self.errors):
+            return "XML security violation"
+        if self.updated > 0 or not self.errors:
+            return None
+        return f"No orders updated. processed={self.processed}, updated={self.updated}, errors={len(self.errors)}"
+
 
 class DocumentParseError(Exception):
     """Ошибка парсинга одного документа orders.xml."""
@@ -148,33 +170,62 @@ class OrderStatusImportService:
 
         # PARSE: извлечь данные из XML
         try:
-            order_updates, total_documents, parse_errors = self._parse_orders_xml(xml_data)
-        except DefusedXmlException as e:
-            logger.error(f"XML security error: {e}")
-            result.errors.append(f"XML security error: {e}")
-            return result
-        except ET.ParseError as e:
-            logger.error(f"XML parse error: {e}")
-            result.errors.append(f"XML parse error: {e}")
+            parsed = self._parse_orders_xml(xml_data)
+        except (DefusedXmlException, ET.ParseError) as e:
+            self._record_xml_error(result, e)
             return result
 
-        # [AI-Review][Low] Учитываем все найденные <Документ>, включая некорректные
-        result.processed = total_documents
+        return self._process_parsed_chunks([parsed], result)
+
+    def process_stream(
+        self,
+        source: IO[bytes],
+        progress_callback: Callable[[ImportResult], None] | None = None,
+    ) -> ImportResult:
+        """
+        Потоковый импорт: документы разбираются по мере чтения файла.
+
+        В памяти одновременно находится не больше одного batch документов,
+        поэтому пиковое потребление не зависит от размера orders.xml.
+        Батчи, обработанные до ошибки разбора XML, остаются применёнными —
+        повторная загрузка того же файла идемпотентна.
+
+        Args:
+            source: бинарный файловый объект с XML в формате CommerceML 3.1.
+            progress_callback: вызывается с текущим ImportResult после каждого batch.
+
+        Returns:
+            ImportResult с подробной статистикой обработки.
+        """
+        return self._process_parsed_chunks(self._iter_orders_xml(source), ImportResult(), progress_callback)
+
+    def _record_xml_error(self, result: ImportResult, error: Exception) -> None:
+        """Зафиксировать ошибку разбора XML (небезопасный или невалидный документ)."""
+        if isinstance(error, DefusedXmlException):
+            logger.error(f"XML security error: {error}")
+            result.errors.append(f"XML security error: {error}")
+        else:
+            logger.error(f"XML parse error: {error}")
+            result.errors.append(f"XML parse error: {error}")
 
-        if parse_errors:
-            result.skipped_invalid = len(parse_errors)
-            for error_msg in parse_errors:
-                if len(result.errors) >= MAX_ERRORS:
-                    break
-                result.errors.append(error_msg)
+    def _process_parsed_chunks(
+        self,
+        chunks: Iterable[tuple[list[OrderUpdateData], int, list[str]]],
+        result: ImportResult,
+        progress_callback: Callable[[ImportResult], None] | None = None,
+    ) -> ImportResult:
+        """
+        Обработать результаты парсинга порциями.
 
-        # [AI-Review][Medium] Observability: собираем ошибки парсинга дат из OrderUpdateData
-        for order_data in order_updates:
-            for warning in order_data.parse_warnings:
-                if len(result.errors) >= MAX_ERRORS:
-                    break
-                result.errors.append(warning)
+        Args:
+            chunks: порции в формате _parse_orders_xml() —
+                (OrderUpdateData, число <Документ>, ошибки парсинга).
+            result: накапливаемый ImportResult.
+            progress_callback: вызывается с ImportResult после каждого batch.
 
+        Returns:
+            ImportResult с подробной статистикой обработки.
+        """
         # PROCESS: обновить каждый заказ
         # [AI-Review][High] Изоляция ошибок — одна ошибка не останавливает весь процесс
         # [AI-Review][Medium] Rate-limited logging: остановка логирования после N последовательных ошибок
@@ -188,85 +239,116 @@ class OrderStatusImportService:
         # [AI-Review][Medium] Batch processing — сокращаем длительные блокировки
         batch_size = self._get_batch_size()
 
-        # [AI-Review][High] Защита от race condition — блокировки в bulk fetch
-        for start in range(0, len(order_updates), batch_size):
-            batch = order_updates[start : start + batch_size]
+        chunks_iter = iter(chunks)
+        while True:
             try:
-                with transaction.atomic():
-                    # BULK FETCH: загрузить заказы для пакета (оптимизация N+1)
-                    orders_cache = self._bulk_fetch_orders(batch)
-                    # [Story 34-4] Собираем master_ids для агрегации после batch
-                    master_ids_in_batch: set[int] = set()
-
-                    for order_data in batch:
-                        try:
-                            status, update_error = self._process_order_update(order_data, orders_cache)
-                            # [AI-Review][Medium] Используем Enum вместо magic strings
-                            if status == ProcessingStatus.UPDATED:
-                                result.updated += 1
-                                consecutive_errors = 0  # Сброс счётчика при успехе
-                                # [Story 34-4] Собираем parent_order_id для агрегации
-                                sub = self._find_in_cache(order_data, orders_cache)
-                                if sub is not None:
-                                    updated_sub_ids.append(sub.pk)
-                                    if sub.parent_order_id is not None:
+                order_updates, total_documents, parse_errors = next(chunks_iter)
+            except StopIteration:
+                break
+            except (DefusedXmlException, ET.ParseError) as e:
+                # Потоковый разбор: ошибка может возникнуть после уже обработанных батчей
+                self._record_xml_error(result, e)
+                break
+
+            # [AI-Review][Low] Учитываем все найденные <Документ>, включая некорректные
+            result.processed += total_documents
+
+            if parse_errors:
+                result.skipped_invalid += len(parse_errors)
+                for error_msg in parse_errors:
+                    if len(result.errors) >= MAX_ERRORS:
+                        break
+                    result.errors.append(error_msg)
+
+            # [AI-Review][Medium] Observability: собираем ошибки парсинга дат из OrderUpdateData
+            for order_data in order_updates:
+                for warning in order_data.parse_warnings:
+                    if len(result.errors) >= MAX_ERRORS:
+                        break
+                    result.errors.append(warning)
+
+            # [AI-Review][High] Защита от race condition — блокировки в bulk fetch
+            for start in range(0, len(order_updates), batch_size):
+                batch = order_updates[start : start + batch_size]
+                try:
+                    with transaction.atomic():
+                        # BULK FETCH: загрузить заказы для пакета (оптимизация N+1)
+                        orders_cache = self._bulk_fetch_orders(batch)
+                        # [Story 34-4] Собираем master_ids для агрегации после batch
+                        master_ids_in_batch: set[int] = set()
+
+                        for order_data in batch:
+                            try:
+                                status, update_error = self._process_order_update(order_data, orders_cache)
+                                # [AI-Review][Medium] Используем Enum вместо magic strings
+                                if status == ProcessingStatus.UPDATED:
+                                    result.updated += 1
+                                    consecutive_errors = 0  # Сброс счётчика при успехе
+                                    # [Story 34-4] Собираем parent_order_id для агрегации
+                                    sub = self._find_in_cache(order_data, orders_cache)
+                                    if sub is not None:
+                                        updated_sub_ids.append(sub.pk)
+                                        if sub.parent_order_id is not None:
+                                            master_ids_in_batch.add(sub.parent_order_id)
+                                elif status == ProcessingStatus.SKIPPED_UP_TO_DATE:
+                                    result.skipped_up_to_date += 1
+                                    # [Story 34-4] SKIPPED_UP_TO_DATE тоже затрагивает sub
+                                    sub = self._find_in_cache(order_data, orders_cache)
+                                    if sub is not None and sub.parent_order_id is not None:
                                         master_ids_in_batch.add(sub.parent_order_id)
-                            elif status == ProcessingStatus.SKIPPED_UP_TO_DATE:
-                                result.skipped_up_to_date += 1
-                                # [Story 34-4] SKIPPED_UP_TO_DATE тоже затрагивает sub
-                                sub = self._find_in_cache(order_data, orders_cache)
-                                if sub is not None and sub.parent_order_id is not None:
-                                    master_ids_in_batch.add(sub.parent_order_id)
-                            elif status == ProcessingStatus.SKIPPED_UNKNOWN_STATUS:
-                                result.skipped_unknown_status += 1
-                            elif status == ProcessingStatus.SKIPPED_DATA_CONFLICT:
-                                result.skipped_data_conflict += 1
-                            elif status == ProcessingStatus.SKIPPED_STATUS_REGRESSION:
-                                result.skipped_status_regression += 1
-                            elif status == ProcessingStatus.SKIPPED_MASTER_UNEXPECTED:
-                                result.skipped_master_unexpected += 1
-                            elif status == ProcessingStatus.NOT_FOUND:
-                                result.not_found += 1
+                                elif status == ProcessingStatus.SKIPPED_UNKNOWN_STATUS:
+                                    result.skipped_unknown_status += 1
+                                elif status == ProcessingStatus.SKIPPED_DATA_CONFLICT:
+                                    result.skipped_data_conflict += 1
+                                elif status == ProcessingStatus.SKIPPED_STATUS_REGRESSION:
+                                    result.skipped_status_regression += 1
+                                elif status == ProcessingStatus.SKIPPED_MASTER_UNEXPECTED:
+                                    result.skipped_master_unexpected += 1
+                                elif status == ProcessingStatus.NOT_FOUND:
+                                    result.not_found += 1
+                                    consecutive_errors += 1
+
+                                # Сбор ошибок из _process_order_update
+                                if update_error and len(result.errors) < MAX_ERRORS:
+                                    result.errors.append(update_error)
+
+                            except Exception as e:
                                 consecutive_errors += 1
-
-                            # Сбор ошибок из _process_order_update
-                            if update_error and len(result.errors) < MAX_ERRORS:
-                                result.errors.append(update_error)
-
-                        except Exception as e:
-                            consecutive_errors += 1
-                            order_ref = order_data.order_number or order_data.order_id
-                            update_error = f"Error processing order {order_ref}: {e}"
-
-                            # Rate-limited logging: предотвращаем флуд логов
-                            if consecutive_errors <= MAX_CONSECUTIVE_ERRORS:
-                                logger.exception(update_error)
-                            elif not log_suppressed:
-                                logger.warning(
-                                    f"Suppressing further error logs after "
-                                    f"{MAX_CONSECUTIVE_ERRORS} consecutive errors"
-                                )
-                                log_suppressed = True
-
-                            if len(result.errors) < MAX_ERRORS:
-                                result.errors.append(update_error)
-
-                    # [Story 34-4] Применить агрегацию мастеров для batch
-                    if master_ids_in_batch:
-                        self._apply_master_aggregation(master_ids_in_batch, result, aggregated_master_ids)
-            except OperationalError as e:
-                consecutive_errors += 1
-                update_error = f"Database error during bulk fetch: {e}"
-                if consecutive_errors <= MAX_CONSECUTIVE_ERRORS:
-                    logger.exception(update_error)
-                elif not log_suppressed:
-                    logger.warning(
-                        f"Suppressing further error logs after " f"{MAX_CONSECUTIVE_ERRORS} consecutive errors"
-                    )
-                    log_suppressed = True
-                if len(result.errors) < MAX_ERRORS:
-                    result.errors.append(update_error)
-                continue
+                                order_ref = order_data.order_number or order_data.order_id
+                                update_error = f"Error processing order {order_ref}: {e}"
+
+                                # Rate-limited logging: предотвращаем флуд логов
+                                if consecutive_errors <= MAX_CONSECUTIVE_ERRORS:
+                                    logger.exception(update_error)
+                                elif not log_suppressed:
+                                    logger.warning(
+                                        f"Suppressing further error logs after "
+                                        f"{MAX_CONSECUTIVE_ERRORS} consecutive errors"
+                                    )
+                                    log_suppressed = True
+
+                                if len(result.errors) < MAX_ERRORS:
+                                    result.errors.append(update_error)
+
+                        # [Story 34-4] Применить агрегацию мастеров для batch
+                        if master_ids_in_batch:
+                            self._apply_master_aggregation(master_ids_in_batch, result, aggregated_master_ids)
+                except OperationalError as e:
+                    consecutive_errors += 1
+                    update_error = f"Database error during bulk fetch: {e}"
+                    if consecutive_errors <= MAX_CONSECUTIVE_ERRORS:
+                        logger.exception(update_error)
+                    elif not log_suppressed:
+                        logger.warning(
+                            f"Suppressing further error logs after " f"{MAX_CONSECUTIVE_ERRORS} consecutive errors"
+                        )
+                        log_suppressed = True
+                    if len(result.errors) < MAX_ERRORS:
+                        result.errors.append(update_error)
+                    continue
+                finally:
+                    if progress_callback is not None:
+                        progress_callback(result)
 
         # Итоговое сообщение, если логи были подавлены
         if log_suppressed:
@@ -353,6 +435,55 @@ class OrderStatusImportService:
 
         return order_updates, total_documents, parse_errors
 
+    def _iter_orders_xml(self, source: IO[bytes]) -> Iterator[tuple[list[OrderUpdateData], int, list[str]]]:
+        """
+        Потоковый парсинг orders.xml (iterparse) порциями по _get_batch_size() документов.
+
+        Каждый разобранный <Документ> удаляется из дерева, поэтому в памяти
+        не накапливаются уже обработанные документы. Кодировка (в т.ч.
+        windows-1251) определяется парсером по XML-декларации.
+
+        Args:
+            source: бинарный файловый объект с XML.
+
+        Yields:
+            tuple: (список OrderUpdateData, число найденных <Документ>,
+            список ошибок парсинга документов) — формат _parse_orders_xml().
+
+        Raises:
+            ET.ParseError: при невалидном XML (в момент чтения проблемной порции).
+        """
+        batch_size = self._get_batch_size()
+        order_updates: list[OrderUpdateData] = []
+        parse_errors: list[str] = []
+        total_documents = 0
+        parents: list[Element] = []
+
+        for event, elem in ET.iterparse(source, events=("start", "end")):
+            if event == "start":
+                parents.append(elem)
+                continue
+            parents.pop()
+            if elem.tag != "Документ":
+                continue
+
+            total_documents += 1
+            try:
+                order_updates.append(self._parse_document(elem))
+            except DocumentParseError as exc:
+                parse_errors.append(str(exc))
+
+            elem.clear()
+            if parents:
+                parents[-1].remove(elem)
+
+            if total_documents >= batch_size:
+                yield order_updates, total_documents, parse_errors
+                order_updates, parse_errors, total_documents = [], [], 0
+
+        if total_documents:
+            yield order_updates, total_documents, parse_errors
+
     def _parse_document(self, document: Element) -> OrderUpdateData:
         """
         Парсинг одного элемента <Документ>.
@@ -819,21 +950,28 @@ class OrderStatusImportService:
     # Master Aggregation Methods (Story 34-4)
     # =========================================================================
 
-    def _aggregate_master_status(self, master: Order) -> tuple[str | None, bool]:
+    def _aggregate_master_status(
+        self, master: Order, statuses: Collection[str] | None = None
+    ) -> tuple[str | None, bool]:
         """Пересчёт master.status на основе sub_orders (Story 34-4, AC4, AC5).
 
+        statuses — статусы субзаказов, если уже получены групповым запросом
+        (_apply_master_aggregation); иначе читаются из БД.
+
         Returns:
             tuple[new_status | None, regression_blocked].
             - (new_status, False) — статус нужно обновить
             - (None, False) — статус не изменился
             - (None, True) — регрессия финального статуса заблокирована
         """
-        statuses = list(master.sub_orders.values_list("status", flat=True))
+        if statuses is None:
+            statuses = list(master.sub_orders.values_list("status", flat=True))
         if not statuses:
             return None, False  # legacy master без subs
 
-        if all(s == statuses[0] for s in statuses):
-            new_status = statuses[0]
+        distinct_statuses = set(statuses)
+        if len(distinct_statuses) == 1:
+            new_status = next(iter(distinct_statuses))
         elif "pending" in statuses:
             new_status = "pending"
         else:
@@ -855,9 +993,10 @@ class OrderStatusImportService:
 
         return new_status, False
 
-    def _aggregate_master_payment_status(self, master: Order) -> str | None:
+    def _aggregate_master_payment_status(self, master: Order, payments: Collection[str] | None = None) -> str | None:
         """Пересчёт master.payment_status (Story 34-4, AC6)."""
-        payments = list(master.sub_orders.values_list("payment_status", flat=True))
+        if payments is None:
+            payments = list(master.sub_orders.values_list("payment_status", flat=True))
         if not payments:
             return None
         if "refunded" in payments:
@@ -868,13 +1007,19 @@ class OrderStatusImportService:
             new_ps = "pending"
         return new_ps if new_ps != master.payment_status else None
 
-    def _aggregate_master_sent_to_1c_at(self, master: Order) -> datetime | None:
-        """max(sub.sent_to_1c_at) игнорируя None (Story 34-4, AC7)."""
-        timestamps = [ts for ts in master.sub_orders.values_list("sent_to_1c_at", flat=True) if ts is not None]
-        if not timestamps:
+    def _aggregate_master_sent_to_1c_at(
+        self, master: Order, latest: datetime | None = None, *, prefetched: bool = False
+    ) -> datetime | None:
+        """max(sub.sent_to_1c_at) игнорируя None (Story 34-4, AC7).
+
+        prefetched=True — latest уже посчитан групповым запросом (Max игнорирует NULL).
+        """
+        if not prefetched:
+            timestamps = [ts for ts in master.sub_orders.values_list("sent_to_1c_at", flat=True) if ts is not None]
+            latest = max(timestamps) if timestamps else None
+        if latest is None:
             return None
-        new_ts = max(timestamps)
-        return new_ts if new_ts != master.sent_to_1c_at else None
+        return latest if latest != master.sent_to_1c_at else None
 
     def _apply_master_aggregation(
         self,
@@ -882,42 +1027,85 @@ class OrderStatusImportService:
         result: ImportResult,
         aggregated_master_ids: set[int],
     ) -> None:
-        """Применить агрегацию на всех затронутых мастерах (Story 34-4, AC3, AC10)."""
-        for master_id in master_ids:
-            try:
-                master = Order.objects.select_for_update().get(pk=master_id)
-            except Order.DoesNotExist:
-                logger.warning(f"Master order {master_id} not found during aggregation")
-                continue
+        """Применить агрегацию на всех затронутых мастерах (Story 34-4, AC3, AC10).
+
+        Для всего батча: одна блокировка мастеров (select_for_update по pk__in,
+        в порядке pk против взаимоблокировок), один групповой запрос по субзаказам
+        (множество статусов, статусов оплаты и max(sent_to_1c_at) на мастера)
+        и один bulk_update изменённых мастеров. bulk_update не шлёт post_save,
+        поэтому сигнал отправляется явно — на нём держится начисление бонусов.
+        """
+        masters = {
+            master.pk: master for master in Order.objects.select_for_update().filter(pk__in=master_ids).order_by("pk")
+        }
+        for master_id in sorted(master_ids - masters.keys()):
+            logger.warning(f"Master order {master_id} not found during aggregation")
+
+        sub_aggregates = {
+            row["parent_order_id"]: row
+            for row in Order.objects.filter(parent_order_id__in=masters.keys())
+            .order_by()
+            .values("parent_order_id")
+            .annotate(
+                statuses=ArrayAgg("status", distinct=True),
+                payment_statuses=ArrayAgg("payment_status", distinct=True),
+                latest_sent_to_1c_at=Max("sent_to_1c_at"),
+            )
+        }
+
+        now = timezone.now()
+        changed: list[tuple[Order, list[str]]] = []
+        for master_id, master in masters.items():
+            row = sub_aggregates.get(master_id)
+            statuses = row["statuses"] if row else []
+            payments = row["payment_statuses"] if row else []
+            latest = row["latest_sent_to_1c_at"] if row else None
 
             update_fields: list[str] = []
 
-            new_status, regression_blocked = self._aggregate_master_status(master)
+            new_status, regression_blocked = self._aggregate_master_status(master, statuses)
             if regression_blocked:
                 result.skipped_master_regression += 1
             elif new_status is not None:
                 master.status = new_status
                 update_fields.append("status")
 
-            new_ps = self._aggregate_master_payment_status(master)
+            new_ps = self._aggregate_master_payment_status(master, payments)
             if new_ps is not None:
                 master.payment_status = new_ps
                 update_fields.append("payment_status")
 
-            new_ts = self._aggregate_master_sent_to_1c_at(master)
+            new_ts = self._aggregate_master_sent_to_1c_at(master, latest, prefetched=True)
             if new_ts is not None:
                 master.sent_to_1c_at = new_ts
                 update_fields.append("sent_to_1c_at")
 
             if update_fields:
                 update_fields.append("updated_at")
-                master.save(update_fields=update_fields)
+                master.updated_at = now
+                changed.append((master, update_fields))
                 # AC11: только мастера с изменённым status/payment_status
                 if "status" in update_fields or "payment_status" in update_fields:
                     if master_id not in aggregated_master_ids:
                         result.aggregated_master_count += 1
                     aggregated_master_ids.add(master_id)
 
+        if not changed:
+            return
+
+        fields = sorted({name for _, update_fields in changed for name in update_fields})
+        Order.objects.bulk_update([master for master, _ in changed], fields)
+        using = router.db_for_write(Order)
+        for master, update_fields in changed:
+            post_save.send(
+                sender=Order,
+                instance=master,
+                created=False,
+                update_fields=frozenset(update_fields),
+                raw=False,
+                using=using,
+            )
+
     def _find_in_cache(self, order_data: OrderUpdateData, orders_cache: dict[str, Order] | None) -> Order | None:
         """Искать заказ только в кэше (не DB)."""
         if orders_cache is None:
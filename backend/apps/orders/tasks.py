@@ -1,21 +1,28 @@
 """
-Celery tasks для отправки email-уведомлений о заказах.
+Celery tasks для заказов.
 
 Реализует асинхронную отправку уведомлений при создании/отмене заказов
-получателям, настроенным через NotificationRecipient в Django Admin.
+получателям, настроенным через NotificationRecipient в Django Admin,
+и фоновый импорт статусов заказов из крупных orders.xml.
 """
 
 import logging
+from dataclasses import asdict
+from pathlib import Path
 from smtplib import SMTPException
 from typing import Any
 
 from celery import shared_task
 from django.conf import settings
 from django.core.mail import send_mail
+from django.db import OperationalError
 from django.template.loader import render_to_string
+from django.utils import timezone
 
 from apps.common.models import NotificationRecipient
 from apps.orders.models import Order, OrderItem
+from apps.orders.services.order_status_import import ImportResult, OrderStatusImportService
+from apps.products.models import ImportSession
 
 logger = logging.getLogger(__name__)
 
@@ -338,3 +345,81 @@ def send_order_cancelled_notification_email(self: Any, order_id: int) -> bool:
             },
         )
         raise self.retry(exc=exc)
+
+
+def _import_result_details(result: ImportResult) -> dict[str, Any]:
+    """ImportResult в формате ImportSession.report_details (прогресс для админки и 1С)."""
+    return {**asdict(result), "processed_items": result.processed, "skipped": result.skipped}
+
+
+@shared_task(bind=True, max_retries=3)
+def process_order_status_import_task(self: Any, session_id: int, file_path: str) -> str:
+    """
+    Фоновый импорт статусов заказов из orders.xml, принятого от 1С.
+
+    Прогресс после каждого batch и итоговый ImportResult сохраняются
+    в ImportSession.report_details — их опрашивает 1С (mode=import)
+    и показывает журнал сессий импорта в админке.
+
+    Args:
+        session_id: ID сессии ImportSession
+        file_path: путь к сохранённому orders.xml
+
+    Returns:
+        Результат выполнения ('success' или 'failure')
+    """
+    try:
+        session = ImportSession.objects.get(pk=session_id)
+    except ImportSession.DoesNotExist:
+        logger.error("Order status import session not found", extra={"session_id": session_id})
+        return "failure"
+
+    session.status = ImportSession.ImportStatus.IN_PROGRESS
+    session.celery_task_id = self.request.id
+    session.report += f"[{timezone.now()}] Задача Celery запущена (попытка {self.request.retries + 1})\n"
+    session.save(update_fields=["status", "celery_task_id", "report", "updated_at"])
+    base_details = {
+        "sessid": session.report_details.get("sessid"),
+        "total_items": session.report_details.get("total_items", 0),
+    }
+
+    def save_progress(result: ImportResult) -> None:
+        ImportSession.objects.filter(pk=session_id).update(
+            report_details={**base_details, **_import_result_details(result)},
+            updated_at=timezone.now(),
+        )
+
+    try:
+        with open(file_path, "rb") as xml_file:
+            result = OrderStatusImportService().process_stream(xml_file, progress_callback=save_progress)
+    except OperationalError as exc:
+        if self.request.retries < self.max_retries:
+            logger.warning(f"[ORDERS IMPORT] DB error in session {session_id}, retrying: {exc}")
+            raise self.retry(exc=exc, countdown=5 * (self.request.retries + 1))
+        session.refresh_from_db(fields=["report_details"])
+        _finish_order_status_import(session, file_path, error_message=f"Database error: {exc}")
+        return "failure"
+    except Exception as exc:
+        logger.exception(f"[ORDERS IMPORT] Session {session_id} failed: {exc}")
+        session.refresh_from_db(fields=["report_details"])
+        _finish_order_status_import(session, file_path, error_message=f"Internal error: {exc}")
+        return "failure"
+
+    session.report_details = {**base_details, **_import_result_details(result)}
+    failure_reason = result.failure_reason
+    _finish_order_status_import(session, file_path, error_message=failure_reason or "")
+    logger.info(
+        f"[ORDERS IMPORT] Session {session_id}: processed={result.processed}, "
+        f"updated={result.updated}, skipped={result.skipped}, errors={len(result.errors)}"
+    )
+    return "failure" if failure_reason else "success"
+
+
+def _finish_order_status_import(session: ImportSession, file_path: str, error_message: str) -> None:
+    """Завершить сессию импорта статусов и удалить обработанный файл."""
+    session.status = ImportSession.ImportStatus.FAILED if error_message else ImportSession.ImportStatus.COMPLETED
+    session.error_message = error_message
+    session.finished_at = timezone.now()
+    session.report += f"[{session.finished_at}] Импорт завершён: {error_message or 'успешно'}\n"
+    session.save(update_fields=["status", "error_message", "finished_at", "report", "report_details", "updated_at"])
+    Path(file_path).unlink(missing_ok=True)
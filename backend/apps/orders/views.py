@@ -125,11 +125,12 @@ class OrderViewSet(viewsets.ModelViewSet):
 
         # Наполняем prefetch cache на уже созданном объекте без лишнего root SELECT
         # по Order.pk. Для freshly-created master direct items всегда пусты,
-        # поэтому достаточно префетчить sub_orders/items path.
+        # поэтому достаточно префетчить sub_orders/items path. M2M attributes
+        # сериализуются depth=1 — без prefetch это два запроса на позицию.
         prefetch_related_objects(
             [order],
-            "sub_orders__items__product",
-            "sub_orders__items__variant",
+            "sub_orders__items__product__attributes",
+            "sub_orders__items__variant__attributes",
         )
         detail_serializer = OrderDetailSerializer(order, context={"request": request})
         return Response(detail_serializer.data, status=status.HTTP_201_CREATED)
@@ -2,17 +2,22 @@
 Views для статических страниц
 """
 
+from asgiref.sync import sync_to_async
 from django.core.cache import cache
 from drf_spectacular.utils import extend_schema
 from rest_framework import permissions, viewsets
+from rest_framework.exceptions import NotFound
 from rest_framework.response import Response
 
+from apps.common.async_views import AsyncAPIViewMixin
+from apps.common.db_routing import ReplicaReadMixin
+
 from .models import Page
 from .serializers import PageSerializer
 
 
-class PageViewSet(viewsets.ReadOnlyModelViewSet):
-    """ViewSet для чтения статических страниц"""
+class PageViewSet(AsyncAPIViewMixin, ReplicaReadMixin, viewsets.ReadOnlyModelViewSet):
+    """ViewSet для чтения статических страниц (асинхронный, кэш через async API)"""
 
     serializer_class = PageSerializer
     lookup_field = "slug"
@@ -27,14 +32,15 @@ class PageViewSet(viewsets.ReadOnlyModelViewSet):
         description="Возвращает список всех опубликованных статических страниц",
         tags=["Pages"],
     )
-    def list(self, request, *args, **kwargs):
+    async def list(self, request, *args, **kwargs):
         """Получить список страниц с кэшированием"""
         cache_key = "pages_list"
-        cached_result = cache.get(cache_key)
+        cached_result = await cache.aget(cache_key)
 
         if cached_result is None:
-            result = super().list(request, *args, **kwargs)
-            cache.set(cache_key, result.data, 60 * 60 * 24)  # 24 hours
+            # Пагинатор DRF синхронный (count + срез) — промах кэша уходит в пул потоков
+            result = await sync_to_async(super().list)(request, *args, **kwargs)
+            await cache.aset(cache_key, result.data, 60 * 60 * 24)  # 24 hours
             return result
 
         return Response(cached_result)
@@ -44,15 +50,20 @@ class PageViewSet(viewsets.ReadOnlyModelViewSet):
         description="Возвращает содержимое статической страницы по URL slug",
         tags=["Pages"],
     )
-    def retrieve(self, request, *args, **kwargs):
+    async def retrieve(self, request, *args, **kwargs):
         """Получить страницу с кэшированием по предсказуемому ключу"""
         slug = kwargs.get(self.lookup_field)
         cache_key = f"page_detail_{slug}"
-        cached = cache.get(cache_key)
+        cached = await cache.aget(cache_key)
 
         if cached is not None:
             return Response(cached)
 
-        response = super().retrieve(request, *args, **kwargs)
-        cache.set(cache_key, response.data, 60 * 60 * 24)
-        return response
+        page = await self.get_queryset().filter(slug=slug).afirst()
+        if page is None:
+            raise NotFound()
+        self.check_object_permissions(request, page)
+
+        data = self.get_serializer(page).data
+        await cache.aset(cache_key, data, 60 * 60 * 24)
+        return Response(data)
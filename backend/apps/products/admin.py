@@ -33,10 +33,55 @@ from .models import (
     ProductImage,
     ProductVariant,
 )
+from .services.catalog_cache import (
+    NS_ATTRIBUTES,
+    NS_BRANDS,
+    NS_CATEGORIES,
+    NS_PRICES,
+    NS_PRODUCTS,
+    NS_STOCK,
+    bump_catalog_version,
+)
 
 logger = logging.getLogger(__name__)
 
 
+class CatalogCacheAdminMixin:
+    """
+    Инвалидирует кэш каталога после изменений через админку.
+
+    Увеличивает версии доменов из catalog_cache_namespaces после сохранения,
+    удаления и массовых действий (QuerySet.update() в actions обходит сигналы).
+    Действие считается выполненным, только если выбраны объекты и admin
+    вернул redirect: промежуточные формы и «ничего не выбрано» кэш не трогают.
+    """
+
+    catalog_cache_namespaces: tuple[str, ...] = ()
+
+    def _bump_catalog_cache(self) -> None:
+        if self.catalog_cache_namespaces:
+            bump_catalog_version(*self.catalog_cache_namespaces)
+
+    def save_model(self, request: HttpRequest, obj: Any, form: Any, change: bool) -> None:
+        super().save_model(request, obj, form, change)  # type: ignore[misc]
+        self._bump_catalog_cache()
+
+    def delete_model(self, request: HttpRequest, obj: Any) -> None:
+        super().delete_model(request, obj)  # type: ignore[misc]
+        self._bump_catalog_cache()
+
+    def delete_queryset(self, request: HttpRequest, queryset: QuerySet) -> None:
+        super().delete_queryset(request, queryset)  # type: ignore[misc]
+        self._bump_catalog_cache()
+
+    def response_action(self, request: HttpRequest, queryset: QuerySet) -> Any:
+        response = super().response_action(request, queryset)  # type: ignore[misc]
+        has_selection = bool(request.POST.getlist(ACTION_CHECKBOX_NAME)) or request.POST.get("select_across") == "1"
+        if has_selection and isinstance(response, HttpResponseRedirect):
+            self._bump_catalog_cache()
+        return response
+
+
 class ProductImageInline(admin.TabularInline):
     """Инлайн для изображений продукта"""
 
@@ -174,6 +219,9 @@ class BrandAdmin(admin.ModelAdmin):
                             source_brand.delete()
                             count += 1
 
+                        # Перенос товаров через QuerySet.update() обходит сигналы
+                        bump_catalog_version(NS_BRANDS, NS_PRODUCTS)
+
                     self.message_user(
                         request,
                         f"Успешно объединено {count} брендов в {target_brand}",
@@ -304,9 +352,11 @@ class IsOnHomepageFilter(SimpleListFilter):
 
 
 @admin.register(Category)
-class CategoryAdmin(admin.ModelAdmin):
+class CategoryAdmin(CatalogCacheAdminMixin, admin.ModelAdmin):
     """Admin для модели Category"""
 
+    catalog_cache_namespaces = (NS_CATEGORIES,)
+
     list_display = ("name", "slug", "parent", "onec_id", "is_active", "created_at")
     list_filter = ("is_active", IsOnHomepageFilter, HasIconFilter, HasImageFilter, "created_at")
     search_fields = ("name", "slug", "onec_id")
@@ -316,13 +366,15 @@ class CategoryAdmin(admin.ModelAdmin):
 
 
 @admin.register(HomepageCategory)
-class HomepageCategoryAdmin(admin.ModelAdmin):
+class HomepageCategoryAdmin(CatalogCacheAdminMixin, admin.ModelAdmin):
     """
     Admin для управления категориями на главной странице.
     Показывает только корневые категории (parent=None).
     Удаление запрещено для безопасности каталога.
     """
 
+    catalog_cache_namespaces = (NS_CATEGORIES,)
+
     list_display = ("id", "image_preview", "name", "parent", "sort_order", "is_active")
     list_editable = ("sort_order", "is_active")
     list_display_links = ("name",)
@@ -364,9 +416,12 @@ class HomepageCategoryAdmin(admin.ModelAdmin):
 
 
 @admin.register(Product)
-class ProductAdmin(admin.ModelAdmin):
+class ProductAdmin(CatalogCacheAdminMixin, admin.ModelAdmin):
     """Admin для модели Product"""
 
+    # Инлайн вариантов редактирует цены и остатки
+    catalog_cache_namespaces = (NS_PRODUCTS, NS_PRICES, NS_STOCK)
+
     list_display = (
         "name",
         "brand",
@@ -578,9 +633,11 @@ class ColorMappingAdmin(admin.ModelAdmin):
 
 
 @admin.register(ProductVariant)
-class ProductVariantAdmin(admin.ModelAdmin):
+class ProductVariantAdmin(CatalogCacheAdminMixin, admin.ModelAdmin):
     """Admin для модели ProductVariant"""
 
+    catalog_cache_namespaces = (NS_PRODUCTS, NS_PRICES, NS_STOCK)
+
     list_display = (
         "sku",
         "product",
@@ -702,9 +759,11 @@ class Attribute1CMappingInline(admin.TabularInline):
 
 
 @admin.register(Attribute)
-class AttributeAdmin(admin.ModelAdmin):
+class AttributeAdmin(CatalogCacheAdminMixin, admin.ModelAdmin):
     """Admin для модели Attribute с подсчетом значений и inline значениями"""
 
+    catalog_cache_namespaces = (NS_ATTRIBUTES,)
+
     list_display = (
         "name",
         "slug",
@@ -940,9 +999,11 @@ class AttributeValue1CMappingInline(admin.TabularInline):
 
 
 @admin.register(AttributeValue)
-class AttributeValueAdmin(admin.ModelAdmin):
+class AttributeValueAdmin(CatalogCacheAdminMixin, admin.ModelAdmin):
     """Admin для модели AttributeValue с маппингами 1С"""
 
+    catalog_cache_namespaces = (NS_ATTRIBUTES,)
+
     list_display = (
         "value",
         "attribute",
@@ -2,6 +2,12 @@
 Константы для приложения products.
 """
 
+# Базовая часть ключа; итоговый ключ включает версию домена brands
+# (см. apps.products.services.catalog_cache.get_featured_brands_cache_key)
 FEATURED_BRANDS_CACHE_KEY = "products:brands:featured:v1"
-FEATURED_BRANDS_CACHE_TIMEOUT = 60 * 60  # 1 час
+FEATURED_BRANDS_CACHE_TIMEOUT = 60 * 60 * 24  # 24 часа, свежесть гарантирует версия brands
 FEATURED_BRANDS_MAX_ITEMS = 50
+
+# Дерево категорий зависит от categories/products/stock. Продажи не bump'ают stock
+# (иначе каждый заказ сбрасывал бы кэш), поэтому дрейф in_stock_count ограничен TTL.
+CATEGORY_TREE_CACHE_TIMEOUT = 60 * 15  # 15 минут
@@ -13,6 +13,7 @@ from django.db import connection
 from django.db.models import Q, QuerySet
 
 from .models import Attribute, Brand, Category, Product
+from .services.catalog_cache import CATALOG_CACHE_TIMEOUT, NS_ATTRIBUTES, NS_CATEGORIES, build_catalog_cache_key
 
 if TYPE_CHECKING:
     from django.http import HttpRequest
@@ -39,19 +40,19 @@ class ProductFilter(django_filters.FilterSet):
         Например: ?attr_color=red,blue или ?attr_size=xl
 
         Оптимизировано: кешируем атрибуты для избежания запроса к БД при каждом запросе.
+        Ключ включает версию домена attributes — кеш сбрасывается после импорта/админки.
         """
         super().__init__(*args, **kwargs)
 
         from django.core.cache import cache
 
-        cache_key = "active_attributes_for_filters"
+        cache_key = build_catalog_cache_key("filters:active_attributes", NS_ATTRIBUTES)
         active_attributes = cache.get(cache_key)
 
         if active_attributes is None:
             # Загружаем только активные атрибуты для создания фильтров
             active_attributes = list(Attribute.objects.filter(is_active=True).only("id", "slug", "name"))
-            # Кешируем на 5 минут
-            cache.set(cache_key, active_attributes, 300)
+            cache.set(cache_key, active_attributes, CATALOG_CACHE_TIMEOUT)
 
         for attr in active_attributes:
             filter_name = f"attr_{attr.slug}"
@@ -217,7 +218,7 @@ class ProductFilter(django_filters.FilterSet):
         # или просто кешируем дерево категорий
         from django.core.cache import cache
 
-        cache_key = f"category_descendants_{category_id}"
+        cache_key = build_catalog_cache_key(f"categories:descendants:{category_id}", NS_CATEGORIES)
         category_ids = cache.get(cache_key)
 
         if category_ids is None:
@@ -240,8 +241,8 @@ class ProductFilter(django_filters.FilterSet):
                 category_ids.update(children)
                 current_level = children
 
-            # Кешируем на 5 минут
-            cache.set(cache_key, list(category_ids), 300)
+            # Версия categories в ключе гарантирует свежесть после импорта
+            cache.set(cache_key, list(category_ids), CATALOG_CACHE_TIMEOUT)
 
         return queryset.filter(category_id__in=category_ids)
 
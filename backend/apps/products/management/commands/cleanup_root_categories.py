@@ -21,6 +21,8 @@ from django.core.management.base import BaseCommand
 from django.db import transaction
 from django.db.models import Count, Q
 
+from apps.products.services.catalog_cache import NS_CATEGORIES, NS_PRODUCTS, bump_catalog_version
+
 logger = logging.getLogger(__name__)
 
 
@@ -168,6 +170,8 @@ class Command(BaseCommand):
         other_root_pks = list(Category.objects.filter(parent=None).exclude(pk=anchor.pk).values_list("pk", flat=True))
 
         with transaction.atomic():
+            # Кэш каталога сбрасывается после коммита (bump через on_commit)
+            bump_catalog_version(NS_CATEGORIES, NS_PRODUCTS)
             # Шаг 3: Reparent дочерних якорной
             reparented = Category.objects.filter(parent=anchor).update(parent=None)
             self.stdout.write(self.style.SUCCESS(f"\n✅ Шаг 3: Reparented {reparented} категорий → parent=None"))
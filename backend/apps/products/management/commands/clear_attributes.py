@@ -12,6 +12,7 @@ from django.core.management.base import BaseCommand
 from django.db import transaction
 
 from apps.products.models import Attribute, AttributeValue
+from apps.products.services.catalog_cache import NS_ATTRIBUTES, NS_PRODUCTS, bump_catalog_version
 
 
 class Command(BaseCommand):
@@ -45,6 +46,8 @@ class Command(BaseCommand):
 
         try:
             with transaction.atomic():
+                # Кэш каталога сбрасывается после коммита (bump через on_commit)
+                bump_catalog_version(NS_ATTRIBUTES, NS_PRODUCTS)
                 # Сначала удаляем значения атрибутов (из-за FK)
                 deleted_values = AttributeValue.objects.all().delete()
                 self.stdout.write(self.style.SUCCESS(f"✓ Удалено значений атрибутов: {deleted_values[0]}"))
@@ -5,6 +5,8 @@ Management команда для полной очистки каталога т
 from django.core.management.base import BaseCommand, CommandError
 from django.db import transaction
 
+from apps.products.services.catalog_cache import CATALOG_NAMESPACES, bump_catalog_version
+
 
 class Command(BaseCommand):
     help = "Полная очистка каталога товаров, брендов и категорий"
@@ -37,6 +39,8 @@ class Command(BaseCommand):
         self.stdout.write(self.style.SUCCESS("\n🔄 Начинаю очистку..."))
 
         with transaction.atomic():
+            # Кэш каталога сбрасывается после коммита (bump через on_commit)
+            bump_catalog_version(*CATALOG_NAMESPACES)
             from apps.products.models import Brand, Category, ImportSession, PriceType, Product, ProductImage
 
             # Очистка в правильном порядке с учетом foreign key constraints
@@ -10,6 +10,7 @@ from django.db import transaction
 from django.utils.text import slugify
 
 from apps.products.category_utils import REPAIR_ANCHOR_ONEC_ID, is_repair_placeholder_category_name
+from apps.products.services.catalog_cache import NS_CATEGORIES, NS_PRODUCTS, bump_catalog_version
 
 FALLBACK_SLUG = "onec-unresolved-category"
 
@@ -89,6 +90,8 @@ class Command(BaseCommand):
             return
 
         with transaction.atomic():
+            # Кэш каталога сбрасывается после коммита (bump через on_commit)
+            bump_catalog_version(NS_CATEGORIES, NS_PRODUCTS)
             if anchor is None:
                 anchor = self._create_anchor(root_name)
             elif not anchor.is_active:
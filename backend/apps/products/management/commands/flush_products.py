@@ -23,6 +23,8 @@ from typing import TYPE_CHECKING, Any
 from django.core.management.base import BaseCommand, CommandError
 from django.db import transaction
 
+from apps.products.services.catalog_cache import CATALOG_NAMESPACES, bump_catalog_version
+
 if TYPE_CHECKING:
     from argparse import ArgumentParser
 
@@ -121,6 +123,8 @@ class Command(BaseCommand):
 
         try:
             with transaction.atomic():
+                # Кэш каталога сбрасывается после коммита (bump через on_commit)
+                bump_catalog_version(*CATALOG_NAMESPACES)
                 # Удаляем ProductVariant первым (FK на Product)
                 deleted_variants = ProductVariant.objects.all().delete()[0]
                 self.stdout.write(f"   ✓ Удалено ProductVariant: {deleted_variants}")
@@ -17,6 +17,7 @@ from django.utils import timezone
 from tqdm import tqdm
 
 from apps.products.models import ImportSession, Product
+from apps.products.services.image_catalog import ImageCatalog
 from apps.products.services.variant_import import VariantImportProcessor
 
 logger = logging.getLogger(__name__)
@@ -56,6 +57,12 @@ class Command(BaseCommand):
             action="store_true",
             help="Подробный вывод в консоль",
         )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help="Число потоков копирования изображений (по умолчанию settings.PRODUCT_IMAGE_INGEST_WORKERS)",
+        )
 
     def handle(self, *args: Any, **options: Any) -> None:
         """Основной метод выполнения команды."""
@@ -63,6 +70,7 @@ class Command(BaseCommand):
         dry_run = options.get("dry_run", False)
         limit = options.get("limit")
         verbose = options.get("verbose", False)
+        workers = options.get("workers")
 
         # Получаем директорию с данными
         if data_dir is None:
@@ -103,6 +111,7 @@ class Command(BaseCommand):
                 dry_run=dry_run,
                 limit=limit,
                 verbose=verbose,
+                workers=workers,
             )
 
             # Обновляем сессию
@@ -132,6 +141,7 @@ class Command(BaseCommand):
         dry_run: bool,
         limit: int | None,
         verbose: bool,
+        workers: int | None = None,
     ) -> dict:
         """
         Выполнение импорта изображений.
@@ -142,6 +152,7 @@ class Command(BaseCommand):
             dry_run: Тестовый запуск без записи
             limit: Лимит товаров для обработки
             verbose: Подробный вывод
+            workers: Число потоков копирования изображений
 
         Returns:
             Dict со статистикой импорта
@@ -165,8 +176,15 @@ class Command(BaseCommand):
                 "errors": 0,
             }
 
+        # Один проход по директории вместо glob/stat на каждый товар
+        catalog = ImageCatalog.build(base_dir)
+        self.stdout.write(f"🗂️  Проиндексировано файлов: {len(catalog)}\n")
+
         # Создаём процессор
         processor = VariantImportProcessor(session_id=session.id if session else 0)
+        processor.use_image_catalog(catalog)
+        # Проход по товарам только собирает изображения; копирование — отдельным этапом пулом потоков
+        processor.defer_image_ingest()
 
         processed = 0
         total_copied = 0
@@ -183,7 +201,7 @@ class Command(BaseCommand):
             for product in products_qs.iterator(chunk_size=100):
                 try:
                     # Получаем изображения для товара
-                    image_paths = self._get_product_images(product, base_dir)
+                    image_paths = self._get_product_images(product, catalog)
 
                     if not image_paths:
                         total_skipped += 1
@@ -235,6 +253,14 @@ class Command(BaseCommand):
                     }
                     session.save(update_fields=["report_details"])
 
+        if not dry_run:
+            ingest_result = processor.ingest_deferred_images(max_workers=workers)
+            self.stdout.write(
+                f"🖼️  Файлов обработано: {ingest_result['files']}, "
+                f"обновлено товаров: {ingest_result['products_updated']}, "
+                f"вариантов: {ingest_result['variants_updated']}\n"
+            )
+
         return {
             "total_products": total_products,
             "processed": processed,
@@ -244,37 +270,20 @@ class Command(BaseCommand):
             "completed_at": timezone.now().isoformat(),
         }
 
-    def _get_product_images(self, product: Product, base_dir: Path) -> list[str]:
+    def _get_product_images(self, product: Product, catalog: ImageCatalog) -> list[str]:
         """
-        Получить список изображений для товара из директории 1С.
+        Получить список изображений для товара из индекса директории 1С.
 
         Args:
             product: Product instance с onec_id
-            base_dir: Путь к goods/import_files/
+            catalog: Индекс goods/import_files/
 
         Returns:
             Список относительных путей (например, ["00/001a16a4_image.jpg"])
         """
         if not product.onec_id:
             return []
-
-        # Первые 2 символа onec_id определяют поддиректорию
-        onec_id = product.onec_id
-        subdir = onec_id[:2] if len(onec_id) >= 2 else "00"
-
-        images_dir = base_dir / subdir
-
-        if not images_dir.exists():
-            return []
-
-        # Поиск файлов начинающихся с onec_id
-        image_paths = []
-        for img_file in images_dir.glob(f"{onec_id}*"):
-            if img_file.suffix.lower() in [".jpg", ".jpeg", ".png"]:
-                relative_path = f"{subdir}/{img_file.name}"
-                image_paths.append(relative_path)
-
-        return image_paths
+        return catalog.product_images(product.onec_id)
 
     def _print_summary(self, result: dict[str, int]) -> None:
         """Вывод итоговой статистики."""
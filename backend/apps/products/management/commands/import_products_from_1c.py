@@ -34,6 +34,8 @@ from django.core.management.base import BaseCommand, CommandError
 from tqdm import tqdm
 
 from apps.products.models import Brand, Category, ImportSession, Product, ProductVariant
+from apps.products.services.catalog_cache import CATALOG_NAMESPACES, bump_catalog_version
+from apps.products.services.image_catalog import ImageCatalog
 from apps.products.services.parser import XMLDataParser
 from apps.products.services.variant_import import VariantImportProcessor
 
@@ -100,6 +102,12 @@ class Command(BaseCommand):
             action="store_true",
             help="Пропустить импорт изображений товаров (только метаданные)",
         )
+        parser.add_argument(
+            "--image-workers",
+            type=int,
+            default=None,
+            help="Число потоков копирования изображений (по умолчанию settings.PRODUCT_IMAGE_INGEST_WORKERS)",
+        )
         parser.add_argument(
             "--skip-default-variants",
             action="store_true",
@@ -151,6 +159,7 @@ class Command(BaseCommand):
         clear_existing = options.get("clear_existing", False)
         skip_backup = options.get("skip_backup", False)
         skip_images = options.get("skip_images", False)
+        image_workers = options.get("image_workers")
         skip_default_variants = options.get("skip_default_variants", False)
         variants_only = options.get("variants_only", False)
         celery_task_id = options.get("celery_task_id", None)
@@ -254,6 +263,7 @@ class Command(BaseCommand):
             self.stdout.write(self.style.SUCCESS(f"\n✅ Создана НОВАЯ сессия импорта ID: {session.pk}"))
 
         session_id = session.pk
+        variant_processor: VariantImportProcessor | None = None
 
         try:
             # Инициализация парсера и процессора
@@ -268,6 +278,9 @@ class Command(BaseCommand):
                 batch_size=batch_size,
                 skip_validation=skip_validation,
             )
+            if not skip_images:
+                # Товары и варианты только собирают изображения; копирование — отдельным этапом (ШАГ 3.1)
+                variant_processor.defer_image_ingest()
 
             # ШАГ 0.5: Загрузка категорий из groups.xml
             if file_type in ["all", "goods"]:
@@ -294,6 +307,10 @@ class Command(BaseCommand):
                 variant_processor.log_progress("Начало импорта вариантов (offers.xml)...")
                 self._import_variants_from_offers(data_dir, parser, variant_processor, skip_images)
 
+            # ШАГ 3.1: Копирование изображений пулом потоков и bulk-привязка к товарам/вариантам
+            if not skip_images:
+                self._ingest_images(variant_processor, image_workers)
+
             # ШАГ 3.5: Создание default variants для товаров без вариантов
             if file_type in ["all", "offers"] and not skip_default_variants:
                 variant_processor.log_progress("Создание дефолтных вариантов...")
@@ -324,6 +341,9 @@ class Command(BaseCommand):
             session.status = ImportSession.ImportStatus.FAILED
             session.error_message = str(e)
             session.save()
+            # Частично выполненный импорт мог изменить каталог — сбрасываем кэш
+            if variant_processor is not None:
+                variant_processor.invalidate_catalog_cache()
             raise CommandError(f"Импорт завершился с ошибкой: {e}")
 
     def _import_categories(self, data_dir: str, parser: XMLDataParser, processor: VariantImportProcessor) -> None:
@@ -400,9 +420,11 @@ class Command(BaseCommand):
             self.stdout.write(self.style.WARNING("   ⚠️ Файлы товаров (goods_*.xml) не найдены. Пропуск шага."))
             return
 
+        base_dir = os.path.join(data_dir, "goods", "import_files")
+        self._use_image_catalog(processor, base_dir, skip_images)
+
         for file_path in goods_files:
             goods_data = parser.parse_goods_xml(file_path)
-            base_dir = os.path.join(data_dir, "goods", "import_files")
 
             for i, goods_item in enumerate(tqdm(goods_data, desc=f"   Обработка {Path(file_path).name}")):
                 processor.process_product_from_goods(
@@ -437,16 +459,18 @@ class Command(BaseCommand):
             self.stdout.write(self.style.WARNING("   ⚠️ Файлы вариантов (offers_*.xml) не найдены. Пропуск шага."))
             return
 
+        base_dir = os.path.join(data_dir, "offers", "import_files")
+        # Fallback: Если папка offers/import_files не существует, пробуем goods/import_files
+        # (так как FileRoutingService по умолчанию кладет все картинки в goods/import_files)
+        if not os.path.exists(base_dir):
+            alt_dir = os.path.join(data_dir, "goods", "import_files")
+            if os.path.exists(alt_dir):
+                base_dir = alt_dir
+                self.stdout.write(f"   ℹ️ Изображения будут загружаться из: {Path(base_dir).relative_to(data_dir)}")
+        self._use_image_catalog(processor, base_dir, skip_images)
+
         for file_path in offers_files:
             offers_data = parser.parse_offers_xml(file_path)
-            base_dir = os.path.join(data_dir, "offers", "import_files")
-            # Fallback: Если папка offers/import_files не существует, пробуем goods/import_files
-            # (так как FileRoutingService по умолчанию кладет все картинки в goods/import_files)
-            if not os.path.exists(base_dir):
-                alt_dir = os.path.join(data_dir, "goods", "import_files")
-                if os.path.exists(alt_dir):
-                    base_dir = alt_dir
-                    self.stdout.write(f"   ℹ️ Изображения будут загружаться из: {Path(base_dir).relative_to(data_dir)}")
 
             for i, offer_item in enumerate(tqdm(offers_data, desc=f"   Обработка {Path(file_path).name}")):
                 processor.process_variant_from_offer(
@@ -623,6 +647,7 @@ class Command(BaseCommand):
             Product.objects.all().delete()
             Category.objects.all().delete()
             Brand.objects.all().delete()
+            bump_catalog_version(*CATALOG_NAMESPACES)
             self.stdout.write(self.style.SUCCESS("✅ Данные очищены"))
         else:
             self.stdout.write(self.style.ERROR("❌ Очистка отменена"))
@@ -649,8 +674,30 @@ class Command(BaseCommand):
         self.stdout.write(f"   Скопировано:             {stats.get('images_copied', 0)}")
         self.stdout.write(f"   Пропущено (существуют):  {stats.get('images_skipped', 0)}")
         self.stdout.write(f"   Ошибок:                  {stats.get('images_errors', 0)}")
+        self.stdout.write(f"   Производных (WebP/AVIF): {stats.get('images_derivatives', 0)}")
         self.stdout.write("=" * 60)
 
+    def _ingest_images(self, processor: VariantImportProcessor, workers: int | None) -> None:
+        """Копирование изображений, собранных на шагах 2-3."""
+        self.stdout.write("\n📸 Шаг 3.1: Копирование изображений...")
+        processor.log_progress("Копирование изображений...")
+        result = processor.ingest_deferred_images(max_workers=workers)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"   ✅ Файлов: {result['files']}, "
+                f"обновлено товаров: {result['products_updated']}, "
+                f"вариантов: {result['variants_updated']}"
+            )
+        )
+
+    def _use_image_catalog(self, processor: VariantImportProcessor, base_dir: str, skip_images: bool) -> None:
+        """Индексирует директорию изображений одним проходом, чтобы не делать stat() на каждый файл."""
+        if skip_images or not os.path.isdir(base_dir):
+            return
+        catalog = ImageCatalog.build(base_dir)
+        processor.use_image_catalog(catalog)
+        self.stdout.write(f"   🗂️ Проиндексировано файлов изображений: {len(catalog)}")
+
     def _collect_xml_files(self, base_dir: str, subdir: str, filename: str) -> list[str]:
         """
         Сбор XML файлов из директории с поддержкой альтернативных имен и папок.
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.7 on 2026-10-18 23:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("products", "0051_alter_productvariant_vat_rate"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="importsession",
+            name="import_type",
+            field=models.CharField(
+                choices=[
+                    ("catalog", "Каталог товаров"),
+                    ("variants", "Варианты товаров"),
+                    ("attributes", "Атрибуты (справочники)"),
+                    ("images", "Изображения товаров"),
+                    ("stocks", "Остатки товаров"),
+                    ("prices", "Цены товаров"),
+                    ("customers", "Клиенты"),
+                    ("order_statuses", "Статусы заказов"),
+                ],
+                default="catalog",
+                max_length=20,
+                verbose_name="Тип импорта",
+            ),
+        ),
+    ]
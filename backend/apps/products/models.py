@@ -569,6 +569,7 @@ class ImportType(models.TextChoices):
     STOCKS = "stocks", "Остатки товаров"
     PRICES = "prices", "Цены товаров"
     CUSTOMERS = "customers", "Клиенты"
+    ORDER_STATUSES = "order_statuses", "Статусы заказов"
 
 
 class ImportStatus(models.TextChoices):
@@ -13,6 +13,7 @@ from drf_spectacular.utils import extend_schema_field, inline_serializer
 from rest_framework import serializers
 
 from .category_utils import FULL_PLACEHOLDER_CATEGORY_RE_PATTERN
+from .services.image_derivatives import image_srcset
 from .models import Attribute, AttributeValue, Brand, Category, ColorMapping, Product, ProductImage, ProductVariant
 
 # Константы для отображения диапазонов остатков
@@ -68,6 +69,8 @@ class ProductVariantSerializer(serializers.ModelSerializer):
     attributes = serializers.SerializerMethodField()
     main_image = serializers.SerializerMethodField()
     gallery_images = serializers.SerializerMethodField()
+    main_image_srcset = serializers.SerializerMethodField()
+    gallery_images_srcset = serializers.SerializerMethodField()
 
     class Meta:
         model = ProductVariant
@@ -86,6 +89,8 @@ class ProductVariantSerializer(serializers.ModelSerializer):
             "msrp",
             "main_image",
             "gallery_images",
+            "main_image_srcset",
+            "gallery_images_srcset",
             "attributes",
         ]
         read_only_fields = fields  # Все поля read-only
@@ -205,6 +210,22 @@ class ProductVariantSerializer(serializers.ModelSerializer):
 
         return result
 
+    @extend_schema_field(serializers.DictField(child=serializers.CharField(), allow_null=True))
+    def get_main_image_srcset(self, obj: ProductVariant) -> dict[str, str] | None:
+        """
+        srcset производных main_image по форматам ({"webp": "<url> 320w, ..."})
+
+        None — для изображения нет производных (загружено не через импорт 1С).
+        """
+        return image_srcset(self.get_main_image(obj))
+
+    @extend_schema_field(
+        serializers.ListField(child=serializers.DictField(child=serializers.CharField(), allow_null=True))
+    )
+    def get_gallery_images_srcset(self, obj: ProductVariant) -> list[dict[str, str] | None]:
+        """srcset производных для каждого URL из gallery_images (в том же порядке)"""
+        return [image_srcset(url) for url in self.get_gallery_images(obj)]
+
     def get_current_price(self, obj: ProductVariant) -> str:
         """
         Получить роле-ориентированную цену для текущего пользователя
@@ -463,6 +484,7 @@ class ProductListSerializer(serializers.ModelSerializer):
     - stock_quantity: суммарное количество на складе по всем вариантам
     - is_in_stock: есть ли хотя бы один вариант в наличии
     - main_image: изображение из первого варианта или base_images
+    - main_image_srcset: srcset WebP/AVIF производных main_image
     - can_be_ordered: можно ли заказать товар
     """
 
@@ -479,6 +501,7 @@ class ProductListSerializer(serializers.ModelSerializer):
     stock_quantity = serializers.SerializerMethodField()
     is_in_stock = serializers.SerializerMethodField()
     main_image = serializers.SerializerMethodField()
+    main_image_srcset = serializers.SerializerMethodField()
     can_be_ordered = serializers.SerializerMethodField()
     current_price = serializers.SerializerMethodField()
     sku = serializers.SerializerMethodField()
@@ -515,6 +538,7 @@ class ProductListSerializer(serializers.ModelSerializer):
             "stock_quantity",
             "is_in_stock",
             "main_image",
+            "main_image_srcset",
             "can_be_ordered",
             "current_price",
             "sku",
@@ -674,6 +698,11 @@ class ProductListSerializer(serializers.ModelSerializer):
             return str(img_url)
         return None
 
+    @extend_schema_field(serializers.DictField(child=serializers.CharField(), allow_null=True))
+    def get_main_image_srcset(self, obj: Product) -> dict[str, str] | None:
+        """srcset производных main_image по форматам ({"webp": "<url> 320w, ..."})"""
+        return image_srcset(self.get_main_image(obj))
+
     def get_can_be_ordered(self, obj: Product) -> bool:
         """Проверить можно ли заказать товар"""
         return self.get_is_in_stock(obj)
@@ -741,6 +770,7 @@ class ProductDetailSerializer(ProductListSerializer):
                 "url": serializers.CharField(),
                 "alt_text": serializers.CharField(),
                 "is_main": serializers.BooleanField(),
+                "srcset": serializers.DictField(child=serializers.CharField(), allow_null=True),
             },
         )
     )
@@ -753,6 +783,8 @@ class ProductDetailSerializer(ProductListSerializer):
 
         Пути в base_images хранятся как относительные от /media/:
         - /products/base/... → /media/products/base/...
+
+        srcset — WebP/AVIF производные изображения (None, если их нет).
         """
         images = []
         request = self.context.get("request")
@@ -781,6 +813,7 @@ class ProductDetailSerializer(ProductListSerializer):
                         "url": url,
                         "alt_text": f"{obj.name} - изображение {idx + 1}",
                         "is_main": idx == 0,  # Первое изображение - основное
+                        "srcset": image_srcset(img_url, request),
                     }
                 )
 
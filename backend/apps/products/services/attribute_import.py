@@ -15,6 +15,8 @@ import defusedxml.ElementTree as ET
 from django.conf import settings
 from django.db import transaction
 
+from apps.products.services.catalog_cache import NS_ATTRIBUTES, bump_catalog_version
+
 if TYPE_CHECKING:
     from xml.etree.ElementTree import Element
 
@@ -97,6 +99,9 @@ class AttributeImportService:
                 logger.error(f"Error processing file {filename}: {e}")
                 self.stats["errors"] += 1
 
+        # Новые/реактивированные атрибуты должны сразу появиться в фильтрах каталога
+        bump_catalog_version(NS_ATTRIBUTES)
+
         logger.info(f"Import completed. Stats: {self.stats}")
         return self.stats
 
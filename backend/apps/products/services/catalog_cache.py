@@ -0,0 +1,186 @@
+"""
+Реестр версий кэша каталога (generational cache invalidation).
+
+Каждый домен каталога (товары, категории, бренды, атрибуты, цены, остатки)
+имеет собственный счётчик поколения в кэше. Версии нужных доменов входят
+в каждый ключ кэша каталога, поэтому ``bump_catalog_version()`` мгновенно
+делает устаревшими все зависимые записи без перебора и удаления ключей.
+
+Это позволяет держать длинные TTL и при этом гарантировать свежесть данных
+сразу после импорта из 1С, действий в админке и management-команд.
+
+Домены и их потребители:
+- attributes — активные атрибуты для ProductFilter
+- categories — потомки категории (ProductFilter), дерево категорий
+- brands — избранные бренды
+- products, stock — дерево категорий (products_count / in_stock_count)
+- prices — потребителей пока нет; bump'ается наравне с остальными, чтобы
+  кэш по ценам можно было добавить без доработки источников изменений
+
+Гранулярность: версии увеличивают только массовые источники изменений
+(импорт, админка, команды). Checkout НЕ bump'ает stock — иначе каждая
+продажа сбрасывала бы все stock-зависимые записи; их дрейф между
+импортами ограничивается собственным TTL записи.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+from apps.products.constants import FEATURED_BRANDS_CACHE_KEY
+
+logger = logging.getLogger(__name__)
+
+NS_PRODUCTS = "products"
+NS_CATEGORIES = "categories"
+NS_BRANDS = "brands"
+NS_ATTRIBUTES = "attributes"
+NS_PRICES = "prices"
+NS_STOCK = "stock"
+
+CATALOG_NAMESPACES = (NS_PRODUCTS, NS_CATEGORIES, NS_BRANDS, NS_ATTRIBUTES, NS_PRICES, NS_STOCK)
+
+CATALOG_VERSION_KEY_PATTERN = "catalog:version:{namespace}"
+CATALOG_CACHE_KEY_PREFIX = "catalog"
+# Свежесть гарантируется версиями, TTL лишь ограничивает занимаемую память
+CATALOG_CACHE_TIMEOUT = 60 * 60 * 24  # 24 часа
+
+
+def _validate_namespaces(namespaces: tuple[str, ...]) -> None:
+    unknown = [ns for ns in namespaces if ns not in CATALOG_NAMESPACES]
+    if unknown:
+        raise ValueError(f"Unknown catalog cache namespace(s): {', '.join(unknown)}")
+
+
+def _version_key(namespace: str) -> str:
+    return CATALOG_VERSION_KEY_PATTERN.format(namespace=namespace)
+
+
+def _initial_version() -> int:
+    """
+    Начальное значение счётчика поколения.
+
+    Используется время в микросекундах, а не 1: если ключ версии был вытеснен
+    из Redis, новое поколение не совпадёт ни с одним ранее выданным, и старые
+    записи не «оживут».
+    """
+    return time.time_ns() // 1000
+
+
+def get_catalog_versions(*namespaces: str) -> dict[str, int]:
+    """
+    Возвращает текущие версии указанных доменов каталога одним обращением к кэшу.
+
+    Args:
+        namespaces: Домены из CATALOG_NAMESPACES.
+
+    Returns:
+        Словарь {namespace: version}.
+    """
+    _validate_namespaces(namespaces)
+    keys = {ns: _version_key(ns) for ns in namespaces}
+    stored = cache.get_many(list(keys.values()))
+
+    versions: dict[str, int] = {}
+    for ns, key in keys.items():
+        version = stored.get(key)
+        if version is None:
+            # add() атомарен: при гонке побеждает первое записанное значение
+            cache.add(key, _initial_version(), timeout=None)
+            version = cache.get(key)
+        versions[ns] = int(version) if version is not None else 0
+    return versions
+
+
+async def aget_catalog_versions(*namespaces: str) -> dict[str, int]:
+    """Асинхронная версия get_catalog_versions (async API кэша) для ASGI представлений."""
+    _validate_namespaces(namespaces)
+    keys = {ns: _version_key(ns) for ns in namespaces}
+    stored = await cache.aget_many(list(keys.values()))
+
+    versions: dict[str, int] = {}
+    for ns, key in keys.items():
+        version = stored.get(key)
+        if version is None:
+            await cache.aadd(key, _initial_version(), timeout=None)
+            version = await cache.aget(key)
+        versions[ns] = int(version) if version is not None else 0
+    return versions
+
+
+def get_catalog_version(namespace: str) -> int:
+    """Возвращает текущую версию одного домена каталога."""
+    return get_catalog_versions(namespace)[namespace]
+
+
+def build_catalog_cache_key(base_key: str, *namespaces: str) -> str:
+    """
+    Строит ключ кэша каталога с версиями доменов, от которых зависят данные.
+
+    Формат: catalog:{base_key}:{ns1}={v1}:{ns2}={v2}
+
+    Args:
+        base_key: Базовая часть ключа (например, "categories:descendants:42").
+        namespaces: Домены, изменение которых должно инвалидировать запись.
+
+    Returns:
+        Строка ключа кэша.
+    """
+    return _format_catalog_cache_key(base_key, namespaces, get_catalog_versions(*namespaces))
+
+
+async def abuild_catalog_cache_key(base_key: str, *namespaces: str) -> str:
+    """Асинхронная версия build_catalog_cache_key."""
+    return _format_catalog_cache_key(base_key, namespaces, await aget_catalog_versions(*namespaces))
+
+
+def _format_catalog_cache_key(base_key: str, namespaces: tuple[str, ...], versions: dict[str, int]) -> str:
+    suffix = ":".join(f"{ns}={versions[ns]}" for ns in namespaces)
+    return f"{CATALOG_CACHE_KEY_PREFIX}:{base_key}:{suffix}"
+
+
+def bump_catalog_version(*namespaces: str) -> None:
+    """
+    Увеличивает версии доменов каталога, инвалидируя все зависимые ключи.
+
+    Инкремент выполняется через transaction.on_commit: внутри транзакции
+    кэш инвалидируется только после успешного коммита (без race condition
+    «старые данные закэшированы новой версией»), вне транзакции — сразу.
+    Ошибки кэша логируются и не прерывают вызывающую операцию.
+
+    Args:
+        namespaces: Домены из CATALOG_NAMESPACES.
+    """
+    _validate_namespaces(namespaces)
+    if not namespaces:
+        return
+    unique_namespaces = tuple(dict.fromkeys(namespaces))
+
+    def _bump() -> None:
+        for ns in unique_namespaces:
+            key = _version_key(ns)
+            try:
+                try:
+                    cache.incr(key)
+                except ValueError:
+                    # Ключ версии отсутствует — инициализируем новым поколением
+                    cache.set(key, _initial_version(), timeout=None)
+            except Exception as e:
+                logger.warning(f"Failed to bump catalog cache version '{ns}': {e}")
+        logger.debug("Bumped catalog cache versions: %s", ", ".join(unique_namespaces))
+
+    transaction.on_commit(_bump)
+
+
+def get_featured_brands_cache_key() -> str:
+    """Ключ кэша endpoint'а избранных брендов (зависит только от брендов)."""
+    return build_catalog_cache_key(FEATURED_BRANDS_CACHE_KEY, NS_BRANDS)
+
+
+async def aget_featured_brands_cache_key() -> str:
+    """Асинхронная версия get_featured_brands_cache_key."""
+    return await abuild_catalog_cache_key(FEATURED_BRANDS_CACHE_KEY, NS_BRANDS)
@@ -0,0 +1,103 @@
+"""
+Индекс изображений директории импорта 1С (goods/import_files).
+
+Директория обходится один раз через os.scandir: размеры и mtime берутся
+из того же прохода, поэтому импорт изображений не делает glob/stat
+на каждый товар.
+"""
+
+from __future__ import annotations
+
+import bisect
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png")
+
+
+@dataclass(frozen=True)
+class ImageFileInfo:
+    """Файл из директории импорта."""
+
+    relative_path: str  # POSIX-путь от base_dir, например "00/001a16a4_image.jpg"
+    size: int
+    mtime: float
+
+
+class ImageCatalog:
+    """
+    Снимок директории импорта изображений 1С.
+
+    Файлы лежат в поддиректориях по первым двум символам onec_id
+    (base_dir/00/001a16a4_image.jpg). Индекс хранит все файлы по
+    относительному пути и отсортированные имена изображений по
+    поддиректориям для поиска по префиксу onec_id.
+    """
+
+    def __init__(self, base_dir: str | Path, files: list[ImageFileInfo]):
+        self.base_dir = Path(base_dir)
+        self._base_key = os.path.normpath(self.base_dir)
+        self._files: dict[str, ImageFileInfo] = {info.relative_path: info for info in files}
+        self._names_by_subdir: dict[str, list[str]] = {}
+        for info in files:
+            subdir, _, name = info.relative_path.rpartition("/")
+            if subdir and "/" not in subdir and name.lower().endswith(IMAGE_EXTENSIONS):
+                self._names_by_subdir.setdefault(subdir, []).append(name)
+        for names in self._names_by_subdir.values():
+            names.sort()
+
+    @classmethod
+    def build(cls, base_dir: str | Path) -> ImageCatalog:
+        """Обходит base_dir рекурсивно одним проходом os.scandir."""
+        files: list[ImageFileInfo] = []
+        pending = [""]
+        while pending:
+            prefix = pending.pop()
+            try:
+                entries = os.scandir(os.path.join(base_dir, prefix))
+            except OSError:
+                continue
+            with entries:
+                for entry in entries:
+                    relative_path = f"{prefix}/{entry.name}" if prefix else entry.name
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            pending.append(relative_path)
+                        elif entry.is_file():
+                            stat = entry.stat()
+                            files.append(ImageFileInfo(relative_path, stat.st_size, stat.st_mtime))
+                    except OSError:
+                        continue
+        return cls(base_dir, files)
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+    def covers(self, base_dir: str | Path) -> bool:
+        """Построен ли индекс для этой директории импорта."""
+        return os.path.normpath(base_dir) == self._base_key
+
+    def get(self, relative_path: str) -> ImageFileInfo | None:
+        """Файл по относительному пути (None — файла нет)."""
+        return self._files.get(os.path.normpath(relative_path).replace(os.sep, "/"))
+
+    def product_images(self, onec_id: str) -> list[str]:
+        """
+        Изображения товара: файлы поддиректории onec_id[:2], имя которых начинается с onec_id.
+
+        Returns:
+            Список относительных путей (например, ["00/001a16a4_image.jpg"])
+        """
+        if not onec_id:
+            return []
+        subdir = onec_id[:2] if len(onec_id) >= 2 else "00"
+        names = self._names_by_subdir.get(subdir)
+        if not names:
+            return []
+        image_paths = []
+        for name in names[bisect.bisect_left(names, onec_id) :]:
+            if not name.startswith(onec_id):
+                break
+            image_paths.append(f"{subdir}/{name}")
+        return image_paths
@@ -0,0 +1,201 @@
+"""
+Производные изображений товаров (WebP/AVIF фиксированной ширины) для srcset.
+
+Производные строятся при импорте из 1С рядом с оригиналом в
+content-addressed хранилище:
+products/images/ab/<sha256>.jpg → products/images/ab/<sha256>-640w.webp.
+
+Набор имён фиксирован настройками: ширины больше оригинала рендерятся
+в размере оригинала (без увеличения), поэтому сериализаторам достаточно
+проверить наличие одного файла-маркера.
+
+Кодирование — CPU-bound, поэтому build_derivatives использует пул процессов.
+"""
+
+from __future__ import annotations
+
+import functools
+import io
+import logging
+import multiprocessing
+from collections.abc import Iterable
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from pathlib import Path, PurePosixPath
+from typing import Any
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps, features
+
+from apps.products.services.image_store import IMAGE_STORE_PREFIX
+
+logger = logging.getLogger(__name__)
+
+# Маркеры, наличие которых уже подтверждено (имена в хранилище неизменяемы)
+_known_derivatives: set[str] = set()
+
+
+def derivative_widths() -> tuple[int, ...]:
+    """Ширины производных по возрастанию."""
+    return tuple(sorted(set(getattr(settings, "PRODUCT_IMAGE_DERIVATIVE_WIDTHS", (320, 640, 1024)))))
+
+
+def derivative_formats() -> tuple[str, ...]:
+    """Форматы производных, поддерживаемые установленным Pillow."""
+    formats = (fmt.lower() for fmt in getattr(settings, "PRODUCT_IMAGE_DERIVATIVE_FORMATS", ("webp",)))
+    return tuple(fmt for fmt in formats if _format_supported(fmt))
+
+
+@functools.lru_cache
+def _format_supported(fmt: str) -> bool:
+    if features.check(fmt):
+        return True
+    logger.warning(f"Pillow без поддержки {fmt}: производные этого формата не строятся")
+    return False
+
+
+def derivative_name(name: str, width: int, fmt: str) -> str:
+    """Путь производной в хранилище: <путь без расширения>-<ширина>w.<формат>."""
+    path = PurePosixPath(name)
+    return str(path.with_name(f"{path.stem}-{width}w.{fmt}"))
+
+
+def has_derivatives(name: str) -> bool:
+    """Построены ли производные для изображения хранилища (проверяется последний записываемый файл)."""
+    widths, formats = derivative_widths(), derivative_formats()
+    if not widths or not formats:
+        return False
+    marker = derivative_name(name, widths[-1], formats[-1])
+    if marker in _known_derivatives:
+        return True
+    if default_storage.exists(marker):
+        _known_derivatives.add(marker)
+        return True
+    return False
+
+
+def image_srcset(image_url: str | None, request: Any = None) -> dict[str, str] | None:
+    """
+    srcset производных изображения по форматам.
+
+    Args:
+        image_url: Путь или URL оригинала (products/..., /media/products/..., /products/...)
+        request: Если передан — URL строятся абсолютными
+
+    Returns:
+        {"webp": "<url> 320w, <url> 640w, ..."} или None, если производных нет
+    """
+    if not image_url or image_url.startswith(("http://", "https://")):
+        return None
+    name = image_url
+    if name.startswith(settings.MEDIA_URL):
+        name = name[len(settings.MEDIA_URL) :]
+    name = name.lstrip("/")
+    if not name.startswith(f"{IMAGE_STORE_PREFIX}/") or not has_derivatives(name):
+        return None
+
+    srcset = {}
+    for fmt in derivative_formats():
+        candidates = []
+        for width in derivative_widths():
+            url = default_storage.url(derivative_name(name, width, fmt))
+            if request is not None and hasattr(request, "build_absolute_uri"):
+                url = request.build_absolute_uri(url)
+            candidates.append(f"{url} {width}w")
+        srcset[fmt] = ", ".join(candidates)
+    return srcset
+
+
+def render_derivatives(
+    source_path: str, widths: tuple[int, ...], formats: tuple[str, ...], quality: int
+) -> list[tuple[int, str, bytes]]:
+    """
+    Кодирует производные одного изображения (выполняется в процессе пула).
+
+    Returns:
+        [(ширина, формат, данные)] в порядке записи: по возрастанию ширины
+    """
+    with Image.open(source_path) as original:
+        # JPEG декодируется сразу в уменьшенном масштабе (DCT scaling)
+        if original.width > widths[-1]:
+            original.draft("RGB", (widths[-1], original.height * widths[-1] // original.width))
+        image = ImageOps.exif_transpose(original)
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if image.mode in ("LA", "P", "PA") else "RGB")
+
+        renditions = []
+        for width in widths:
+            target = image
+            if image.width > width:
+                target = image.resize((width, max(1, round(image.height * width / image.width))), Image.LANCZOS)
+            for fmt in formats:
+                buffer = io.BytesIO()
+                target.save(buffer, format=fmt.upper(), quality=quality)
+                renditions.append((width, fmt, buffer.getvalue()))
+        return renditions
+
+
+def build_derivatives(items: Iterable[tuple[Path, str]], max_workers: int) -> dict[str, int]:
+    """
+    Строит недостающие производные изображений хранилища.
+
+    Args:
+        items: (исходный файл, путь оригинала в хранилище)
+        max_workers: Размер пула процессов; 1 — в текущем процессе
+
+    Returns:
+        Dict: rendered (изображений обработано), errors (не удалось декодировать/закодировать)
+    """
+    widths, formats = derivative_widths(), derivative_formats()
+    quality = getattr(settings, "PRODUCT_IMAGE_DERIVATIVE_QUALITY", 80)
+    result = {"rendered": 0, "errors": 0}
+    if not widths or not formats:
+        return result
+
+    pending = {name: source_path for source_path, name in items if not has_derivatives(name)}
+    if not pending:
+        return result
+
+    with _executor(max_workers if len(pending) > 1 else 1) as executor:
+        futures = {
+            executor.submit(render_derivatives, str(source_path), widths, formats, quality): name
+            for name, source_path in pending.items()
+        }
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                renditions = future.result()
+            except Exception as e:
+                logger.warning(f"Не удалось построить производные {name}: {e}")
+                result["errors"] += 1
+                continue
+            # Маркер (последняя производная) записывается последним: недописанный набор перестроится
+            for width, fmt, data in renditions:
+                rendition_name = derivative_name(name, width, fmt)
+                if not default_storage.exists(rendition_name):
+                    default_storage.save(rendition_name, ContentFile(data))
+            result["rendered"] += 1
+    return result
+
+
+class _InlineExecutor(Executor):
+    """Выполнение в текущем процессе (одно изображение или max_workers=1)."""
+
+    def submit(self, fn, /, *args, **kwargs):
+        future: Future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+
+def _executor(max_workers: int) -> Executor:
+    if max_workers <= 1:
+        return _InlineExecutor()
+    # Демонические процессы (prefork-воркеры Celery) не могут порождать дочерние процессы
+    if multiprocessing.current_process().daemon or "fork" not in multiprocessing.get_all_start_methods():
+        return ThreadPoolExecutor(max_workers=max_workers)
+    # fork: дочерние процессы наследуют настроенный Django и не импортируют модули заново
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("fork"))
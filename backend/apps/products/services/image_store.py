@@ -0,0 +1,137 @@
+"""
+Content-addressed хранилище изображений товаров.
+
+Файл хранится один раз по хэшу содержимого:
+products/images/<первые 2 символа sha256>/<sha256><расширение>.
+Одна и та же картинка в base_images товара и в галерее варианта ссылается
+на один канонический путь — дедупликация происходит при загрузке.
+
+Копирование идёт без чтения файла в память Python: hardlink (если включён
+PRODUCT_IMAGE_STORE_HARDLINKS) или os.copy_file_range в ядре.
+
+ingest_images обрабатывает набор файлов пулом потоков: hashlib и
+copy_file_range отпускают GIL, поэтому потоки масштабируются по I/O.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import shutil
+import uuid
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import default_storage
+
+IMAGE_STORE_PREFIX = "products/images"
+
+
+def image_digest(source_path: Path) -> str:
+    """SHA-256 содержимого файла (потоковое чтение в C, без буфера на весь файл)."""
+    with open(source_path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def image_store_name(digest: str, suffix: str) -> str:
+    """Канонический путь изображения в хранилище (относительно MEDIA_ROOT)."""
+    return f"{IMAGE_STORE_PREFIX}/{digest[:2]}/{digest}{suffix.lower()}"
+
+
+def store_image(source_path: Path, name: str) -> bool:
+    """
+    Помещает файл в хранилище под каноническим именем.
+
+    Returns:
+        True — файл записан, False — изображение с таким хэшем уже есть.
+    """
+    try:
+        destination = Path(default_storage.path(name))
+    except NotImplementedError:
+        # Удалённое хранилище: потоковая загрузка через storage API
+        if default_storage.exists(name):
+            return False
+        with open(source_path, "rb") as f:
+            default_storage.save(name, File(f))
+        return True
+
+    if destination.exists():
+        return False
+
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    # Запись во временный файл и атомарный rename: параллельный импорт того же хэша безопасен
+    tmp_path = destination.with_name(f".{destination.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        if not (getattr(settings, "PRODUCT_IMAGE_STORE_HARDLINKS", False) and _link_file(source_path, tmp_path)):
+            _copy_file(source_path, tmp_path)
+            if settings.FILE_UPLOAD_PERMISSIONS is not None:
+                os.chmod(tmp_path, settings.FILE_UPLOAD_PERMISSIONS)
+        os.replace(tmp_path, destination)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return True
+
+
+def ingest_image(source_path: Path) -> tuple[str, bool]:
+    """
+    Хэширует файл и помещает его в хранилище.
+
+    Returns:
+        (канонический путь, True — файл записан / False — такой хэш уже был в хранилище)
+    """
+    name = image_store_name(image_digest(source_path), source_path.suffix)
+    return name, store_image(source_path, name)
+
+
+def ingest_images(source_paths: Iterable[Path], max_workers: int) -> dict[Path, tuple[str, bool] | Exception]:
+    """
+    ingest_image для набора файлов в пуле из max_workers потоков.
+
+    Ошибка одного файла не прерывает остальные: вместо результата возвращается исключение.
+    """
+    results: dict[Path, tuple[str, bool] | Exception] = {}
+    if max_workers <= 1:
+        for source_path in source_paths:
+            try:
+                results[source_path] = ingest_image(source_path)
+            except Exception as e:
+                results[source_path] = e
+        return results
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="image-ingest") as executor:
+        futures = {executor.submit(ingest_image, source_path): source_path for source_path in source_paths}
+        for future in as_completed(futures):
+            try:
+                results[futures[future]] = future.result()
+            except Exception as e:
+                results[futures[future]] = e
+    return results
+
+
+def _link_file(source_path: Path, destination: Path) -> bool:
+    """Hardlink на исходный файл; False — ФС не поддерживает или другой раздел (EXDEV)."""
+    try:
+        os.link(source_path, destination)
+    except OSError:
+        return False
+    return True
+
+
+def _copy_file(source_path: Path, destination: Path) -> None:
+    """Копирование через os.copy_file_range (в ядре, с reflink на CoW ФС), иначе — копирование потоком."""
+    with open(source_path, "rb") as src, open(destination, "wb") as dst:
+        remaining = os.fstat(src.fileno()).st_size
+        try:
+            while remaining > 0:
+                copied = os.copy_file_range(src.fileno(), dst.fileno(), remaining)
+                if copied == 0:
+                    break
+                remaining -= copied
+        except (AttributeError, OSError):
+            # Нет copy_file_range (не Linux) или ФС его не поддерживает — дописываем с текущих смещений
+            pass
+        shutil.copyfileobj(src, dst)
@@ -14,6 +14,7 @@ import logging
 import os
 import re
 import uuid
+from dataclasses import dataclass, field
 from decimal import Decimal
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Sequence, TypedDict
@@ -26,6 +27,18 @@ from django.utils import timezone
 from django.utils.text import slugify
 
 from apps.products.category_utils import REPAIR_ANCHOR_ONEC_ID
+from apps.products.services.catalog_cache import (
+    NS_ATTRIBUTES,
+    NS_BRANDS,
+    NS_CATEGORIES,
+    NS_PRICES,
+    NS_PRODUCTS,
+    NS_STOCK,
+    bump_catalog_version,
+)
+from apps.products.services.image_catalog import ImageCatalog, ImageFileInfo
+from apps.products.services.image_derivatives import build_derivatives
+from apps.products.services.image_store import ingest_image, ingest_images
 
 if TYPE_CHECKING:
     from apps.products.models import Product, ProductVariant
@@ -33,6 +46,18 @@ if TYPE_CHECKING:
 logger = logging.getLogger("import_products")
 
 
+@dataclass
+class DeferredImages:
+    """Изображения товара/варианта, отложенные до этапа ingest_deferred_images."""
+
+    kind: str  # "product" (base_images) или "variant" (main_image + gallery_images)
+    pk: int
+    image_paths: list[str]
+    base_dir: str
+    # (ключ кэша хранилища, исходный файл) прошедших проверку наличия и размера
+    sources: list[tuple[tuple[str, int, float], Path]] = field(default_factory=list)
+
+
 # ============================================================================
 # TypedDict definitions for parsed data
 # ============================================================================
@@ -281,6 +306,8 @@ class VariantImportProcessor:
             "images_copied": 0,
             "images_skipped": 0,
             "images_errors": 0,
+            "images_derivatives": 0,
+            "images_derivative_errors": 0,
             "attributes_linked": 0,
             "attributes_missing": 0,
             # Story 27.1: Keys for migrated methods
@@ -309,6 +336,16 @@ class VariantImportProcessor:
         # Коллекция всех валидных категорий для деактивации устаревших
         self._valid_category_onec_ids: set[str] = set()
 
+        # Домены кэша каталога, затронутые импортом (bump в finalize_session)
+        self._changed_cache_namespaces: set[str] = set()
+
+        # Индексы директорий изображений (см. use_image_catalog)
+        self._image_catalogs: list[ImageCatalog] = []
+        # (путь, размер, mtime) исходного файла → канонический путь в хранилище изображений
+        self._stored_images: dict[tuple[str, int, float], str] = {}
+        # Отложенные изображения (см. defer_image_ingest); None — изображения сохраняются сразу
+        self._deferred_images: list[DeferredImages] | None = None
+
     # ========================================================================
     # Helper methods
     # ========================================================================
@@ -318,6 +355,27 @@ class VariantImportProcessor:
     # Резервный минимум — используется когда нет изображений >= 100KB
     FALLBACK_MIN_IMAGE_SIZE_BYTES = 8 * 1024
 
+    def use_image_catalog(self, catalog: ImageCatalog) -> None:
+        """
+        Подключает индекс директории изображений.
+
+        Проверки наличия и размера файлов из этой директории берутся из индекса
+        вместо stat() на каждый файл.
+        """
+        self._image_catalogs = [c for c in self._image_catalogs if not c.covers(catalog.base_dir)]
+        self._image_catalogs.append(catalog)
+
+    def _get_image_file_info(self, source_path: Path, base_dir: str | Path | None) -> ImageFileInfo | None:
+        """Размер исходного изображения: из индекса base_dir, иначе stat() (None — файла нет)."""
+        for catalog in self._image_catalogs:
+            if base_dir is not None and catalog.covers(base_dir):
+                return catalog.get(os.path.relpath(source_path, base_dir))
+        try:
+            stat = source_path.stat()
+        except OSError:
+            return None
+        return ImageFileInfo(str(source_path), stat.st_size, stat.st_mtime)
+
     def _get_effective_min_size(self, image_paths: list[str], base_dir: str) -> int:
         """
         Определяет эффективный минимальный размер изображения.
@@ -328,79 +386,84 @@ class VariantImportProcessor:
         """
         for image_path in image_paths:
             normalized_path = normalize_image_path(image_path)
-            source_path = Path(base_dir) / normalized_path
-            try:
-                if source_path.exists() and source_path.stat().st_size >= self.MIN_IMAGE_SIZE_BYTES:
-                    return self.MIN_IMAGE_SIZE_BYTES
-            except OSError:
-                continue
+            info = self._get_image_file_info(Path(base_dir) / normalized_path, base_dir)
+            if info is not None and info.size >= self.MIN_IMAGE_SIZE_BYTES:
+                return self.MIN_IMAGE_SIZE_BYTES
         return self.FALLBACK_MIN_IMAGE_SIZE_BYTES
 
     def _save_image_if_not_exists(
         self,
         source_path: Path,
         image_path: str,
-        destination_prefix: str,
         min_size_bytes: int | None = None,
+        base_dir: str | None = None,
     ) -> str | None:
         """
-        Helper метод для сохранения изображения если оно еще не существует
+        Helper метод для сохранения изображения в content-addressed хранилище
+
+        Путь назначения определяется хэшем содержимого, поэтому одинаковые
+        картинки (base и variant, разные имена в 1С) хранятся один раз.
 
         Args:
             source_path: Путь к исходному файлу изображения
             image_path: Относительный путь изображения из XML
-            destination_prefix: Префикс директории назначения ('base' или 'variants')
             min_size_bytes: Минимальный размер файла; если None — использует MIN_IMAGE_SIZE_BYTES
+            base_dir: Директория импорта; если для неё подключён индекс — размер берётся из него
 
         Returns:
-            Путь к сохраненному файлу или None если файл не найден/ошибка/слишком мал
+            Канонический путь файла или None если файл не найден/ошибка/слишком мал
         """
-        from django.conf import settings
-        from django.core.files.base import ContentFile
-        from django.core.files.storage import default_storage
+        info = self._check_image_source(source_path, min_size_bytes, base_dir)
+        if info is None:
+            return None
 
-        if not source_path.exists():
+        try:
+            # Хэш одного и того же файла (base и variant импорт) считается один раз
+            cache_key = (str(source_path), info.size, info.mtime)
+            destination_path = self._stored_images.get(cache_key)
+            if destination_path is None:
+                destination_path, copied = ingest_image(source_path)
+                self._stored_images[cache_key] = destination_path
+                self._build_image_derivatives([(source_path, destination_path)], max_workers=1)
+                if copied:
+                    self.stats["images_copied"] += 1
+                    return destination_path
+            self.stats["images_skipped"] += 1
+            return destination_path
+        except Exception as e:
+            logger.error(f"Error saving image {image_path}: {e}")
+            self.stats["images_errors"] += 1
+            return None
+
+    def _build_image_derivatives(self, items: list[tuple[Path, str]], max_workers: int) -> None:
+        """WebP/AVIF производные для srcset; ошибка не влияет на импорт оригинала."""
+        try:
+            result = build_derivatives(items, max_workers)
+        except Exception as e:
+            logger.error(f"Error building image derivatives: {e}")
+            self.stats["images_derivative_errors"] += len(items)
+            return
+        self.stats["images_derivatives"] += result["rendered"]
+        self.stats["images_derivative_errors"] += result["errors"]
+
+    def _check_image_source(
+        self, source_path: Path, min_size_bytes: int | None, base_dir: str | None
+    ) -> ImageFileInfo | None:
+        """Исходный файл изображения, если он существует и не меньше минимального размера."""
+        info = self._get_image_file_info(source_path, base_dir)
+        if info is None:
             logger.warning(f"Image not found: {source_path}")
             self.stats["images_errors"] += 1
             return None
 
         effective_min = min_size_bytes if min_size_bytes is not None else self.MIN_IMAGE_SIZE_BYTES
-        file_size = source_path.stat().st_size
+        file_size = info.size
         if file_size < effective_min:
             size_kb = file_size / 1024
             logger.debug(f"Image too small, skipping: {source_path} " f"({size_kb:.1f}KB < {effective_min // 1024}KB)")
             self.stats["images_skipped"] += 1
             return None
-
-        # Сохранение структуры директорий
-        filename = source_path.name
-        subdir = image_path.split("/")[0] if "/" in image_path else ""
-        destination_path = (
-            f"products/{destination_prefix}/{subdir}/{filename}"
-            if subdir
-            else f"products/{destination_prefix}/{filename}"
-        )
-
-        # Проверка существования
-        if default_storage.exists(destination_path):
-            self.stats["images_skipped"] += 1
-            return destination_path
-
-        # Создание директории
-        if subdir:
-            subdir_path = os.path.join(settings.MEDIA_ROOT, "products", destination_prefix, subdir)
-            os.makedirs(subdir_path, exist_ok=True)
-
-        # Копирование файла
-        try:
-            with open(source_path, "rb") as f:
-                saved_path = default_storage.save(destination_path, ContentFile(f.read()))
-            self.stats["images_copied"] += 1
-            return saved_path
-        except Exception as e:
-            logger.error(f"Error saving image {image_path}: {e}")
-            self.stats["images_errors"] += 1
-            return None
+        return info
 
     # ========================================================================
     # Task 1: Рефакторинг парсера goods.xml (AC: 1)
@@ -603,6 +666,153 @@ class VariantImportProcessor:
             logger.info(f"Product {product.onec_id}: synchronized vat_rate={vat_rate} to {updated} existing variants")
         return updated
 
+    def _store_images(self, image_paths: list[str], base_dir: str) -> tuple[list[str], dict[str, str]]:
+        """
+        Сохраняет изображения из 1С в хранилище изображений.
+
+        Returns:
+            (канонические пути в порядке image_paths, имя исходного файла → канонический путь)
+        """
+        saved_paths: list[str] = []
+        canonical_by_name: dict[str, str] = {}
+        effective_min = self._get_effective_min_size(image_paths, base_dir)
+
+        for image_path in image_paths:
+            try:
+                # Нормализация пути (убираем import_files/ если есть)
+                normalized_path = normalize_image_path(image_path)
+                source_path = Path(base_dir) / normalized_path
+                saved_path = self._save_image_if_not_exists(
+                    source_path, normalized_path, min_size_bytes=effective_min, base_dir=base_dir
+                )
+                if saved_path:
+                    saved_paths.append(saved_path)
+                    canonical_by_name[source_path.name] = saved_path
+            except Exception as e:
+                logger.error(f"Error copying image {image_path}: {e}")
+                self.stats["images_errors"] += 1
+
+        return saved_paths, canonical_by_name
+
+    def _canonical_image_path(self, image_path: str, canonical_by_name: dict[str, str]) -> str:
+        """Путь прежней копии (products/base|variants/<subdir>/<имя файла 1С>) → канонический путь."""
+        if not image_path:
+            return image_path
+        return canonical_by_name.get(Path(image_path).name, image_path)
+
+    def defer_image_ingest(self) -> None:
+        """
+        Включает отложенный импорт изображений.
+
+        _import_base_images/_import_variant_images только запоминают, какие
+        изображения нужны товару/варианту. Копирование выполняет
+        ingest_deferred_images — отдельным этапом после записи данных в БД.
+        """
+        if self._deferred_images is None:
+            self._deferred_images = []
+
+    def ingest_deferred_images(self, max_workers: int | None = None) -> dict[str, int]:
+        """
+        Импорт отложенных изображений.
+
+        1. Проверка наличия и размера исходных файлов (по индексу директории).
+        2. Хэширование и копирование уникальных файлов пулом из max_workers потоков.
+        3. Привязка путей к Product/ProductVariant через bulk_update пакетами по batch_size.
+
+        Args:
+            max_workers: Число потоков; если None — PRODUCT_IMAGE_INGEST_WORKERS
+
+        Returns:
+            Dict: files (уникальных файлов в пуле), products_updated, variants_updated
+        """
+        from apps.products.models import Product, ProductVariant
+
+        jobs = self._deferred_images or []
+        if self._deferred_images is not None:
+            self._deferred_images = []
+        if max_workers is None:
+            max_workers = getattr(settings, "PRODUCT_IMAGE_INGEST_WORKERS", 8)
+
+        pending: dict[tuple[str, int, float], Path] = {}
+        for job in jobs:
+            effective_min = self._get_effective_min_size(job.image_paths, job.base_dir)
+            for image_path in job.image_paths:
+                source_path = Path(job.base_dir) / normalize_image_path(image_path)
+                info = self._check_image_source(source_path, effective_min, job.base_dir)
+                if info is None:
+                    continue
+                cache_key = (str(source_path), info.size, info.mtime)
+                job.sources.append((cache_key, source_path))
+                if cache_key not in self._stored_images:
+                    pending[cache_key] = source_path
+
+        results = ingest_images(pending.values(), max_workers)
+        copied_keys: set[tuple[str, int, float]] = set()
+        failed: dict[tuple[str, int, float], Exception] = {}
+        for cache_key, source_path in pending.items():
+            result = results[source_path]
+            if isinstance(result, Exception):
+                failed[cache_key] = result
+                continue
+            self._stored_images[cache_key], copied = result
+            if copied:
+                copied_keys.add(cache_key)
+
+        self._build_image_derivatives(
+            [(source_path, self._stored_images[key]) for key, source_path in pending.items() if key not in failed],
+            max_workers=getattr(settings, "PRODUCT_IMAGE_DERIVATIVE_WORKERS", 4),
+        )
+
+        updated = {"product": 0, "variant": 0}
+        targets = (
+            ("product", Product, ["base_images"], self._merge_base_images),
+            ("variant", ProductVariant, ["main_image", "gallery_images"], self._merge_variant_images),
+        )
+        for kind, model, fields, merge in targets:
+            kind_jobs = [job for job in jobs if job.kind == kind]
+            for start in range(0, len(kind_jobs), self.batch_size):
+                batch = kind_jobs[start : start + self.batch_size]
+                objects = model.objects.only("id", *fields).in_bulk({job.pk for job in batch})
+                changed: dict[int, Any] = {}
+                for job in batch:
+                    saved_paths, canonical_by_name = self._resolve_deferred_sources(job, copied_keys, failed)
+                    obj = objects.get(job.pk)
+                    if obj is not None and merge(obj, saved_paths, canonical_by_name):
+                        changed[obj.pk] = obj
+                if changed:
+                    model.objects.bulk_update(list(changed.values()), fields)
+                    updated[kind] += len(changed)
+
+        logger.info(
+            f"Deferred images ingested: {len(pending)} files ({max_workers} workers), "
+            f"products updated: {updated['product']}, variants updated: {updated['variant']}"
+        )
+        return {"files": len(pending), "products_updated": updated["product"], "variants_updated": updated["variant"]}
+
+    def _resolve_deferred_sources(
+        self,
+        job: DeferredImages,
+        copied_keys: set[tuple[str, int, float]],
+        failed: dict[tuple[str, int, float], Exception],
+    ) -> tuple[list[str], dict[str, str]]:
+        """Результаты пула для изображений одного товара/варианта (в формате _store_images) + статистика."""
+        saved_paths: list[str] = []
+        canonical_by_name: dict[str, str] = {}
+        for cache_key, source_path in job.sources:
+            if cache_key in failed:
+                logger.error(f"Error saving image {source_path}: {failed[cache_key]}")
+                self.stats["images_errors"] += 1
+                continue
+            if cache_key in copied_keys:
+                copied_keys.discard(cache_key)
+                self.stats["images_copied"] += 1
+            else:
+                self.stats["images_skipped"] += 1
+            saved_path = self._stored_images[cache_key]
+            saved_paths.append(saved_path)
+            canonical_by_name[source_path.name] = saved_path
+        return saved_paths, canonical_by_name
+
     def _import_base_images(
         self,
         product: Any,
@@ -620,8 +830,25 @@ class VariantImportProcessor:
         if not image_paths:
             return
 
-        # Дедупликация существующих base_images по filename (исправление бага дублей)
-        existing_images = product.base_images or []
+        if self._deferred_images is not None:
+            self._deferred_images.append(DeferredImages("product", product.pk, list(image_paths), base_dir))
+            return
+
+        saved_paths, canonical_by_name = self._store_images(image_paths, base_dir)
+        if self._merge_base_images(product, saved_paths, canonical_by_name):
+            product.save(update_fields=["base_images"])
+            logger.info(f"Product {product.onec_id} base_images updated: " f"{len(product.base_images)} images")
+
+    def _merge_base_images(self, product: Any, saved_paths: list[str], canonical_by_name: dict[str, str]) -> bool:
+        """
+        Добавляет сохранённые изображения в product.base_images (без записи в БД).
+
+        Returns:
+            True если base_images изменились
+        """
+        # Дедупликация существующих base_images по filename (исправление бага дублей).
+        # Копии, сохранённые до content-addressed хранилища, заменяются каноническим путём.
+        existing_images = [self._canonical_image_path(p, canonical_by_name) for p in product.base_images or []]
         seen_filenames: set[str] = set()
         base_images: list[str] = []
 
@@ -633,36 +860,20 @@ class VariantImportProcessor:
 
         seen_paths: set[str] = set(base_images)
 
-        effective_min = self._get_effective_min_size(image_paths, base_dir)
-
-        for image_path in image_paths:
-            try:
-                # Нормализация пути (убираем import_files/ если есть)
-                normalized_path = normalize_image_path(image_path)
-                source_path = Path(base_dir) / normalized_path
-                saved_path = self._save_image_if_not_exists(
-                    source_path, normalized_path, "base", min_size_bytes=effective_min
-                )
-
-                if saved_path:
-                    saved_filename = Path(saved_path).name
-                    # Проверяем и по пути, и по filename
-                    if saved_filename in seen_filenames:
-                        continue
-                    if saved_path not in seen_paths:
-                        base_images.append(saved_path)
-                        seen_paths.add(saved_path)
-                        seen_filenames.add(saved_filename)
-
-            except Exception as e:
-                logger.error(f"Error copying image {image_path}: {e}")
-                self.stats["images_errors"] += 1
+        for saved_path in saved_paths:
+            saved_filename = Path(saved_path).name
+            # Проверяем и по пути, и по filename
+            if saved_filename in seen_filenames:
+                continue
+            if saved_path not in seen_paths:
+                base_images.append(saved_path)
+                seen_paths.add(saved_path)
+                seen_filenames.add(saved_filename)
 
-        # Сохранение base_images
-        if base_images != list(product.base_images or []):
-            product.base_images = base_images
-            product.save(update_fields=["base_images"])
-            logger.info(f"Product {product.onec_id} base_images updated: " f"{len(base_images)} images")
+        if base_images == list(product.base_images or []):
+            return False
+        product.base_images = base_images
+        return True
 
     # ========================================================================
     # Task 2: Парсер offers.xml для ProductVariant (AC: 2, 3, 4)
@@ -898,10 +1109,34 @@ class VariantImportProcessor:
         if not image_paths:
             return
 
+        if self._deferred_images is not None:
+            self._deferred_images.append(DeferredImages("variant", variant.pk, list(image_paths), base_dir))
+            return
+
+        saved_paths, canonical_by_name = self._store_images(image_paths, base_dir)
+        self._merge_variant_images(variant, saved_paths, canonical_by_name)
+
+        # Сохранение
+        variant.save(update_fields=["main_image", "gallery_images"])
+
+    def _merge_variant_images(self, variant: Any, saved_paths: list[str], canonical_by_name: dict[str, str]) -> bool:
+        """
+        Раскладывает сохранённые изображения в main_image/gallery_images (без записи в БД).
+
+        Returns:
+            True если main_image или gallery_images изменились
+        """
+        previous = (str(variant.main_image or ""), list(variant.gallery_images or []))
+
+        # Копии, сохранённые до content-addressed хранилища, заменяются каноническим путём
+        if variant.main_image:
+            main_image = self._canonical_image_path(str(variant.main_image), canonical_by_name)
+            if main_image != str(variant.main_image):
+                variant.main_image = main_image
         main_image_set = bool(variant.main_image)
 
         # Дедупликация существующих gallery_images по filename (исправление бага дублей)
-        existing_gallery = variant.gallery_images or []
+        existing_gallery = [self._canonical_image_path(p, canonical_by_name) for p in variant.gallery_images or []]
         seen_filenames: set[str] = set()
         gallery_images: list[str] = []
 
@@ -919,39 +1154,23 @@ class VariantImportProcessor:
 
         seen_paths: set[str] = set(gallery_images)
 
-        effective_min = self._get_effective_min_size(image_paths, base_dir)
-
-        for image_path in image_paths:
-            try:
-                # Нормализация пути (убираем import_files/ если есть)
-                normalized_path = normalize_image_path(image_path)
-                source_path = Path(base_dir) / normalized_path
-                saved_path = self._save_image_if_not_exists(
-                    source_path, normalized_path, "variants", min_size_bytes=effective_min
-                )
-
-                if saved_path:
-                    saved_filename = Path(saved_path).name
-                    # Проверяем и по пути, и по filename
-                    if saved_filename in seen_filenames:
-                        continue
-
-                    if not main_image_set:
-                        variant.main_image = saved_path
-                        main_image_set = True
-                        seen_filenames.add(saved_filename)
-                    elif saved_path not in seen_paths:
-                        gallery_images.append(saved_path)
-                        seen_paths.add(saved_path)
-                        seen_filenames.add(saved_filename)
+        for saved_path in saved_paths:
+            saved_filename = Path(saved_path).name
+            # Проверяем и по пути, и по filename
+            if saved_filename in seen_filenames:
+                continue
 
-            except Exception as e:
-                logger.error(f"Error copying variant image {image_path}: {e}")
-                self.stats["images_errors"] += 1
+            if not main_image_set:
+                variant.main_image = saved_path
+                main_image_set = True
+                seen_filenames.add(saved_filename)
+            elif saved_path not in seen_paths:
+                gallery_images.append(saved_path)
+                seen_paths.add(saved_path)
+                seen_filenames.add(saved_filename)
 
-        # Сохранение
         variant.gallery_images = gallery_images
-        variant.save(update_fields=["main_image", "gallery_images"])
+        return (str(variant.main_image or ""), gallery_images) != previous
 
     # ========================================================================
     # Task 3: Обработка товаров без вариантов (AC: 5)
@@ -1734,9 +1953,7 @@ class VariantImportProcessor:
                         category_map[onec_id] = repair_anchor
                         self._valid_category_onec_ids.add(onec_id)
                         result["updated"] += 1
-                        logger.info(
-                            f"Repair-якорь '{name}' обновлён реальным onec_id={onec_id}"
-                        )
+                        logger.info(f"Repair-якорь '{name}' обновлён реальным onec_id={onec_id}")
                         continue
 
                 category, created = Category.objects.update_or_create(
@@ -1803,6 +2020,8 @@ class VariantImportProcessor:
             f"{result['cycles_detected']} cycles detected"
             + (f", filtering={'active' if filtering_active else 'inactive'}" "")
         )
+        if result["created"] or result["updated"]:
+            self._changed_cache_namespaces.add(NS_CATEGORIES)
         return result
 
     def deactivate_obsolete_categories(self) -> None:
@@ -1819,6 +2038,8 @@ class VariantImportProcessor:
         )
 
         logger.info(f"Deactivated {obsolete_categories_updated} obsolete categories.")
+        if obsolete_categories_updated:
+            self._changed_cache_namespaces.add(NS_CATEGORIES)
 
     def _has_circular_reference(
         self,
@@ -2009,13 +2230,8 @@ class VariantImportProcessor:
             f"{result['mappings_updated']} mappings updated"
         )
 
-        # Инвалидация кэша избранных брендов
-        from django.core.cache import cache
-
-        from apps.products.constants import FEATURED_BRANDS_CACHE_KEY
-
-        cache.delete(FEATURED_BRANDS_CACHE_KEY)
-        logger.info("Invalidated featured brands cache after import.")
+        # Кэш брендов (в т.ч. featured) инвалидируется bump'ом версии в finalize_session
+        self._changed_cache_namespaces.add(NS_BRANDS)
 
         return result
 
@@ -2040,6 +2256,37 @@ class VariantImportProcessor:
         except Exception as e:
             logger.error(f"Error updating session report: {e}")
 
+    # Счётчики статистики → домены кэша каталога, которые они затрагивают
+    _STATS_CACHE_NAMESPACES: dict[str, str] = {
+        "products_created": NS_PRODUCTS,
+        "products_updated": NS_PRODUCTS,
+        "variants_created": NS_PRODUCTS,
+        "variants_updated": NS_PRODUCTS,
+        "default_variants_created": NS_PRODUCTS,
+        "images_copied": NS_PRODUCTS,
+        "prices_updated": NS_PRICES,
+        "stocks_updated": NS_STOCK,
+        "attributes_linked": NS_ATTRIBUTES,
+    }
+
+    def invalidate_catalog_cache(self) -> set[str]:
+        """
+        Инвалидирует кэш каталога по доменам, затронутым импортом.
+
+        Returns:
+            Множество доменов, версии которых были увеличены.
+        """
+        namespaces = set(self._changed_cache_namespaces)
+        for stat_key, namespace in self._STATS_CACHE_NAMESPACES.items():
+            if self.stats.get(stat_key):
+                namespaces.add(namespace)
+
+        if namespaces:
+            bump_catalog_version(*sorted(namespaces))
+            logger.info(f"Catalog cache invalidated after import: {', '.join(sorted(namespaces))}")
+        self._changed_cache_namespaces.clear()
+        return namespaces
+
     def finalize_session(self, status: str, error_message: str = "") -> None:
         """Завершение сессии импорта"""
         from apps.products.models import ImportSession
@@ -2051,6 +2298,11 @@ class VariantImportProcessor:
             except Exception as e:
                 logger.error(f"Error during deactivate_obsolete_categories: {e}")
 
+        # Инвалидируем кэш при любом статусе finalize_session: даже неуспешный
+        # импорт мог частично изменить каталог. Вызывающий код, завершающий
+        # сессию без finalize_session, обязан вызвать invalidate_catalog_cache()
+        self.invalidate_catalog_cache()
+
         try:
             session = ImportSession.objects.get(id=self.session_id)
             session.status = status
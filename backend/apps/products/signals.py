@@ -1,18 +1,21 @@
 """
 Signals для инвалидации кэша featured brands при изменении Brand.
 
-LIMITATION: QuerySet.update() и bulk_create/bulk_update обходят Django signals,
-поэтому кэш НЕ инвалидируется при массовых операциях. Для таких случаев
-необходимо вручную вызывать cache.delete(FEATURED_BRANDS_CACHE_KEY).
+Инвалидация выполняется увеличением версии домена brands в реестре версий
+кэша каталога (apps.products.services.catalog_cache), bump откладывается
+до коммита транзакции.
+
+Массовые операции обходят signals: импорт из 1С инвалидирует кэш через
+VariantImportProcessor.invalidate_catalog_cache() (в т.ч. при ошибке импорта),
+merge брендов в админке — явным bump. Прочие QuerySet.update()/bulk_update
+по Brand по-прежнему требуют ручного вызова bump_catalog_version(NS_BRANDS).
 """
 
-from django.core.cache import cache
-from django.db import transaction
 from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 
-from .constants import FEATURED_BRANDS_CACHE_KEY
 from .models import Brand
+from .services.catalog_cache import NS_BRANDS, bump_catalog_version
 
 # Поля Brand, влияющие на featured endpoint payload.
 _FEATURED_RELEVANT_FIELDS = frozenset({"is_featured", "is_active", "name", "slug", "image", "website"})
@@ -39,18 +42,18 @@ def invalidate_featured_brands_cache_on_save(sender, instance, created, **kwargs
     Оптимизация: если обновлено только поле вроде description, инвалидация
     не происходит, предотвращая cache thrashing.
 
-    Использует transaction.on_commit чтобы кэш очищался только после
-    успешного коммита транзакции, предотвращая race condition.
+    bump_catalog_version использует transaction.on_commit, чтобы кэш очищался
+    только после успешного коммита транзакции, предотвращая race condition.
     """
     if created:
         if instance.is_featured and instance.is_active:
-            transaction.on_commit(lambda: cache.delete(FEATURED_BRANDS_CACHE_KEY))
+            bump_catalog_version(NS_BRANDS)
         return
 
     old = getattr(instance, "_pre_save_state", None)
     if old is None:
         # Не удалось загрузить предыдущее состояние — безопасная инвалидация
-        transaction.on_commit(lambda: cache.delete(FEATURED_BRANDS_CACHE_KEY))
+        bump_catalog_version(NS_BRANDS)
         return
 
     # Проверяем, изменились ли релевантные поля
@@ -61,7 +64,7 @@ def invalidate_featured_brands_cache_on_save(sender, instance, created, **kwargs
         if hasattr(new_value, "name"):
             new_value = new_value.name
         if str(old_value) != str(new_value):
-            transaction.on_commit(lambda: cache.delete(FEATURED_BRANDS_CACHE_KEY))
+            bump_catalog_version(NS_BRANDS)
             return
 
 
@@ -72,4 +75,4 @@ def invalidate_featured_brands_cache_on_delete(sender, instance, **kwargs):
     Инвалидирует только если удалённый бренд мог быть в featured выдаче.
     """
     if instance.is_featured and instance.is_active:
-        transaction.on_commit(lambda: cache.delete(FEATURED_BRANDS_CACHE_KEY))
+        bump_catalog_version(NS_BRANDS)
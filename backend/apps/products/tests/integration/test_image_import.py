@@ -200,3 +200,64 @@ class TestImageImportWithNormalization:
 
         # Должна быть ошибка (файл не найден)
         assert processor.stats["images_errors"] > initial_errors
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+class TestDeferredImageIngest:
+    """Отложенный импорт изображений: сбор на этапе БД, копирование пулом, bulk-привязка"""
+
+    @pytest.fixture(autouse=True)
+    def media_root(self, tmp_path, settings):
+        settings.MEDIA_ROOT = tmp_path / "media"
+        return settings.MEDIA_ROOT
+
+    def test_images_attached_only_after_ingest(self, processor, product, variant, temp_import_dir):
+        """До ingest_deferred_images файлы не копируются и пути не записываются"""
+        processor.MIN_IMAGE_SIZE_BYTES = 0
+        processor.defer_image_ingest()
+
+        processor._import_base_images(product, ["xx/test1.jpg", "xx/test2.jpg"], str(temp_import_dir))
+        processor._import_variant_images(variant, ["import_files/xx/test2.jpg"], str(temp_import_dir))
+
+        product.refresh_from_db()
+        assert product.base_images == []
+        assert processor.stats["images_copied"] == 0
+
+        result = processor.ingest_deferred_images(max_workers=4)
+
+        assert result == {"files": 2, "products_updated": 1, "variants_updated": 1}
+        product.refresh_from_db()
+        variant.refresh_from_db()
+        assert len(product.base_images) == 2
+        assert str(variant.main_image) == product.base_images[1]
+        assert (processor.stats["images_copied"], processor.stats["images_skipped"]) == (2, 1)
+
+    def test_deferred_result_matches_serial_import(self, import_session, product, variant, temp_import_dir):
+        """Параллельный этап даёт те же пути, что и последовательный импорт"""
+        serial = VariantImportProcessor(session_id=import_session.id)
+        serial.MIN_IMAGE_SIZE_BYTES = 0
+        serial._import_base_images(product, ["xx/test1.jpg", "xx/test2.jpg"], str(temp_import_dir))
+        expected = list(product.base_images)
+
+        Product.objects.filter(pk=product.pk).update(base_images=[])
+        deferred = VariantImportProcessor(session_id=import_session.id)
+        deferred.MIN_IMAGE_SIZE_BYTES = 0
+        deferred.defer_image_ingest()
+        deferred._import_base_images(product, ["xx/test1.jpg", "xx/test2.jpg"], str(temp_import_dir))
+        deferred.ingest_deferred_images(max_workers=2)
+
+        product.refresh_from_db()
+        assert product.base_images == expected
+
+    def test_missing_file_counted_as_error(self, processor, product, temp_import_dir):
+        """Отсутствующий файл учитывается в images_errors, остальные привязываются"""
+        processor.MIN_IMAGE_SIZE_BYTES = 0
+        processor.defer_image_ingest()
+        processor._import_base_images(product, ["xx/test1.jpg", "nonexistent/missing.jpg"], str(temp_import_dir))
+
+        processor.ingest_deferred_images(max_workers=2)
+
+        product.refresh_from_db()
+        assert len(product.base_images) == 1
+        assert processor.stats["images_errors"] == 1
@@ -5,7 +5,7 @@ Tests cover:
 - AC-1: GET /api/v1/brands/featured/ returns only is_featured=True brands
 - AC-1: Response fields: id, name, slug, image, website
 - AC-1: List ordered by name
-- AC-2: Response is cached for 1 hour with invalidation on Brand changes
+- AC-2: Response is cached (versioned key) with invalidation on Brand changes
 - AC-3: Response returns flat JSON list (no pagination wrapper)
 - AC-3: image field uses cache-safe URL format (relative path without host dependency)
 - Anonymous user access (no auth required)
@@ -24,6 +24,7 @@ from rest_framework.test import APIClient
 from apps.products.constants import FEATURED_BRANDS_CACHE_KEY, FEATURED_BRANDS_CACHE_TIMEOUT, FEATURED_BRANDS_MAX_ITEMS
 from apps.products.factories import BrandFactory, ProductFactory, ProductVariantFactory
 from apps.products.models import Brand
+from apps.products.services.catalog_cache import get_featured_brands_cache_key
 
 
 def _make_png():
@@ -171,15 +172,15 @@ class TestFeaturedBrandsEndpoint:
 
         response_plain = self.client.get(FEATURED_URL)
         assert response_plain.status_code == 200
-        assert cache.get(FEATURED_BRANDS_CACHE_KEY) is not None
-        cached_payload_plain = cache.get(FEATURED_BRANDS_CACHE_KEY)
+        assert cache.get(get_featured_brands_cache_key()) is not None
+        cached_payload_plain = cache.get(get_featured_brands_cache_key())
 
         cache.clear()
         response_filtered = self.client.get(FEATURED_URL, {"is_featured": "false", "has_stock": "true"})
 
         assert response_filtered.status_code == 200
         assert response_filtered.data == response_plain.data
-        assert cache.get(FEATURED_BRANDS_CACHE_KEY) == cached_payload_plain
+        assert cache.get(get_featured_brands_cache_key()) == cached_payload_plain
 
 
 LOCMEM_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
@@ -215,29 +216,29 @@ class TestFeaturedBrandsCaching:
     def test_cache_key_set_after_request(self):
         """AC-2: Cache key is populated after first request."""
         cache.clear()
-        assert cache.get(FEATURED_BRANDS_CACHE_KEY) is None
+        assert cache.get(get_featured_brands_cache_key()) is None
         self.client.get(FEATURED_URL)
-        assert cache.get(FEATURED_BRANDS_CACHE_KEY) is not None
+        assert cache.get(get_featured_brands_cache_key()) is not None
 
     @override_settings(CACHES=LOCMEM_CACHE)
     def test_cache_invalidated_on_brand_save(self):
         """AC-2: Cache is cleared when a Brand is saved (via transaction.on_commit)."""
         cache.clear()
         self.client.get(FEATURED_URL)
-        assert cache.get(FEATURED_BRANDS_CACHE_KEY) is not None
+        assert cache.get(get_featured_brands_cache_key()) is not None
         # Save a brand — signal fires on_commit which invalidates cache
         self.brand.name = "UpdatedBrand"
         self.brand.save()
-        assert cache.get(FEATURED_BRANDS_CACHE_KEY) is None
+        assert cache.get(get_featured_brands_cache_key()) is None
 
     @override_settings(CACHES=LOCMEM_CACHE)
     def test_cache_invalidated_on_brand_delete(self):
         """AC-2: Cache is cleared when a Brand is deleted (via transaction.on_commit)."""
         cache.clear()
         self.client.get(FEATURED_URL)
-        assert cache.get(FEATURED_BRANDS_CACHE_KEY) is not None
+        assert cache.get(get_featured_brands_cache_key()) is not None
         self.brand.delete()
-        assert cache.get(FEATURED_BRANDS_CACHE_KEY) is None
+        assert cache.get(get_featured_brands_cache_key()) is None
 
     @override_settings(CACHES=LOCMEM_CACHE)
     def test_new_brand_visible_after_invalidation(self):
@@ -258,50 +259,50 @@ class TestFeaturedBrandsCaching:
         """Документирует ограничение: QuerySet.update() не инвалидирует кэш."""
         cache.clear()
         self.client.get(FEATURED_URL)
-        assert cache.get(FEATURED_BRANDS_CACHE_KEY) is not None
+        assert cache.get(get_featured_brands_cache_key()) is not None
         # bulk update обходит signals — on_commit не вызывается
         Brand.objects.filter(pk=self.brand.pk).update(name="BulkUpdated")
         # кэш НЕ инвалидирован — это известное ограничение
-        assert cache.get(FEATURED_BRANDS_CACHE_KEY) is not None
+        assert cache.get(get_featured_brands_cache_key()) is not None
 
     @override_settings(CACHES=LOCMEM_CACHE)
     def test_irrelevant_field_change_does_not_invalidate_cache(self):
         """[AI-Review] Изменение description не инвалидирует кэш featured brands."""
         cache.clear()
         self.client.get(FEATURED_URL)
-        assert cache.get(FEATURED_BRANDS_CACHE_KEY) is not None
+        assert cache.get(get_featured_brands_cache_key()) is not None
         self.brand.description = "Updated description that should not bust cache"
         self.brand.save()
-        assert cache.get(FEATURED_BRANDS_CACHE_KEY) is not None
+        assert cache.get(get_featured_brands_cache_key()) is not None
 
     @override_settings(CACHES=LOCMEM_CACHE)
     def test_relevant_field_change_invalidates_cache(self):
         """[AI-Review] Изменение is_featured инвалидирует кэш."""
         cache.clear()
         self.client.get(FEATURED_URL)
-        assert cache.get(FEATURED_BRANDS_CACHE_KEY) is not None
+        assert cache.get(get_featured_brands_cache_key()) is not None
         self.brand.is_featured = False
         self.brand.save()
-        assert cache.get(FEATURED_BRANDS_CACHE_KEY) is None
+        assert cache.get(get_featured_brands_cache_key()) is None
 
     @override_settings(CACHES=LOCMEM_CACHE)
     def test_name_change_invalidates_cache(self):
         """[AI-Review] Изменение name инвалидирует кэш (влияет на сортировку и отображение)."""
         cache.clear()
         self.client.get(FEATURED_URL)
-        assert cache.get(FEATURED_BRANDS_CACHE_KEY) is not None
+        assert cache.get(get_featured_brands_cache_key()) is not None
         self.brand.name = "RenamedBrand"
         self.brand.save()
-        assert cache.get(FEATURED_BRANDS_CACHE_KEY) is None
+        assert cache.get(get_featured_brands_cache_key()) is None
 
     @override_settings(CACHES=LOCMEM_CACHE)
     def test_non_featured_brand_create_does_not_invalidate_cache(self):
         """[AI-Review] Создание non-featured бренда не инвалидирует кэш."""
         cache.clear()
         self.client.get(FEATURED_URL)
-        assert cache.get(FEATURED_BRANDS_CACHE_KEY) is not None
+        assert cache.get(get_featured_brands_cache_key()) is not None
         Brand(name="RegularNew", is_featured=False).save()
-        assert cache.get(FEATURED_BRANDS_CACHE_KEY) is not None
+        assert cache.get(get_featured_brands_cache_key()) is not None
 
     @override_settings(CACHES=LOCMEM_CACHE)
     def test_non_featured_delete_does_not_invalidate_cache(self):
@@ -310,9 +311,9 @@ class TestFeaturedBrandsCaching:
         regular.save()
         cache.clear()
         self.client.get(FEATURED_URL)
-        assert cache.get(FEATURED_BRANDS_CACHE_KEY) is not None
+        assert cache.get(get_featured_brands_cache_key()) is not None
         regular.delete()
-        assert cache.get(FEATURED_BRANDS_CACHE_KEY) is not None
+        assert cache.get(get_featured_brands_cache_key()) is not None
 
 
 @pytest.mark.django_db
@@ -429,7 +430,7 @@ class TestBrandsHasStockGate:
 
         assert response.status_code == 200
         assert {brand["name"] for brand in response.data} == {"Adidas", "Nike"}
-        assert cache.get(FEATURED_BRANDS_CACHE_KEY) is not None
+        assert cache.get(get_featured_brands_cache_key()) is not None
 
     def test_has_stock_does_not_affect_retrieve_action(self):
         nike = BrandFactory(name="Nike", slug="nike")
@@ -524,5 +525,9 @@ class TestFeaturedBrandsConstants:
         assert isinstance(FEATURED_BRANDS_CACHE_KEY, str)
         assert FEATURED_BRANDS_CACHE_KEY == "products:brands:featured:v1"
 
-    def test_cache_timeout_is_one_hour(self):
-        assert FEATURED_BRANDS_CACHE_TIMEOUT == 3600
+    def test_cache_timeout_is_one_day(self):
+        # Свежесть гарантирует версия домена brands, TTL лишь ограничивает память
+        assert FEATURED_BRANDS_CACHE_TIMEOUT == 60 * 60 * 24
+
+    def test_versioned_cache_key_contains_base_key(self):
+        assert FEATURED_BRANDS_CACHE_KEY in get_featured_brands_cache_key()
@@ -0,0 +1,203 @@
+"""
+Тесты реестра версий кэша каталога (generational invalidation).
+
+Проверяет:
+- версии доменов и построение ключей кэша каталога
+- bump версии откладывается до коммита транзакции
+- finalize_session импорта увеличивает версии затронутых доменов
+- фильтр по категории получает свежие потомки после bump
+- массовые действия админки bump'ают версии только при выбранных объектах
+"""
+
+import pytest
+from django.contrib.admin.helpers import ACTION_CHECKBOX_NAME
+from django.core.cache import cache
+from django.db import transaction
+from django.urls import reverse
+
+from apps.products.filters import ProductFilter
+from apps.products.models import Attribute, Category, ImportSession, Product
+from apps.products.services.catalog_cache import (
+    CATALOG_NAMESPACES,
+    NS_ATTRIBUTES,
+    NS_BRANDS,
+    NS_CATEGORIES,
+    NS_PRICES,
+    NS_PRODUCTS,
+    NS_STOCK,
+    build_catalog_cache_key,
+    bump_catalog_version,
+    get_catalog_version,
+    get_catalog_versions,
+)
+from apps.products.services.variant_import import VariantImportProcessor
+
+LOCMEM_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+@pytest.fixture(autouse=True)
+def locmem_cache(settings):
+    settings.CACHES = LOCMEM_CACHE
+    cache.clear()
+
+
+class TestCatalogVersionRegistry:
+    """Версии доменов и ключи кэша каталога."""
+
+    def test_versions_initialized_for_all_namespaces(self):
+        versions = get_catalog_versions(*CATALOG_NAMESPACES)
+        assert set(versions) == set(CATALOG_NAMESPACES)
+        assert all(v > 0 for v in versions.values())
+
+    def test_version_is_stable_without_bump(self):
+        assert get_catalog_version(NS_PRODUCTS) == get_catalog_version(NS_PRODUCTS)
+
+    def test_unknown_namespace_raises(self):
+        with pytest.raises(ValueError):
+            get_catalog_version("unknown")
+        with pytest.raises(ValueError):
+            bump_catalog_version("unknown")
+
+    def test_key_contains_base_and_versions(self):
+        key = build_catalog_cache_key("categories:descendants:1", NS_CATEGORIES, NS_PRODUCTS)
+        assert key.startswith("catalog:categories:descendants:1:")
+        assert f"categories={get_catalog_version(NS_CATEGORIES)}" in key
+        assert f"products={get_catalog_version(NS_PRODUCTS)}" in key
+
+    @pytest.mark.django_db
+    def test_bump_changes_only_requested_namespaces(self, django_capture_on_commit_callbacks):
+        categories_before = build_catalog_cache_key("x", NS_CATEGORIES)
+        brands_before = build_catalog_cache_key("x", NS_BRANDS)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            bump_catalog_version(NS_CATEGORIES)
+
+        assert build_catalog_cache_key("x", NS_CATEGORIES) != categories_before
+        assert build_catalog_cache_key("x", NS_BRANDS) == brands_before
+
+    @pytest.mark.django_db(transaction=True)
+    def test_bump_deferred_until_commit(self):
+        before = get_catalog_version(NS_STOCK)
+
+        with transaction.atomic():
+            bump_catalog_version(NS_STOCK)
+            assert get_catalog_version(NS_STOCK) == before
+
+        assert get_catalog_version(NS_STOCK) == before + 1
+
+    @pytest.mark.django_db(transaction=True)
+    def test_bump_discarded_on_rollback(self):
+        before = get_catalog_version(NS_STOCK)
+
+        with pytest.raises(RuntimeError):
+            with transaction.atomic():
+                bump_catalog_version(NS_STOCK)
+                raise RuntimeError("rollback")
+
+        assert get_catalog_version(NS_STOCK) == before
+
+    @pytest.mark.django_db
+    def test_bump_recovers_from_evicted_version_key(self, django_capture_on_commit_callbacks):
+        before = get_catalog_version(NS_PRICES)
+        cache.delete("catalog:version:prices")
+
+        with django_capture_on_commit_callbacks(execute=True):
+            bump_catalog_version(NS_PRICES)
+
+        assert get_catalog_version(NS_PRICES) != before
+
+
+@pytest.mark.django_db
+class TestImportInvalidation:
+    """finalize_session увеличивает версии доменов, затронутых импортом."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        session = ImportSession.objects.create(import_type="catalog")
+        self.processor = VariantImportProcessor(session_id=session.id)
+
+    def test_finalize_bumps_namespaces_from_stats(self, django_capture_on_commit_callbacks):
+        before = get_catalog_versions(*CATALOG_NAMESPACES)
+        self.processor.stats["prices_updated"] = 3
+        self.processor.stats["stocks_updated"] = 2
+
+        with django_capture_on_commit_callbacks(execute=True):
+            self.processor.finalize_session(status=ImportSession.ImportStatus.COMPLETED)
+
+        after = get_catalog_versions(*CATALOG_NAMESPACES)
+        assert after[NS_PRICES] == before[NS_PRICES] + 1
+        assert after[NS_STOCK] == before[NS_STOCK] + 1
+        assert after[NS_PRODUCTS] == before[NS_PRODUCTS]
+        assert after[NS_BRANDS] == before[NS_BRANDS]
+
+    def test_brands_import_marks_brands_namespace(self, django_capture_on_commit_callbacks):
+        before = get_catalog_version(NS_BRANDS)
+        self.processor.process_brands([{"id": "brand-1", "name": "Brand One"}])
+
+        with django_capture_on_commit_callbacks(execute=True):
+            namespaces = self.processor.invalidate_catalog_cache()
+
+        assert NS_BRANDS in namespaces
+        assert get_catalog_version(NS_BRANDS) == before + 1
+
+    def test_nothing_changed_does_not_bump(self, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=True) as callbacks:
+            namespaces = self.processor.invalidate_catalog_cache()
+
+        assert namespaces == set()
+        assert callbacks == []
+
+
+@pytest.mark.django_db
+class TestCategoryDescendantsCache:
+    """Кэш потомков категории обновляется сразу после bump домена categories."""
+
+    def test_new_child_visible_after_bump(self, django_capture_on_commit_callbacks):
+        root = Category.objects.create(name="Root", slug="root-cc", is_active=True)
+        filterset = ProductFilter(data={}, queryset=Product.objects.all())
+        filterset.filter_category_id(Product.objects.all(), "category_id", root.id)
+
+        child = Category.objects.create(name="Child", slug="child-cc", parent=root, is_active=True)
+        cached_key = build_catalog_cache_key(f"categories:descendants:{root.id}", NS_CATEGORIES)
+        assert child.id not in cache.get(cached_key)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            bump_catalog_version(NS_CATEGORIES)
+
+        filterset.filter_category_id(Product.objects.all(), "category_id", root.id)
+        fresh_key = build_catalog_cache_key(f"categories:descendants:{root.id}", NS_CATEGORIES)
+        assert fresh_key != cached_key
+        assert child.id in cache.get(fresh_key)
+
+
+@pytest.mark.django_db
+class TestAdminActionInvalidation:
+    """Массовые действия админки bump'ают версии только при реальном выполнении."""
+
+    @pytest.fixture
+    def admin_client(self, client, django_user_model):
+        admin_user = django_user_model.objects.create_superuser(email="cache-admin@example.com", password="pass12345")
+        client.force_login(admin_user)
+        return client
+
+    def test_action_with_selection_bumps(self, admin_client, django_capture_on_commit_callbacks):
+        attribute = Attribute.objects.create(name="Цвет", slug="color-cc", is_active=False)
+        before = get_catalog_version(NS_ATTRIBUTES)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            response = admin_client.post(
+                reverse("admin:products_attribute_changelist"),
+                {"action": "activate_attributes", ACTION_CHECKBOX_NAME: [attribute.pk]},
+            )
+
+        assert response.status_code == 302
+        assert get_catalog_version(NS_ATTRIBUTES) == before + 1
+
+    def test_action_without_selection_does_not_bump(self, admin_client, django_capture_on_commit_callbacks):
+        Attribute.objects.create(name="Размер", slug="size-cc", is_active=False)
+        before = get_catalog_version(NS_ATTRIBUTES)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            admin_client.post(reverse("admin:products_attribute_changelist"), {"action": "activate_attributes"})
+
+        assert get_catalog_version(NS_ATTRIBUTES) == before
@@ -8,6 +8,7 @@ from __future__ import annotations
 from decimal import Decimal
 
 import pytest
+from django.core.cache import cache
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
@@ -137,6 +138,11 @@ class TestVisibleCategoriesAction:
 class TestCategoryTreeInStockCount:
     """in_stock_count в CategoryTreeViewSet"""
 
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        # Дерево кэшируется по версиям каталога; фабрики меняют БД без bump
+        cache.clear()
+
     @pytest.fixture
     def client(self):
         return APIClient()
@@ -0,0 +1,74 @@
+"""
+Unit tests for ImageCatalog — индекс директории изображений 1С одним проходом os.scandir
+"""
+
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from apps.products.services.image_catalog import ImageCatalog
+from apps.products.services.variant_import import VariantImportProcessor
+
+
+@pytest.fixture
+def import_dir(tmp_path):
+    """goods/import_files: поддиректории по первым двум символам onec_id"""
+    (tmp_path / "ab").mkdir()
+    (tmp_path / "ab" / "abc123_2.JPG").write_bytes(b"x" * 200)
+    (tmp_path / "ab" / "abc123_1.jpg").write_bytes(b"x" * 100)
+    (tmp_path / "ab" / "abc123.txt").write_bytes(b"x")
+    (tmp_path / "ab" / "abc1234_1.png").write_bytes(b"x")
+    (tmp_path / "ab" / "abd_1.jpg").write_bytes(b"x")
+    (tmp_path / "ab" / "nested").mkdir()
+    (tmp_path / "ab" / "nested" / "abc123_deep.jpg").write_bytes(b"x" * 300)
+    return tmp_path
+
+
+@pytest.mark.unit
+class TestImageCatalog:
+    """Тесты для ImageCatalog"""
+
+    def test_product_images_by_onec_id_prefix(self, import_dir):
+        """Файлы поддиректории onec_id[:2] с префиксом onec_id и расширением изображения"""
+        catalog = ImageCatalog.build(import_dir)
+
+        assert catalog.product_images("abc123") == ["ab/abc1234_1.png", "ab/abc123_1.jpg", "ab/abc123_2.JPG"]
+        assert catalog.product_images("abd") == ["ab/abd_1.jpg"]
+        assert catalog.product_images("zz999") == []
+        assert catalog.product_images("") == []
+
+    def test_files_indexed_with_size(self, import_dir):
+        """Все файлы (включая вложенные) доступны по относительному пути с размером"""
+        catalog = ImageCatalog.build(import_dir)
+
+        assert len(catalog) == 6
+        assert catalog.get("ab/abc123_2.JPG").size == 200
+        assert catalog.get("ab/nested/abc123_deep.jpg").size == 300
+        assert catalog.get("ab/missing.jpg") is None
+
+    def test_missing_directory_gives_empty_catalog(self, tmp_path):
+        """Отсутствующая директория — пустой индекс"""
+        catalog = ImageCatalog.build(tmp_path / "missing")
+
+        assert len(catalog) == 0
+        assert catalog.product_images("abc") == []
+
+    def test_processor_uses_catalog_instead_of_stat(self, import_dir):
+        """С подключённым индексом размеры изображений не запрашиваются через stat()"""
+        processor = VariantImportProcessor(session_id=0)
+        processor.use_image_catalog(ImageCatalog.build(import_dir))
+        processor.MIN_IMAGE_SIZE_BYTES = 150
+
+        with patch.object(Path, "stat", side_effect=AssertionError("stat() called")):
+            effective_min = processor._get_effective_min_size(["import_files/ab/abc123_2.JPG"], str(import_dir))
+            missing = processor._save_image_if_not_exists(
+                import_dir / "ab" / "missing.jpg", "ab/missing.jpg", base_dir=str(import_dir)
+            )
+            too_small = processor._save_image_if_not_exists(
+                import_dir / "ab" / "abc123_1.jpg", "ab/abc123_1.jpg", base_dir=str(import_dir)
+            )
+
+        assert effective_min == 150
+        assert missing is None and processor.stats["images_errors"] == 1
+        assert too_small is None and processor.stats["images_skipped"] == 1
@@ -0,0 +1,95 @@
+"""
+Unit tests for image_derivatives — WebP/AVIF производные изображений для srcset
+"""
+
+from pathlib import Path
+
+import pytest
+from PIL import Image
+
+from apps.products.services import image_derivatives
+from apps.products.services.image_derivatives import (
+    build_derivatives,
+    derivative_name,
+    has_derivatives,
+    image_srcset,
+    render_derivatives,
+)
+from apps.products.services.image_store import ingest_image
+from apps.products.services.variant_import import VariantImportProcessor
+
+
+@pytest.fixture(autouse=True)
+def media_root(tmp_path, settings):
+    settings.MEDIA_ROOT = tmp_path / "media"
+    settings.PRODUCT_IMAGE_DERIVATIVE_WIDTHS = [320, 640]
+    settings.PRODUCT_IMAGE_DERIVATIVE_FORMATS = ["webp"]
+    image_derivatives._known_derivatives.clear()
+    yield settings.MEDIA_ROOT
+    image_derivatives._known_derivatives.clear()
+
+
+def _write_jpeg(path: Path, width: int, height: int, color: str = "red") -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    Image.new("RGB", (width, height), color).save(path, "JPEG")
+    return path
+
+
+@pytest.mark.unit
+class TestImageDerivatives:
+    """Тесты для image_derivatives"""
+
+    def test_derivative_name_next_to_original(self):
+        assert derivative_name("products/images/ab/abc.jpg", 640, "webp") == "products/images/ab/abc-640w.webp"
+
+    def test_render_downscales_without_upscaling(self, tmp_path):
+        source = _write_jpeg(tmp_path / "src.jpg", 800, 400)
+
+        renditions = render_derivatives(str(source), (320, 640, 1024), ("webp",), 80)
+
+        sizes = []
+        for width, fmt, data in renditions:
+            path = tmp_path / f"out-{width}.{fmt}"
+            path.write_bytes(data)
+            with Image.open(path) as image:
+                assert image.format == "WEBP"
+                sizes.append(image.size)
+        assert sizes == [(320, 160), (640, 320), (800, 400)]
+
+    def test_build_writes_renditions_and_srcset(self, tmp_path, media_root):
+        source = _write_jpeg(tmp_path / "import" / "ab" / "abc_1.jpg", 1000, 500)
+        name, _ = ingest_image(source)
+
+        assert build_derivatives([(source, name)], max_workers=1) == {"rendered": 1, "errors": 0}
+        assert (media_root / derivative_name(name, 320, "webp")).exists()
+        assert has_derivatives(name)
+
+        srcset = image_srcset(f"/media/{name}")
+        stem = name.rsplit(".", 1)[0]
+        assert srcset == {"webp": f"/media/{stem}-320w.webp 320w, /media/{stem}-640w.webp 640w"}
+        # Повторный запуск ничего не перестраивает
+        assert build_derivatives([(source, name)], max_workers=1) == {"rendered": 0, "errors": 0}
+
+    def test_corrupt_image_counted_as_error(self, tmp_path):
+        source = tmp_path / "broken.jpg"
+        source.write_bytes(b"not an image")
+        name, _ = ingest_image(source)
+
+        assert build_derivatives([(source, name)], max_workers=1) == {"rendered": 0, "errors": 1}
+        assert image_srcset(name) is None
+
+    def test_srcset_only_for_image_store_paths(self):
+        assert image_srcset("/media/products/base/ab/abc.jpg") is None
+        assert image_srcset("https://cdn.example.com/products/images/ab/abc.jpg") is None
+        assert image_srcset(None) is None
+
+    def test_import_builds_derivatives(self, tmp_path):
+        import_dir = tmp_path / "import"
+        _write_jpeg(import_dir / "ab" / "abc_1.jpg", 700, 700)
+        processor = VariantImportProcessor(session_id=0)
+        processor.MIN_IMAGE_SIZE_BYTES = 0
+
+        name = processor._save_image_if_not_exists(import_dir / "ab" / "abc_1.jpg", "ab/abc_1.jpg")
+
+        assert name is not None and has_derivatives(name)
+        assert processor.stats["images_derivatives"] == 1
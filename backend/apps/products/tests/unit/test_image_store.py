@@ -0,0 +1,87 @@
+"""
+Unit tests for image_store — content-addressed хранилище изображений товаров
+"""
+
+import hashlib
+from unittest.mock import MagicMock
+
+import pytest
+
+from apps.products.services.image_store import image_digest, image_store_name, store_image
+from apps.products.services.variant_import import VariantImportProcessor
+
+IMAGE_BYTES = b"\xff\xd8\xff\xe0" + b"image" * 100
+
+
+@pytest.fixture
+def media_root(tmp_path, settings):
+    settings.MEDIA_ROOT = tmp_path / "media"
+    settings.PRODUCT_IMAGE_STORE_HARDLINKS = False
+    return settings.MEDIA_ROOT
+
+
+@pytest.fixture
+def import_dir(tmp_path):
+    """goods/import_files: одна и та же картинка под разными именами"""
+    (tmp_path / "import" / "ab").mkdir(parents=True)
+    (tmp_path / "import" / "ab" / "abc_1.jpg").write_bytes(IMAGE_BYTES)
+    (tmp_path / "import" / "ab" / "abc#1_1.JPG").write_bytes(IMAGE_BYTES)
+    (tmp_path / "import" / "ab" / "abc_2.jpg").write_bytes(IMAGE_BYTES + b"2")
+    return tmp_path / "import"
+
+
+@pytest.fixture
+def processor():
+    processor = VariantImportProcessor(session_id=0)
+    processor.MIN_IMAGE_SIZE_BYTES = 0
+    return processor
+
+
+@pytest.mark.unit
+class TestImageStore:
+    """Тесты для image_store"""
+
+    def test_store_name_is_sha256_of_content(self, import_dir):
+        digest = image_digest(import_dir / "ab" / "abc_1.jpg")
+
+        assert digest == hashlib.sha256(IMAGE_BYTES).hexdigest()
+        assert image_store_name(digest, ".JPG") == f"products/images/{digest[:2]}/{digest}.jpg"
+
+    def test_existing_hash_is_not_copied_again(self, media_root, import_dir):
+        source = import_dir / "ab" / "abc_1.jpg"
+        name = image_store_name(image_digest(source), ".jpg")
+
+        assert store_image(source, name) is True
+        assert store_image(source, name) is False
+        stored = media_root / name
+        assert stored.read_bytes() == IMAGE_BYTES
+        assert stored.stat().st_ino != source.stat().st_ino
+        assert [p.name for p in stored.parent.iterdir()] == [stored.name]
+
+    def test_hardlink_mode_shares_inode(self, media_root, import_dir, settings):
+        settings.PRODUCT_IMAGE_STORE_HARDLINKS = True
+        source = import_dir / "ab" / "abc_1.jpg"
+        name = image_store_name(image_digest(source), ".jpg")
+
+        assert store_image(source, name) is True
+        assert (media_root / name).stat().st_ino == source.stat().st_ino
+
+    def test_same_image_in_base_and_variant_stored_once(self, media_root, import_dir, processor):
+        product = MagicMock(onec_id="abc", base_images=[])
+        variant = MagicMock(main_image="", gallery_images=[])
+
+        processor._import_base_images(product, ["ab/abc_1.jpg", "ab/abc_2.jpg"], str(import_dir))
+        processor._import_variant_images(variant, ["import_files/ab/abc#1_1.JPG"], str(import_dir))
+
+        assert len(product.base_images) == 2
+        assert variant.main_image == product.base_images[0]
+        assert processor.stats["images_copied"] == 2
+        assert processor.stats["images_skipped"] == 1
+        assert len(list((media_root / "products" / "images").rglob("*.jpg"))) == 2
+
+    def test_legacy_copies_replaced_with_canonical_path(self, media_root, import_dir, processor):
+        product = MagicMock(onec_id="abc", base_images=["products/base/ab/abc_1.jpg"])
+
+        processor._import_base_images(product, ["ab/abc_1.jpg"], str(import_dir))
+
+        assert product.base_images == [image_store_name(image_digest(import_dir / "ab" / "abc_1.jpg"), ".jpg")]
@@ -7,6 +7,7 @@ from __future__ import annotations
 import logging
 from typing import Any
 
+from asgiref.sync import sync_to_async
 from django.conf import settings
 from django.core.cache import cache
 from django.db.models import Count, Exists, Min, OuterRef, Prefetch, Q, Sum
@@ -19,8 +20,11 @@ from rest_framework.pagination import PageNumberPagination
 from rest_framework.request import Request
 from rest_framework.response import Response
 
+from apps.common.async_views import AsyncAPIViewMixin
+from apps.common.db_routing import ReplicaReadMixin
+
 from .category_utils import FULL_PLACEHOLDER_CATEGORY_RE_PATTERN
-from .constants import FEATURED_BRANDS_CACHE_KEY, FEATURED_BRANDS_CACHE_TIMEOUT, FEATURED_BRANDS_MAX_ITEMS
+from .constants import CATEGORY_TREE_CACHE_TIMEOUT, FEATURED_BRANDS_CACHE_TIMEOUT, FEATURED_BRANDS_MAX_ITEMS
 from .filters import CategoryFilter, ProductFilter
 from .models import Attribute, AttributeValue, Brand, Category, Product, ProductVariant
 from .serializers import (
@@ -32,6 +36,13 @@ from .serializers import (
     ProductDetailSerializer,
     ProductListSerializer,
 )
+from .services.catalog_cache import (
+    NS_CATEGORIES,
+    NS_PRODUCTS,
+    NS_STOCK,
+    abuild_catalog_cache_key,
+    aget_featured_brands_cache_key,
+)
 from .services.facets import AttributeFacetService
 
 logger = logging.getLogger(__name__)
@@ -47,7 +58,7 @@ class BrandPageNumberPagination(CustomPageNumberPagination):
     max_page_size = 500
 
 
-class ProductViewSet(viewsets.ReadOnlyModelViewSet):
+class ProductViewSet(ReplicaReadMixin, viewsets.ReadOnlyModelViewSet):
     """
     ViewSet для товаров с фильтрацией, сортировкой и ролевым ценообразованием
     """
@@ -266,7 +277,7 @@ class ProductViewSet(viewsets.ReadOnlyModelViewSet):
         return Response({"brand_ids": brand_ids})
 
 
-class CategoryViewSet(viewsets.ReadOnlyModelViewSet):
+class CategoryViewSet(ReplicaReadMixin, viewsets.ReadOnlyModelViewSet):
     """
     ViewSet для категорий с поддержкой иерархии
     """
@@ -313,12 +324,13 @@ class CategoryViewSet(viewsets.ReadOnlyModelViewSet):
         return super().retrieve(request, *args, **kwargs)
 
 
-class CategoryTreeViewSet(viewsets.ReadOnlyModelViewSet):
+class CategoryTreeViewSet(AsyncAPIViewMixin, ReplicaReadMixin, viewsets.ReadOnlyModelViewSet):
     """
     ViewSet для публичного дерева категорий.
 
     В БД хранится полное дерево 1С с якорем СПОРТ. Публичный контракт отдаёт
-    прямых детей СПОРТ как корни витрины.
+    прямых детей СПОРТ как корни витрины. list асинхронный: попадание в кэш
+    обслуживается в event loop без потока воркера.
     """
 
     permission_classes = [permissions.AllowAny]
@@ -369,13 +381,29 @@ class CategoryTreeViewSet(viewsets.ReadOnlyModelViewSet):
         description="Получение иерархического дерева категорий для навигации",
         tags=["Categories"],
     )
-    def list(self, request, *args, **kwargs):
-        return super().list(request, *args, **kwargs)
+    async def list(self, request, *args, **kwargs):
+        """Дерево целиком кэшируется по версиям categories/products/stock.
+
+        Рекурсивный get_children выполняет запрос на каждый узел, поэтому
+        кэш снимает основную нагрузку. Ключ включает host: сериализатор
+        отдаёт абсолютные URL изображений.
+        """
+        cache_key = await abuild_catalog_cache_key(
+            f"categories:tree:{request.build_absolute_uri('/')}", NS_CATEGORIES, NS_PRODUCTS, NS_STOCK
+        )
+        cached = await cache.aget(cache_key)
+        if cached is not None:
+            return Response(cached)
+
+        # Рекурсивный сериализатор синхронный — построение дерева уходит в пул потоков
+        response = await sync_to_async(super().list)(request, *args, **kwargs)
+        await cache.aset(cache_key, response.data, CATEGORY_TREE_CACHE_TIMEOUT)
+        return response
 
 
-class BrandViewSet(viewsets.ReadOnlyModelViewSet):
+class BrandViewSet(AsyncAPIViewMixin, ReplicaReadMixin, viewsets.ReadOnlyModelViewSet):
     """
-    ViewSet для брендов
+    ViewSet для брендов (featured — асинхронный, list/retrieve выполняются в пуле потоков)
     """
 
     permission_classes = [permissions.AllowAny]
@@ -442,19 +470,21 @@ class BrandViewSet(viewsets.ReadOnlyModelViewSet):
     @extend_schema(
         summary="Избранные бренды",
         description=(
-            "Получение списка избранных брендов для отображения на главной странице. " "Ответ кэшируется на 1 час."
+            "Получение списка избранных брендов для отображения на главной странице. "
+            "Ответ кэшируется до изменения брендов (не дольше 24 часов)."
         ),
         tags=["Brands"],
     )
     @action(detail=False, methods=["get"], url_path="featured", pagination_class=None, filter_backends=[])
-    def featured(self, request: Request, *args: Any, **kwargs: Any) -> Response:
-        """Список избранных брендов с кэшированием на 1 час (flat JSON list).
+    async def featured(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        """Список избранных брендов с кэшированием по версии брендов (flat JSON list).
 
         filter_backends=[] intentionally bypasses global SearchFilter because
         this action uses a fixed cache key — applying search params would serve
         stale/wrong cached results. Search is available on the list endpoint.
         """
-        cached = cache.get(FEATURED_BRANDS_CACHE_KEY)
+        cache_key = await aget_featured_brands_cache_key()
+        cached = await cache.aget(cache_key)
         if cached is not None:
             return Response(cached)
 
@@ -463,15 +493,16 @@ class BrandViewSet(viewsets.ReadOnlyModelViewSet):
             .filter(is_featured=True)
             .exclude(Q(image="") | Q(image__isnull=True))[:FEATURED_BRANDS_MAX_ITEMS]
         )
+        brands = [brand async for brand in queryset]
 
         # Не передаем request в контекст, чтобы в кэш не попадал host из заголовка.
-        serializer = BrandFeaturedSerializer(queryset, many=True, context={})
+        serializer = BrandFeaturedSerializer(brands, many=True, context={})
         payload = serializer.data
-        cache.set(FEATURED_BRANDS_CACHE_KEY, payload, FEATURED_BRANDS_CACHE_TIMEOUT)
+        await cache.aset(cache_key, payload, FEATURED_BRANDS_CACHE_TIMEOUT)
         return Response(payload)
 
 
-class AttributeFilterViewSet(viewsets.ReadOnlyModelViewSet):
+class AttributeFilterViewSet(ReplicaReadMixin, viewsets.ReadOnlyModelViewSet):
     """
     ViewSet для фильтров каталога на основе активных атрибутов.
 
@@ -5,6 +5,7 @@ Django management команда для импорта клиентов из 1С
 from __future__ import annotations
 
 import logging
+from itertools import chain
 from pathlib import Path
 from typing import Any
 
@@ -35,6 +36,9 @@ class Command(BaseCommand):
 
     help = "Импортирует клиентов из директории с файлами 1С (contragents*.xml)."
 
+    # Сколько пакетов парсер готовит заранее, пока процессор пишет текущий
+    PARSE_PREFETCH_CHUNKS = 2
+
     def add_arguments(self, parser: Any) -> None:
         parser.add_argument(
             "--data-dir",
@@ -128,15 +132,17 @@ class Command(BaseCommand):
 
                 try:
                     with transaction.atomic():
-                        # Парсинг данных из XML
-                        self.stdout.write("  Парсинг файла...")
-                        customer_data = parser.parse(str(file_path))
-
-                        self.stdout.write(self.style.SUCCESS(f"  Распознано {len(customer_data)} клиентов"))
+                        # Потоковый парсинг XML: пакеты уходят в процессор по мере
+                        # разбора, следующий пакет разбирается, пока пишется текущий
+                        self.stdout.write("  Парсинг и обработка клиентов...")
+                        customer_chunks = parser.iter_customer_chunks(
+                            str(file_path), chunk_size=chunk_size, prefetch=self.PARSE_PREFETCH_CHUNKS
+                        )
+                        result = processor.process_customers(
+                            chain.from_iterable(customer_chunks), chunk_size=chunk_size
+                        )
 
-                        # Обработка данных
-                        self.stdout.write("  Обработка клиентов...")
-                        result = processor.process_customers(customer_data, chunk_size=chunk_size)
+                        self.stdout.write(self.style.SUCCESS(f"  Распознано {result['total']} клиентов"))
 
                         # Суммируем статистику
                         for key in total_stats.keys():
@@ -15,6 +15,7 @@ from django.template.loader import render_to_string
 from django.utils import timezone
 
 from apps.common.models import CustomerSyncLog, SyncConflict
+from apps.common.services.sync_log_buffer import write_sync_log
 from apps.users.models import User
 
 logger = logging.getLogger(__name__)
@@ -288,18 +289,20 @@ class CustomerConflictResolver:
             conflicting_fields: Список конфликтующих полей
             source: Источник конфликта
         """
-        CustomerSyncLog.objects.create(
-            session="",  # Session опционален для conflict resolution
-            customer=customer,
-            onec_id=customer.onec_id or "",
-            operation_type=CustomerSyncLog.OperationType.CONFLICT_RESOLUTION,
-            status=CustomerSyncLog.StatusType.SUCCESS,
-            correlation_id=uuid.uuid4(),
-            details={
-                "conflict_source": source,
-                "resolution_strategy": "onec_wins",
-                "conflicting_fields": conflicting_fields,
-            },
+        write_sync_log(
+            CustomerSyncLog(
+                session="",  # Session опционален для conflict resolution
+                customer=customer,
+                onec_id=customer.onec_id or "",
+                operation_type=CustomerSyncLog.OperationType.CONFLICT_RESOLUTION,
+                status=CustomerSyncLog.StatusType.SUCCESS,
+                correlation_id=uuid.uuid4(),
+                details={
+                    "conflict_source": source,
+                    "resolution_strategy": "onec_wins",
+                    "conflicting_fields": conflicting_fields,
+                },
+            )
         )
 
     def _send_notification_safe(
@@ -387,13 +390,15 @@ class CustomerConflictResolver:
             customer: Клиент
             error_message: Сообщение об ошибке
         """
-        CustomerSyncLog.objects.create(
-            session="",  # Session опционален для notification errors
-            customer=customer,
-            onec_id=customer.onec_id or "",
-            operation_type=CustomerSyncLog.OperationType.NOTIFICATION_FAILED,
-            status=CustomerSyncLog.StatusType.WARNING,
-            correlation_id=uuid.uuid4(),
-            details={"error": error_message},
-            error_message=error_message,
+        write_sync_log(
+            CustomerSyncLog(
+                session="",  # Session опционален для notification errors
+                customer=customer,
+                onec_id=customer.onec_id or "",
+                operation_type=CustomerSyncLog.OperationType.NOTIFICATION_FAILED,
+                status=CustomerSyncLog.StatusType.WARNING,
+                correlation_id=uuid.uuid4(),
+                details={"error": error_message},
+                error_message=error_message,
+            )
         )
@@ -7,6 +7,7 @@ import re
 from typing import Optional, Tuple
 
 from apps.common.models import CustomerSyncLog
+from apps.common.services.sync_log_buffer import write_sync_log
 from apps.users.models import User
 
 logger = logging.getLogger(__name__)
@@ -237,16 +238,18 @@ class CustomerIdentityResolver:
             )
             return
 
-        CustomerSyncLog.objects.create(
-            session=session,
-            customer=customer,
-            onec_id=onec_data.get("onec_id", ""),
-            operation_type="identify_customer",
-            status="success" if customer else "not_found",
-            details={
-                "identification_method": method,
-                "onec_guid": (str(onec_data.get("onec_guid")) if onec_data.get("onec_guid") else None),
-                "tax_id": onec_data.get("tax_id"),
-                "email": onec_data.get("email"),
-            },
+        write_sync_log(
+            CustomerSyncLog(
+                session=session,
+                customer=customer,
+                onec_id=onec_data.get("onec_id", ""),
+                operation_type="identify_customer",
+                status="success" if customer else "not_found",
+                details={
+                    "identification_method": method,
+                    "onec_guid": (str(onec_data.get("onec_guid")) if onec_data.get("onec_guid") else None),
+                    "tax_id": onec_data.get("tax_id"),
+                    "email": onec_data.get("email"),
+                },
+            )
         )
@@ -5,8 +5,12 @@
 from __future__ import annotations
 
 import logging
+import threading
 import xml.etree.ElementTree as ET
+from collections.abc import Iterator
+from itertools import islice
 from pathlib import Path
+from queue import Full, Queue
 from typing import Any
 
 from django.core.exceptions import ValidationError
@@ -23,6 +27,11 @@ class CustomerDataParser:
     # Namespace для CommerceML 3.1
     COMMERCEML_NS = {"cml": "urn:1C.ru:commerceml_3"}
 
+    def __init__(self) -> None:
+        # Namespace текущего файла в нотации ElementTree ("{uri}" или "").
+        # None — файл не разбирается, поиск пробует оба варианта.
+        self._namespace: str | None = None
+
     def parse(self, file_path: str) -> list[dict[str, Any]]:
         """
         Парсит XML файл contragents.xml и возвращает список клиентов.
@@ -37,44 +46,104 @@ class CustomerDataParser:
             FileNotFoundError: Если файл не найден
             ValidationError: Если структура XML некорректна
         """
+        customers = list(self.iter_customers(file_path))
+        logger.info(f"Успешно распознано {len(customers)} контрагентов")
+        return customers
+
+    def iter_customers(self, file_path: str) -> Iterator[dict[str, Any]]:
+        """
+        Потоково разбирает contragents.xml (iterparse) и отдаёт клиентов по одному.
+
+        Namespace определяется один раз по корневому элементу. Каждый
+        разобранный <Контрагент> удаляется из дерева, поэтому память не
+        растёт с размером выгрузки.
+
+        Args:
+            file_path: Путь к файлу contragents.xml
+
+        Yields:
+            Dict: Данные клиента (формат parse())
+
+        Raises:
+            FileNotFoundError: Если файл не найден
+            ValidationError: Если структура XML некорректна (в момент чтения проблемной части)
+        """
         path = Path(file_path)
         if not path.exists():
             raise FileNotFoundError(f"Файл не найден: {file_path}")
 
+        contragents_found = False
+        parents: list[ET.Element] = []
         try:
-            tree = ET.parse(file_path)
-            root = tree.getroot()
-
-            # Найти узел <Контрагенты>
-            contragents_node = root.find("cml:Контрагенты", self.COMMERCEML_NS)
-            if contragents_node is None:
-                # Попробуем без namespace
-                contragents_node = root.find("Контрагенты")
-
-            if contragents_node is None:
-                logger.warning(f"Узел <Контрагенты> не найден в {file_path}")
-                return []
-
-            customers = []
-            # Парсим каждого контрагента
-            for customer_node in contragents_node.findall(
-                "cml:Контрагент", self.COMMERCEML_NS
-            ) or contragents_node.findall("Контрагент"):
-                try:
-                    customer_data = self._parse_customer_node(customer_node)
-                    if self._validate_customer_data(customer_data):
-                        customers.append(customer_data)
-                except Exception as e:
-                    logger.error(f"Ошибка парсинга контрагента: {e}")
+            for event, elem in ET.iterparse(file_path, events=("start", "end")):
+                if event == "start":
+                    if not parents:
+                        self._namespace = elem.tag[: elem.tag.index("}") + 1] if elem.tag.startswith("{") else ""
+                        contragents_tag = f"{self._namespace}Контрагенты"
+                        customer_tag = f"{self._namespace}Контрагент"
+                    elif len(parents) == 1 and elem.tag == contragents_tag:
+                        contragents_found = True
+                    parents.append(elem)
                     continue
 
-            logger.info(f"Успешно распознано {len(customers)} контрагентов")
-            return customers
+                parents.pop()
+                if len(parents) == 2 and elem.tag == customer_tag and parents[1].tag == contragents_tag:
+                    customer_data = self._parse_customer_element(elem)
+                    if customer_data is not None:
+                        yield customer_data
+                elif len(parents) != 1:
+                    continue
 
+                # Разобранные контрагенты и прочие разделы корня больше не нужны
+                elem.clear()
+                parents[-1].remove(elem)
         except ET.ParseError as e:
             raise ValidationError(f"Некорректный XML файл: {e}") from e
-        except Exception as e:
+        except OSError as e:
             raise ValidationError(f"Ошибка при парсинге файла: {e}") from e
+        finally:
+            self._namespace = None
+
+        if not contragents_found:
+            logger.warning(f"Узел <Контрагенты> не найден в {file_path}")
+
+    def iter_customer_chunks(
+        self, file_path: str, chunk_size: int, prefetch: int = 0
+    ) -> Iterator[list[dict[str, Any]]]:
+        """
+        Отдаёт клиентов файла пакетами по chunk_size.
+
+        Args:
+            file_path: Путь к файлу contragents.xml
+            chunk_size: Размер пакета
+            prefetch: Сколько пакетов разбирать заранее в фоновом потоке
+                (0 — разбор в вызывающем потоке). Пока процессор пишет пакет
+                в БД, парсер готовит следующие; очередь ограничена, поэтому
+                память остаётся постоянной.
+
+        Yields:
+            List[Dict]: Пакет данных клиентов
+        """
+        chunks = self._chunked(self.iter_customers(file_path), chunk_size)
+        if prefetch > 0:
+            chunks = _prefetched(chunks, prefetch)
+        yield from chunks
+
+    @staticmethod
+    def _chunked(customers: Iterator[dict[str, Any]], chunk_size: int) -> Iterator[list[dict[str, Any]]]:
+        while chunk := list(islice(customers, chunk_size)):
+            yield chunk
+
+    def _parse_customer_element(self, customer_node: ET.Element) -> dict[str, Any] | None:
+        """Разбирает и валидирует <Контрагент>; None — контрагент пропущен."""
+        try:
+            customer_data = self._parse_customer_node(customer_node)
+        except Exception as e:
+            logger.error(f"Ошибка парсинга контрагента: {e}")
+            return None
+        if not self._validate_customer_data(customer_data):
+            return None
+        return customer_data
 
     def _parse_customer_node(self, customer_node: ET.Element) -> dict[str, Any]:
         """
@@ -105,9 +174,7 @@ class CustomerDataParser:
         contact_info = self._extract_contact_info(customer_node)
 
         # Извлечение адреса
-        address_node = customer_node.find("cml:АдресРегистрации", self.COMMERCEML_NS)
-        if address_node is None:
-            address_node = customer_node.find("АдресРегистрации")
+        address_node = self._find(customer_node, "АдресРегистрации")
 
         address = ""
         if address_node is not None:
@@ -152,17 +219,13 @@ class CustomerDataParser:
         Returns:
             Dict: Словарь с email, phone и другими контактами
         """
-        contacts_node = customer_node.find("cml:Контакты", self.COMMERCEML_NS)
-        if contacts_node is None:
-            contacts_node = customer_node.find("Контакты")
+        contacts_node = self._find(customer_node, "Контакты")
 
         contact_info: dict[str, str] = {"email": "", "phone": ""}
 
         if contacts_node is not None:
             # Парсим контакты
-            for contact_node in contacts_node.findall("cml:Контакт", self.COMMERCEML_NS) or contacts_node.findall(
-                "Контакт"
-            ):
+            for contact_node in self._findall(contacts_node, "Контакт"):
                 contact_type = self._get_text(contact_node, "Тип")
                 contact_value = self._get_text(contact_node, "Значение")
 
@@ -234,11 +297,7 @@ class CustomerDataParser:
         Returns:
             str: Текстовое содержимое или default
         """
-        # Пробуем с namespace
-        element = node.find(f"cml:{tag_name}", self.COMMERCEML_NS)
-        if element is None:
-            # Пробуем без namespace
-            element = node.find(tag_name)
+        element = self._find(node, tag_name)
 
         if element is not None and element.text:
             return element.text.strip()
@@ -256,12 +315,24 @@ class CustomerDataParser:
         Returns:
             list[str]: Непустые значения в порядке следования
         """
-        elements = node.findall(f"cml:{tag_name}", self.COMMERCEML_NS)
-        if not elements:
-            elements = node.findall(tag_name)
+        elements = self._findall(node, tag_name)
 
         return [element.text.strip() for element in elements if element is not None and element.text]
 
+    def _find(self, node: ET.Element, tag_name: str) -> ET.Element | None:
+        """Дочерний элемент по имени тега с учётом namespace файла."""
+        if self._namespace is not None:
+            return node.find(f"{self._namespace}{tag_name}")
+        # Узел вне разбора файла: пробуем с namespace CommerceML и без него
+        element = node.find(f"cml:{tag_name}", self.COMMERCEML_NS)
+        return element if element is not None else node.find(tag_name)
+
+    def _findall(self, node: ET.Element, tag_name: str) -> list[ET.Element]:
+        """Все дочерние элементы по имени тега с учётом namespace файла."""
+        if self._namespace is not None:
+            return node.findall(f"{self._namespace}{tag_name}")
+        return node.findall(f"cml:{tag_name}", self.COMMERCEML_NS) or node.findall(tag_name)
+
     def _parse_name(self, name: str, customer_type: str) -> tuple[str, str]:
         """
         Извлекает first_name и last_name из строки имени.
@@ -289,3 +360,46 @@ class CustomerDataParser:
             return ("", parts[0])
 
         return ("", "")
+
+
+def _prefetched(chunks: Iterator[list[dict[str, Any]]], depth: int) -> Iterator[list[dict[str, Any]]]:
+    """
+    Разбирает пакеты в фоновом потоке с опережением не более чем на depth пакетов.
+
+    Ошибка разбора передаётся вызывающему в точке, где он дошёл до неё.
+    """
+    queue: Queue[tuple[list[dict[str, Any]] | None, BaseException | None]] = Queue(maxsize=depth)
+    stopped = threading.Event()
+
+    def put(item: tuple[list[dict[str, Any]] | None, BaseException | None]) -> bool:
+        while not stopped.is_set():
+            try:
+                queue.put(item, timeout=0.1)
+                return True
+            except Full:
+                continue
+        return False
+
+    def produce() -> None:
+        try:
+            for chunk in chunks:
+                if not put((chunk, None)):
+                    return
+        except BaseException as e:
+            put((None, e))
+            return
+        put((None, None))
+
+    producer = threading.Thread(target=produce, name="customer-parser", daemon=True)
+    producer.start()
+    try:
+        while True:
+            chunk, error = queue.get()
+            if error is not None:
+                raise error
+            if chunk is None:
+                return
+            yield chunk
+    finally:
+        stopped.set()
+        producer.join()
@@ -6,15 +6,20 @@ from __future__ import annotations
 
 import logging
 import re
+import uuid
+from collections.abc import Iterable, Iterator
+from itertools import islice
 from typing import TYPE_CHECKING, Any
 
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
 from django.core.validators import validate_email
 from django.db import transaction
+from django.db.models import Q
 from django.utils import timezone
 
 from apps.common.models import CustomerSyncLog
+from apps.common.services.sync_log_buffer import sync_log_buffer, write_sync_log
 from apps.users.models import Company, User
 
 if TYPE_CHECKING:
@@ -40,6 +45,23 @@ class CustomerDataProcessor:
     # нейтральную роль, реальную назначает менеджер при верификации заявки.
     IMPORTED_CUSTOMER_ROLE = User.ROLE_UNREGISTERED
 
+    # Типы контрагентов, для которых ведётся объект Company
+    COMPANY_CUSTOMER_TYPES = ("legal_entity", "individual_entrepreneur")
+
+    # Поля, которые импорт меняет у существующих записей (bulk_update)
+    USER_UPDATE_FIELDS = [
+        "first_name",
+        "last_name",
+        "phone",
+        "company_name",
+        "tax_id",
+        "onec_id",
+        "sync_status",
+        "last_sync_at",
+        "updated_at",
+    ]
+    COMPANY_UPDATE_FIELDS = ["legal_name", "tax_id", "kpp", "legal_address", "updated_at"]
+
     def __init__(self, session_id: int):
         """
         Инициализирует процессор с ID сессии импорта.
@@ -180,28 +202,217 @@ class CustomerDataProcessor:
             )
             return None
 
-    def process_customers(self, customers_data: list[dict[str, Any]], chunk_size: int = 100) -> dict[str, int]:
+    def process_customers(self, customers_data: Iterable[dict[str, Any]], chunk_size: int = 100) -> dict[str, int]:
         """
-        Обрабатывает список клиентов пакетами.
+        Обрабатывает клиентов пакетами.
+
+        Для каждого пакета пользователи загружаются одним запросом (по onec_id
+        и email), дубликаты ищутся в памяти по тем же правилам, что и
+        _find_duplicate, а пользователи, компании и записи CustomerSyncLog
+        пишутся через bulk_create/bulk_update. Если запись пакета падает на
+        ошибке БД, пакет обрабатывается поштучно (process_customer), чтобы
+        ошибка осталась у одного клиента, как при последовательном импорте.
+        Записи лога поштучного пути копятся в sync_log_buffer и пишутся пакетами.
 
         Args:
-            customers_data: Список словарей с данными клиентов
+            customers_data: Список или поток (например, CustomerDataParser.iter_customers)
+                словарей с данными клиентов; поток читается по одному пакету
             chunk_size: Размер пакета для обработки
 
         Returns:
             Dict: Статистика обработки (total, created, updated, skipped, errors)
         """
         stats = {
-            "total": len(customers_data),
+            "total": 0,
             "created": 0,
             "updated": 0,
             "skipped": 0,
             "errors": 0,
         }
 
-        for i, customer_data in enumerate(customers_data, 1):
-            logger.debug(f"Обработка клиента {i}/{len(customers_data)}")
+        with sync_log_buffer():
+            self._process_chunks(iter(customers_data), chunk_size, stats)
+
+        logger.info(
+            f"Обработка завершена. Статистика: "
+            f"создано={stats['created']}, обновлено={stats['updated']}, "
+            f"пропущено={stats['skipped']}, ошибок={stats['errors']}"
+        )
+
+        return stats
+
+    def _process_chunks(self, customers: Iterator[dict[str, Any]], chunk_size: int, stats: dict[str, int]) -> None:
+        """Обрабатывает поток клиентов пакетами по chunk_size, накапливая статистику в stats."""
+        start = 0
+        while chunk := list(islice(customers, chunk_size)):
+            stats["total"] += len(chunk)
+            logger.debug(f"Обработка клиентов {start + 1}-{start + len(chunk)}")
+
+            try:
+                with transaction.atomic():
+                    chunk_stats = self._process_chunk(chunk)
+            except Exception as e:
+                logger.warning(
+                    f"Пакетная обработка клиентов {start + 1}-{start + len(chunk)} не удалась ({e}), "
+                    f"переход на поштучную обработку"
+                )
+                chunk_stats = self._process_chunk_one_by_one(chunk, offset=start)
+
+            for key, value in chunk_stats.items():
+                stats[key] += value
+            start += len(chunk)
+
+    def _process_chunk(self, chunk: list[dict[str, Any]]) -> dict[str, int]:
+        """
+        Обрабатывает пакет клиентов с пакетной записью в БД.
+
+        Повторяет ветвление process_customer, но вместо записи по одному
+        накапливает изменения и сохраняет их несколькими bulk-запросами.
+
+        Returns:
+            Dict: Статистика пакета (created, updated, skipped, errors)
+        """
+        stats = {"created": 0, "updated": 0, "skipped": 0, "errors": 0}
+        by_onec_id, by_email, companies = self._preload_chunk(chunk)
+
+        new_users: list[User] = []
+        updated_users: dict[int, User] = {}
+        touched_companies: dict[int, Company] = {}
+        logs: list[CustomerSyncLog] = []
+
+        for customer_data in chunk:
+            onec_id = customer_data.get("onec_id")
+            if not onec_id:
+                logger.error("Отсутствует onec_id в данных клиента")
+                stats["errors"] += 1
+                continue
+
+            if not self.is_buyer(customer_data):
+                logger.info(
+                    "Контрагент %s пропущен: роль в 1С '%s', ожидается '%s'",
+                    onec_id,
+                    customer_data.get("role", ""),
+                    self.ONEC_BUYER_ROLE,
+                )
+                logs.append(
+                    self._build_log(
+                        user=None,
+                        onec_id=onec_id,
+                        operation_type="skipped",
+                        status="success",
+                        details={"reason": "not_buyer", "role": customer_data.get("role", "")},
+                    )
+                )
+                stats["skipped"] += 1
+                continue
+
+            existing_user = by_onec_id.get(onec_id)
+            email = customer_data.get("email", "").strip()
+            if existing_user is None and email:
+                existing_user = by_email.get(email)
+
+            if email:
+                if not self._validate_email(email):
+                    logger.warning(f"Невалидный email для клиента {onec_id}: {email}")
+                    logs.append(
+                        self._build_log(
+                            user=None,
+                            onec_id=onec_id,
+                            operation_type="error",
+                            status="failed",
+                            error_message=f"Невалидный формат email: {email}",
+                        )
+                    )
+                    stats["errors"] += 1
+                    continue
+            else:
+                logger.info(f"Клиент {onec_id} не имеет email адреса")
+
+            if existing_user:
+                user = self._apply_customer_update(existing_user, customer_data)
+                if user.pk is not None:
+                    updated_users[user.pk] = user
+                logs.append(
+                    self._build_log(
+                        user=user,
+                        onec_id=onec_id,
+                        operation_type="updated",
+                        status="success",
+                        details={"role": user.role, "role_preserved": True},
+                    )
+                )
+                stats["updated"] += 1
+            else:
+                user = self._build_customer(customer_data, self.IMPORTED_CUSTOMER_ROLE)
+                new_users.append(user)
+                logs.append(
+                    self._build_log(
+                        user=user,
+                        onec_id=onec_id,
+                        operation_type="created",
+                        status="success",
+                        details={
+                            "role": self.IMPORTED_CUSTOMER_ROLE,
+                            "has_email": bool(email),
+                            "customer_type": customer_data.get("customer_type"),
+                        },
+                    )
+                )
+                if not email:
+                    logs.append(
+                        self._build_log(
+                            user=user,
+                            onec_id=onec_id,
+                            operation_type="created",
+                            status="warning",
+                            details={"notes": "Клиент создан без email адреса"},
+                        )
+                    )
+                stats["created"] += 1
+
+            if customer_data.get("customer_type", "") in self.COMPANY_CUSTOMER_TYPES:
+                # Несохранённые User не хэшируются — компании ключуются по id() объекта
+                company = companies.get(id(user))
+                if company is None:
+                    company = companies[id(user)] = Company(user=user)
+                self._apply_company_fields(company, customer_data)
+                touched_companies[id(user)] = company
+
+            # Следующие записи пакета должны находить этого пользователя, как после save()
+            by_onec_id[user.onec_id] = user
+            if user.email:
+                by_email.setdefault(user.email, user)
+
+        # bulk_update не вызывает pre_save: auto_now поля выставляются явно, как их выставил бы save()
+        now = timezone.now()
+        for user in updated_users.values():
+            user.updated_at = now
+        new_companies = [company for company in touched_companies.values() if company.pk is None]
+        existing_companies = [company for company in touched_companies.values() if company.pk is not None]
+        for company in existing_companies:
+            company.updated_at = now
+
+        User.objects.bulk_create(new_users)
+        User.objects.bulk_update(list(updated_users.values()), self.USER_UPDATE_FIELDS)
+        Company.objects.bulk_create(new_companies)
+        Company.objects.bulk_update(existing_companies, self.COMPANY_UPDATE_FIELDS)
+        CustomerSyncLog.objects.bulk_create(logs)
+
+        for user in new_users:
+            logger.info(f"Создан новый пользователь: {str(user.email or user.onec_id)} (role={user.role})")
+
+        return stats
+
+    def _process_chunk_one_by_one(self, chunk: list[dict[str, Any]], offset: int) -> dict[str, int]:
+        """
+        Поштучная обработка пакета (запасной путь при ошибке пакетной записи).
+
+        Returns:
+            Dict: Статистика пакета (created, updated, skipped, errors)
+        """
+        stats = {"created": 0, "updated": 0, "skipped": 0, "errors": 0}
 
+        for i, customer_data in enumerate(chunk, offset + 1):
             # Получаем onec_id перед обработкой для логирования
             onec_id = customer_data.get("onec_id", f"unknown-{i}")
 
@@ -217,26 +428,44 @@ class CustomerDataProcessor:
                 else:
                     stats["created"] += 1
             else:
-                # Проверяем логи на наличие записи с типом SKIPPED
-                skipped_log = CustomerSyncLog.objects.filter(
-                    session=str(self.session.pk),
-                    onec_id=onec_id,
-                    operation_type="skipped",
-                ).exists()
-
-                if skipped_log:
+                # process_customer пропускает (skipped) только не-покупателей с onec_id;
+                # по логу не проверяем: при активном буфере он ещё не записан
+                if customer_data.get("onec_id") and not self.is_buyer(customer_data):
                     stats["skipped"] += 1
                 else:
                     stats["errors"] += 1
 
-        logger.info(
-            f"Обработка завершена. Статистика: "
-            f"создано={stats['created']}, обновлено={stats['updated']}, "
-            f"пропущено={stats['skipped']}, ошибок={stats['errors']}"
-        )
-
         return stats
 
+    def _preload_chunk(
+        self, chunk: list[dict[str, Any]]
+    ) -> tuple[dict[str, User], dict[str, User], dict[int, Company]]:
+        """
+        Загружает пользователей и компании пакета двумя запросами.
+
+        Returns:
+            (onec_id → User, email → User, id(User) → Company). Один пользователь,
+            найденный и по onec_id, и по email, — один и тот же объект.
+        """
+        onec_ids = {customer_data["onec_id"] for customer_data in chunk if customer_data.get("onec_id")}
+        emails = {customer_data.get("email", "").strip() for customer_data in chunk} - {""}
+
+        users = list(User.objects.filter(Q(onec_id__in=onec_ids) | Q(email__in=emails)).order_by("pk"))
+        by_onec_id: dict[str, User] = {}
+        by_email: dict[str, User] = {}
+        for user in users:
+            if user.onec_id:
+                by_onec_id.setdefault(user.onec_id, user)
+            if user.email:
+                by_email.setdefault(user.email, user)
+
+        users_by_pk = {user.pk: user for user in users}
+        companies = {
+            id(users_by_pk[company.user_id]): company
+            for company in Company.objects.filter(user_id__in=users_by_pk.keys())
+        }
+        return by_onec_id, by_email, companies
+
     def _find_duplicate(self, customer_data: dict[str, Any]) -> User | None:
         """
         Ищет дубликаты клиента по onec_id и email.
@@ -336,6 +565,28 @@ class CustomerDataProcessor:
         Returns:
             User: Созданный пользователь
         """
+        user = self._build_customer(customer_data, role)
+        user.save(force_insert=True)
+
+        # Создаем объект Company для B2B клиентов (юр.лиц и ИП)
+        customer_type = customer_data.get("customer_type", "")
+        if customer_type in self.COMPANY_CUSTOMER_TYPES:
+            self._create_or_update_company(user, customer_data)
+
+        logger.info(f"Создан новый пользователь: {str(user.email or user.onec_id)} (role={role})")
+        return user
+
+    def _build_customer(self, customer_data: dict[str, Any], role: str) -> User:
+        """
+        Собирает несохранённого пользователя из данных клиента.
+
+        Args:
+            customer_data: Словарь с данными клиента
+            role: Роль пользователя
+
+        Returns:
+            User: Пользователь без записи в БД
+        """
         email = customer_data.get("email", "").strip()
         first_name = customer_data.get("first_name", "").strip()
         last_name = customer_data.get("last_name", "").strip()
@@ -354,7 +605,7 @@ class CustomerDataProcessor:
             else:
                 last_name = name
 
-        user = User.objects.create(
+        return User(
             email=email or None,  # None для пустого email (уникальность)
             first_name=first_name,
             last_name=last_name,
@@ -368,14 +619,6 @@ class CustomerDataProcessor:
             last_sync_at=timezone.now(),
         )
 
-        # Создаем объект Company для B2B клиентов (юр.лиц и ИП)
-        customer_type = customer_data.get("customer_type", "")
-        if customer_type in ["legal_entity", "individual_entrepreneur"]:
-            self._create_or_update_company(user, customer_data)
-
-        logger.info(f"Создан новый пользователь: {str(user.email or onec_id)} (role={role})")
-        return user
-
     def _update_customer(self, user: User, customer_data: dict[str, Any]) -> User:
         """
         Обновляет существующего пользователя данными из 1С.
@@ -390,6 +633,28 @@ class CustomerDataProcessor:
         Returns:
             User: Обновленный пользователь
         """
+        self._apply_customer_update(user, customer_data)
+        user.save()
+
+        # Создаем/обновляем объект Company для B2B клиентов
+        customer_type = customer_data.get("customer_type", "")
+        if customer_type in self.COMPANY_CUSTOMER_TYPES:
+            self._create_or_update_company(user, customer_data)
+
+        logger.info(f"Обновлен пользователь: {str(user.email or user.onec_id)} (role={user.role} сохранена)")
+        return user
+
+    def _apply_customer_update(self, user: User, customer_data: dict[str, Any]) -> User:
+        """
+        Переносит данные из 1С в существующего пользователя (без записи в БД).
+
+        Args:
+            user: Существующий пользователь
+            customer_data: Словарь с данными клиента
+
+        Returns:
+            User: Тот же пользователь
+        """
         # Обновляем поля из 1С
         user.first_name = customer_data.get("first_name", user.first_name)
         user.last_name = customer_data.get("last_name", user.last_name)
@@ -404,15 +669,6 @@ class CustomerDataProcessor:
             user.onec_id = customer_data.get("onec_id")
         user.sync_status = "synced"
         user.last_sync_at = timezone.now()
-
-        user.save()
-
-        # Создаем/обновляем объект Company для B2B клиентов
-        customer_type = customer_data.get("customer_type", "")
-        if customer_type in ["legal_entity", "individual_entrepreneur"]:
-            self._create_or_update_company(user, customer_data)
-
-        logger.info(f"Обновлен пользователь: {str(user.email or user.onec_id)} (role={user.role} сохранена)")
         return user
 
     def _log_operation(
@@ -435,9 +691,19 @@ class CustomerDataProcessor:
             error_message: Сообщение об ошибке
             details: Дополнительные детали операции
         """
-        import uuid
+        write_sync_log(self._build_log(user, onec_id, operation_type, status, error_message, details))
 
-        CustomerSyncLog.objects.create(
+    def _build_log(
+        self,
+        user: User | None,
+        onec_id: str,
+        operation_type: str,
+        status: str,
+        error_message: str = "",
+        details: dict[str, Any] | None = None,
+    ) -> CustomerSyncLog:
+        """Собирает несохранённую запись CustomerSyncLog (параметры — как у _log_operation)."""
+        return CustomerSyncLog(
             session=str(self.session.pk),  # CharField - преобразуем ID в строку
             customer=user,  # Поле называется customer, не user
             onec_id=onec_id,
@@ -459,31 +725,25 @@ class CustomerDataProcessor:
         Returns:
             Company: Созданный или обновленный объект компании
         """
-        # Получаем данные компании из customer_data
-        legal_name = customer_data.get("full_name", "") or customer_data.get("name", "")
-        tax_id = customer_data.get("tax_id", "").strip()
-        kpp = customer_data.get("kpp", "").strip()
-        legal_address = customer_data.get("address", "").strip()
-
         # Пытаемся найти существующую компанию
         try:
             company = Company.objects.get(user=user)
             # Обновляем данные компании
-            company.legal_name = legal_name
-            company.tax_id = tax_id
-            company.kpp = kpp
-            company.legal_address = legal_address
+            self._apply_company_fields(company, customer_data)
             company.save()
             logger.debug(f"Обновлена компания для пользователя {user.onec_id}")
         except Company.DoesNotExist:
             # Создаем новую компанию
-            company = Company.objects.create(
-                user=user,
-                legal_name=legal_name,
-                tax_id=tax_id,
-                kpp=kpp,
-                legal_address=legal_address,
-            )
-            logger.info(f"Создана компания '{legal_name}' для пользователя {user.onec_id}")
+            company = Company(user=user)
+            self._apply_company_fields(company, customer_data)
+            company.save(force_insert=True)
+            logger.info(f"Создана компания '{company.legal_name}' для пользователя {user.onec_id}")
 
         return company
+
+    def _apply_company_fields(self, company: Company, customer_data: dict[str, Any]) -> None:
+        """Переносит реквизиты компании из данных клиента (без записи в БД)."""
+        company.legal_name = customer_data.get("full_name", "") or customer_data.get("name", "")
+        company.tax_id = customer_data.get("tax_id", "").strip()
+        company.kpp = customer_data.get("kpp", "").strip()
+        company.legal_address = customer_data.get("address", "").strip()
@@ -3,10 +3,13 @@
 Общая конфигурация для всех окружений
 """
 
+import importlib.util
 import os
 import sys
+from collections.abc import Callable
 from datetime import timedelta
 from pathlib import Path
+from typing import Any
 
 from decouple import Csv, config
 
@@ -87,6 +90,7 @@ MIDDLEWARE = [
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "django_ratelimit.middleware.RatelimitMiddleware",
+    "apps.common.db_routing.ReplicaRoutingMiddleware",
 ]
 
 ROOT_URLCONF = "freesport.urls"
@@ -110,21 +114,141 @@ TEMPLATES = [
 
 WSGI_APPLICATION = "freesport.wsgi.application"
 
+# Режим сервера приложений: wsgi (sync gunicorn) или asgi (uvicorn воркеры), см. gunicorn.conf.py
+SERVER_MODE = config("SERVER_MODE", default="wsgi")
+
+
+def detect_process_type() -> str:
+    """
+    Тип процесса для настройки соединений с БД: web, celery или beat.
+
+    Явно задаётся переменной PROCESS_TYPE (docker-compose), иначе
+    определяется по командной строке celery worker / celery beat.
+    """
+    process_type = os.environ.get("PROCESS_TYPE")
+    if process_type:
+        return process_type.strip().lower()
+    if sys.argv and Path(sys.argv[0]).name == "celery":
+        return "beat" if "beat" in sys.argv else "celery"
+    return "web"
+
+
+PROCESS_TYPE = detect_process_type()
+
+# Время жизни persistent-соединения по умолчанию для каждого типа процесса (сек).
+# web под ASGI — 0: sync-код каждого запроса выполняется в своём потоке,
+# соединения не переиспользуются. beat почти не обращается к БД.
+DB_CONN_MAX_AGE_DEFAULTS = {"web": 60, "celery": 300, "beat": 0}
+
+
+def configure_database_connections(
+    database: dict,
+    max_age_defaults: dict[str, int] = DB_CONN_MAX_AGE_DEFAULTS,
+    process_type: str = PROCESS_TYPE,
+) -> dict:
+    """
+    Дополняет DATABASES["default"] настройками соединений для типа процесса.
+
+    Переменные окружения (суффикс _WEB / _CELERY / _BEAT переопределяет общее значение,
+    например DB_CONN_MAX_AGE_CELERY=600):
+    - DB_CONN_MAX_AGE — время жизни persistent-соединения, сек
+    - DB_CONN_HEALTH_CHECKS — проверять соединение перед переиспользованием (по умолчанию True)
+    - DB_POOL — пул соединений psycopg3 (Django 5.1+); параметры DB_POOL_MIN_SIZE,
+      DB_POOL_MAX_SIZE, DB_POOL_TIMEOUT. Требует пакет psycopg[pool] и несовместим с CONN_MAX_AGE
+    - DB_PGBOUNCER — работа через pgbouncer в режиме transaction pooling: серверные
+      курсоры (QuerySet.iterator()) отключены, т.к. не переживают смену backend-соединения
+
+    Args:
+        database: Словарь настроек соединения (ENGINE, NAME, OPTIONS, ...)
+        max_age_defaults: CONN_MAX_AGE по умолчанию для каждого типа процесса
+        process_type: web, celery или beat
+
+    Returns:
+        Новый словарь настроек соединения
+    """
+    from django.core.exceptions import ImproperlyConfigured
+
+    suffix = process_type.upper()
+
+    def process_config(name: str, default: Any, cast: Callable[[Any], Any]) -> Any:
+        return config(f"DB_{name}_{suffix}", default=config(f"DB_{name}", default=default, cast=cast), cast=cast)
+
+    default_max_age = max_age_defaults.get(process_type, 0)
+    if process_type == "web" and SERVER_MODE == "asgi":
+        default_max_age = 0
+
+    use_pool = process_config("POOL", False, bool)
+    use_pgbouncer = config("DB_PGBOUNCER", default=False, cast=bool)
+
+    result = {**database, "OPTIONS": dict(database.get("OPTIONS", {}))}
+    result["CONN_HEALTH_CHECKS"] = process_config("CONN_HEALTH_CHECKS", True, bool)
+    result["DISABLE_SERVER_SIDE_CURSORS"] = use_pgbouncer
+
+    if use_pool:
+        if use_pgbouncer:
+            raise ImproperlyConfigured("DB_POOL и DB_PGBOUNCER взаимоисключающие: пул уже обеспечивает pgbouncer")
+        if importlib.util.find_spec("psycopg") is None or importlib.util.find_spec("psycopg_pool") is None:
+            raise ImproperlyConfigured("DB_POOL требует psycopg 3 с пулом: pip install 'psycopg[binary,pool]'")
+        # Пул сам переиспользует соединения; Django запрещает сочетать его с CONN_MAX_AGE
+        result["CONN_MAX_AGE"] = 0
+        result["OPTIONS"]["pool"] = {
+            "min_size": process_config("POOL_MIN_SIZE", 2, int),
+            "max_size": process_config("POOL_MAX_SIZE", 10, int),
+            "timeout": process_config("POOL_TIMEOUT", 10, int),
+        }
+    else:
+        result["CONN_MAX_AGE"] = process_config("CONN_MAX_AGE", default_max_age, int)
+
+    return result
+
+
+def configure_replica_database(databases: dict, max_age_defaults: dict[str, int] = DB_CONN_MAX_AGE_DEFAULTS) -> dict:
+    """
+    Добавляет в DATABASES необязательную read-реплику (alias ``replica``).
+
+    Реплика включается переменной DB_REPLICA_HOST; DB_REPLICA_NAME, DB_REPLICA_USER,
+    DB_REPLICA_PASSWORD и DB_REPLICA_PORT по умолчанию совпадают с primary.
+    Какие запросы читают с реплики — см. apps/common/db_routing.py.
+    """
+    replica_host = config("DB_REPLICA_HOST", default="")
+    if not replica_host:
+        return databases
+    primary = databases["default"]
+    replica = {
+        **primary,
+        "NAME": config("DB_REPLICA_NAME", default=primary["NAME"]),
+        "USER": config("DB_REPLICA_USER", default=primary["USER"]),
+        "PASSWORD": config("DB_REPLICA_PASSWORD", default=primary["PASSWORD"]),
+        "HOST": replica_host,
+        "PORT": config("DB_REPLICA_PORT", default=primary["PORT"], cast=int),
+    }
+    return {**databases, "replica": configure_database_connections(replica, max_age_defaults)}
+
+
 # Конфигурация базы данных PostgreSQL
-DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.postgresql",
-        "NAME": config("DB_NAME", default="freesport"),
-        "USER": config("DB_USER", default="postgres"),
-        "PASSWORD": config("DB_PASSWORD", default="password123"),
-        "HOST": config("DB_HOST", default="localhost"),
-        "PORT": config("DB_PORT", default="5432", cast=int),
-        "OPTIONS": {
-            "connect_timeout": 10,
-            "client_encoding": "UTF8",
-        },
+DATABASES = configure_replica_database(
+    {
+        "default": configure_database_connections(
+            {
+                "ENGINE": "django.db.backends.postgresql",
+                "NAME": config("DB_NAME", default="freesport"),
+                "USER": config("DB_USER", default="postgres"),
+                "PASSWORD": config("DB_PASSWORD", default="password123"),
+                "HOST": config("DB_HOST", default="localhost"),
+                "PORT": config("DB_PORT", default="5432", cast=int),
+                "OPTIONS": {
+                    "connect_timeout": 10,
+                    "client_encoding": "UTF8",
+                },
+            }
+        )
     }
-}
+)
+
+DATABASE_ROUTERS = ["apps.common.db_routing.ReplicaRouter"]
+
+# Сколько секунд после собственной записи клиент читает с primary (задержка репликации)
+DB_REPLICA_STICKY_SECONDS = config("DB_REPLICA_STICKY_SECONDS", default=10, cast=int)
 
 # Кастомная модель пользователя
 AUTH_USER_MODEL = "users.User"
@@ -233,6 +357,9 @@ CELERY_RESULT_BACKEND = config(
     default=CELERY_BROKER_URL,
 )
 
+# Интервал сверки журнала резервов корзин в reserved_quantity (apps.cart.services)
+RESERVATION_LEDGER_FOLD_SECONDS = config("RESERVATION_LEDGER_FOLD_SECONDS", default=30, cast=int)
+
 # Celery Beat Schedule (Story 29.4 - мониторинг pending верификаций)
 CELERY_BEAT_SCHEDULE = {
     "monitor-pending-verification-queue": {
@@ -243,6 +370,15 @@ CELERY_BEAT_SCHEDULE = {
         "task": "apps.products.tasks.cleanup_stale_import_sessions",
         "schedule": 60 * 60,  # Раз в час (Story 3.1 AC6)
     },
+    # Журнал резервов корзин: available_quantity отстаёт не более чем на этот интервал
+    "fold-cart-reservation-ledger": {
+        "task": "apps.cart.tasks.fold_reservation_ledger_task",
+        "schedule": RESERVATION_LEDGER_FOLD_SECONDS,
+    },
+    "rebuild-cart-reserved-quantities": {
+        "task": "apps.cart.tasks.rebuild_reserved_quantities_task",
+        "schedule": 60 * 60 * 24,  # Раз в сутки
+    },
 }
 
 # Баннеры
@@ -269,6 +405,20 @@ MEDIA_ROOT = BASE_DIR / "media"
 FILE_UPLOAD_PERMISSIONS = 0o644
 FILE_UPLOAD_DIRECTORY_PERMISSIONS = 0o755
 
+# Хранилище изображений товаров (products/images/<sha256>): hardlink вместо копирования.
+# По умолчанию выключено: файлы обмена 1С могут перезаписываться на месте
+# (распаковка ZIP), и общий inode изменил бы уже опубликованное изображение.
+PRODUCT_IMAGE_STORE_HARDLINKS = config("PRODUCT_IMAGE_STORE_HARDLINKS", default=False, cast=bool)
+# Число потоков этапа копирования изображений при импорте из 1С (ingest_deferred_images)
+PRODUCT_IMAGE_INGEST_WORKERS = config("PRODUCT_IMAGE_INGEST_WORKERS", default=8, cast=int)
+
+# Производные изображений товаров для srcset (apps.products.services.image_derivatives).
+# Форматы: webp, avif (если Pillow собран с libavif). Кодирование — в пуле процессов.
+PRODUCT_IMAGE_DERIVATIVE_WIDTHS = config("PRODUCT_IMAGE_DERIVATIVE_WIDTHS", default="320,640,1024", cast=Csv(int))
+PRODUCT_IMAGE_DERIVATIVE_FORMATS = config("PRODUCT_IMAGE_DERIVATIVE_FORMATS", default="webp", cast=Csv())
+PRODUCT_IMAGE_DERIVATIVE_QUALITY = config("PRODUCT_IMAGE_DERIVATIVE_QUALITY", default=80, cast=int)
+PRODUCT_IMAGE_DERIVATIVE_WORKERS = config("PRODUCT_IMAGE_DERIVATIVE_WORKERS", default=4, cast=int)
+
 # Лимит POST/GET параметров для Django Admin с большими inline формами
 # Увеличен для поддержки атрибутов с большим количеством значений
 # (напр. "Размер" с 466+ значениями)
@@ -307,6 +457,9 @@ ONEC_EXCHANGE = {
     "COMMERCEML_VERSION": "3.1",  # CommerceML protocol version
     "TEMP_DIR": ONEC_PRIVATE_DIR / "1c_temp",  # Temporary directory for chunked uploads
     "IMPORT_DIR": ONEC_PRIVATE_DIR / "1c_import",  # Private directory for routed import files
+    "ORDERS_IMPORT_DIR": ONEC_PRIVATE_DIR / "1c_orders",  # orders.xml waiting for the async import task
+    "ORDERS_XML_ASYNC_THRESHOLD_BYTES": 1024 * 1024,  # Larger orders.xml are imported by Celery
+    "EXPORT_MAX_ORDERS": 1000,  # mode=query: cap per query, a backlog is drained across exchanges
     # Реквизиты заказа для УТ 11 (фиксированные значения — операция и статус)
     "ORDER_DEFAULTS": {
         "OPERATION": "Реализация",
@@ -445,6 +598,11 @@ SPECTACULAR_SETTINGS = {
 # Настройки для разрешения конфликтов синхронизации (Story 3.2.2)
 CONFLICT_NOTIFICATION_EMAIL = config("CONFLICT_NOTIFICATION_EMAIL", default="admin@freesport.ru")
 
+# Буфер CustomerSyncLog на время синхронизации (apps.common.services.sync_log_buffer):
+# сброс bulk_create каждые N записей или не реже чем раз в T секунд
+CUSTOMER_SYNC_LOG_BUFFER_SIZE = config("CUSTOMER_SYNC_LOG_BUFFER_SIZE", default=500, cast=int)
+CUSTOMER_SYNC_LOG_FLUSH_INTERVAL = config("CUSTOMER_SYNC_LOG_FLUSH_INTERVAL", default=5.0, cast=float)
+
 # ============================================================================
 # Email Configuration (Story 29.3)
 # ============================================================================
@@ -22,22 +22,25 @@ MIDDLEWARE += [
     "debug_toolbar.middleware.DebugToolbarMiddleware",
 ]
 
-# Настройки базы данных для разработки (используем PostgreSQL через Docker)
-DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.postgresql",
-        "NAME": os.environ.get("DB_NAME", "freesport"),
-        "USER": os.environ.get("DB_USER", "postgres"),
-        "PASSWORD": os.environ.get("DB_PASSWORD", "password123"),
-        "HOST": os.environ.get("DB_HOST", "db"),
-        "PORT": os.environ.get("DB_PORT", "5432"),
-        "OPTIONS": {
-            "connect_timeout": 10,
-            # Исправление для UnicodeDecodeError в Windows
-            "client_encoding": "UTF8",
-        },
+# Настройки базы данных для разработки (используем PostgreSQL через Docker).
+# Read-реплику можно проверить локально: DB_REPLICA_HOST / DB_REPLICA_NAME.
+DATABASES = configure_replica_database(
+    {
+        "default": {
+            "ENGINE": "django.db.backends.postgresql",
+            "NAME": os.environ.get("DB_NAME", "freesport"),
+            "USER": os.environ.get("DB_USER", "postgres"),
+            "PASSWORD": os.environ.get("DB_PASSWORD", "password123"),
+            "HOST": os.environ.get("DB_HOST", "db"),
+            "PORT": os.environ.get("DB_PORT", "5432"),
+            "OPTIONS": {
+                "connect_timeout": 10,
+                # Исправление для UnicodeDecodeError в Windows
+                "client_encoding": "UTF8",
+            },
+        }
     }
-}
+)
 
 # Настройки CORS для фронтенда
 CORS_ALLOWED_ORIGINS = [
@@ -12,20 +12,28 @@ DEBUG = False
 ALLOWED_HOSTS = config("ALLOWED_HOSTS", default="").split(",")
 
 # Настройки базы данных для продакшена (PostgreSQL)
-DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.postgresql",
-        "NAME": config("DB_NAME"),
-        "USER": config("DB_USER"),
-        "PASSWORD": config("DB_PASSWORD"),
-        "HOST": config("DB_HOST"),
-        "PORT": config("DB_PORT", default="5432", cast=int),
-        "CONN_MAX_AGE": 600,
-        "OPTIONS": {
-            "sslmode": config("DB_SSLMODE", default="prefer"),
-        },
-    }
-}
+# Persistent-соединения / пул / pgbouncer настраиваются по типу процесса,
+# см. configure_database_connections в base.py. Read-реплика — DB_REPLICA_HOST.
+PROD_DB_CONN_MAX_AGE_DEFAULTS = {"web": 600, "celery": 300, "beat": 0}
+DATABASES = configure_replica_database(
+    {
+        "default": configure_database_connections(
+            {
+                "ENGINE": "django.db.backends.postgresql",
+                "NAME": config("DB_NAME"),
+                "USER": config("DB_USER"),
+                "PASSWORD": config("DB_PASSWORD"),
+                "HOST": config("DB_HOST"),
+                "PORT": config("DB_PORT", default="5432", cast=int),
+                "OPTIONS": {
+                    "sslmode": config("DB_SSLMODE", default="prefer"),
+                },
+            },
+            max_age_defaults=PROD_DB_CONN_MAX_AGE_DEFAULTS,
+        )
+    },
+    max_age_defaults=PROD_DB_CONN_MAX_AGE_DEFAULTS,
+)
 
 # Настройки безопасности для продакшена
 SECURE_BROWSER_XSS_FILTER = True
@@ -64,6 +64,18 @@ DATABASES = {
     }
 }
 
+# Read-реплика для тестов маршрутизации (tests/integration/test_replica_routing.py):
+# вторая локальная БД PostgreSQL, независимая от primary, чтобы было видно,
+# с какой базы прочитаны данные. Включается только явно, т.к. маршрутизированные
+# на реплику endpoint'ы в остальных тестах видели бы пустую базу.
+# Схема реплики создаётся по текущим моделям (MIGRATE=False): как и настоящую
+# физическую реплику, её не мигрируют, а data-миграции рассчитаны на default.
+if os.environ.get("TEST_DB_REPLICA_NAME"):
+    DATABASES["replica"] = {
+        **DATABASES["default"],
+        "TEST": {"NAME": os.environ["TEST_DB_REPLICA_NAME"], "MIGRATE": False},
+    }
+
 
 # ==============================================================================
 # УСКОРЕНИЕ ТЕСТОВ (TESTING SPEEDUPS)
@@ -0,0 +1,40 @@
+"""
+Конфигурация Gunicorn для FREESPORT backend.
+
+Режим сервера выбирается переменной окружения SERVER_MODE:
+- wsgi (по умолчанию) — sync воркеры, freesport.wsgi:application
+- asgi — uvicorn воркеры, freesport.asgi:application. Асинхронные read-only
+  endpoint'ы (каталог, баннеры, страницы, health) обслуживаются в event loop,
+  а синхронные (обмен с 1С, экспорт заказов) — в пуле потоков, поэтому
+  долгий обмен с 1С не занимает воркер целиком.
+
+Переопределения: GUNICORN_WORKERS, GUNICORN_TIMEOUT, GUNICORN_BIND.
+"""
+
+import os
+
+server_mode = os.environ.get("SERVER_MODE", "wsgi").strip().lower()
+if server_mode not in ("wsgi", "asgi"):
+    raise RuntimeError(f"Unsupported SERVER_MODE '{server_mode}': expected 'wsgi' or 'asgi'")
+
+if server_mode == "asgi":
+    wsgi_app = "freesport.asgi:application"
+    worker_class = "uvicorn.workers.UvicornWorker"
+else:
+    wsgi_app = "freesport.wsgi:application"
+    worker_class = "sync"
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.environ.get("GUNICORN_WORKERS", "4"))
+
+# timeout=300 (5 минут) для длительных операций импорта
+# graceful-timeout=300 для корректного завершения worker'ов
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", "300"))
+graceful_timeout = 300
+
+max_requests = 1000
+max_requests_jitter = 100
+preload_app = True
+
+accesslog = "-"
+errorlog = "-"
@@ -115,3 +115,137 @@ def test_guest_cart_persistence(api_client, product):
     response = api_client.get(cart_url)
     assert response.status_code == status.HTTP_200_OK
     assert response.data["total_items"] == 1
+
+
+# Bulk add (order sheet paste)
+def test_bulk_add_items(authenticated_client, product):
+    """Test bulk add by variant_id and sku with per-line errors and the recalculated cart."""
+    from apps.cart.models import ReservationLedgerEntry
+    from tests.conftest import ProductVariantFactory
+
+    variant = product.variants.first()
+    other = ProductVariantFactory.create(stock_quantity=5)
+    inactive = ProductVariantFactory.create(is_active=False)
+    authenticated_client.post(reverse("cart:cart-items-list"), {"variant_id": variant.id, "quantity": 1}, format="json")
+
+    data = {
+        "items": [
+            {"variant_id": variant.id, "quantity": 2},
+            {"sku": other.sku, "quantity": 5},
+            {"sku": "NO-SUCH-SKU", "quantity": 1},
+            {"variant_id": inactive.id, "quantity": 1},
+            {"sku": other.sku, "quantity": 1},
+        ]
+    }
+    response = authenticated_client.post(reverse("cart:cart-items-bulk"), data, format="json")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [line["index"] for line in response.data["added"]] == [0, 1]
+    assert [(line["index"], line["error"]) for line in response.data["errors"]] == [
+        (2, "Вариант товара не найден"),
+        (3, "Вариант товара неактивен"),
+        (4, "Недостаточно товара на складе. Доступно: 5"),
+    ]
+    assert response.data["cart"]["total_items"] == 8
+    cart = Cart.objects.get(user=authenticated_client.user)
+    assert dict(cart.items.values_list("variant_id", "quantity")) == {variant.id: 3, other.id: 5}
+    # Резерв каждой строки записан в журнал
+    assert sum(ReservationLedgerEntry.objects.filter(variant=variant).values_list("delta", flat=True)) == 3
+    assert sum(ReservationLedgerEntry.objects.filter(variant=other).values_list("delta", flat=True)) == 5
+
+
+def test_bulk_add_query_count_does_not_grow(authenticated_client):
+    """Test that bulk add resolves all lines with a fixed number of queries."""
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    from tests.conftest import ProductVariantFactory
+
+    variants = ProductVariantFactory.create_batch(30, stock_quantity=10)
+    authenticated_client.get(reverse("cart:cart-list"))
+    data = {"items": [{"variant_id": v.id, "quantity": 1} for v in variants]}
+
+    with CaptureQueriesContext(connection) as ctx:
+        response = authenticated_client.post(reverse("cart:cart-items-bulk"), data, format="json")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.data["added"]) == 30
+    writes = [q for q in ctx.captured_queries if q["sql"].startswith('INSERT INTO "cart_items"')]
+    assert len(writes) == 1
+    assert len(ctx.captured_queries) < 20
+
+
+def test_bulk_add_invalid_payload(authenticated_client, product):
+    """Test bulk add validation: line identifiers and all-failed requests."""
+    url = reverse("cart:cart-items-bulk")
+    variant = product.variants.first()
+
+    response = authenticated_client.post(
+        url, {"items": [{"variant_id": variant.id, "sku": variant.sku, "quantity": 1}]}, format="json"
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    response = authenticated_client.post(url, {"items": [{"sku": "NO-SUCH-SKU", "quantity": 1}]}, format="json")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.data["errors"][0]["error"] == "Вариант товара не найден"
+    assert not CartItem.objects.exists()
+
+
+# Cart serialization and summary
+def test_get_cart_query_count_does_not_grow(authenticated_client):
+    """Test that the cart response is built from one prefetched query regardless of size."""
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    from tests.conftest import ProductVariantFactory
+
+    url = reverse("cart:cart-list")
+
+    def cart_queries(lines):
+        variants = ProductVariantFactory.create_batch(lines, stock_quantity=10)
+        items = [{"variant_id": v.id, "quantity": 2} for v in variants]
+        authenticated_client.post(reverse("cart:cart-items-bulk"), {"items": items}, format="json")
+        with CaptureQueriesContext(connection) as ctx:
+            response = authenticated_client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        return response, len(ctx.captured_queries)
+
+    _, small = cart_queries(2)
+    response, large = cart_queries(20)
+
+    assert large == small
+    assert response.data["total_items"] == 44
+    assert len(response.data["items"]) == 22
+
+
+def test_cart_summary(authenticated_client, product):
+    """Test cached cart summary: no cart created, refreshed after line changes."""
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    url = reverse("cart:cart-summary")
+    variant = product.variants.first()
+
+    response = authenticated_client.get(url)
+    assert response.data == {"items_count": 0, "total_items": 0, "total_amount": "0.00"}
+    assert not Cart.objects.exists()
+
+    response = authenticated_client.post(
+        reverse("cart:cart-items-list"), {"variant_id": variant.id, "quantity": 2}, format="json"
+    )
+    item_id = response.data["id"]
+    price = CartItem.objects.get(pk=item_id).price_snapshot
+
+    response = authenticated_client.get(url)
+    assert response.data == {"items_count": 1, "total_items": 2, "total_amount": f"{price * 2:.2f}"}
+
+    # Повторный запрос — из кэша, без агрегата по позициям
+    with CaptureQueriesContext(connection) as ctx:
+        authenticated_client.get(url)
+    assert not [q for q in ctx.captured_queries if '"cart_items"' in q["sql"]]
+
+    authenticated_client.patch(reverse("cart:cart-items-detail", args=[item_id]), {"quantity": 5}, format="json")
+    assert authenticated_client.get(url).data["total_items"] == 5
+
+    authenticated_client.delete(reverse("cart:cart-clear"))
+    assert authenticated_client.get(url).data["total_items"] == 0
@@ -0,0 +1,109 @@
+"""
+Integration тесты очистки корзин и переноса гостевой корзины (apps.cart.services)
+"""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.cart.models import Cart, CartItem, ReservationLedgerEntry
+from apps.cart.services import fold_reservation_ledger, merge_guest_cart
+from apps.products.models import ProductVariant
+from tests.conftest import CartFactory, ProductVariantFactory, UserFactory
+
+pytestmark = [pytest.mark.integration, pytest.mark.django_db]
+
+
+def _reserved(variant: ProductVariant) -> int:
+    fold_reservation_ledger()
+    variant.refresh_from_db(fields=["reserved_quantity"])
+    return variant.reserved_quantity
+
+
+def _fill(cart: Cart, variants: list[ProductVariant], quantity: int = 2) -> None:
+    for variant in variants:
+        CartItem.objects.create(cart=cart, variant=variant, quantity=quantity, price_snapshot=variant.retail_price)
+
+
+class TestCleanupCommands:
+    """Пакетное удаление брошенных позиций и старых гостевых корзин"""
+
+    def test_cleanup_guest_carts_in_chunks(self):
+        variants = ProductVariantFactory.create_batch(2, reserved_quantity=0, stock_quantity=100)
+        old_carts = [CartFactory.create(user=None, session_key=f"old-{i}") for i in range(5)]
+        fresh = CartFactory.create(user=None, session_key="fresh")
+        for cart in [*old_carts, fresh]:
+            _fill(cart, variants)
+        Cart.objects.filter(pk__in=[c.pk for c in old_carts]).update(updated_at=timezone.now() - timedelta(days=31))
+        assert _reserved(variants[0]) == 12
+
+        out = StringIO()
+        with CaptureQueriesContext(connection) as ctx:
+            call_command("cleanup_guest_carts", "--chunk-size=2", stdout=out)
+
+        assert "Успешно удалено 5" in out.getvalue()
+        assert list(Cart.objects.values_list("pk", flat=True)) == [fresh.pk]
+        # Резерв снимается агрегированной записью журнала на вариант, строки вариантов не обновляются
+        assert not [q for q in ctx.captured_queries if q["sql"].startswith('UPDATE "product_variants"')]
+        assert [_reserved(variant) for variant in variants] == [2, 2]
+
+    def test_clear_abandoned_carts(self):
+        variant = ProductVariantFactory.create(reserved_quantity=0, stock_quantity=100)
+        other = ProductVariantFactory.create(reserved_quantity=0, stock_quantity=100)
+        cart = CartFactory.create()
+        _fill(cart, [variant, other], quantity=3)
+        CartItem.objects.filter(variant=variant).update(added_at=timezone.now() - timedelta(hours=30))
+
+        call_command("clear_abandoned_carts", "--hours=24", stdout=StringIO())
+
+        assert list(cart.items.values_list("variant_id", flat=True)) == [other.pk]
+        assert _reserved(variant) == 0
+        assert _reserved(other) == 3
+
+
+class TestMergeGuestCart:
+    """Идемпотентный перенос гостевой корзины"""
+
+    def test_merge_sums_quantities_and_keeps_reservations(self):
+        user = UserFactory.create()
+        shared, guest_only = ProductVariantFactory.create_batch(2, reserved_quantity=0, stock_quantity=100)
+        user_cart = CartFactory.create(user=user)
+        _fill(user_cart, [shared], quantity=1)
+        guest_cart = CartFactory.create(user=None, session_key="guest-merge")
+        _fill(guest_cart, [shared, guest_only], quantity=2)
+        fold_reservation_ledger()
+
+        assert merge_guest_cart(guest_cart.pk, user.pk) == 2
+        # Повторный вызов (ретрай задачи) ничего не меняет
+        assert merge_guest_cart(guest_cart.pk, user.pk) == 0
+
+        assert not Cart.objects.filter(pk=guest_cart.pk).exists()
+        assert dict(user_cart.items.values_list("variant_id", "quantity")) == {shared.pk: 3, guest_only.pk: 2}
+        assert not ReservationLedgerEntry.objects.exists()
+        assert (_reserved(shared), _reserved(guest_only)) == (3, 2)
+
+    def test_signal_schedules_merge_after_commit(self):
+        from apps.users.models import User
+
+        guest_cart = CartFactory.create(user=None, session_key="signal-session")
+
+        class Request:
+            class session:
+                session_key = "signal-session"
+
+        user = User(email="merge-signal@example.com", role="retail")
+        user.set_password("testpass123")
+        user._request = Request()
+
+        with patch("apps.cart.tasks.merge_guest_cart_task.delay") as delay:
+            user.save()
+
+        delay.assert_called_once_with(guest_cart.pk, user.pk)
@@ -240,3 +240,25 @@ class TestImportCustomersCommand:
         for user in users:
             assert user.sync_status == "synced"
             assert user.last_sync_at is not None
+
+    def test_command_streams_synthetic_file_in_chunks(self, tmp_path):
+        """Файл разбирается потоково и уходит в процессор пакетами (без реального dataset)"""
+        contragents_dir = tmp_path / "contragents"
+        contragents_dir.mkdir()
+        customers = "".join(
+            f"<Контрагент><Ид>STREAM-CMD-{i}</Ид><Наименование>Иванов Иван {i}</Наименование>"
+            "<Роль>Покупатель</Роль></Контрагент>"
+            for i in range(5)
+        )
+        (contragents_dir / "contragents_1.xml").write_text(
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<КоммерческаяИнформация xmlns="urn:1C.ru:commerceml_3">'
+            f"<Контрагенты>{customers}</Контрагенты></КоммерческаяИнформация>",
+            encoding="utf-8",
+        )
+        out = StringIO()
+
+        call_command("import_customers_from_1c", data_dir=str(tmp_path), chunk_size=2, stdout=out)
+
+        assert "Распознано 5 клиентов" in out.getvalue()
+        assert User.objects.filter(onec_id__startswith="STREAM-CMD-").count() == 5
@@ -14,6 +14,7 @@ Tests cover:
 
 import base64
 import io
+import os
 import zipfile
 from pathlib import Path
 from unittest.mock import patch
@@ -1720,3 +1721,121 @@ class TestLegacyOrderExclusion:
 
         legacy_order.refresh_from_db()
         assert legacy_order.sent_to_1c is False
+
+
+@pytest.mark.django_db
+@pytest.mark.integration
+class TestKeysetExportBatching:
+    """mode=query: keyset-чанки по pk и лимит EXPORT_MAX_ORDERS на один обмен."""
+
+    def _create_sub_orders(self, customer_user, product_variant, count: int, with_items: bool = True) -> list[Order]:
+        from decimal import Decimal
+
+        master = Order.objects.create(
+            user=customer_user,
+            order_number=f"FS-KEYSET-M-{Order.objects.count()}",
+            total_amount=Decimal("100"),
+            delivery_address="ул. Тестовая, 1",
+            delivery_method="pickup",
+            payment_method="card",
+            is_master=True,
+        )
+        subs = []
+        for i in range(count):
+            sub = Order.objects.create(
+                user=customer_user,
+                order_number=f"FS-KEYSET-{master.pk}-{i}",
+                total_amount=Decimal("100"),
+                delivery_address="ул. Тестовая, 1",
+                delivery_method="pickup",
+                payment_method="card",
+                is_master=False,
+                parent_order=master,
+            )
+            if with_items:
+                OrderItem.objects.create(
+                    order=sub,
+                    product=product_variant.product,
+                    variant=product_variant,
+                    product_name="Test Product",
+                    unit_price=Decimal("100"),
+                    quantity=1,
+                    total_price=Decimal("100"),
+                )
+            subs.append(sub)
+        return subs
+
+    def test_backlog_drained_across_queries(self, authenticated_client, customer_user, product_variant, log_dir):
+        subs = self._create_sub_orders(customer_user, product_variant, 3)
+        empty = self._create_sub_orders(customer_user, product_variant, 1, with_items=False)[0]
+        exchange = {**settings.ONEC_EXCHANGE, "EXPORT_MAX_ORDERS": 2}
+
+        with patch.object(settings, "ONEC_EXCHANGE", exchange):
+            first = get_response_content(
+                authenticated_client.get("/api/integration/1c/exchange/", data={"mode": "query"})
+            ).decode("utf-8")
+            # Повторный query подтверждает первую порцию и отдаёт следующую
+            second = get_response_content(
+                authenticated_client.get("/api/integration/1c/exchange/", data={"mode": "query"})
+            ).decode("utf-8")
+
+        assert [sub.order_number in first for sub in subs] == [True, True, False]
+        assert [sub.order_number in second for sub in subs] == [False, False, True]
+        sent = Order.objects.filter(pk__in=[s.pk for s in subs]).order_by("pk").values_list("sent_to_1c", flat=True)
+        assert list(sent) == [True, True, False]
+        empty.refresh_from_db()
+        assert empty.export_skipped is True
+
+    def test_xml_streamed_in_keyset_chunks(self, authenticated_client, customer_user, product_variant, log_dir):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        from apps.orders.services.order_export import OrderExportService
+
+        subs = self._create_sub_orders(customer_user, product_variant, 5)
+
+        with patch.object(OrderExportService, "EXPORT_CHUNK_SIZE", 2):
+            response = authenticated_client.get("/api/integration/1c/exchange/", data={"mode": "query"})
+            with CaptureQueriesContext(connection) as ctx:
+                content = get_response_content(response).decode("utf-8")
+
+        assert response.get("Content-Type") == "application/xml"
+        positions = [content.index(sub.order_number) for sub in subs]
+        assert positions == sorted(positions)
+        # 3 чанка заказов (2 + 2 + 1) и пустой хвост, у каждого чанка свой prefetch позиций
+        chunk_queries = [q for q in ctx.captured_queries if '"orders"."id" >' in q["sql"]]
+        assert len(chunk_queries) == 3
+        assert len(list(log_dir.glob("*orders.xml"))) == 1
+
+
+@pytest.mark.django_db
+@pytest.mark.integration
+class TestStreamingZipExport:
+    """mode=query&zip=yes: архив сжимается на лету без временных файлов."""
+
+    def test_zip_streamed_and_logged_without_temp_files(self, authenticated_client, order_for_export, log_dir):
+        import tempfile
+
+        with patch.object(tempfile, "NamedTemporaryFile", side_effect=AssertionError("temp file used")):
+            response = authenticated_client.get("/api/integration/1c/exchange/", data={"mode": "query", "zip": "yes"})
+            content = get_response_content(response)
+
+        assert response.streaming
+        assert response["Content-Disposition"] == 'attachment; filename="orders.zip"'
+        with zipfile.ZipFile(io.BytesIO(content)) as zf:
+            assert zf.testzip() is None
+            assert "FS-TEST-001" in zf.read("orders.xml").decode("utf-8")
+        # Аудит-лог — побайтовая копия отданного архива
+        (log_file,) = log_dir.glob("*orders.zip")
+        assert log_file.read_bytes() == content
+
+    def test_iter_zip_stream_yields_incrementally(self):
+        from apps.integrations.onec_exchange.views import _iter_zip_stream
+
+        # Несжимаемые данные: deflate отдаёт вывод до конца входного потока
+        chunks = [os.urandom(64 * 1024).hex() for _ in range(4)]
+        parts = list(_iter_zip_stream("orders.xml", iter(chunks)))
+
+        assert len([part for part in parts if part]) > 2
+        with zipfile.ZipFile(io.BytesIO(b"".join(parts))) as zf:
+            assert zf.read("orders.xml").decode("utf-8") == "".join(chunks)
@@ -298,7 +298,7 @@ class TestOrderStatusImportDBIntegration(TestCase):
 """
 
         # ACT
-        # Query count breakdown (14 total) после Story 34-5 (master+sub)
+        # Query count breakdown (12 total) после Story 34-5 (master+sub)
         # и бонусной программы:
         # 1. SAVEPOINT — transaction.atomic() start
         # 2. SELECT ... FOR UPDATE — bulk fetch all 3 sub-orders in one query
@@ -306,18 +306,16 @@ class TestOrderStatusImportDBIntegration(TestCase):
         # 3. UPDATE sub1 — save() with update_fields
         # 4. UPDATE sub2 — save() with update_fields
         # 5. UPDATE sub3 — save() with update_fields
-        # [Master aggregation — 1 shared master]
-        # 6. SELECT FOR UPDATE master — get master by pk
-        # 7. SELECT sub_orders.status — _aggregate_master_status
-        # 8. SELECT sub_orders.payment_status — _aggregate_master_payment_status
-        # 9. SELECT sub_orders.sent_to_1c_at — _aggregate_master_sent_to_1c_at
-        # 10. UPDATE master — save() with update_fields
+        # [Master aggregation — на весь батч, не зависит от числа мастеров]
+        # 6. SELECT FOR UPDATE masters — pk__in
+        # 7. SELECT sub_orders GROUP BY parent_order — статусы, оплаты, max(sent_to_1c_at)
+        # 8. UPDATE masters — bulk_update
         # [Сигнал бонусной программы на post_save мастера]
-        # 11. SAVEPOINT — вложенный atomic() в accrue_for_order
-        # 12. SELECT bonus_program_settings — BonusProgramSettings.load()
-        # 13. RELEASE SAVEPOINT — заказ не проходит is_eligible, выход
-        # 14. RELEASE SAVEPOINT — transaction.atomic() commit
-        with cast(Any, self).assertNumQueries(14):
+        # 9. SAVEPOINT — вложенный atomic() в accrue_for_order
+        # 10. SELECT bonus_program_settings — BonusProgramSettings.load()
+        # 11. RELEASE SAVEPOINT — заказ не проходит is_eligible, выход
+        # 12. RELEASE SAVEPOINT — transaction.atomic() commit
+        with cast(Any, self).assertNumQueries(12):
             result = self.service.process(xml_data)
 
         # ASSERT — все 3 заказа обновлены
@@ -783,3 +781,48 @@ class TestMasterAggregationDB(TestCase):
         self.master.refresh_from_db()
         self.assertEqual(self.sub5.status, "pending")
         self.assertEqual(self.master.status, "pending")
+
+    def test_many_masters_aggregated_with_grouped_queries(self):
+        """Агрегация батча: один групповой запрос и один bulk_update на все мастера."""
+        from decimal import Decimal
+
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        common = {
+            "total_amount": Decimal("1000.00"),
+            "delivery_address": "Test",
+            "delivery_method": "courier",
+            "payment_method": "card",
+        }
+        # Второй мастер уже в финальном статусе — регрессия должна быть заблокирована
+        final_master = Order.objects.create(
+            order_number=f"FS-AGG-M2-{get_unique_suffix()}", is_master=True, status="delivered", **common
+        )
+        final_sub = Order.objects.create(
+            order_number=f"FS-AGG-S2-{get_unique_suffix()}", parent_order=final_master, status="pending", **common
+        )
+        xml_data = _build_multi_sub_xml(
+            [
+                {"order_id": f"{ORDER_ID_PREFIX}{sub.pk}", "order_number": sub.order_number, "status": status}
+                for sub, status in [(self.sub5, "Отгружен"), (self.sub22, "Отгружен"), (final_sub, "Подтвержден")]
+            ]
+        )
+
+        with CaptureQueriesContext(connection) as ctx:
+            result = self.service.process(xml_data)
+
+        grouped = [q for q in ctx.captured_queries if "ARRAY_AGG" in q["sql"]]
+        master_updates = [q for q in ctx.captured_queries if "CASE WHEN" in q["sql"]]
+        self.assertEqual(len(grouped), 1)
+        self.assertEqual(len(master_updates), 1)
+
+        self.assertEqual(result.updated, 3)
+        self.assertEqual(result.aggregated_master_count, 1)
+        self.assertEqual(result.skipped_master_regression, 1)
+        self.master.refresh_from_db()
+        final_master.refresh_from_db()
+        self.assertEqual(self.master.status, "shipped")
+        self.assertEqual(final_master.status, "delivered")
+        latest_sub = Order.objects.filter(parent_order=self.master).latest("sent_to_1c_at")
+        self.assertEqual(self.master.sent_to_1c_at, latest_sub.sent_to_1c_at)
@@ -0,0 +1,126 @@
+"""
+Интеграционные тесты асинхронного импорта orders.xml.
+
+Крупный orders.xml сохраняется и подтверждается `success` сразу,
+импорт выполняет Celery-задача, 1С опрашивает прогресс через mode=import.
+"""
+
+from decimal import Decimal
+from pathlib import Path
+from typing import cast
+from unittest.mock import patch
+
+import pytest
+from django.conf import settings
+from django.http import HttpResponse
+from django.test import override_settings
+from rest_framework.test import APIClient
+
+from apps.orders.models import Order
+from apps.orders.tasks import process_order_status_import_task
+from apps.products.models import ImportSession
+from tests.conftest import UserFactory, get_unique_suffix
+from tests.utils import EXCHANGE_URL, ONEC_PASSWORD
+from tests.utils import build_orders_xml as _build_orders_xml  # noqa: E402
+from tests.utils import perform_1c_checkauth
+
+
+@pytest.mark.django_db
+@pytest.mark.integration
+class TestOrdersXmlAsyncImport:
+    """orders.xml выше порога импортируется в фоне с опросом статуса."""
+
+    @pytest.fixture(autouse=True)
+    def _async_settings(self, tmp_path):
+        self.import_dir = tmp_path / "1c_orders"
+        exchange = {
+            **settings.ONEC_EXCHANGE,
+            "ORDERS_XML_ASYNC_THRESHOLD_BYTES": 0,
+            "ORDERS_IMPORT_DIR": self.import_dir,
+        }
+        with override_settings(ONEC_EXCHANGE=exchange, EXCHANGE_LOG_DIR=str(tmp_path / "logs")):
+            yield
+
+    def setup_method(self):
+        self.client = APIClient()
+        self.user = UserFactory.create(is_staff=True, password=ONEC_PASSWORD)
+        perform_1c_checkauth(self.client, self.user.email, ONEC_PASSWORD)
+
+    def _post_orders_xml(self, xml_data: bytes) -> HttpResponse:
+        return cast(
+            HttpResponse,
+            self.client.post(
+                f"{EXCHANGE_URL}?mode=file&filename=orders.xml",
+                data=xml_data,
+                content_type="application/xml",
+                CONTENT_LENGTH=str(len(xml_data)),
+            ),
+        )
+
+    def _poll(self) -> str:
+        response = self.client.get(EXCHANGE_URL, {"mode": "import", "filename": "orders.xml"})
+        return response.content.decode("utf-8")
+
+    def _queue(self, xml_data: bytes) -> tuple[ImportSession, str]:
+        with patch("apps.orders.tasks.process_order_status_import_task.delay") as delay:
+            response = self._post_orders_xml(xml_data)
+
+        assert response.content.decode("utf-8") == "success"
+        session = ImportSession.objects.get(import_type=ImportSession.ImportType.ORDER_STATUSES)
+        delay.assert_called_once()
+        session_id, file_path = delay.call_args[0]
+        assert session_id == session.pk
+        return session, file_path
+
+    def test_large_file_is_acknowledged_and_processed_in_background(self):
+        order_number = f"FS-ASYNC-{get_unique_suffix()}"
+        order = Order.objects.create(
+            order_number=order_number,
+            status="pending",
+            status_1c="",
+            delivery_address="Test",
+            delivery_method="courier",
+            payment_method="card",
+            total_amount=Decimal("100.00"),
+        )
+
+        session, file_path = self._queue(_build_orders_xml(order_number=order_number, status_1c="Подтвержден"))
+
+        # Ответ получен до импорта: заказ ещё не обновлён, 1С видит progress
+        order.refresh_from_db()
+        assert order.status == "pending"
+        assert session.status == ImportSession.ImportStatus.PENDING
+        assert session.report_details["total_items"] == 1
+        assert self._poll().startswith("progress")
+
+        assert process_order_status_import_task.apply(args=(session.pk, file_path)).get() == "success"
+
+        order.refresh_from_db()
+        session.refresh_from_db()
+        assert order.status == "confirmed"
+        assert session.status == ImportSession.ImportStatus.COMPLETED
+        assert session.report_details["processed_items"] == 1
+        assert session.report_details["updated"] == 1
+        assert not Path(file_path).exists()
+        assert self._poll() == "success"
+
+    def test_failed_import_is_reported_to_poll(self):
+        xml_data = _build_orders_xml().replace(b"</\xd0\x9a\xd0\xbe", b"<broken></\xd0\x9a\xd0\xbe", 1)
+        session, file_path = self._queue(xml_data)
+
+        assert process_order_status_import_task.apply(args=(session.pk, file_path)).get() == "failure"
+
+        session.refresh_from_db()
+        assert session.status == ImportSession.ImportStatus.FAILED
+        assert session.error_message == "Malformed XML"
+        assert self._poll() == "failure\nMalformed XML"
+
+    def test_small_file_stays_inline(self):
+        with override_settings(ONEC_EXCHANGE={**settings.ONEC_EXCHANGE, "ORDERS_XML_ASYNC_THRESHOLD_BYTES": 10**6}):
+            with patch("apps.orders.tasks.process_order_status_import_task.delay") as delay:
+                response = self._post_orders_xml(_build_orders_xml(order_number=f"FS-INLINE-{get_unique_suffix()}"))
+
+        delay.assert_not_called()
+        assert response.content.decode("utf-8").startswith("failure\nNo orders updated")
+        assert not ImportSession.objects.exists()
+        assert self._poll() == "success"
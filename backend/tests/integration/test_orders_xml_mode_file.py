@@ -5,6 +5,7 @@ Story 5.2: View-обработчик mode=file для orders.xml.
 Тестирует полный цикл: HTTP POST → _handle_orders_xml → OrderStatusImportService → DB.
 """
 
+import io
 from datetime import timedelta
 from decimal import Decimal
 from types import SimpleNamespace
@@ -18,7 +19,12 @@ from rest_framework import status
 from rest_framework.test import APIClient
 
 from apps.integrations.onec_exchange.throttling import OneCExchangeThrottle
-from apps.integrations.onec_exchange.views import ORDERS_XML_MAX_SIZE, ICExchangeView
+from apps.integrations.onec_exchange.views import (
+    ORDERS_XML_MAX_SIZE,
+    ICExchangeView,
+    _count_xml_documents,
+    _document_tag_re,
+)
 from apps.orders.models import Order
 from tests.conftest import OrderFactory, UserFactory, get_unique_suffix
 from tests.utils import EXCHANGE_URL, ONEC_PASSWORD
@@ -357,7 +363,7 @@ class TestOrdersXmlModeFile:
                 f"{EXCHANGE_URL}?mode=file&filename=orders.xml",
                 data=xml_data,
                 content_type="application/xml",
-                CONTENT_LENGTH=str(6 * 1024 * 1024),  # 6MB > 5MB limit
+                CONTENT_LENGTH=str(ORDERS_XML_MAX_SIZE + 1),
             ),
         )
 
@@ -406,6 +412,24 @@ class TestOrdersXmlModeFile:
         assert "failure" in content
         assert "Too many documents" in content
 
+    def test_too_many_documents_windows_1251(self):
+        """Документы считаются и в windows-1251 без перекодирования тела."""
+        xml_data = _build_orders_xml(encoding="windows-1251").decode("utf-8").encode("windows-1251")
+
+        with patch("apps.integrations.onec_exchange.views.MAX_DOCUMENTS_PER_FILE", 0):
+            response = self._post_orders_xml(xml_data)
+
+        assert "Too many documents" in response.content.decode("utf-8")
+
+    def test_document_count_across_chunk_boundaries(self):
+        """Тег <Документ>, разрезанный границей чанка, считается один раз."""
+        xml_data = _build_multi_orders_xml([{"order_number": f"FS-CHUNK-{i}"} for i in range(50)])
+
+        with patch("apps.integrations.onec_exchange.views.ORDERS_XML_READ_CHUNK", 7):
+            count = _count_xml_documents(io.BytesIO(xml_data), _document_tag_re(xml_data[:200]))
+
+        assert count == 50
+
     # ===================================================================
     # 4.12: Stale timestamp → failure (AC13)
     # ===================================================================
@@ -0,0 +1,101 @@
+"""
+Integration тесты маршрутизации на read-реплику с двумя локальными базами PostgreSQL.
+
+Реплика в тестах — отдельная база без репликации, поэтому по данным видно,
+откуда прочитан ответ. Запуск:
+
+    TEST_DB_REPLICA_NAME=pytest_freesport_replica pytest tests/integration/test_replica_routing.py
+
+Без TEST_DB_REPLICA_NAME тесты пропускаются.
+"""
+
+from __future__ import annotations
+
+import uuid
+
+import pytest
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.cart.models import Cart
+from apps.common.db_routing import STICKY_COOKIE_NAME
+from apps.common.models import CustomerSyncLog
+from apps.products.models import Brand
+
+User = get_user_model()
+
+pytestmark = [
+    pytest.mark.integration,
+    pytest.mark.skipif("replica" not in settings.DATABASES, reason="TEST_DB_REPLICA_NAME не задан"),
+]
+
+
+class TestReplicaRouting(TestCase):
+    """Чтение каталога и метрик — с реплики, после собственной записи — с primary."""
+
+    databases = {"default", "replica"}
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.client = APIClient()
+        Brand.objects.create(name="Primary Brand", slug="primary-brand")
+        Brand.objects.using("replica").create(name="Replica Brand", slug="replica-brand")
+
+    def _brand_names(self) -> list[str]:
+        response = self.client.get(reverse("products:brand-list"))
+        assert response.status_code == 200
+        return [item["name"] for item in response.json()["results"]]
+
+    def test_catalog_reads_from_replica(self) -> None:
+        assert self._brand_names() == ["Replica Brand"]
+
+    def test_guest_sticks_to_primary_after_write(self) -> None:
+        response = self.client.post(reverse("common:subscribe"), {}, format="json")
+
+        assert STICKY_COOKIE_NAME in response.cookies
+        assert self._brand_names() == ["Primary Brand"]
+
+    def test_authenticated_user_sticks_to_primary_without_cookies(self) -> None:
+        user = User.objects.create_user(email="replica@example.com", password="pass12345", role="retail")
+        self.client.force_authenticate(user=user)
+
+        response = self.client.patch(reverse("users:profile"), {"first_name": "Иван"}, format="json")
+        assert response.status_code == 200
+        # JWT-клиенты не хранят cookie — закрепление по ключу пользователя в кэше
+        self.client.cookies.clear()
+
+        assert self._brand_names() == ["Primary Brand"]
+
+        other = APIClient()
+        response = other.get(reverse("products:brand-list"))
+        assert [item["name"] for item in response.json()["results"]] == ["Replica Brand"]
+
+    def test_cart_stays_on_primary(self) -> None:
+        user = User.objects.create_user(email="cart@example.com", password="pass12345", role="retail")
+        self.client.force_authenticate(user=user)
+
+        response = self.client.get(reverse("cart:cart-list"))
+
+        assert response.status_code == 200
+        assert Cart.objects.filter(user=user).exists()
+        assert not Cart.objects.using("replica").filter(user_id=user.pk).exists()
+
+    def test_monitoring_metrics_read_from_replica(self) -> None:
+        admin = User.objects.create_superuser(email="admin-replica@example.com", password="adminpass123")
+        self.client.force_authenticate(user=admin)
+        CustomerSyncLog.objects.using("replica").create(
+            operation_type=CustomerSyncLog.OperationType.IMPORT_FROM_1C,
+            status=CustomerSyncLog.StatusType.SUCCESS,
+            onec_id="1C-REPLICA",
+            duration_ms=100,
+            correlation_id=uuid.uuid4(),
+        )
+
+        response = self.client.get(reverse("common:operation-metrics"))
+
+        assert response.status_code == 200
+        assert response.json()["total_operations"] == 1
@@ -28,6 +28,7 @@ from apps.products.models import (
     Product,
     ProductVariant,
 )
+from apps.products.services.image_store import image_digest, image_store_name
 from apps.products.services.parser import XMLDataParser
 from apps.products.services.variant_import import (
     VariantImportProcessor,
@@ -778,7 +779,7 @@ class TestHybridImagesLogic(TransactionTestCase):
     """
     Integration тесты для AC6 - Hybrid images логика
     - base_images fallback через effective_images()
-    - Копирование изображений в products/base/ и products/variants/
+    - Копирование изображений в хранилище products/images/
     - main_image + gallery_images логика
     """
 
@@ -870,9 +871,10 @@ class TestHybridImagesLogic(TransactionTestCase):
         variant_img2 = os.path.join(variant_dir, "variant2.jpg")
         variant_img3 = os.path.join(variant_dir, "variant3.jpg")
 
-        for img_path in [variant_img1, variant_img2, variant_img3]:
+        # Разное содержимое: хранилище дедуплицирует изображения по хэшу
+        for index, img_path in enumerate([variant_img1, variant_img2, variant_img3]):
             with open(img_path, "wb") as f:
-                f.write(dummy_jpg)
+                f.write(dummy_jpg + bytes([index]))
 
         # Создаем offer_data с изображениями
         offer_data = {
@@ -900,13 +902,13 @@ class TestHybridImagesLogic(TransactionTestCase):
 
         # Проверка: main_image установлен (первое изображение)
         assert variant.main_image is not None
-        assert "products/variants/offers/variant1.jpg" in str(variant.main_image)
+        assert str(variant.main_image) == image_store_name(image_digest(Path(variant_img1)), ".jpg")
 
         # Проверка: gallery_images содержит остальные изображения
         assert variant.gallery_images is not None
         assert len(variant.gallery_images) == 2
-        assert "products/variants/offers/variant2.jpg" in str(variant.gallery_images[0])
-        assert "products/variants/offers/variant3.jpg" in str(variant.gallery_images[1])
+        assert variant.gallery_images[0] == image_store_name(image_digest(Path(variant_img2)), ".jpg")
+        assert variant.gallery_images[1] == image_store_name(image_digest(Path(variant_img3)), ".jpg")
 
     def test_default_variant_without_images_uses_base_images(self):
         """
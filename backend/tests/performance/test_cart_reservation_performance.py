@@ -0,0 +1,156 @@
+"""
+Performance тесты резервирования популярного варианта из параллельных корзин
+"""
+
+import threading
+import time
+from decimal import Decimal
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.test import TestCase, TransactionTestCase
+from rest_framework.test import APIClient
+
+from apps.cart.models import Cart, CartItem, ReservationLedgerEntry
+from apps.cart.services import fold_reservation_ledger, purge_carts
+from apps.products.models import Brand, Category, Product, ProductVariant
+
+User = get_user_model()
+
+
+@pytest.mark.slow
+class HotVariantReservationTest(TransactionTestCase):
+    """
+    Параллельные покупатели добавляют один и тот же вариант в свои корзины.
+
+    TransactionTestCase — каждый поток работает в собственном соединении с
+    реальными commit'ами, как под нагрузкой. Резерв не должен терять приращения.
+    """
+
+    THREADS = 8
+    ADDS_PER_THREAD = 10
+
+    def setUp(self):
+        category = Category.objects.create(name="Hot Category", slug="hot-category")
+        brand = Brand.objects.create(name="Hot Brand", slug="hot-brand")
+        product = Product.objects.create(
+            name="Hot Product", slug="hot-product", category=category, brand=brand, is_active=True
+        )
+        self.variant = ProductVariant.objects.create(
+            product=product,
+            sku="HOT-001",
+            onec_id="1C-HOT-001",
+            retail_price=Decimal("100.00"),
+            stock_quantity=10000,
+            is_active=True,
+        )
+        self.users = [
+            User.objects.create_user(email=f"hot{i}@example.com", password="testpass123", role="retail")
+            for i in range(self.THREADS)
+        ]
+
+    def test_hot_variant_reservations_are_not_lost(self):
+        """Все добавления учтены в reserved_quantity после сверки журнала"""
+        errors = []
+        statuses = []
+        lock = threading.Lock()
+        barrier = threading.Barrier(self.THREADS, timeout=10)
+
+        def add_to_cart(user):
+            from django.db import connections
+
+            client = APIClient()
+            client.force_authenticate(user=user)
+            barrier.wait()
+            try:
+                for _ in range(self.ADDS_PER_THREAD):
+                    response = client.post("/api/v1/cart/items/", {"variant_id": self.variant.id, "quantity": 1})
+                    with lock:
+                        statuses.append(response.status_code)
+            except Exception as exc:
+                with lock:
+                    errors.append(str(exc))
+            finally:
+                for conn in connections.all():
+                    conn.close()
+
+        threads = [threading.Thread(target=add_to_cart, args=(user,)) for user in self.users]
+        start_time = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=60)
+        elapsed = time.perf_counter() - start_time
+
+        total = self.THREADS * self.ADDS_PER_THREAD
+        self.assertEqual(errors, [])
+        self.assertEqual(len(statuses), total)
+        self.assertTrue(all(status in (200, 201) for status in statuses), statuses)
+
+        # До сверки строка варианта не обновлялась — все изменения в журнале
+        self.variant.refresh_from_db()
+        self.assertEqual(self.variant.reserved_quantity, 0)
+        self.assertEqual(ReservationLedgerEntry.objects.count(), total)
+
+        fold_reservation_ledger()
+
+        self.variant.refresh_from_db()
+        self.assertEqual(self.variant.reserved_quantity, total)
+        self.assertEqual(self.variant.available_quantity, 10000 - total)
+
+        print(
+            f"Hot variant: {total} cart updates in {elapsed:.2f}s "
+            f"({total / elapsed:.0f} ops/s, {self.THREADS} threads)"
+        )
+
+
+@pytest.mark.slow
+class GuestCartCleanupBenchmarkTest(TestCase):
+    """Ночная очистка гостевых корзин: пакетами, без блокировки популярных вариантов"""
+
+    CARTS = 20000
+
+    def setUp(self):
+        category = Category.objects.create(name="Cleanup Category", slug="cleanup-category")
+        brand = Brand.objects.create(name="Cleanup Brand", slug="cleanup-brand")
+        product = Product.objects.create(name="Cleanup Product", slug="cleanup-product", category=category, brand=brand)
+        self.variants = [
+            ProductVariant.objects.create(
+                product=product,
+                sku=f"CLEANUP-{i}",
+                onec_id=f"1C-CLEANUP-{i}",
+                retail_price=Decimal("100.00"),
+                stock_quantity=100000,
+                reserved_quantity=self.CARTS,
+            )
+            for i in range(2)
+        ]
+        carts = Cart.objects.bulk_create(Cart(session_key=f"guest-{i}") for i in range(self.CARTS))
+        CartItem.objects.bulk_create(
+            CartItem(cart=cart, variant=variant, quantity=1, price_snapshot=Decimal("100.00"))
+            for cart in carts
+            for variant in self.variants
+        )
+
+    def test_purge_guest_carts(self):
+        start_time = time.perf_counter()
+        deleted = purge_carts(Cart.objects.filter(user__isnull=True))
+        elapsed = time.perf_counter() - start_time
+
+        self.assertEqual(deleted, self.CARTS)
+        self.assertFalse(CartItem.objects.exists())
+        # Одна агрегированная запись журнала на вариант в каждой пачке
+        self.assertEqual(ReservationLedgerEntry.objects.count(), 2 * (self.CARTS // 1000))
+        self.assertLess(elapsed, 10.0, f"Очистка {self.CARTS} корзин заняла {elapsed:.2f}s")
+
+        fold_reservation_ledger()
+        self.assertEqual(
+            list(
+                ProductVariant.objects.filter(pk__in=[v.pk for v in self.variants]).values_list(
+                    "reserved_quantity", flat=True
+                )
+            ),
+            [0, 0],
+        )
+
+        print(f"Guest cart cleanup: {self.CARTS} carts in {elapsed:.2f}s")
@@ -0,0 +1,49 @@
+"""
+Performance тесты этапа копирования изображений при импорте из 1С
+"""
+
+import shutil
+import time
+
+import pytest
+
+from apps.products.services.image_store import ingest_images
+
+
+@pytest.mark.slow
+class TestImageIngestThroughput:
+    """Пропускная способность ingest_images в зависимости от числа потоков"""
+
+    FILES = 400
+    FILE_SIZE = 256 * 1024
+
+    @pytest.fixture
+    def source_files(self, tmp_path):
+        source_dir = tmp_path / "import_files" / "ab"
+        source_dir.mkdir(parents=True)
+        paths = []
+        for i in range(self.FILES):
+            path = source_dir / f"abc{i:05d}_1.jpg"
+            path.write_bytes(i.to_bytes(4, "big") * (self.FILE_SIZE // 4))
+            paths.append(path)
+        return paths
+
+    def test_ingest_throughput_by_workers(self, source_files, tmp_path, settings):
+        settings.PRODUCT_IMAGE_STORE_HARDLINKS = False
+        throughput = {}
+        for workers in (1, 2, 4, 8):
+            settings.MEDIA_ROOT = tmp_path / f"media-{workers}"
+
+            start_time = time.perf_counter()
+            results = ingest_images(source_files, max_workers=workers)
+            elapsed = time.perf_counter() - start_time
+
+            assert all(result[1] is True for result in results.values())
+            throughput[workers] = self.FILES / elapsed
+            shutil.rmtree(settings.MEDIA_ROOT)
+
+        print(
+            f"Image ingest: {self.FILES} files x {self.FILE_SIZE // 1024}KB — "
+            + ", ".join(f"{workers} workers: {rate:.0f} files/s" for workers, rate in throughput.items())
+        )
+        assert min(throughput.values()) > 50
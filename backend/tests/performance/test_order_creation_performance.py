@@ -9,8 +9,11 @@ from django.contrib.auth import get_user_model
 from django.test import TestCase
 from rest_framework.test import APIClient
 
+from apps.cart.models import Cart, CartItem
+from apps.cart.services import fold_reservation_ledger
+from apps.orders.services.order_create import OrderCreateService
 from apps.products.factories import ProductVariantFactory
-from apps.products.models import Brand, Category, Product
+from apps.products.models import Brand, Category, Product, ProductVariant
 
 User = get_user_model()
 
@@ -351,3 +354,103 @@ class OrderCreationPerformanceTest(TestCase):
         self.assertEqual(response.status_code, 201)
 
         print(f"Order creation memory usage: {memory_mb:.2f}MB")
+
+
+class WholesaleCheckoutBenchmarkTest(TestCase):
+    """Бенчмарк checkout оптовой корзины на 200 позиций"""
+
+    LINES = 200
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            email="bench_wholesale@example.com",
+            password="testpass123",
+            role="wholesale_level1",
+            company_name="Benchmark Company",
+            tax_id="1234567891",
+            customer_code="00009",
+        )
+        category = Category.objects.create(name="Benchmark Category", slug="benchmark-category")
+        brand = Brand.objects.create(name="Benchmark Brand", slug="benchmark-brand")
+        # Три склада/ставки НДС — несколько субзаказов
+        warehouses = [None, "1 СДВ", "Intex ОСНОВНОЙ"]
+        self.variants = [
+            ProductVariantFactory.create(
+                product__category=category,
+                product__brand=brand,
+                product__is_active=True,
+                product__min_order_quantity=1,
+                sku=f"BENCH-{i:03d}",
+                stock_quantity=50,
+                reserved_quantity=3,
+                warehouse_name=warehouses[i % len(warehouses)],
+            )
+            for i in range(self.LINES)
+        ]
+        cart = Cart.objects.create(user=self.user)
+        # bulk_create без post_save-сигнала: резерв уже задан фабрикой
+        CartItem.objects.bulk_create(
+            CartItem(cart=cart, variant=variant, quantity=3, price_snapshot=variant.opt1_price)
+            for variant in self.variants
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def test_checkout_200_lines(self):
+        """Остатки всех позиций списываются одним UPDATE, число запросов не растёт с размером корзины"""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        order_data = {
+            "delivery_address": "Benchmark Address",
+            "delivery_method": "transport_company",
+            "payment_method": "bank_transfer",
+        }
+        with CaptureQueriesContext(connection) as ctx:
+            start_time = time.perf_counter()
+            response = self.client.post("/api/v1/orders/", order_data)
+            response_time = time.perf_counter() - start_time
+
+        self.assertEqual(response.status_code, 201, response.content)
+        stock_updates = [q["sql"] for q in ctx.captured_queries if q["sql"].startswith('UPDATE "product_variants"')]
+        self.assertEqual(len(stock_updates), 1)
+        self.assertLess(len(ctx.captured_queries), 60, f"{len(ctx.captured_queries)} запросов на checkout")
+        self.assertLess(response_time, 5.0, f"Checkout 200 позиций занял {response_time:.2f}s")
+
+        # Резерв снимается журналом и применяется периодической сверкой
+        fold_reservation_ledger()
+        variants = ProductVariant.objects.filter(pk__in=[v.pk for v in self.variants])
+        self.assertTrue(all(v.stock_quantity == 47 and v.reserved_quantity == 0 for v in variants))
+        self.assertFalse(CartItem.objects.filter(cart__user=self.user).exists())
+
+        print(f"Checkout {self.LINES} lines: {response_time * 1000:.0f} ms, " f"{len(ctx.captured_queries)} queries")
+
+    def test_checkout_rolls_back_when_stock_taken(self):
+        """Нехватка остатка по одной строке откатывает весь checkout"""
+        from unittest.mock import patch
+
+        from apps.orders.models import Order
+
+        last = self.variants[-1]
+        original_decrement = OrderCreateService._decrement_stock
+
+        def take_stock_then_decrement(service, quantities):
+            # Параллельный покупатель забрал остаток после валидации корзины
+            ProductVariant.objects.filter(pk=last.pk).update(stock_quantity=1)
+            return original_decrement(service, quantities)
+
+        with patch.object(OrderCreateService, "_decrement_stock", take_stock_then_decrement):
+            response = self.client.post(
+                "/api/v1/orders/",
+                {
+                    "delivery_address": "Benchmark Address",
+                    "delivery_method": "transport_company",
+                    "payment_method": "bank_transfer",
+                },
+            )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn(last.sku, str(response.content, "utf-8"))
+        self.assertFalse(Order.objects.filter(user=self.user).exists())
+        self.assertEqual(ProductVariant.objects.get(pk=self.variants[0].pk).stock_quantity, 50)
+        self.assertEqual(CartItem.objects.filter(cart__user=self.user).count(), self.LINES)
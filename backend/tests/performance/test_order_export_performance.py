@@ -0,0 +1,95 @@
+"""
+Performance тесты сериализации заказов в CommerceML для обмена с 1С
+"""
+
+import time
+from decimal import Decimal
+
+import pytest
+from django.test import TestCase
+
+from apps.orders.models import Order, OrderItem
+from apps.orders.services import OrderExportService
+from apps.products.models import Brand, Category, Product, ProductVariant
+from apps.users.models import User
+
+
+@pytest.mark.slow
+class OrderExportThroughputTest(TestCase):
+    """Пропускная способность OrderExportService: заказов в секунду"""
+
+    ORDERS = 300
+    ITEMS_PER_ORDER = 5
+
+    def setUp(self):
+        category = Category.objects.create(name="Export Category", slug="export-category")
+        brand = Brand.objects.create(name="Export Brand", slug="export-brand")
+        product = Product.objects.create(name="Export Product", slug="export-product", category=category, brand=brand)
+        variants = [
+            ProductVariant.objects.create(
+                product=product,
+                sku=f"EXPORT-{i}",
+                onec_id=f"1C-EXPORT-{i}",
+                retail_price=Decimal("1500.00"),
+                stock_quantity=100,
+            )
+            for i in range(self.ITEMS_PER_ORDER)
+        ]
+        user = User.objects.create_user(email="export@example.com", password="testpass123", role="retail")
+        master = Order.objects.create(
+            user=user,
+            total_amount=Decimal("7500.00"),
+            delivery_address="Москва, ул. Ленина, 1",
+            delivery_method="courier",
+            payment_method="card",
+            is_master=True,
+        )
+        orders = Order.objects.bulk_create(
+            Order(
+                user=user,
+                order_number=f"FS-EXPORT-{i}",
+                total_amount=Decimal("7500.00"),
+                delivery_address="Москва, ул. Ленина, 1",
+                delivery_method="courier",
+                payment_method="card",
+                is_master=False,
+                parent_order=master,
+                vat_group=Decimal("22"),
+            )
+            for i in range(self.ORDERS)
+        )
+        OrderItem.objects.bulk_create(
+            OrderItem(
+                order=order,
+                product=product,
+                variant=variant,
+                product_name="Футболка & <Limited>",
+                product_sku=variant.sku,
+                quantity=1,
+                unit_price=Decimal("1500.00"),
+                total_price=Decimal("1500.00"),
+            )
+            for order in orders
+            for variant in variants
+        )
+
+    def test_export_throughput(self):
+        orders = (
+            Order.objects.filter(is_master=False)
+            .select_related("user", "parent_order")
+            .prefetch_related("items__variant", "items__product")
+        )
+        service = OrderExportService()
+
+        start_time = time.perf_counter()
+        xml_str = service.generate_xml(orders)
+        elapsed = time.perf_counter() - start_time
+
+        self.assertEqual(xml_str.count("<Документ>"), self.ORDERS)
+        # Сериализация без построения ET-деревьев: сотни заказов в секунду даже с запросами к БД
+        self.assertGreater(self.ORDERS / elapsed, 100, f"{self.ORDERS} заказов за {elapsed:.2f}s")
+
+        print(
+            f"Order export: {self.ORDERS} orders x {self.ITEMS_PER_ORDER} items in {elapsed:.2f}s "
+            f"({self.ORDERS / elapsed:.0f} orders/s)"
+        )
@@ -0,0 +1,116 @@
+"""
+Unit тесты для буферизованной записи CustomerSyncLog
+"""
+
+import uuid
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import transaction
+
+from apps.common.models import CustomerSyncLog
+from apps.common.services import CustomerSyncLogger, sync_log_buffer, write_sync_log
+
+User = get_user_model()
+
+
+def _record(onec_id: str, **kwargs) -> CustomerSyncLog:
+    return CustomerSyncLog(
+        operation_type=CustomerSyncLog.OperationType.SYNC_CHANGES,
+        status=CustomerSyncLog.StatusType.SUCCESS,
+        correlation_id=uuid.uuid4(),
+        session="buffer-test",
+        onec_id=onec_id,
+        **kwargs,
+    )
+
+
+def _count() -> int:
+    return CustomerSyncLog.objects.filter(session="buffer-test").count()
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestSyncLogBuffer:
+    """Тесты для sync_log_buffer / write_sync_log"""
+
+    def test_without_buffer_record_is_saved_immediately(self):
+        record = write_sync_log(_record("NOBUF-1"))
+
+        assert record.pk is not None
+        assert _count() == 1
+
+    def test_records_are_written_in_batches(self, django_assert_num_queries):
+        with sync_log_buffer(max_records=3, flush_interval=3600) as buffer:
+            for i in range(2):
+                write_sync_log(_record(f"BUF-{i}"))
+            assert _count() == 0
+
+            # Третья запись достигает порога: один INSERT (в savepoint) на весь пакет
+            with django_assert_num_queries(3):
+                write_sync_log(_record("BUF-2"))
+            write_sync_log(_record("BUF-3"))
+
+        assert buffer.written == 4
+        assert list(
+            CustomerSyncLog.objects.filter(session="buffer-test").order_by("pk").values_list("onec_id", flat=True)
+        ) == [
+            "BUF-0",
+            "BUF-1",
+            "BUF-2",
+            "BUF-3",
+        ]
+
+    def test_flush_by_interval(self):
+        with sync_log_buffer(max_records=100, flush_interval=0):
+            write_sync_log(_record("INTERVAL-1"))
+            assert _count() == 1
+
+    def test_buffer_is_flushed_when_block_raises(self):
+        with pytest.raises(RuntimeError):
+            with sync_log_buffer(max_records=100, flush_interval=3600):
+                write_sync_log(_record("RAISE-1"))
+                raise RuntimeError("sync failed")
+
+        assert _count() == 1
+
+    def test_threshold_flush_waits_for_nested_transaction(self):
+        with sync_log_buffer(max_records=1, flush_interval=3600):
+            with pytest.raises(RuntimeError), transaction.atomic():
+                write_sync_log(_record("NESTED-1"))
+                assert _count() == 0
+                raise RuntimeError("rollback")
+
+        # Откат savepoint вызывающего кода не унёс запись из буфера
+        assert _count() == 1
+
+    def test_bad_record_does_not_drop_batch(self):
+        with sync_log_buffer(max_records=100, flush_interval=3600) as buffer:
+            write_sync_log(_record("GOOD-1"))
+            write_sync_log(_record("X" * 300))  # onec_id длиннее колонки в БД
+            write_sync_log(_record("GOOD-2"))
+
+        assert buffer.written == 2
+        assert set(CustomerSyncLog.objects.filter(session="buffer-test").values_list("onec_id", flat=True)) == {
+            "GOOD-1",
+            "GOOD-2",
+        }
+
+    def test_nested_buffer_reuses_active(self):
+        with sync_log_buffer(max_records=100, flush_interval=3600) as outer:
+            with sync_log_buffer() as inner:
+                write_sync_log(_record("INNER-1"))
+            assert inner is outer
+            assert _count() == 0
+        assert _count() == 1
+
+    def test_sync_logger_writes_through_buffer(self):
+        user = User.objects.create_user(email="buffered@example.com", password="testpass123")
+        sync_logger = CustomerSyncLogger()
+
+        with sync_log_buffer(max_records=100, flush_interval=3600):
+            record = sync_logger.log_sync_changes(user, {"phone": "+79000000000"})
+            assert record.pk is None
+
+        assert record.pk is not None
+        assert CustomerSyncLog.objects.get(pk=record.pk).customer == user
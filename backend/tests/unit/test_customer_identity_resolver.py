@@ -410,8 +410,9 @@ class TestCustomerIdentityResolver:
         assert resolver.normalize_email("") is None
 
     # Тесты логирования
+    @patch("apps.users.services.identity_resolution.write_sync_log")
     @patch("apps.users.services.identity_resolution.CustomerSyncLog")
-    def test_log_identification_with_session(self, mock_log, resolver, b2b_user):
+    def test_log_identification_with_session(self, mock_log, mock_write, resolver, b2b_user):
         """Тест логирования с session"""
         mock_session = MagicMock()
         onec_data = {
@@ -423,8 +424,8 @@ class TestCustomerIdentityResolver:
 
         resolver._log_identification("onec_id", b2b_user, onec_data)
 
-        mock_log.objects.create.assert_called_once()
-        call_kwargs = mock_log.objects.create.call_args[1]
+        mock_write.assert_called_once_with(mock_log.return_value)
+        call_kwargs = mock_log.call_args[1]
         assert call_kwargs["session"] == mock_session
         assert call_kwargs["customer"] == b2b_user
         assert call_kwargs["onec_id"] == "1C-B2B-001"
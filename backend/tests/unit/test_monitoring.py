@@ -147,6 +147,25 @@ class TestIntegrationHealthCheck(TestCase):
         self.assertTrue(result["available"])
         self.assertEqual(result["message"], "OK")
 
+    def test_check_database_connections_reports_mode_and_server_stats(self) -> None:
+        """Тест статистики соединений с БД."""
+        result = self.health_checker.check_database_connections()
+
+        self.assertEqual(result["component"], "database_connections")
+        self.assertTrue(result["available"])
+        self.assertEqual(result["mode"], "per_request")
+        self.assertGreaterEqual(result["server"]["total"], 1)
+        self.assertGreater(result["server"]["max_connections"], 0)
+        self.assertNotIn("pool", result)
+
+    @patch.dict("os.environ", {"HEALTH_CHECK_DB_CONNECTIONS_THRESHOLD": "0"})
+    def test_check_database_connections_threshold(self) -> None:
+        """Тест превышения порога занятых соединений."""
+        result = self.health_checker.check_database_connections()
+
+        self.assertFalse(result["available"])
+        self.assertIn("max_connections", result["message"])
+
     @patch("apps.common.services.customer_sync_monitor.cache")
     def test_check_redis_connection_success(self, mock_cache: MagicMock) -> None:
         """Тест проверки подключения к Redis."""
@@ -2548,3 +2548,64 @@ class TestLegacyOrderWithoutSubOrders:
         assert len(docs) == 0
         assert legacy_order.pk in skipped_ids
         assert legacy_order.pk not in exported_ids
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestOrderExportServiceSerialization:
+    """Строковые шаблоны документа дают тот же вывод, что ET.tostring."""
+
+    def _create_sub_order(self, user, **kwargs):
+        master = Order.objects.create(
+            user=user,
+            total_amount=Decimal("1000.00"),
+            delivery_address="Москва",
+            delivery_method="courier",
+            payment_method="card",
+            is_master=True,
+        )
+        return Order.objects.create(
+            user=user,
+            total_amount=Decimal("1000.00"),
+            delivery_method="courier",
+            payment_method="card",
+            is_master=False,
+            parent_order=master,
+            **kwargs,
+        )
+
+    def test_output_matches_elementtree_serialization(self, settings):
+        """Пустые тексты — <tag />, экранирование текста и атрибутов — как в ElementTree."""
+        settings.ONEC_EXCHANGE = {
+            **settings.ONEC_EXCHANGE,
+            "DEFAULT_AGREEMENT": "",
+            "DEFAULT_UNIT": {"CODE": '7"96', "NAME_FULL": "Шт\tука & <к>", "NAME_INTL": "", "NAME_SHORT": ""},
+        }
+        user = UserFactory(
+            email=f"ser-{get_unique_suffix()}@example.com",
+            company_name='ООО "Рога & Копыта" <опт>',
+            role="wholesale_level1",
+            tax_id="7701234567",
+        )
+        variant = ProductVariantFactory(onec_id=f"v-ser-{get_unique_suffix()}", retail_price=Decimal("1000.00"))
+        registered = self._create_sub_order(user, delivery_address="Адрес & <дом>", vat_group=Decimal("22"))
+        guest = self._create_sub_order(None, delivery_address="", customer_name="", customer_email="")
+        for order, name in ((registered, 'Товар "A" & <B>'), (guest, "")):
+            OrderItem.objects.create(
+                order=order,
+                product=variant.product,
+                variant=variant,
+                quantity=1,
+                unit_price=Decimal("1000.00"),
+                total_price=Decimal("1000.00"),
+                product_name=name,
+                product_sku=variant.sku,
+            )
+
+        xml_str = OrderExportService().generate_xml(Order.objects.filter(id__in=[registered.id, guest.id]))
+
+        declaration, body = xml_str.split("\n", 1)
+        assert declaration == '<?xml version="1.0" encoding="UTF-8"?>'
+        assert body == ET.tostring(ET.fromstring(xml_str), encoding="unicode")
+        assert "<Наименование />" in body
+        assert '<БазоваяЕдиница Код="7&quot;96" НаименованиеПолное="Шт&#09;ука &amp; &lt;к&gt;"' in body
@@ -5,6 +5,7 @@ Unit-тесты для OrderStatusImportService.
 Покрывают AC1-AC9.
 """
 
+import io
 import logging
 from datetime import date, timedelta
 from typing import cast
@@ -412,6 +413,53 @@ class TestXMLParsing:
         with pytest.raises(ET.ParseError):
             service._parse_orders_xml(invalid_xml)
 
+    def test_iter_orders_xml_yields_batches(self):
+        """Потоковый парсинг отдаёт документы порциями по batch_size."""
+        # ARRANGE
+        xml_data = build_multi_order_xml(
+            [{"order_id": f"order-{i}", "order_number": f"FS-{i}"} for i in range(5)]
+            + [{"order_id": "", "order_number": ""}]
+        )
+        service = OrderStatusImportService()
+
+        # ACT
+        with override_settings(ONEC_EXCHANGE={"ORDER_STATUS_IMPORT_BATCH_SIZE": 2}):
+            chunks = list(service._iter_orders_xml(io.BytesIO(xml_data.encode("utf-8"))))
+
+        # ASSERT
+        assert [total for _, total, _ in chunks] == [2, 2, 2]
+        assert [u.order_number for updates, _, _ in chunks for u in updates] == [f"FS-{i}" for i in range(5)]
+        assert len(chunks[-1][2]) == 1
+
+    def test_iter_orders_xml_windows_1251(self):
+        """Кодировка windows-1251 определяется парсером по XML-декларации."""
+        # ARRANGE
+        xml_data = build_test_xml(status="Доставлен").replace('encoding="UTF-8"', 'encoding="windows-1251"')
+        service = OrderStatusImportService()
+
+        # ACT
+        chunks = list(service._iter_orders_xml(io.BytesIO(xml_data.encode("windows-1251"))))
+
+        # ASSERT
+        assert chunks[0][0][0].status_1c == "Доставлен"
+
+    def test_process_stream_keeps_batches_before_parse_error(self):
+        """Ошибка XML в середине потока фиксируется, завершённые батчи обработаны."""
+        # ARRANGE
+        xml_data = build_multi_order_xml([{"order_id": f"order-{i}", "order_number": f"FS-{i}"} for i in range(3)])
+        broken = xml_data.replace("</КоммерческаяИнформация>", "<broken>").encode("utf-8")
+        service = OrderStatusImportService()
+
+        # ACT
+        with override_settings(ONEC_EXCHANGE={"ORDER_STATUS_IMPORT_BATCH_SIZE": 2}):
+            result = service.process_stream(io.BytesIO(broken))
+
+        # ASSERT
+        # Полный первый batch обработан, незавершённый хвост — нет
+        assert result.processed == 2
+        assert result.not_found == 2
+        assert "xml parse error" in result.errors[-1].lower()
+
 
 @pytest.mark.unit
 class TestDateExtraction:
@@ -7,13 +7,13 @@ Story 14.6: Filtering & Facets API
 from __future__ import annotations
 
 import pytest
-from django.core.cache import cache
 from django.test import RequestFactory
 from django.urls import reverse
 from rest_framework.test import APIClient
 
 from apps.products.filters import ProductFilter
 from apps.products.models import Attribute, AttributeValue, Product, ProductVariant
+from apps.products.services.catalog_cache import NS_ATTRIBUTES, bump_catalog_version
 from apps.products.services.facets import AttributeFacetService
 from tests.factories import (
     AttributeFactory,
@@ -32,8 +32,9 @@ class TestAttributeFilters:
     """Тесты для динамических фильтров атрибутов"""
 
     @pytest.fixture(autouse=True)
-    def clear_attribute_cache(self):
-        cache.delete("active_attributes_for_filters")
+    def clear_attribute_cache(self, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=True):
+            bump_catalog_version(NS_ATTRIBUTES)
 
     def test_filter_by_single_attribute_value(self):
         """AC1: Фильтр по одному значению атрибута ?attr_color=red"""
@@ -453,8 +454,9 @@ class TestAttributeFiltersAPI:
     """Интеграционные тесты API с фильтрами атрибутов"""
 
     @pytest.fixture(autouse=True)
-    def clear_attribute_cache(self):
-        cache.delete("active_attributes_for_filters")
+    def clear_attribute_cache(self, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=True):
+            bump_catalog_version(NS_ATTRIBUTES)
 
     def test_api_filter_by_attribute(self):
         """API: Фильтрация через GET параметр ?attr_<slug>=<value>"""
@@ -412,3 +412,39 @@ class TestOnecBrandIdSerializerGuardrail:
 
         # onec_brand_id не должно быть в публичном API
         assert "onec_brand_id" not in data
+
+
+@pytest.mark.django_db
+class TestProductImageSrcset:
+    """srcset WebP-производных изображений из хранилища products/images/"""
+
+    @pytest.fixture
+    def stored_image(self, tmp_path, settings):
+        from PIL import Image
+
+        from apps.products.services import image_derivatives
+        from apps.products.services.image_derivatives import build_derivatives
+        from apps.products.services.image_store import ingest_image
+
+        settings.MEDIA_ROOT = tmp_path / "media"
+        settings.PRODUCT_IMAGE_DERIVATIVE_WIDTHS = [320]
+        settings.PRODUCT_IMAGE_DERIVATIVE_FORMATS = ["webp"]
+        image_derivatives._known_derivatives.clear()
+        source = tmp_path / "source.jpg"
+        Image.new("RGB", (600, 600), "blue").save(source, "JPEG")
+        name, _ = ingest_image(source)
+        build_derivatives([(source, name)], max_workers=1)
+        yield name
+        image_derivatives._known_derivatives.clear()
+
+    def test_list_and_detail_expose_srcset(self, product_factory, stored_image):
+        """main_image_srcset в списке и srcset в images детальной карточки"""
+        product = product_factory.create(base_images=[stored_image, "products/base/legacy.jpg"])
+        expected = {"webp": f"/media/{stored_image.rsplit('.', 1)[0]}-320w.webp 320w"}
+
+        list_data = ProductListSerializer(product).data
+        detail_data = ProductDetailSerializer(product).data
+
+        assert list_data["main_image_srcset"] == expected
+        assert detail_data["images"][0]["srcset"] == expected
+        assert detail_data["images"][1]["srcset"] is None
@@ -0,0 +1,133 @@
+"""
+Unit-тесты журнала резервов корзины (apps.cart.services)
+"""
+
+from __future__ import annotations
+
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.cart.models import CartItem, ReservationLedgerEntry
+from apps.cart.services import fold_reservation_ledger, rebuild_reserved_quantities
+from apps.products.models import ProductVariant
+from tests.conftest import CartFactory, ProductVariantFactory
+
+
+def _reserved(variant: ProductVariant) -> int:
+    variant.refresh_from_db(fields=["reserved_quantity"])
+    return variant.reserved_quantity
+
+
+def _ledger_sum(variant: ProductVariant) -> int:
+    return sum(ReservationLedgerEntry.objects.filter(variant=variant).values_list("delta", flat=True))
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestReservationLedgerSignals:
+    """Изменения позиций корзины пишут журнал, не обновляя строку варианта"""
+
+    def test_item_changes_are_journaled(self):
+        variant = ProductVariantFactory.create(reserved_quantity=0)
+        cart = CartFactory.create()
+
+        item = CartItem.objects.create(cart=cart, variant=variant, quantity=3, price_snapshot=variant.retail_price)
+        item.quantity = 5
+        item.save()
+        CartItem.objects.get(pk=item.pk).delete()
+
+        assert list(ReservationLedgerEntry.objects.order_by("id").values_list("delta", flat=True)) == [3, 2, -5]
+        assert _reserved(variant) == 0
+
+        fold_reservation_ledger()
+
+        assert _reserved(variant) == 0
+        assert not ReservationLedgerEntry.objects.exists()
+
+    def test_update_does_not_write_variant_row(self):
+        variant = ProductVariantFactory.create()
+        cart = CartFactory.create()
+        item = CartItem.objects.create(cart=cart, variant=variant, quantity=1, price_snapshot=variant.retail_price)
+        item = CartItem.objects.get(pk=item.pk)
+
+        with CaptureQueriesContext(connection) as ctx:
+            item.quantity = 4
+            item.save(update_fields=["quantity"])
+
+        # Строка популярного варианта не обновляется и не блокируется
+        assert not [q for q in ctx.captured_queries if q["sql"].startswith('UPDATE "product_variants"')]
+        assert not [q for q in ctx.captured_queries if "FOR UPDATE" in q["sql"]]
+        assert _ledger_sum(variant) == 4
+
+    def test_variant_change_moves_reservation(self):
+        old_variant = ProductVariantFactory.create()
+        new_variant = ProductVariantFactory.create()
+        cart = CartFactory.create()
+        item = CartItem.objects.create(cart=cart, variant=old_variant, quantity=2, price_snapshot=1)
+
+        item.variant = new_variant
+        item.save()
+
+        assert _ledger_sum(old_variant) == 0
+        assert _ledger_sum(new_variant) == 2
+
+    def test_cart_clear_releases_in_bulk(self):
+        cart = CartFactory.create()
+        variants = ProductVariantFactory.create_batch(3)
+        for variant in variants:
+            CartItem.objects.create(cart=cart, variant=variant, quantity=2, price_snapshot=variant.retail_price)
+        fold_reservation_ledger()
+
+        with CaptureQueriesContext(connection) as ctx:
+            cart.clear()
+
+        assert len(ctx.captured_queries) <= 5
+        assert not cart.items.exists()
+        fold_reservation_ledger()
+        assert [_reserved(variant) for variant in variants] == [0, 0, 0]
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestReservationLedgerFold:
+    """Сверка журнала и пересчёт резерва"""
+
+    def test_fold_in_batches(self):
+        variant = ProductVariantFactory.create(reserved_quantity=10)
+        ReservationLedgerEntry.objects.bulk_create(
+            ReservationLedgerEntry(variant=variant, delta=delta) for delta in [5, -3, 1, 1, -20]
+        )
+
+        assert fold_reservation_ledger(batch_size=2) == 5
+
+        # 10 + 5 - 3 + 1 + 1 = 14, затем -20 — резерв не уходит в минус
+        assert _reserved(variant) == 0
+
+    def test_rebuild_from_cart_items(self):
+        variant = ProductVariantFactory.create(reserved_quantity=0)
+        other = ProductVariantFactory.create(reserved_quantity=7)
+        CartItem.objects.create(cart=CartFactory.create(), variant=variant, quantity=4, price_snapshot=1)
+        CartItem.objects.create(cart=CartFactory.create(), variant=variant, quantity=1, price_snapshot=1)
+
+        assert rebuild_reserved_quantities() == 2
+
+        assert _reserved(variant) == 5
+        assert _reserved(other) == 0
+        assert not ReservationLedgerEntry.objects.exists()
+
+    def test_reconcile_command(self):
+        variant = ProductVariantFactory.create(reserved_quantity=0)
+        CartItem.objects.create(cart=CartFactory.create(), variant=variant, quantity=2, price_snapshot=1)
+
+        out = StringIO()
+        call_command("reconcile_cart_reservations", stdout=out)
+        assert "Свёрнуто записей журнала резервов: 1" in out.getvalue()
+        assert _reserved(variant) == 2
+
+        ProductVariant.objects.filter(pk=variant.pk).update(reserved_quantity=99)
+        call_command("reconcile_cart_reservations", "--rebuild", stdout=StringIO())
+        assert _reserved(variant) == 2
@@ -1,6 +1,6 @@
 """
 Unit-тесты для CustomerDataParser
-Используют реальные данные из data/import_1c/contragents/
+Используют реальные данные из data/import_1c/contragents/ и синтетические XML
 """
 
 from __future__ import annotations
@@ -8,6 +8,7 @@ from __future__ import annotations
 from pathlib import Path
 
 import pytest
+from django.core.exceptions import ValidationError
 
 from apps.users.services.parser import CustomerDataParser
 
@@ -248,3 +249,78 @@ class TestCustomerDataParser:
 
         for customer in business_customers:
             assert customer.get("company_name"), f"company_name должен быть заполнен для {customer['customer_type']}"
+
+
+def _contragents_xml(count: int, namespace: str | None = "urn:1C.ru:commerceml_3", tail: str = "") -> str:
+    """contragents.xml с count контрагентами-ИП"""
+    xmlns = f' xmlns="{namespace}"' if namespace else ""
+    customers = "".join(
+        "<Контрагент>"
+        f"<Ид>stream-{i}</Ид>"
+        f"<Наименование>ИП Потоковый {i}</Наименование>"
+        "<Роль>Покупатель</Роль><ИНН>770708389300</ИНН>"
+        f"<Контакты><Контакт><Тип>Почта</Тип><Значение>stream{i}@example.com</Значение></Контакт></Контакты>"
+        f"<АдресРегистрации><Представление>Москва, {i}</Представление></АдресРегистрации>"
+        "</Контрагент>"
+        for i in range(count)
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        f'<КоммерческаяИнформация{xmlns} ВерсияСхемы="3.1">'
+        f"<Контрагенты>{customers}</Контрагенты>{tail or '</КоммерческаяИнформация>'}"
+    )
+
+
+@pytest.mark.unit
+class TestCustomerDataParserStreaming:
+    """Потоковый разбор contragents.xml (iter_customers / iter_customer_chunks)"""
+
+    @pytest.fixture
+    def parser(self):
+        return CustomerDataParser()
+
+    @pytest.mark.parametrize("namespace", ["urn:1C.ru:commerceml_3", None])
+    def test_iter_customers_resolves_namespace_from_root(self, parser, tmp_path, namespace):
+        xml_file = tmp_path / "contragents.xml"
+        xml_file.write_text(_contragents_xml(3, namespace), encoding="utf-8")
+
+        customers = list(parser.iter_customers(str(xml_file)))
+
+        assert [c["onec_id"] for c in customers] == ["stream-0", "stream-1", "stream-2"]
+        assert customers[1]["email"] == "stream1@example.com"
+        assert customers[1]["address"] == "Москва, 1"
+        assert customers[1]["customer_type"] == "individual_entrepreneur"
+        assert customers == parser.parse(str(xml_file))
+
+    def test_customers_before_malformed_tail_are_yielded(self, parser, tmp_path):
+        """Разбор потоковый: ошибка XML в конце файла возникает после уже отданных клиентов"""
+        xml_file = tmp_path / "broken.xml"
+        xml_file.write_text(_contragents_xml(2, tail="<Оборвано>"), encoding="utf-8")
+
+        customers = parser.iter_customers(str(xml_file))
+
+        assert next(customers)["onec_id"] == "stream-0"
+        assert next(customers)["onec_id"] == "stream-1"
+        with pytest.raises(ValidationError):
+            next(customers)
+
+    @pytest.mark.parametrize("prefetch", [0, 2])
+    def test_iter_customer_chunks(self, parser, tmp_path, prefetch):
+        xml_file = tmp_path / "contragents.xml"
+        xml_file.write_text(_contragents_xml(7), encoding="utf-8")
+
+        chunks = list(parser.iter_customer_chunks(str(xml_file), chunk_size=3, prefetch=prefetch))
+
+        assert [len(chunk) for chunk in chunks] == [3, 3, 1]
+        assert chunks[2][0]["onec_id"] == "stream-6"
+
+    def test_prefetch_propagates_parse_error(self, parser, tmp_path):
+        xml_file = tmp_path / "broken.xml"
+        xml_file.write_text(_contragents_xml(5, tail="<Оборвано>"), encoding="utf-8")
+
+        chunks = parser.iter_customer_chunks(str(xml_file), chunk_size=2, prefetch=1)
+
+        assert len(next(chunks)) == 2
+        assert len(next(chunks)) == 2
+        with pytest.raises(ValidationError):
+            list(chunks)
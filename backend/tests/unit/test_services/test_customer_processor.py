@@ -9,10 +9,12 @@ from decimal import Decimal
 
 import pytest
 from django.contrib.auth import get_user_model
+from django.db import DatabaseError
 from django.utils import timezone
 
 from apps.common.models import CustomerSyncLog
 from apps.products.models import ImportSession
+from apps.users.models import Company
 from apps.users.services.processor import CustomerDataProcessor
 
 User = get_user_model()
@@ -388,3 +390,102 @@ class TestCustomerDataProcessor:
         assert log.operation_type == CustomerSyncLog.OperationType.CREATED
         assert log.status == CustomerSyncLog.StatusType.SUCCESS
         assert log.details == {"test": "data"}
+
+    def test_process_customers_query_count_independent_of_chunk_content(self, processor, django_assert_max_num_queries):
+        """Пакет пишется фиксированным числом запросов, а не запросами на каждого клиента"""
+        User.objects.create(email="batch-existing@example.com", onec_id="TEST-BULK-000")
+        customers_data = [
+            {
+                "onec_id": f"TEST-BULK-{i:03d}",
+                "email": "batch-existing@example.com" if i == 0 else f"bulk{i}@example.com",
+                "first_name": f"Клиент{i}",
+                "role": "Покупатель",
+                "customer_type": "legal_entity",
+                "full_name": f"ООО Клиент{i}",
+                "tax_id": "7700000000",
+            }
+            for i in range(50)
+        ]
+
+        # savepoint, 2 запроса предзагрузки, bulk-записи пользователей, компаний и логов
+        with django_assert_max_num_queries(10):
+            result = processor.process_customers(customers_data, chunk_size=50)
+
+        assert result["created"] == 49
+        assert result["updated"] == 1
+        assert Company.objects.filter(user__onec_id__startswith="TEST-BULK-").count() == 50
+        assert CustomerSyncLog.objects.filter(onec_id__startswith="TEST-BULK-").count() == 50
+
+    def test_process_customers_duplicate_in_chunk_updates_same_user(self, processor):
+        """Повтор клиента внутри пакета обновляет созданного ранее пользователя"""
+        customers_data = [
+            {"onec_id": "TEST-REPEAT-001", "email": "repeat@example.com", "first_name": "Первый", "role": "Покупатель"},
+            {"onec_id": "TEST-REPEAT-002", "email": "repeat@example.com", "first_name": "Второй", "role": "Покупатель"},
+        ]
+
+        result = processor.process_customers(customers_data, chunk_size=10)
+
+        assert result["created"] == 1
+        assert result["updated"] == 1
+        user = User.objects.get(email="repeat@example.com")
+        assert user.first_name == "Второй"
+        assert user.onec_id == "TEST-REPEAT-001"
+        assert set(CustomerSyncLog.objects.filter(customer=user).values_list("operation_type", flat=True)) == {
+            CustomerSyncLog.OperationType.CREATED,
+            CustomerSyncLog.OperationType.UPDATED,
+        }
+
+    def test_process_customers_updates_existing_company(self, processor):
+        """Реквизиты компании существующего клиента обновляются пакетно"""
+        user = User.objects.create(email="company@example.com", onec_id="TEST-COMP-001")
+        Company.objects.create(user=user, legal_name="Старое название", tax_id="1111111111")
+
+        result = processor.process_customers(
+            [
+                {
+                    "onec_id": "TEST-COMP-001",
+                    "email": "company@example.com",
+                    "role": "Покупатель",
+                    "customer_type": "legal_entity",
+                    "full_name": "ООО Новое название",
+                    "tax_id": "2222222222",
+                    "kpp": "770101001",
+                }
+            ]
+        )
+
+        assert result["updated"] == 1
+        company = Company.objects.get(user=user)
+        assert company.legal_name == "ООО Новое название"
+        assert company.tax_id == "2222222222"
+        assert company.kpp == "770101001"
+
+    def test_process_customers_falls_back_to_one_by_one_on_db_error(self, processor, monkeypatch):
+        """Ошибка пакетной записи не теряет пакет: клиенты обрабатываются поштучно"""
+        customers_data = [
+            {"onec_id": f"TEST-FALLBACK-{i}", "email": f"fallback{i}@example.com", "role": "Покупатель"}
+            for i in range(3)
+        ]
+
+        def broken_bulk_create(*args, **kwargs):
+            raise DatabaseError("bulk insert failed")
+
+        monkeypatch.setattr(User.objects, "bulk_create", broken_bulk_create)
+
+        result = processor.process_customers(customers_data, chunk_size=10)
+
+        assert result["created"] == 3
+        assert result["errors"] == 0
+        assert User.objects.filter(onec_id__startswith="TEST-FALLBACK-").count() == 3
+
+    def test_process_customers_consumes_stream(self, processor):
+        """Поток клиентов (генератор парсера) обрабатывается без материализации в список"""
+        customers = (
+            {"onec_id": f"TEST-STREAM-{i}", "email": f"stream{i}@example.com", "role": "Покупатель"} for i in range(5)
+        )
+
+        result = processor.process_customers(customers, chunk_size=2)
+
+        assert result["total"] == 5
+        assert result["created"] == 5
+        assert User.objects.filter(onec_id__startswith="TEST-STREAM-").count() == 5
@@ -0,0 +1,120 @@
+"""
+Unit-тесты настроек соединений с БД по типу процесса (web/celery/beat)
+"""
+
+import importlib.util
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+
+from freesport.settings import base
+
+DATABASE = {
+    "ENGINE": "django.db.backends.postgresql",
+    "NAME": "freesport",
+    "OPTIONS": {"connect_timeout": 10},
+}
+
+DB_ENV_VARS = (
+    "DB_CONN_MAX_AGE",
+    "DB_CONN_MAX_AGE_WEB",
+    "DB_CONN_MAX_AGE_CELERY",
+    "DB_CONN_HEALTH_CHECKS",
+    "DB_POOL",
+    "DB_POOL_CELERY",
+    "DB_PGBOUNCER",
+)
+
+
+@pytest.fixture(autouse=True)
+def clean_db_env(monkeypatch):
+    for name in DB_ENV_VARS:
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setattr(base, "SERVER_MODE", "wsgi")
+
+
+@pytest.mark.unit
+class TestConfigureDatabaseConnections:
+    """Тесты configure_database_connections"""
+
+    def test_defaults_per_process_type(self):
+        assert base.configure_database_connections(DATABASE, process_type="web")["CONN_MAX_AGE"] == 60
+        assert base.configure_database_connections(DATABASE, process_type="celery")["CONN_MAX_AGE"] == 300
+        assert base.configure_database_connections(DATABASE, process_type="beat")["CONN_MAX_AGE"] == 0
+
+        result = base.configure_database_connections(DATABASE, process_type="web")
+        assert result["CONN_HEALTH_CHECKS"] is True
+        assert result["DISABLE_SERVER_SIDE_CURSORS"] is False
+        assert "pool" not in result["OPTIONS"]
+
+    def test_asgi_web_disables_persistent_connections(self, monkeypatch):
+        monkeypatch.setattr(base, "SERVER_MODE", "asgi")
+
+        assert base.configure_database_connections(DATABASE, process_type="web")["CONN_MAX_AGE"] == 0
+        assert base.configure_database_connections(DATABASE, process_type="celery")["CONN_MAX_AGE"] == 300
+
+    def test_process_specific_env_overrides_common(self, monkeypatch):
+        monkeypatch.setenv("DB_CONN_MAX_AGE", "120")
+        monkeypatch.setenv("DB_CONN_MAX_AGE_CELERY", "900")
+
+        assert base.configure_database_connections(DATABASE, process_type="web")["CONN_MAX_AGE"] == 120
+        assert base.configure_database_connections(DATABASE, process_type="celery")["CONN_MAX_AGE"] == 900
+
+    def test_pgbouncer_disables_server_side_cursors(self, monkeypatch):
+        monkeypatch.setenv("DB_PGBOUNCER", "True")
+
+        result = base.configure_database_connections(DATABASE, process_type="celery")
+
+        assert result["DISABLE_SERVER_SIDE_CURSORS"] is True
+
+    def test_input_dict_not_mutated(self, monkeypatch):
+        monkeypatch.setenv("DB_PGBOUNCER", "True")
+
+        base.configure_database_connections(DATABASE, process_type="web")
+
+        assert DATABASE == {
+            "ENGINE": "django.db.backends.postgresql",
+            "NAME": "freesport",
+            "OPTIONS": {"connect_timeout": 10},
+        }
+
+    def test_pool_and_pgbouncer_are_exclusive(self, monkeypatch):
+        monkeypatch.setenv("DB_POOL", "True")
+        monkeypatch.setenv("DB_PGBOUNCER", "True")
+
+        with pytest.raises(ImproperlyConfigured):
+            base.configure_database_connections(DATABASE, process_type="web")
+
+    def test_pool_requires_psycopg3(self, monkeypatch):
+        monkeypatch.setenv("DB_POOL_CELERY", "True")
+        monkeypatch.setattr(importlib.util, "find_spec", lambda name: None)
+
+        # Пул включён только для celery — web не затронут
+        assert "pool" not in base.configure_database_connections(DATABASE, process_type="web")["OPTIONS"]
+        with pytest.raises(ImproperlyConfigured):
+            base.configure_database_connections(DATABASE, process_type="celery")
+
+    def test_pool_options(self, monkeypatch):
+        monkeypatch.setenv("DB_POOL", "True")
+        monkeypatch.setenv("DB_CONN_MAX_AGE", "600")
+        monkeypatch.setattr(importlib.util, "find_spec", lambda name: object())
+
+        result = base.configure_database_connections(DATABASE, process_type="web")
+
+        assert result["CONN_MAX_AGE"] == 0
+        assert result["OPTIONS"]["pool"] == {"min_size": 2, "max_size": 10, "timeout": 10}
+        assert result["OPTIONS"]["connect_timeout"] == 10
+
+    def test_detect_process_type(self, monkeypatch):
+        monkeypatch.delenv("PROCESS_TYPE", raising=False)
+        monkeypatch.setattr(base.sys, "argv", ["/opt/venv/bin/celery", "-A", "freesport", "beat"])
+        assert base.detect_process_type() == "beat"
+
+        monkeypatch.setattr(base.sys, "argv", ["/opt/venv/bin/celery", "-A", "freesport", "worker"])
+        assert base.detect_process_type() == "celery"
+
+        monkeypatch.setattr(base.sys, "argv", ["gunicorn"])
+        assert base.detect_process_type() == "web"
+
+        monkeypatch.setenv("PROCESS_TYPE", "Celery")
+        assert base.detect_process_type() == "celery"
@@ -11,8 +11,8 @@ python manage.py migrate --noinput
 # Сборка статики (если нужно, но обычно в build phase)
 # python manage.py collectstatic --noinput
 
-# Запуск Gunicorn
-exec gunicorn freesport.wsgi:application \
+# Запуск Gunicorn (режим wsgi/asgi задаётся SERVER_MODE, см. gunicorn.conf.py)
+exec gunicorn --config gunicorn.conf.py \
     --name freesport-backend \
     --bind 0.0.0.0:8000 \
     --workers 4 \